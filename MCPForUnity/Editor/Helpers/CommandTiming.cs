@@ -0,0 +1,101 @@
+using System.Diagnostics;
+using System.Globalization;
+using System.Text;
+
+namespace MCPForUnity.Editor.Helpers
+{
+    /// <summary>
+    /// Where the bridge spent one command's time, echoed to the client as a "timing" object
+    /// in the response envelope: queueMs waiting in the command queue for
+    /// EditorApplication.update, execMs in the handler, serializeMs encoding the response JSON
+    /// and bridgeMs from reading the request frame to the response being ready to write.
+    /// Clients subtract bridgeMs from their round trip to get the time spent on the wire.
+    /// </summary>
+    public sealed class CommandTiming
+    {
+        private static readonly UTF8Encoding Utf8 = new UTF8Encoding(false);
+
+        // Stopwatch timestamps; 0 when a stage did not happen (pings skip the queue,
+        // async handlers serialize their own result)
+        public long Received = Stopwatch.GetTimestamp();
+        public long Dequeued;
+        public long Executed;
+        public long Serialized;
+        public long Completed;
+
+        /// <summary>
+        /// UTF-8 encode a response envelope with the timing object added as its last field.
+        /// Falls back to the plain encoding when there is no timing or the response is not a
+        /// non-empty JSON object.
+        /// </summary>
+        public static byte[] Encode(string response, CommandTiming timing)
+        {
+            if (timing == null)
+            {
+                return Utf8.GetBytes(response);
+            }
+            byte[] field = Utf8.GetBytes(timing.ToJsonField(Stopwatch.GetTimestamp()));
+            int length = Utf8.GetByteCount(response);
+            byte[] body = new byte[length + field.Length];
+            Utf8.GetBytes(response, 0, response.Length, body, 0);
+            // '}' never occurs inside a multi-byte UTF-8 sequence, so a byte scan finds the envelope's end
+            int end = length - 1;
+            while (end >= 0 && body[end] != (byte)'}')
+            {
+                if (body[end] != (byte)' ' && body[end] != (byte)'\n' && body[end] != (byte)'\r' && body[end] != (byte)'\t')
+                {
+                    end = -1;
+                    break;
+                }
+                end--;
+            }
+            if (end <= 0 || body[0] != (byte)'{' || IsEmptyObject(body, end))
+            {
+                return Utf8.GetBytes(response);
+            }
+            System.Buffer.BlockCopy(body, end, body, end + field.Length, length - end);
+            System.Buffer.BlockCopy(field, 0, body, end, field.Length);
+            return body;
+        }
+
+        private static bool IsEmptyObject(byte[] body, int end)
+        {
+            for (int i = 1; i < end; i++)
+            {
+                if (body[i] != (byte)' ' && body[i] != (byte)'\n' && body[i] != (byte)'\r' && body[i] != (byte)'\t')
+                {
+                    return false;
+                }
+            }
+            return true;
+        }
+
+        private string ToJsonField(long now)
+        {
+            var sb = new StringBuilder(",\"timing\":{", 96);
+            if (Dequeued != 0)
+            {
+                Append(sb, "queueMs", Dequeued - Received);
+                long executed = Executed != 0 ? Executed : Completed;
+                if (executed != 0)
+                {
+                    Append(sb, "execMs", executed - Dequeued);
+                }
+                if (Executed != 0 && Serialized != 0)
+                {
+                    Append(sb, "serializeMs", Serialized - Executed);
+                }
+            }
+            Append(sb, "bridgeMs", now - Received);
+            sb[sb.Length - 1] = '}';
+            return sb.ToString();
+        }
+
+        private static void Append(StringBuilder sb, string name, long ticks)
+        {
+            double ms = ticks * 1000.0 / Stopwatch.Frequency;
+            sb.Append('"').Append(name).Append("\":")
+              .Append(ms.ToString("0.###", CultureInfo.InvariantCulture)).Append(',');
+        }
+    }
+}
@@ -0,0 +1,110 @@
+using System.Collections.Generic;
+using System.Threading.Tasks;
+using Newtonsoft.Json;
+using UnityEditor;
+
+namespace MCPForUnity.Editor.Helpers
+{
+    /// <summary>
+    /// Bounded LRU of recent responses by idempotency key, so a client that resends a
+    /// mutation after losing its response (a dropped socket, a domain reload) gets the
+    /// original answer instead of applying the command twice. Completed entries are
+    /// kept in SessionState across domain reloads.
+    /// </summary>
+    internal static class IdempotencyCache
+    {
+        private const int Capacity = 256;
+        private const string SessionKey = "MCPForUnity.IdempotencyCache";
+        // Larger responses survive a reload only as a placeholder
+        private const int PersistMaxChars = 16 * 1024;
+        private const string AppliedPlaceholder =
+            "{\"status\":\"success\",\"result\":{\"success\":true,\"message\":\"Already applied; the original response was not retained across the domain reload.\"}}";
+
+        private static readonly object gate = new object();
+        private static readonly LinkedList<KeyValuePair<string, Task<string>>> order = new LinkedList<KeyValuePair<string, Task<string>>>();
+        private static readonly Dictionary<string, LinkedListNode<KeyValuePair<string, Task<string>>>> index =
+            new Dictionary<string, LinkedListNode<KeyValuePair<string, Task<string>>>>();
+        private static bool restored;
+
+        /// <summary>
+        /// Claim a key for a command about to run. Returns the response of the earlier
+        /// command with the same key (possibly still running), or null if the key is new.
+        /// </summary>
+        public static Task<string> TryBegin(string key, Task<string> response)
+        {
+            lock (gate)
+            {
+                Restore();
+                if (index.TryGetValue(key, out var node))
+                {
+                    order.Remove(node);
+                    order.AddFirst(node);
+                    return node.Value.Value;
+                }
+                Add(key, response);
+                return null;
+            }
+        }
+
+        /// <summary>
+        /// Save completed responses to SessionState; call before a domain reload.
+        /// </summary>
+        public static void Persist()
+        {
+            lock (gate)
+            {
+                var saved = new List<string[]>(order.Count);
+                // Oldest first, so Restore() rebuilds the same order
+                for (var node = order.Last; node != null; node = node.Previous)
+                {
+                    Task<string> task = node.Value.Value;
+                    if (task.Status != TaskStatus.RanToCompletion)
+                    {
+                        continue;
+                    }
+                    string response = task.Result ?? string.Empty;
+                    saved.Add(new[] { node.Value.Key, response.Length <= PersistMaxChars ? response : AppliedPlaceholder });
+                }
+                try { SessionState.SetString(SessionKey, JsonConvert.SerializeObject(saved)); } catch { }
+            }
+        }
+
+        private static void Restore()
+        {
+            if (restored)
+            {
+                return;
+            }
+            restored = true;
+            try
+            {
+                string json = SessionState.GetString(SessionKey, string.Empty);
+                if (string.IsNullOrEmpty(json))
+                {
+                    return;
+                }
+                foreach (string[] entry in JsonConvert.DeserializeObject<List<string[]>>(json))
+                {
+                    if (entry != null && entry.Length == 2 && !index.ContainsKey(entry[0]))
+                    {
+                        Add(entry[0], Task.FromResult(entry[1]));
+                    }
+                }
+            }
+            catch
+            {
+                // A corrupt entry only costs deduplication across this reload
+            }
+        }
+
+        private static void Add(string key, Task<string> response)
+        {
+            index[key] = order.AddFirst(new KeyValuePair<string, Task<string>>(key, response));
+            while (order.Count > Capacity)
+            {
+                index.Remove(order.Last.Value.Key);
+                order.RemoveLast();
+            }
+        }
+    }
+}
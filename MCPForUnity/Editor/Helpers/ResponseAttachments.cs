@@ -0,0 +1,93 @@
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Text;
+using Newtonsoft.Json.Linq;
+
+namespace MCPForUnity.Editor.Helpers
+{
+    /// <summary>
+    /// Raw byte payloads sent next to a command's JSON response instead of inside it.
+    /// Clients that negotiated ATTACH=1 may ask for them per request; the bridge then
+    /// writes each attachment as its own frame ahead of the response, which refers to
+    /// it as {"$attachment": index}.
+    /// </summary>
+    public static class ResponseAttachments
+    {
+        // Set by the bridge on the main thread while a handler runs
+        private static List<byte[]> current;
+
+        /// <summary>
+        /// True when the command being handled can return attachments.
+        /// </summary>
+        public static bool Accepted => current != null;
+
+        /// <summary>
+        /// Attach raw bytes to the current response. Returns the JSON reference to put in the
+        /// result, or null when the client did not accept attachments (fall back to inline data).
+        /// </summary>
+        public static JObject Attach(byte[] data)
+        {
+            if (current == null || data == null)
+            {
+                return null;
+            }
+            lock (current)
+            {
+                current.Add(data);
+                return new JObject { ["$attachment"] = current.Count - 1 };
+            }
+        }
+
+        /// <summary>
+        /// Attach a text file as UTF-8 bytes: the file's own bytes when they already are valid
+        /// UTF-8, otherwise File.ReadAllText's decoding of it (UTF-16/32 by BOM) re-encoded.
+        /// Returns null like Attach() when attachments were not accepted.
+        /// </summary>
+        public static JObject AttachFileText(string fullPath)
+        {
+            if (current == null)
+            {
+                return null;
+            }
+            byte[] data = File.ReadAllBytes(fullPath);
+            try
+            {
+                // UTF-16 and UTF-32 byte order marks are never valid UTF-8
+                StrictUtf8.GetCharCount(data);
+            }
+            catch (DecoderFallbackException)
+            {
+                data = Encoding.UTF8.GetBytes(File.ReadAllText(fullPath));
+            }
+            return Attach(data);
+        }
+
+        private static readonly UTF8Encoding StrictUtf8 = new UTF8Encoding(false, true);
+
+        /// <summary>
+        /// Collect attachments into the given list until disposed; a null list disables them.
+        /// </summary>
+        internal static IDisposable Collect(List<byte[]> into)
+        {
+            var previous = current;
+            current = into;
+            return new Scope(previous);
+        }
+
+        private sealed class Scope : IDisposable
+        {
+            private readonly List<byte[]> previous;
+
+            public Scope(List<byte[]> previous)
+            {
+                this.previous = previous;
+            }
+
+            public void Dispose()
+            {
+                current = previous;
+            }
+        }
+    }
+}
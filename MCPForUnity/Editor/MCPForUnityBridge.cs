@@ -37,6 +37,10 @@ namespace MCPForUnity.Editor
         public string CommandJson;
         public TaskCompletionSource<string> Tcs;
         public bool IsExecuting;
+        // Non-null when the request accepts attachments; filled by the handler
+        public List<byte[]> Attachments;
+        // Stage timestamps echoed in the response envelope
+        public CommandTiming Timing;
     }
     [InitializeOnLoad]
     public static partial class MCPForUnityBridge
@@ -46,10 +50,16 @@ namespace MCPForUnity.Editor
         private static readonly object lockObj = new object();
         private static readonly object startStopLock = new object();
         private static readonly object clientsLock = new object();
-        private static readonly System.Collections.Generic.HashSet<TcpClient> activeClients = new System.Collections.Generic.HashSet<TcpClient>();
+        // TcpClients and Unix domain sockets alike; disposed on Stop() to unblock pending reads
+        private static readonly System.Collections.Generic.HashSet<IDisposable> activeClients = new System.Collections.Generic.HashSet<IDisposable>();
         private static readonly BlockingCollection<Outbound> _outbox = new BlockingCollection<Outbound>(new ConcurrentQueue<Outbound>());
         private static CancellationTokenSource cts;
         private static Task listenerTask;
+#if UNITY_2021_2_OR_NEWER
+        // Same-host clients may skip TCP loopback; the path is advertised in the status file
+        private static Socket unixListener;
+#endif
+        private static string unixSocketPath;
         private static int processingCommands = 0;
         private static bool initScheduled = false;
         private static bool ensureUpdateHooked = false;
@@ -63,6 +73,24 @@ namespace MCPForUnity.Editor
         private static bool isAutoConnectMode = false;
         private const ulong MaxFrameBytes = 64UL * 1024 * 1024; // 64 MiB hard cap for framed payloads
         private const int FrameIOTimeoutMs = 30000; // Per-read timeout to avoid stalled clients
+        // Tagged frames (negotiated via REQID=1): marker byte, flags byte, big-endian uint32 request id, then the body
+        private const byte TaggedFrameMarker = 0x01;
+        private const int TaggedHeaderBytes = 6;
+        // Tagged flags (CHUNKED=1): a request may set AcceptChunks, and the response is then
+        // split into frames of at most ResponseChunkBytes, every one but the last marked More
+        private const byte TaggedFlagMore = 0x01;
+        private const byte TaggedFlagAcceptChunks = 0x02;
+        private const int ResponseChunkBytes = 1024 * 1024;
+        // Compression (COMPRESS=zlib): bits 2-3 name the codec a frame body is compressed with,
+        // bits 4-5 the codecs a request accepts for its response; small frames are sent as-is
+        private const byte TaggedCodecMask = 0x0C;
+        private const byte TaggedCodecZlib = 0x04;
+        private const byte TaggedAcceptZlib = 0x10;
+        private const int CompressMinBytes = 1024;
+        // Attachments (ATTACH=1): a request may set AcceptAttachments; raw bytes the response
+        // refers to as {"$attachment": n} then precede it, one Attachment frame each, in order
+        private const byte TaggedFlagAcceptAttachments = 0x40;
+        private const byte TaggedFlagAttachment = 0x80;
 
         // IO diagnostics
         private static long _ioSeq = 0;
@@ -413,6 +441,7 @@ namespace MCPForUnity.Editor
                     // Start background listener with cooperative cancellation
                     cts = new CancellationTokenSource();
                     listenerTask = Task.Run(() => ListenerLoopAsync(cts.Token));
+                    StartUnixListener(cts.Token);
                     CommandRegistry.Initialize();
                     EditorApplication.update += ProcessCommands;
                     // Ensure lifecycle events are (re)subscribed in case Stop() removed them earlier in-domain
@@ -456,6 +485,7 @@ namespace MCPForUnity.Editor
 
                     try { listener?.Stop(); } catch { }
                     listener = null;
+                    StopUnixListener();
 
                     // Capture background task to wait briefly outside the lock
                     toWait = listenerTask;
@@ -468,7 +498,7 @@ namespace MCPForUnity.Editor
             }
 
             // Proactively close all active client sockets to unblock any pending reads
-            TcpClient[] toClose;
+            IDisposable[] toClose;
             lock (clientsLock)
             {
                 toClose = activeClients.ToArray();
@@ -476,7 +506,7 @@ namespace MCPForUnity.Editor
             }
             foreach (var c in toClose)
             {
-                try { c.Close(); } catch { }
+                try { c.Dispose(); } catch { }
             }
 
             // Give the background loop a short window to exit without blocking the editor
@@ -552,33 +582,121 @@ namespace MCPForUnity.Editor
             }
         }
 
-        private static async Task HandleClientAsync(TcpClient client, CancellationToken token)
+        private static void StartUnixListener(CancellationToken token)
+        {
+#if UNITY_2021_2_OR_NEWER
+            if (Application.platform == RuntimePlatform.WindowsEditor || !EditorPrefs.GetBool("MCPForUnity.UnixSocket", true))
+            {
+                return;
+            }
+            string path = Path.Combine(GetStatusDirectory(), $"unity-mcp-{ComputeProjectHash(Application.dataPath)}.sock");
+            try
+            {
+                // A socket file left by the previous domain would make Bind fail
+                if (File.Exists(path)) File.Delete(path);
+                var socket = new Socket(AddressFamily.Unix, SocketType.Stream, ProtocolType.Unspecified);
+                socket.Bind(new UnixDomainSocketEndPoint(path));
+                socket.Listen(16);
+                unixListener = socket;
+                unixSocketPath = path;
+                _ = Task.Run(() => UnixListenerLoopAsync(socket, token));
+                if (IsDebugEnabled()) McpLog.Info($"MCPForUnityBridge also listening on {path}");
+            }
+            catch (Exception ex)
+            {
+                // Path too long for sun_path, unsupported runtime, ...: clients use TCP
+                unixSocketPath = null;
+                if (IsDebugEnabled()) McpLog.Warn($"Unix socket listener unavailable: {ex.Message}");
+            }
+#endif
+        }
+
+        private static void StopUnixListener()
+        {
+#if UNITY_2021_2_OR_NEWER
+            try { unixListener?.Dispose(); } catch { }
+            unixListener = null;
+#endif
+            if (unixSocketPath != null)
+            {
+                try { File.Delete(unixSocketPath); } catch { }
+                unixSocketPath = null;
+            }
+        }
+
+#if UNITY_2021_2_OR_NEWER
+        private static async Task UnixListenerLoopAsync(Socket socket, CancellationToken token)
+        {
+            while (isRunning && !token.IsCancellationRequested)
+            {
+                try
+                {
+                    Socket client = await socket.AcceptAsync().ConfigureAwait(false);
+                    string ep = unixSocketPath ?? "unix socket";
+                    _ = Task.Run(() => ServeClientAsync(client, new NetworkStream(client, true), ep, token), token);
+                }
+                catch (ObjectDisposedException)
+                {
+                    if (!isRunning || token.IsCancellationRequested)
+                    {
+                        break;
+                    }
+                }
+                catch (OperationCanceledException)
+                {
+                    break;
+                }
+                catch (Exception ex)
+                {
+                    if (isRunning && !token.IsCancellationRequested)
+                    {
+                        if (IsDebugEnabled()) McpLog.Error($"Unix socket listener error: {ex.Message}");
+                    }
+                }
+            }
+        }
+#endif
+
+        private static Task HandleClientAsync(TcpClient client, CancellationToken token)
+        {
+            string ep = "unknown";
+            try
+            {
+                client.NoDelay = true;
+                ep = client.Client?.RemoteEndPoint?.ToString() ?? "unknown";
+            }
+            catch { }
+            NetworkStream stream;
+            try
+            {
+                stream = client.GetStream();
+            }
+            catch
+            {
+                client.Dispose();
+                throw;
+            }
+            return ServeClientAsync(client, stream, ep, token);
+        }
+
+        // Serves one client over TCP or a Unix domain socket; the protocol is the same on both
+        private static async Task ServeClientAsync(IDisposable client, NetworkStream clientStream, string endpoint, CancellationToken token)
         {
             using (client)
-            using (NetworkStream stream = client.GetStream())
+            using (NetworkStream stream = clientStream)
             {
                 lock (clientsLock) { activeClients.Add(client); }
                 try
                 {
                     // Framed I/O only; legacy mode removed
-                    try
+                    if (IsDebugEnabled())
                     {
-                        if (IsDebugEnabled())
-                        {
-                            var ep = client.Client?.RemoteEndPoint?.ToString() ?? "unknown";
-                            McpLog.Info($"Client connected {ep}");
-                        }
+                        McpLog.Info($"Client connected {endpoint}");
                     }
-                    catch { }
                     // Strict framing: always require FRAMING=1 and frame all I/O
                     try
                     {
-                        client.NoDelay = true;
-                    }
-                    catch { }
-                    try
-                    {
-                        string handshake = "WELCOME UNITY-MCP 1 FRAMING=1\n";
+                        string handshake = "WELCOME UNITY-MCP 1 FRAMING=1 REQID=1 CHUNKED=1 COMPRESS=zlib ATTACH=1 DEDUPE=1\n";
                         byte[] handshakeBytes = System.Text.Encoding.ASCII.GetBytes(handshake);
                         using var cts = new CancellationTokenSource(FrameIOTimeoutMs);
 #if NETSTANDARD2_1 || NET6_0_OR_GREATER
@@ -586,7 +704,7 @@ namespace MCPForUnity.Editor
 #else
                     await stream.WriteAsync(handshakeBytes, 0, handshakeBytes.Length, cts.Token).ConfigureAwait(false);
 #endif
-                        if (IsDebugEnabled()) McpLog.Info("Sent handshake FRAMING=1 (strict)", always: false);
+                        if (IsDebugEnabled()) McpLog.Info("Sent handshake FRAMING=1 REQID=1 CHUNKED=1 COMPRESS=zlib ATTACH=1 DEDUPE=1 (strict)", always: false);
                     }
                     catch (Exception ex)
                     {
@@ -594,79 +712,38 @@ namespace MCPForUnity.Editor
                         return; // abort this client
                     }
 
+                    // Tagged responses are written from their own tasks; serialize whole frames per client
+                    var writeLock = new SemaphoreSlim(1, 1);
+
                     while (isRunning && !token.IsCancellationRequested)
                     {
                         try
                         {
                             // Strict framed mode only: enforced framed I/O for this connection
-                            string commandText = await ReadFrameAsUtf8Async(stream, FrameIOTimeoutMs, token).ConfigureAwait(false);
+                            byte[] frame = await ReadFrameAsync(stream, FrameIOTimeoutMs, token).ConfigureAwait(false);
+                            var timing = new CommandTiming();
 
-                            try
+                            if (IsTaggedFrame(frame))
                             {
-                                if (IsDebugEnabled())
-                                {
-                                    var preview = commandText.Length > 120 ? commandText.Substring(0, 120) + "…" : commandText;
-                                    McpLog.Info($"recv framed: {preview}", always: false);
-                                }
-                            }
-                            catch { }
-                            string commandId = Guid.NewGuid().ToString();
-                            var tcs = new TaskCompletionSource<string>(TaskCreationOptions.RunContinuationsAsynchronously);
-
-                            // Special handling for ping command to avoid JSON parsing
-                            if (commandText.Trim() == "ping")
-                            {
-                                // Direct response to ping without going through JSON parsing
-                                byte[] pingResponseBytes = System.Text.Encoding.UTF8.GetBytes(
-                                    /*lang=json,strict*/
-                                    "{\"status\":\"success\",\"result\":{\"message\":\"pong\"}}"
-                                );
-                                await WriteFrameAsync(stream, pingResponseBytes);
+                                // Request-id tagged frame: answer whenever the command completes so a slow
+                                // command does not hold up the rest of this client's requests
+                                _ = RespondTaggedAsync(stream, writeLock, frame, timing);
                                 continue;
                             }
 
-                            lock (lockObj)
-                            {
-                                commandQueue[commandId] = new QueuedCommand
-                                {
-                                    CommandJson = commandText,
-                                    Tcs = tcs,
-                                    IsExecuting = false
-                                };
-                            }
+                            string commandText = System.Text.Encoding.UTF8.GetString(frame);
 
-                            // Wait for the handler to produce a response, but do not block indefinitely
-                            string response;
                             try
                             {
-                                using var respCts = new CancellationTokenSource(FrameIOTimeoutMs);
-                                var completed = await Task.WhenAny(tcs.Task, Task.Delay(FrameIOTimeoutMs, respCts.Token)).ConfigureAwait(false);
-                                if (completed == tcs.Task)
-                                {
-                                    // Got a result from the handler
-                                    respCts.Cancel();
-                                    response = tcs.Task.Result;
-                                }
-                                else
+                                if (IsDebugEnabled())
                                 {
-                                    // Timeout: return a structured error so the client can recover
-                                    var timeoutResponse = new
-                                    {
-                                        status = "error",
-                                        error = $"Command processing timed out after {FrameIOTimeoutMs} ms",
-                                    };
-                                    response = JsonConvert.SerializeObject(timeoutResponse);
+                                    var preview = commandText.Length > 120 ? commandText.Substring(0, 120) + "…" : commandText;
+                                    McpLog.Info($"recv framed: {preview}", always: false);
                                 }
                             }
-                            catch (Exception ex)
-                            {
-                                var errorResponse = new
-                                {
-                                    status = "error",
-                                    error = ex.Message,
-                                };
-                                response = JsonConvert.SerializeObject(errorResponse);
-                            }
+                            catch { }
+
+                            string response = await ExecuteQueuedCommandAsync(commandText, null, timing).ConfigureAwait(false);
 
                             if (IsDebugEnabled())
                             {
@@ -677,7 +754,7 @@ namespace MCPForUnity.Editor
                             byte[] responseBytes;
                             try
                             {
-                                responseBytes = System.Text.Encoding.UTF8.GetBytes(response);
+                                responseBytes = CommandTiming.Encode(response, timing);
                                 IoInfo($"[IO] ➜ write start seq={seq} tag=response len={responseBytes.Length} reqId=?");
                             }
                             catch (Exception ex)
@@ -689,7 +766,7 @@ namespace MCPForUnity.Editor
                             var swDirect = System.Diagnostics.Stopwatch.StartNew();
                             try
                             {
-                                await WriteFrameAsync(stream, responseBytes);
+                                await WriteFrameLockedAsync(stream, writeLock, responseBytes).ConfigureAwait(false);
                                 swDirect.Stop();
                                 IoInfo($"[IO] ✓ write end   tag=response len={responseBytes.Length} reqId=? durMs={swDirect.Elapsed.TotalMilliseconds:F1}");
                             }
@@ -726,6 +803,243 @@ namespace MCPForUnity.Editor
             }
         }
 
+        // Queue a command for the main thread and wait (bounded) for its serialized response
+        private static async Task<string> ExecuteQueuedCommandAsync(string commandText, List<byte[]> attachments = null,
+            CommandTiming timing = null)
+        {
+            // Special handling for ping command to avoid JSON parsing
+            if (commandText.Trim() == "ping")
+            {
+                /*lang=json,strict*/
+                return "{\"status\":\"success\",\"result\":{\"message\":\"pong\"}}";
+            }
+
+            string commandId = Guid.NewGuid().ToString();
+            var tcs = new TaskCompletionSource<string>(TaskCreationOptions.RunContinuationsAsynchronously);
+            lock (lockObj)
+            {
+                commandQueue[commandId] = new QueuedCommand
+                {
+                    CommandJson = commandText,
+                    Tcs = tcs,
+                    IsExecuting = false,
+                    Attachments = attachments,
+                    Timing = timing
+                };
+            }
+
+            // Wait for the handler to produce a response, but do not block indefinitely
+            try
+            {
+                using var respCts = new CancellationTokenSource(FrameIOTimeoutMs);
+                var completed = await Task.WhenAny(tcs.Task, Task.Delay(FrameIOTimeoutMs, respCts.Token)).ConfigureAwait(false);
+                if (completed == tcs.Task)
+                {
+                    // Got a result from the handler
+                    respCts.Cancel();
+                    if (timing != null) timing.Completed = System.Diagnostics.Stopwatch.GetTimestamp();
+                    return tcs.Task.Result;
+                }
+
+                // Timeout: return a structured error so the client can recover
+                var timeoutResponse = new
+                {
+                    status = "error",
+                    error = $"Command processing timed out after {FrameIOTimeoutMs} ms",
+                };
+                return JsonConvert.SerializeObject(timeoutResponse);
+            }
+            catch (Exception ex)
+            {
+                var errorResponse = new
+                {
+                    status = "error",
+                    error = ex.Message,
+                };
+                return JsonConvert.SerializeObject(errorResponse);
+            }
+        }
+
+        // Execute a tagged request and write its response with the same request id
+        private static async Task RespondTaggedAsync(NetworkStream stream, SemaphoreSlim writeLock, byte[] request,
+            CommandTiming timing)
+        {
+            byte flags = request[1];
+            uint reqId = ReadUInt32BigEndian(request, 2);
+            var attachments = (flags & TaggedFlagAcceptAttachments) != 0 ? new List<byte[]>() : null;
+            try
+            {
+                string response;
+                try
+                {
+                    string commandText = DecodeTaggedBody(request, flags);
+                    response = await ExecuteQueuedCommandAsync(commandText, attachments, timing).ConfigureAwait(false);
+                }
+                catch (InvalidDataException ex)
+                {
+                    response = JsonConvert.SerializeObject(new
+                    {
+                        status = "error",
+                        error = $"Invalid compressed request: {ex.Message}",
+                    });
+                }
+                byte[] body = CommandTiming.Encode(response, timing);
+                // Without AcceptChunks the whole body goes out in one frame, as before
+                int chunkBytes = (flags & TaggedFlagAcceptChunks) != 0 ? ResponseChunkBytes : Math.Max(body.Length, 1);
+                bool compress = (flags & TaggedAcceptZlib) != 0;
+
+                var sw = System.Diagnostics.Stopwatch.StartNew();
+                long wireBytes = 0;
+                byte[][] attached = Array.Empty<byte[]>();
+                if (attachments != null)
+                {
+                    // A command that timed out may still be running on the main thread
+                    lock (attachments) { attached = attachments.ToArray(); }
+                }
+                foreach (byte[] data in attached)
+                {
+                    // Sent as-is: the point is to skip the JSON encoding, and asset bytes rarely compress
+                    byte[] frame = new byte[TaggedHeaderBytes + data.Length];
+                    frame[0] = TaggedFrameMarker;
+                    frame[1] = TaggedFlagAttachment;
+                    WriteUInt32BigEndian(frame, 2, reqId);
+                    Buffer.BlockCopy(data, 0, frame, TaggedHeaderBytes, data.Length);
+                    await WriteFrameLockedAsync(stream, writeLock, frame).ConfigureAwait(false);
+                    wireBytes += data.Length;
+                }
+                int offset = 0;
+                do
+                {
+                    // Take the write lock per chunk so other responses can interleave
+                    int length = Math.Min(chunkBytes, body.Length - offset);
+                    byte frameFlags = offset + length < body.Length ? TaggedFlagMore : (byte)0;
+                    byte[] packed = compress && length >= CompressMinBytes ? ZlibCompress(body, offset, length) : null;
+                    if (packed != null && packed.Length < length)
+                    {
+                        frameFlags |= TaggedCodecZlib;
+                        wireBytes += packed.Length;
+                    }
+                    else
+                    {
+                        packed = null;
+                        wireBytes += length;
+                    }
+                    byte[] frame = new byte[TaggedHeaderBytes + (packed?.Length ?? length)];
+                    frame[0] = TaggedFrameMarker;
+                    frame[1] = frameFlags;
+                    WriteUInt32BigEndian(frame, 2, reqId);
+                    if (packed != null)
+                        Buffer.BlockCopy(packed, 0, frame, TaggedHeaderBytes, packed.Length);
+                    else
+                        Buffer.BlockCopy(body, offset, frame, TaggedHeaderBytes, length);
+                    await WriteFrameLockedAsync(stream, writeLock, frame).ConfigureAwait(false);
+                    offset += length;
+                } while (offset < body.Length);
+                IoInfo($"[IO] ✓ write end   tag=response len={body.Length} wire={wireBytes} reqId={reqId} chunks={(body.Length + chunkBytes - 1) / chunkBytes} attachments={attached.Length} durMs={sw.Elapsed.TotalMilliseconds:F1}");
+            }
+            catch (Exception ex)
+            {
+                // The client went away or the stream was torn down; nothing left to answer
+                IoInfo($"[IO] ✗ write FAIL  tag=response reqId={reqId} {ex.GetType().Name}: {ex.Message}");
+            }
+        }
+
+        private static bool IsTaggedFrame(byte[] frame)
+        {
+            return frame != null && frame.Length >= TaggedHeaderBytes && frame[0] == TaggedFrameMarker;
+        }
+
+        private static string DecodeTaggedBody(byte[] frame, byte flags)
+        {
+            int codec = flags & TaggedCodecMask;
+            if (codec == 0)
+            {
+                return System.Text.Encoding.UTF8.GetString(frame, TaggedHeaderBytes, frame.Length - TaggedHeaderBytes);
+            }
+            if (codec != TaggedCodecZlib)
+            {
+                throw new InvalidDataException($"unsupported codec flags 0x{flags:X2}");
+            }
+            byte[] body = ZlibDecompress(frame, TaggedHeaderBytes, frame.Length - TaggedHeaderBytes);
+            return System.Text.Encoding.UTF8.GetString(body);
+        }
+
+        // zlib (RFC 1950) framing around DeflateStream, which only reads and writes raw deflate
+        private static byte[] ZlibCompress(byte[] data, int offset, int count)
+        {
+            using var output = new MemoryStream(count / 4 + 16);
+            output.WriteByte(0x78);
+            output.WriteByte(0x9C);
+            using (var deflate = new System.IO.Compression.DeflateStream(output, System.IO.Compression.CompressionLevel.Fastest, leaveOpen: true))
+            {
+                deflate.Write(data, offset, count);
+            }
+            byte[] checksum = new byte[4];
+            WriteUInt32BigEndian(checksum, 0, Adler32(data, offset, count));
+            output.Write(checksum, 0, checksum.Length);
+            return output.ToArray();
+        }
+
+        private static byte[] ZlibDecompress(byte[] data, int offset, int count)
+        {
+            if (count < 6 || (data[offset] & 0x0F) != 8 || ((data[offset] << 8) | data[offset + 1]) % 31 != 0 || (data[offset + 1] & 0x20) != 0)
+            {
+                throw new InvalidDataException("bad zlib header");
+            }
+            using var input = new MemoryStream(data, offset + 2, count - 6, writable: false);
+            using var deflate = new System.IO.Compression.DeflateStream(input, System.IO.Compression.CompressionMode.Decompress);
+            using var output = new MemoryStream(count * 4);
+            byte[] buffer = new byte[81920];
+            int read;
+            while ((read = deflate.Read(buffer, 0, buffer.Length)) > 0)
+            {
+                if ((ulong)(output.Length + read) > MaxFrameBytes)
+                {
+                    throw new InvalidDataException($"decompressed request exceeds {MaxFrameBytes} bytes");
+                }
+                output.Write(buffer, 0, read);
+            }
+            byte[] result = output.ToArray();
+            if (Adler32(result, 0, result.Length) != ReadUInt32BigEndian(data, offset + count - 4))
+            {
+                throw new InvalidDataException("zlib checksum mismatch");
+            }
+            return result;
+        }
+
+        private static uint Adler32(byte[] data, int offset, int count)
+        {
+            const uint Mod = 65521;
+            uint a = 1, b = 0;
+            int end = offset + count;
+            while (offset < end)
+            {
+                // 5552 is the largest run before b can overflow 32 bits
+                int stop = Math.Min(end, offset + 5552);
+                for (; offset < stop; offset++)
+                {
+                    a += data[offset];
+                    b += a;
+                }
+                a %= Mod;
+                b %= Mod;
+            }
+            return (b << 16) | a;
+        }
+
+        private static async Task WriteFrameLockedAsync(NetworkStream stream, SemaphoreSlim writeLock, byte[] payload)
+        {
+            await writeLock.WaitAsync().ConfigureAwait(false);
+            try
+            {
+                await WriteFrameAsync(stream, payload).ConfigureAwait(false);
+            }
+            finally
+            {
+                writeLock.Release();
+            }
+        }
+
         // Timeout-aware exact read helper with cancellation; avoids indefinite stalls and background task leaks
         private static async System.Threading.Tasks.Task<byte[]> ReadExactAsync(NetworkStream stream, int count, int timeoutMs, CancellationToken cancel = default)
         {
@@ -801,7 +1115,7 @@ namespace MCPForUnity.Editor
 #endif
         }
 
-        private static async System.Threading.Tasks.Task<string> ReadFrameAsUtf8Async(NetworkStream stream, int timeoutMs, CancellationToken cancel)
+        private static async System.Threading.Tasks.Task<byte[]> ReadFrameAsync(NetworkStream stream, int timeoutMs, CancellationToken cancel)
         {
             byte[] header = await ReadExactAsync(stream, 8, timeoutMs, cancel).ConfigureAwait(false);
             ulong payloadLen = ReadUInt64BigEndian(header);
@@ -816,8 +1130,7 @@ namespace MCPForUnity.Editor
                 throw new System.IO.IOException("Frame too large for buffer");
             }
             int count = (int)payloadLen;
-            byte[] payload = await ReadExactAsync(stream, count, timeoutMs, cancel).ConfigureAwait(false);
-            return System.Text.Encoding.UTF8.GetString(payload);
+            return await ReadExactAsync(stream, count, timeoutMs, cancel).ConfigureAwait(false);
         }
 
         private static ulong ReadUInt64BigEndian(byte[] buffer)
@@ -833,6 +1146,22 @@ namespace MCPForUnity.Editor
                  | buffer[7];
         }
 
+        private static uint ReadUInt32BigEndian(byte[] buffer, int offset)
+        {
+            return ((uint)buffer[offset] << 24)
+                 | ((uint)buffer[offset + 1] << 16)
+                 | ((uint)buffer[offset + 2] << 8)
+                 | buffer[offset + 3];
+        }
+
+        private static void WriteUInt32BigEndian(byte[] dest, int offset, uint value)
+        {
+            dest[offset] = (byte)(value >> 24);
+            dest[offset + 1] = (byte)(value >> 16);
+            dest[offset + 2] = (byte)(value >> 8);
+            dest[offset + 3] = (byte)value;
+        }
+
         private static void WriteUInt64BigEndian(byte[] dest, ulong value)
         {
             if (dest == null || dest.Length < 8)
@@ -883,6 +1212,8 @@ namespace MCPForUnity.Editor
                     QueuedCommand queuedCommand = item.command;
                     string commandText = queuedCommand.CommandJson;
                     TaskCompletionSource<string> tcs = queuedCommand.Tcs;
+                    CommandTiming timing = queuedCommand.Timing;
+                    if (timing != null) timing.Dequeued = System.Diagnostics.Stopwatch.GetTimestamp();
 
                     try
                     {
@@ -947,11 +1278,29 @@ namespace MCPForUnity.Editor
                         }
                         else
                         {
+                            if (!string.IsNullOrEmpty(command.idempotencyKey))
+                            {
+                                Task<string> earlier = IdempotencyCache.TryBegin(command.idempotencyKey, tcs.Task);
+                                if (earlier != null)
+                                {
+                                    // A resend of a mutation already applied (or still running): answer with its response
+                                    _ = earlier.ContinueWith(t => tcs.TrySetResult(t.Status == TaskStatus.RanToCompletion
+                                        ? t.Result
+                                        : JsonConvert.SerializeObject(new { status = "error", error = "Original command did not complete" })));
+                                    lock (lockObj) { commandQueue.Remove(id); }
+                                    continue;
+                                }
+                            }
+
                             // Use JObject for parameters as handlers expect this
                             JObject paramsObject = command.@params ?? new JObject();
 
                             // Execute command (may be sync or async)
-                            object result = CommandRegistry.ExecuteCommand(command.type, paramsObject, tcs);
+                            object result;
+                            using (ResponseAttachments.Collect(queuedCommand.Attachments))
+                            {
+                                result = CommandRegistry.ExecuteCommand(command.type, paramsObject, tcs);
+                            }
 
                             // If result is null, it means async execution - TCS will be completed by the awaited task
                             // In this case, DON'T remove from queue yet, DON'T complete TCS
@@ -975,8 +1324,11 @@ namespace MCPForUnity.Editor
                             }
 
                             // Synchronous result - complete TCS now
+                            if (timing != null) timing.Executed = System.Diagnostics.Stopwatch.GetTimestamp();
                             var response = new { status = "success", result };
-                            tcs.SetResult(JsonConvert.SerializeObject(response));
+                            string serialized = JsonConvert.SerializeObject(response);
+                            if (timing != null) timing.Serialized = System.Diagnostics.Stopwatch.GetTimestamp();
+                            tcs.SetResult(serialized);
                         }
                     }
                     catch (Exception ex)
@@ -1197,6 +1549,8 @@ namespace MCPForUnity.Editor
         {
             // Stop cleanly before reload so sockets close and clients see 'reloading'
             try { Stop(); } catch { }
+            // Clients resend mutations whose responses the reload cut off
+            IdempotencyCache.Persist();
             // Avoid file I/O or heavy work here
         }
 
@@ -1209,17 +1563,23 @@ namespace MCPForUnity.Editor
             ScheduleInitRetry();
         }
 
+        private static string GetStatusDirectory()
+        {
+            // Allow override of status directory (useful in CI/containers)
+            string dir = Environment.GetEnvironmentVariable("UNITY_MCP_STATUS_DIR");
+            if (string.IsNullOrWhiteSpace(dir))
+            {
+                dir = Path.Combine(Environment.GetFolderPath(Environment.SpecialFolder.UserProfile), ".unity-mcp");
+            }
+            Directory.CreateDirectory(dir);
+            return dir;
+        }
+
         private static void WriteHeartbeat(bool reloading, string reason = null)
         {
             try
             {
-                // Allow override of status directory (useful in CI/containers)
-                string dir = Environment.GetEnvironmentVariable("UNITY_MCP_STATUS_DIR");
-                if (string.IsNullOrWhiteSpace(dir))
-                {
-                    dir = Path.Combine(Environment.GetFolderPath(Environment.SpecialFolder.UserProfile), ".unity-mcp");
-                }
-                Directory.CreateDirectory(dir);
+                string dir = GetStatusDirectory();
                 string filePath = Path.Combine(dir, $"unity-mcp-status-{ComputeProjectHash(Application.dataPath)}.json");
 
                 // Extract project name from path
@@ -1253,6 +1613,7 @@ namespace MCPForUnity.Editor
                     project_path = Application.dataPath,
                     project_name = projectName,
                     unity_version = Application.unityVersion,
+                    unix_socket = unixSocketPath,
                     last_heartbeat = DateTime.UtcNow.ToString("O")
                 };
                 File.WriteAllText(filePath, JsonConvert.SerializeObject(payload), new System.Text.UTF8Encoding(false));
@@ -16,6 +16,12 @@ namespace MCPForUnity.Editor.Models
         /// The parameters for the command
         /// </summary>
         public JObject @params { get; set; }
+
+        /// <summary>
+        /// Client-generated key shared by every attempt of one mutation; a repeat is
+        /// answered from IdempotencyCache instead of being applied again
+        /// </summary>
+        public string idempotencyKey { get; set; }
     }
 }
 
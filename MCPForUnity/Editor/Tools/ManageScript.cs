@@ -385,11 +385,25 @@ namespace MCPForUnity.Editor.Tools
 
             try
             {
+                var uri = $"unity://path/{relativePath}";
+                if (ResponseAttachments.Accepted)
+                {
+                    // File bytes as UTF-8 in a binary frame: no JSON escaping, no base64 copy
+                    return Response.Success(
+                        $"Script '{Path.GetFileName(relativePath)}' read successfully.",
+                        new
+                        {
+                            uri,
+                            path = relativePath,
+                            contents = ResponseAttachments.AttachFileText(fullPath),
+                        }
+                    );
+                }
+
                 string contents = File.ReadAllText(fullPath);
 
                 // Return both normal and encoded contents for larger files
                 bool isLarge = contents.Length > 10000; // If content is large, include encoded version
-                var uri = $"unity://path/{relativePath}";
                 var responseData = new
                 {
                     uri,
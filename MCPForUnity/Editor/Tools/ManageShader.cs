@@ -195,6 +195,19 @@ namespace MCPForUnity.Editor.Tools
 
             try
             {
+                if (ResponseAttachments.Accepted)
+                {
+                    // File bytes as UTF-8 in a binary frame: no JSON escaping, no base64 copy
+                    return Response.Success(
+                        $"Shader '{Path.GetFileName(relativePath)}' read successfully.",
+                        new
+                        {
+                            path = relativePath,
+                            contents = ResponseAttachments.AttachFileText(fullPath),
+                        }
+                    );
+                }
+
                 string contents = File.ReadAllText(fullPath);
 
                 // Return both normal and encoded contents for larger files
@@ -0,0 +1 @@
+"""Transport benchmarks; run them from the server directory with `python -m benchmarks.<name>`."""
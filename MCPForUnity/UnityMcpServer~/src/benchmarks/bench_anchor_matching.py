@@ -0,0 +1,104 @@
+"""
+Anchor matching benchmark: resolving a closing-brace anchor by brace depth against line scoring.
+
+The previous scorer counted newlines before every match and ran a
+method-signature regex over a window of lines around it; on a generated
+script with thousands of closing braces that is quadratic. The current one
+lexes the text once (csharp_outline.BraceIndex) and ranks each match by
+lookup. This times both on the class-end anchor r"^\\s*}\\s*$" against
+generated scripts of increasing size.
+
+legacy_closing_brace_match() is the previous scorer, kept for comparison.
+
+Usage (from the server directory):
+
+    python -m benchmarks.bench_anchor_matching [--lines 1000,5000,20000] [--seconds S]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+ANCHOR = r"^\s*}\s*$"
+
+
+def legacy_closing_brace_match(matches, text: str):
+    scored_matches = []
+    lines = text.splitlines()
+
+    for match in matches:
+        score = 0
+        start_pos = match.start()
+        line_num = text[:start_pos].count('\n')
+
+        if line_num < len(lines):
+            line_content = lines[line_num]
+            indentation = len(line_content) - len(line_content.lstrip())
+            score += max(0, 20 - indentation)
+            distance_from_end = len(lines) - line_num
+            score += max(0, 10 - distance_from_end)
+            context_start = max(0, line_num - 3)
+            context_end = min(len(lines), line_num + 2)
+            for context_line in lines[context_start:context_end]:
+                if re.search(r'\b(void|public|private|protected)\s+\w+\s*\(', context_line):
+                    score -= 5
+            if indentation <= 4 and distance_from_end <= 3:
+                score += 15
+
+        scored_matches.append((score, match))
+
+    scored_matches.sort(key=lambda x: x[0], reverse=True)
+    return scored_matches[0][1]
+
+
+def _time_per_call(fn: Callable[[], Any], seconds: float) -> float:
+    """Seconds per call, from the best of three batches sized to fill `seconds`."""
+    fn()
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds / 3 or calls >= 1 << 16:
+            break
+        calls *= 2
+    best = elapsed
+    for _ in range(2):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return best / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", default="1000,5000,20000", help="comma-separated script sizes")
+    parser.add_argument("--seconds", type=float, default=1.0,
+                        help="approximate time spent per measurement")
+    args = parser.parse_args()
+
+    from benchmarks.bench_csharp_outline import generate_script
+    from tools.script_apply_edits import _find_best_closing_brace_match
+
+    print(f"{'lines':>7} {'braces':>7} {'legacy ms':>10} {'index ms':>10} {'legacy pick':>12} {'index pick':>11}")
+    for size in (int(n) for n in args.lines.split(",")):
+        text = generate_script(size)
+        matches = list(re.finditer(ANCHOR, text, re.MULTILINE))
+        legacy = _time_per_call(lambda: legacy_closing_brace_match(matches, text), args.seconds)
+        current = _time_per_call(lambda: _find_best_closing_brace_match(matches, text), args.seconds)
+        picks = [text[:m.start()].count("\n") + 1 for m in (
+            legacy_closing_brace_match(matches, text), _find_best_closing_brace_match(matches, text))]
+        print(f"{text.count(chr(10)):7d} {len(matches):7d} {legacy * 1e3:10.2f} {current * 1e3:10.2f} "
+              f"{'line %d' % picks[0]:>12} {'line %d' % picks[1]:>11}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
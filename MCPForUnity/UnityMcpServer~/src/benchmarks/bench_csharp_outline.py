@@ -0,0 +1,145 @@
+"""
+C# outline benchmark: full parse, cache hit and incremental update after an edit.
+
+Generates a script of about --lines lines in the shape of a large Unity
+MonoBehaviour (a namespace, several classes, attributed fields, properties,
+methods whose bodies hold strings, verbatim and interpolated strings,
+comments and #if blocks), then times:
+
+- a full parse (what a cache miss costs),
+- a cache hit by SHA-256,
+- replacing a method in the middle of the file the way script_apply_edits
+  does (locate it, CSharpOutline.apply_edit() re-parsing just that member)
+  next to a full parse of the edited text,
+- locating a method with the outline next to the per-line regex scan the
+  read_resource "show N lines around" request used before.
+
+Usage (from the server directory):
+
+    python -m benchmarks.bench_csharp_outline [--lines 10000] [--seconds S]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+
+def _method(cls: int, index: int) -> str:
+    return (
+        f"        [ContextMenu(\"Run {index}\")]\n"
+        f"        public int Step{index}(int frame, string label = \"{{\")\n"
+        f"        {{\n"
+        f"            // brace in a comment: {{\n"
+        f"            var path = @\"C:\\Builds\\{{Game}}\\\"\"{cls}\"\"\";\n"
+        f"            var text = $\"step {{frame}} of {{label}} {{(frame > 1 ? \"}}\" : \"{{\")}}\";\n"
+        f"#if UNITY_EDITOR\n"
+        f"            if (frame > {index}) {{\n"
+        f"#else\n"
+        f"            if (frame < {index}) {{\n"
+        f"#endif\n"
+        f"                Debug.Log(text + path + '{{');\n"
+        f"            }}\n"
+        f"            return frame + {index};\n"
+        f"        }}\n"
+        f"\n"
+    )
+
+
+def generate_script(lines: int = 10000) -> str:
+    """A syntactically plausible C# script of roughly `lines` lines."""
+    parts = ["using System;\nusing UnityEngine;\n\nnamespace Game.Generated\n{\n"]
+    count = 0
+    cls = 0
+    while count < lines:
+        header = f"    public class Generated{cls} : MonoBehaviour\n    {{\n"
+        fields = "".join(f"        [SerializeField] private float speed{i} = {i}.5f;\n" for i in range(20))
+        props = "".join(f"        public int Value{i} {{ get; private set; }} = {i};\n" for i in range(10))
+        body = [header, fields, props]
+        for index in range(40):
+            body.append(_method(cls, index))
+        body.append("    }\n\n")
+        chunk = "".join(body)
+        parts.append(chunk)
+        count += chunk.count("\n")
+        cls += 1
+    parts.append("}\n")
+    return "".join(parts)
+
+
+def _time_per_call(fn: Callable[[], Any], seconds: float) -> float:
+    """Seconds per call, from the best of five batches sized to fill `seconds`."""
+    fn()
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds / 5 or calls >= 1 << 20:
+            break
+        calls *= 2
+    best = elapsed
+    for _ in range(4):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return best / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=10000, help="approximate script length")
+    parser.add_argument("--seconds", type=float, default=1.0,
+                        help="approximate time spent per measurement")
+    args = parser.parse_args()
+
+    from csharp_outline import CSharpOutline, OutlineCache
+
+    text = generate_script(args.lines)
+    outline = CSharpOutline(text)
+    assert not outline.errors
+    classes = [d for d, _ in outline.walk() if d.kind == "class"]
+    target = classes[len(classes) // 2]
+    replacement = "        public int Step20(int frame, string label = \"\") => frame;\n"
+
+    def replace_method():
+        method, = outline.find_members(target, "Step20")
+        return outline.apply_edit(method.start, method.end, replacement)
+
+    edited = replace_method()
+    assert not edited.errors and len(edited.find_types(target.name)[0].children) == len(target.children)
+    cache = OutlineCache()
+    cache.put(outline)
+    naive = re.compile(r"^\s*(?:\[[^\]]+\]\s*)*(?:public|private|protected|internal|static|virtual|"
+                       r"override|sealed|async|extern|unsafe|new|partial).*?\bStep39\s*\(", re.MULTILINE)
+    last_class = classes[-1]
+
+    def naive_scan():
+        for line in text.splitlines():
+            if naive.search(line):
+                return line
+
+    rows = [
+        ("full parse", lambda: CSharpOutline(text)),
+        ("cache hit by sha", lambda: cache.outline(text, outline.sha)),
+        ("replace_method (incremental)", replace_method),
+        ("full parse after the edit", lambda: CSharpOutline(edited.text)),
+        ("find method (outline)", lambda: outline.find_members(last_class, "Step39")),
+        ("find method (line regex)", naive_scan),
+    ]
+    print(f"{text.count(chr(10))} lines, {len(text) / 1024:.0f} KiB, {len(classes)} classes, "
+          f"{sum(1 for _ in outline.walk())} declarations")
+    print(f"{'operation':<30} {'ms':>10}")
+    for label, fn in rows:
+        print(f"{label:<30} {_time_per_call(fn, args.seconds) * 1e3:10.3f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
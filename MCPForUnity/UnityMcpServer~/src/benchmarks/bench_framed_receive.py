@@ -0,0 +1,190 @@
+"""
+Framed receive benchmark: responses from 1 KB to 64 MB.
+
+Compares the recv_into() receive path of AsyncUnityConnection against the
+previous asyncio StreamReader path (readexactly + bytes decode) and reports
+throughput and peak RSS (growth is measured from just after connecting). Every (mode, size) pair runs in a fresh interpreter
+so peak RSS is not inflated by earlier, larger runs. The stand-in bridge runs
+in this process and serves pre-encoded responses.
+
+Usage (from the server directory):
+
+    python -m benchmarks.bench_framed_receive [--sizes 1K,1M,64M] [--iterations N]
+"""
+import argparse
+import asyncio
+import json
+import os
+import struct
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+DEFAULT_SIZES = "1K,64K,1M,8M,32M,64M"
+MODES = ("recv_into", "streams")
+# Envelope bytes around the text field; keeps 64M responses within FRAMED_MAX
+ENVELOPE = len(b'{"status": "success", "result": {"text": ""}}')
+
+
+def _parse_size(text: str) -> int:
+    units = {"K": 1024, "M": 1024 * 1024}
+    text = text.strip().upper()
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def _peak_rss_mib() -> float | None:
+    # Linux carries ru_maxrss across execve, which would report the parent's
+    # peak (it holds the bridge and its responses); VmHWM starts fresh
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _response(size: int) -> bytes:
+    text = "x" * max(0, size - ENVELOPE)
+    return json.dumps({"status": "success", "result": {"text": text}}).encode("utf-8")
+
+
+def _payload(size: int) -> bytes:
+    return json.dumps({"type": "bench", "params": {"size": size}}).encode("utf-8")
+
+
+async def _recv_into_client(port: int, size: int, iterations: int) -> tuple[float, float | None]:
+    from unity_connection import AsyncUnityConnection, _load_frame
+
+    conn = AsyncUnityConnection(host="127.0.0.1", port=port)
+    if not await conn.connect():
+        raise SystemExit(f"could not connect to stand-in bridge on {port}")
+    payload = _payload(size)
+    rss_before = _peak_rss_mib()
+
+    async def round_trip():
+        _load_frame(await conn._round_trip(payload))
+
+    await round_trip()  # warm-up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await round_trip()
+    elapsed = time.perf_counter() - started
+    await conn.disconnect()
+    return elapsed, rss_before
+
+
+async def _streams_client(port: int, size: int, iterations: int) -> tuple[float, float | None]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    await reader.readline()
+    payload = _payload(size)
+    rss_before = _peak_rss_mib()
+
+    async def round_trip():
+        writer.write(struct.pack(">Q", len(payload)))
+        writer.write(payload)
+        await writer.drain()
+        length = struct.unpack(">Q", await reader.readexactly(8))[0]
+        data = await reader.readexactly(length)
+        json.loads(data.decode("utf-8"))
+
+    await round_trip()  # warm-up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await round_trip()
+    elapsed = time.perf_counter() - started
+    writer.close()
+    return elapsed, rss_before
+
+
+def _child(mode: str, port: int, size: int, iterations: int) -> None:
+    client = _recv_into_client if mode == "recv_into" else _streams_client
+    elapsed, rss_before = asyncio.run(client(port, size, iterations))
+    print(json.dumps({
+        "mode": mode,
+        "size": size,
+        "iterations": iterations,
+        "seconds": elapsed,
+        "rss_before_mib": rss_before,
+        "rss_peak_mib": _peak_rss_mib(),
+    }))
+
+
+def _iterations_for(size: int, override: int | None) -> int:
+    if override:
+        return override
+    return max(3, min(500, (256 * 1024 * 1024) // size))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help=f"comma-separated response sizes (default {DEFAULT_SIZES})")
+    parser.add_argument("--iterations", type=int, default=None,
+                        help="requests per size (default: scaled to ~256 MB per size)")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--child", nargs=4, metavar=("MODE", "PORT", "SIZE", "N"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, port, size, iterations = args.child
+        _child(mode, int(port), int(size), int(iterations))
+        return
+
+    from tests.integration.stand_in_bridge import StandInBridge
+
+    sizes = [_parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    modes = [m.strip() for m in args.modes.split(",") if m.strip()]
+    cache: dict[int, bytes] = {}
+
+    def handler(command):
+        size = int(command["params"]["size"])
+        if size not in cache:
+            cache.clear()
+            cache[size] = _response(size)
+        return cache[size]
+
+    print(f"{'size':>8} {'mode':>10} {'iters':>6} {'MB/s':>10} {'peak RSS MiB':>13} {'RSS growth MiB':>15}")
+    with StandInBridge(handler) as bridge:
+        for size in sizes:
+            iterations = _iterations_for(size, args.iterations)
+            for mode in modes:
+                out = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_framed_receive",
+                     "--child", mode, str(bridge.port), str(size), str(iterations)],
+                    cwd=SERVER_DIR, capture_output=True, text=True,
+                    env={**os.environ, "DISABLE_TELEMETRY": "true"}, check=True,
+                )
+                row = json.loads(out.stdout.strip().splitlines()[-1])
+                mb_s = size * iterations / row["seconds"] / 1e6
+                peak, before = row["rss_peak_mib"], row["rss_before_mib"]
+                growth = f"{peak - before:15.1f}" if peak is not None else f"{'n/a':>15}"
+                peak_text = f"{peak:13.1f}" if peak is not None else f"{'n/a':>13}"
+                print(f"{args_size(size):>8} {mode:>10} {iterations:>6} {mb_s:10.1f} {peak_text} {growth}",
+                      flush=True)
+
+
+def args_size(size: int) -> str:
+    for unit, factor in (("M", 1024 * 1024), ("K", 1024)):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{unit}"
+    return str(size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Instance discovery benchmark: scan time as the number of editors grows.
+
+Starts N fake bridges in a temporary HOME, each with a status file, and times
+PortDiscovery.discover_all_unity_instances(). Half of the listeners answer
+the probe ping; the other half accept the connection and never reply, like
+an editor hung in a domain reload, so each of their probes runs to
+CONNECT_TIMEOUT. The probe cache is cleared before every scan.
+
+Each N is measured with one probe worker (the old sequential scan) and with
+the configured pool; the parallel scan should stay near one probe timeout
+however many instances there are.
+
+Usage (from the server directory):
+
+    python -m benchmarks.bench_instance_discovery [--counts 1,2,4,8,16] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+PONG = b'{"status":"success","result":{"message":"pong"}}'
+
+
+class FakeBridge:
+    """Minimal listener: answers the framed probe ping, or stays silent when hung."""
+
+    def __init__(self, hung: bool):
+        self.hung = hung
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(64)
+        self.port = self._sock.getsockname()[1]
+        self._clients: list[socket.socket] = []
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            self._clients.append(conn)
+            if not self.hung:
+                threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        try:
+            conn.sendall(b"WELCOME UNITY-MCP 1 FRAMING=1\n")
+            conn.recv(64)
+            conn.sendall(len(PONG).to_bytes(8, "big") + PONG)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        self._sock.close()
+        for client in self._clients:
+            client.close()
+
+
+def _scan(repeat: int) -> tuple[float, int]:
+    from port_discovery import PortDiscovery
+
+    best, found = float("inf"), 0
+    for _ in range(repeat):
+        PortDiscovery.clear_probe_cache()
+        started = time.perf_counter()
+        found = len(PortDiscovery.discover_all_unity_instances())
+        best = min(best, time.perf_counter() - started)
+    return best, found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--counts", default="1,2,4,8,16",
+                        help="comma-separated instance counts to measure")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="scans per measurement (best is reported)")
+    args = parser.parse_args()
+    counts = [int(c) for c in args.counts.split(",") if c]
+
+    home = tempfile.mkdtemp(prefix="unity-mcp-bench-")
+    os.environ["HOME"] = home
+    directory = Path(home) / ".unity-mcp"
+    directory.mkdir()
+
+    from config import config
+    from port_discovery import PortDiscovery
+
+    # Pick up each round's status files immediately
+    config.status_watch, config.status_poll_interval = False, 0.0
+    parallel_workers, deadline = config.discovery_max_workers, config.discovery_deadline
+    print(f"probe timeout {PortDiscovery.CONNECT_TIMEOUT:.2f}s, "
+          f"pool of {parallel_workers}, deadline {config.discovery_deadline:.2f}s")
+    print(f"{'instances':>9} {'found':>6} {'sequential ms':>14} {'parallel ms':>12} {'speedup':>8}")
+    for count in counts:
+        bridges = [FakeBridge(hung=i % 2 == 1) for i in range(count)]
+        try:
+            for i, bridge in enumerate(bridges):
+                (directory / f"unity-mcp-status-bench{i:04d}.json").write_text(json.dumps({
+                    "unity_port": bridge.port, "reloading": False, "project_name": f"Bench{i}",
+                    "project_path": f"/Projects/Bench{i}/Assets",
+                    "last_heartbeat": datetime.now(timezone.utc).isoformat(),
+                }))
+            # The sequential baseline gets no deadline, so it finds every live instance
+            config.discovery_max_workers, config.discovery_deadline = 1, 3600.0
+            sequential, _ = _scan(args.repeat)
+            config.discovery_max_workers, config.discovery_deadline = parallel_workers, deadline
+            parallel, found = _scan(args.repeat)
+            print(f"{count:>9} {found:>6} {sequential * 1e3:14.1f} {parallel * 1e3:12.1f} "
+                  f"{sequential / parallel:7.1f}x", flush=True)
+        finally:
+            for bridge in bridges:
+                bridge.close()
+            for path in directory.glob("unity-mcp-status-*.json"):
+                path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+JSON codec microbenchmark: encode requests and decode bridge responses.
+
+Times every backend json_codec can load (orjson, msgspec, stdlib) on bridge
+response payloads: encoding each one, decoding it from bytes and decoding it
+from a memoryview the way _load_frame() receives frames. By default the
+payloads are synthesized in the shape of real bridge responses (editor
+state, console with stack traces, scene hierarchy, script read, asset
+search). Pass --payloads DIR to use captured responses instead, one JSON
+document per *.json file.
+
+Usage (from the server directory):
+
+    python -m benchmarks.bench_json_codec [--payloads DIR] [--seconds S]
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+
+def _node(depth: int, index: int) -> dict[str, Any]:
+    node = {
+        "name": f"Enemy_{depth}_{index}", "instanceID": -12000 - depth * 100 - index,
+        "activeSelf": index % 5 != 0, "tag": "Untagged", "layer": 0,
+        "transform": {"position": [index * 1.5, 0.0, -depth * 2.25],
+                      "rotation": [0.0, 90.0 * (index % 4), 0.0], "scale": [1.0, 1.0, 1.0]},
+        "components": ["Transform", "MeshFilter", "MeshRenderer", "BoxCollider"],
+        "children": [],
+    }
+    if depth < 3:
+        node["children"] = [_node(depth + 1, i) for i in range(4)]
+    return node
+
+
+def synthesized_payloads() -> dict[str, Any]:
+    trace = "\n".join(f"Game.Systems.Spawner.Update () (at Assets/Scripts/Spawner.cs:{40 + i})"
+                      for i in range(8))
+    script = "\n".join(f"    [SerializeField] private float speed{i} = {i}.5f; // tuning ✓"
+                       for i in range(2000))
+    return {
+        "editor_state": {"status": "success", "result": {
+            "isPlaying": False, "isPaused": False, "isCompiling": False,
+            "activeScene": "Assets/Scenes/Main.unity", "selection": [-12000, -12001]}},
+        "read_console": {"status": "success", "result": {"lines": [
+            {"type": ("Error", "Warning", "Log")[i % 3],
+             "message": f"NullReferenceException: Object reference not set (frame {i})",
+             "file": "Assets/Scripts/Spawner.cs", "line": 40 + i % 8,
+             "timestamp": f"2024-05-01T12:00:{i % 60:02d}Z", "stackTrace": trace}
+            for i in range(500)]}},
+        "get_hierarchy": {"status": "success", "result": {
+            "scene": "Main", "hierarchy": [_node(0, i) for i in range(24)]}},
+        "read_script": {"status": "success", "result": {
+            "path": "Assets/Scripts/Tuning.cs", "encoding": "utf-8",
+            "contents": "using UnityEngine;\n\npublic class Tuning : MonoBehaviour\n{\n" + script + "\n}\n"}},
+        "search_assets": {"status": "success", "result": {"assets": [
+            {"path": f"Assets/Art/Textures/rock_{i:04d}.png", "guid": f"{i:032x}",
+             "assetType": "Texture2D", "fileSize": 1024 * (i % 97 + 1)}
+            for i in range(3000)]}},
+    }
+
+
+def load_payloads(directory: str | None) -> dict[str, Any]:
+    if not directory:
+        return synthesized_payloads()
+    payloads = {}
+    for path in sorted(Path(directory).glob("*.json")):
+        payloads[path.stem] = json.loads(path.read_bytes())
+    if not payloads:
+        raise SystemExit(f"no *.json payloads in {directory}")
+    return payloads
+
+
+def _time_per_call(fn: Callable[[], Any], seconds: float) -> float:
+    """Seconds per call, from the best of five batches sized to fill `seconds`."""
+    fn()
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds / 5 or calls >= 1 << 20:
+            break
+        calls *= 2
+    best = elapsed
+    for _ in range(4):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return best / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--payloads", default=None,
+                        help="directory of captured response payloads (*.json)")
+    parser.add_argument("--seconds", type=float, default=0.5,
+                        help="approximate time spent per measurement")
+    args = parser.parse_args()
+
+    import json_codec
+
+    payloads = load_payloads(args.payloads)
+    codecs = [json_codec.CODECS[name] for name in ("json", "msgspec", "orjson") if name in json_codec.CODECS]
+    print(f"codecs: {', '.join(c.name for c in codecs)}")
+    print(f"{'payload':>14} {'KiB':>8} {'codec':>8} {'encode us':>10} {'decode us':>10} "
+          f"{'view us':>10} {'MB/s dec':>9} {'vs json':>8}")
+    for name, document in payloads.items():
+        encoded = json.dumps(document, ensure_ascii=False).encode("utf-8")
+        frame = bytearray(encoded)
+        baseline = None
+        for codec in codecs:
+            assert codec.loads(encoded) == document
+            encode = _time_per_call(lambda: codec.dumps(document), args.seconds)
+            decode = _time_per_call(lambda: codec.loads(encoded), args.seconds)
+            view = _time_per_call(lambda: codec.loads(memoryview(frame)), args.seconds)
+            baseline = baseline or decode
+            print(f"{name:>14} {len(encoded) / 1024:8.1f} {codec.name:>8} {encode * 1e6:10.1f} "
+                  f"{decode * 1e6:10.1f} {view * 1e6:10.1f} {len(encoded) / decode / 1e6:9.1f} "
+                  f"{baseline / decode:7.2f}x", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Script read benchmark: manage_script read and get_sha through Unity against straight from disk.
+
+Writes a generated script into a temporary project and routes the tools to
+the stand-in bridge, which answers reads and hashes from the same file after
+--editor-ms of simulated main-thread wait (0 measures transport and JSON
+alone). Each tool is then timed three ways:
+
+- bridge: config.script_disk_reads off and the script cache emptied, so
+  every call is a Unity round trip,
+- disk: cache emptied before each call, so every call maps, hashes and
+  decodes the file,
+- cached: the entry stays, so each call is one stat.
+
+Usage (from the server directory):
+
+    python -m benchmarks.bench_script_reads [--lines 1000,10000] [--editor-ms 0] [--seconds S]
+"""
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+INSTANCE_ID = "Bench@bench001"
+
+
+def _handler(assets: Path):
+    def handler(command):
+        params = command["params"]
+        text = (assets / "Scripts" / f"{params['name']}.cs").read_bytes().decode("utf-8-sig")
+        if params.get("action") == "get_sha":
+            data = {"sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                    "lengthBytes": len(text.encode("utf-8"))}
+        else:
+            data = {"uri": f"unity://path/Assets/Scripts/{params['name']}.cs",
+                    "path": f"Assets/Scripts/{params['name']}.cs", "contents": text}
+        return {"status": "success", "result": {"success": True, "data": data}}
+    return handler
+
+
+def _time_per_call(fn: Callable[[], Any], seconds: float) -> float:
+    """Seconds per call, from the best of three batches sized to fill `seconds`."""
+    fn()
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds / 3 or calls >= 1 << 16:
+            break
+        calls *= 2
+    best = elapsed
+    for _ in range(2):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return best / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", default="1000,10000", help="comma-separated script sizes")
+    parser.add_argument("--editor-ms", type=float, default=0.0,
+                        help="simulated main-thread wait before the bridge answers")
+    parser.add_argument("--seconds", type=float, default=1.0,
+                        help="approximate time spent per measurement")
+    args = parser.parse_args()
+
+    home = tempfile.mkdtemp(prefix="unity-mcp-bench-")
+    os.environ["HOME"] = home
+    project = Path(home) / "Project"
+    assets = project / "Assets"
+    (assets / "Scripts").mkdir(parents=True)
+    os.environ["UNITY_PROJECT_ROOT"] = str(project)
+
+    import script_cache
+    import unity_connection
+    from benchmarks.bench_csharp_outline import generate_script
+    from config import config
+    from models import UnityInstanceInfo
+    from port_discovery import PortDiscovery
+    from tests.integration.stand_in_bridge import StandInBridge
+    from tests.integration.test_helpers import DummyContext
+    from tools.manage_script import get_sha, manage_script
+
+    config.status_watch = False
+    # One "using most recent instance" line per call otherwise
+    logging.getLogger("mcp-for-unity-server").setLevel(logging.WARNING)
+    cache = script_cache.ScriptCache(watch=False)
+    script_cache._script_cache = cache
+    ctx = DummyContext()
+    tools = {
+        "read": lambda: manage_script(ctx, action="read", name="Bench", path="Assets/Scripts"),
+        "get_sha": lambda: get_sha(ctx, uri="unity://path/Assets/Scripts/Bench.cs"),
+    }
+
+    def emptied(fn):
+        def call():
+            cache.invalidate(project.resolve())
+            return fn()
+        return call
+
+    with StandInBridge(_handler(assets), delay=args.editor_ms / 1000.0, multiplex=True) as bridge:
+        instance = UnityInstanceInfo(id=INSTANCE_ID, name="Bench", path=str(assets), hash="bench001",
+                                     port=bridge.port, status="running")
+        PortDiscovery.discover_all_unity_instances = staticmethod(lambda: [instance])
+
+        print(f"editor wait {args.editor_ms:g} ms")
+        print(f"{'lines':>7} {'tool':<8} {'bridge ms':>10} {'disk ms':>9} {'cached ms':>10} {'bridge/disk':>12}")
+        try:
+            for size in (int(n) for n in args.lines.split(",")):
+                (assets / "Scripts" / "Bench.cs").write_text(generate_script(size), encoding="utf-8")
+                for name, fn in tools.items():
+                    config.script_disk_reads = False
+                    bridged = _time_per_call(emptied(fn), args.seconds)
+                    config.script_disk_reads = True
+                    disk = _time_per_call(emptied(fn), args.seconds)
+                    cached = _time_per_call(fn, args.seconds)
+                    print(f"{size:7d} {name:<8} {bridged * 1e3:10.3f} {disk * 1e3:9.3f} {cached * 1e3:10.3f} "
+                          f"{bridged / disk:11.1f}x", flush=True)
+        finally:
+            unity_connection.get_unity_connection_pool().disconnect_all()
+    print(f"bridge commands: {len(bridge.commands)}, cache: {cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Transport benchmark: TCP loopback vs Unix domain socket for small RPCs.
+
+Runs the stand-in bridge with both listeners and advertises its Unix socket
+in a status file under a temporary HOME, then sends `ping` and a small
+`editor_state` command through AsyncUnityConnection.send_command() over each
+transport (TCP by turning config.prefer_unix_socket off).
+
+Latency is measured with one connection sending back to back (p50/p99);
+throughput with --connections sockets sending concurrently for --seconds.
+
+Usage (from the server directory):
+
+    python -m benchmarks.bench_unix_socket [--calls 5000] [--connections 4] [--seconds 2]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+INSTANCE_ID = "Bench@bench001"
+EDITOR_STATE = {"status": "success", "result": {
+    "isPlaying": False, "isPaused": False, "isCompiling": False,
+    "isUpdating": False, "activeSceneName": "SampleScene", "selectionCount": 0}}
+COMMANDS = (("ping", {}), ("editor_state", {"action": "get_state"}))
+
+
+def _handler(command):
+    return EDITOR_STATE
+
+
+async def _latency(port: int, command: str, params: dict, calls: int) -> tuple[float, float]:
+    from unity_connection import AsyncUnityConnection
+
+    conn = AsyncUnityConnection(port=port, instance_id=INSTANCE_ID)
+    await conn.connect()
+    try:
+        for _ in range(min(200, calls)):
+            await conn.send_command(command, params)
+        samples = []
+        for _ in range(calls):
+            started = time.perf_counter()
+            await conn.send_command(command, params)
+            samples.append(time.perf_counter() - started)
+    finally:
+        await conn.disconnect()
+    samples.sort()
+    return statistics.median(samples) * 1e6, samples[int(len(samples) * 0.99) - 1] * 1e6
+
+
+async def _throughput(port: int, command: str, params: dict, connections: int, seconds: float) -> float:
+    from unity_connection import AsyncUnityConnection
+
+    conns = [AsyncUnityConnection(port=port, instance_id=INSTANCE_ID) for _ in range(connections)]
+    for conn in conns:
+        await conn.connect()
+    done = [0]
+    stop_at = time.perf_counter() + seconds
+
+    async def worker(conn):
+        while time.perf_counter() < stop_at:
+            await conn.send_command(command, params)
+            done[0] += 1
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(conn) for conn in conns))
+    finally:
+        for conn in conns:
+            await conn.disconnect()
+    return done[0] / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=5000,
+                        help="sequential calls per latency measurement")
+    parser.add_argument("--connections", type=int, default=4,
+                        help="concurrent sockets for the throughput measurement")
+    parser.add_argument("--seconds", type=float, default=2.0,
+                        help="duration of each throughput measurement")
+    args = parser.parse_args()
+    if not hasattr(socket, "AF_UNIX") or sys.platform == "win32":
+        sys.exit("Unix domain sockets are not available on this platform")
+
+    home = tempfile.mkdtemp(prefix="unity-mcp-bench-")
+    os.environ["HOME"] = home
+    directory = Path(home) / ".unity-mcp"
+    directory.mkdir()
+
+    from config import config
+    from tests.integration.stand_in_bridge import StandInBridge
+
+    config.status_watch = False
+    path = str(directory / "bench001.sock")
+    with StandInBridge(_handler, unix_socket=path) as bridge:
+        (directory / "unity-mcp-status-bench001.json").write_text(json.dumps({
+            "unity_port": bridge.port, "reloading": False, "unix_socket": path,
+            "last_heartbeat": datetime.now(timezone.utc).isoformat()}))
+
+        print(f"{args.calls} sequential calls for latency, "
+              f"{args.connections} sockets x {args.seconds:.1f}s for throughput")
+        print(f"{'command':<13} {'transport':<9} {'p50 us':>8} {'p99 us':>8} {'calls/s':>9}")
+        for command, params in COMMANDS:
+            results = {}
+            for transport, prefer_unix in (("tcp", False), ("unix", True)):
+                config.prefer_unix_socket = prefer_unix
+                p50, p99 = asyncio.run(_latency(bridge.port, command, params, args.calls))
+                rate = asyncio.run(_throughput(bridge.port, command, params, args.connections, args.seconds))
+                results[transport] = (p50, rate)
+                print(f"{command:<13} {transport:<9} {p50:8.1f} {p99:8.1f} {rate:9.0f}", flush=True)
+            tcp, unix = results["tcp"], results["unix"]
+            print(f"{command:<13} {'unix/tcp':<9} {unix[0] / tcp[0]:7.2f}x {'':>8} {unix[1] / tcp[1]:8.2f}x")
+    print(f"unix connections served: {bridge.unix_connections} of {bridge.connections}")
+
+
+if __name__ == "__main__":
+    main()
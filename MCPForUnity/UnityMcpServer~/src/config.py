@@ -23,6 +23,98 @@ class ServerConfig:
     framed_receive_timeout: float = 2.0
     # cap heartbeat frames consumed before giving up
     max_heartbeat_frames: int = 16
+    # Connect over the Unix domain socket a same-host bridge advertises in its
+    # status file (Linux/macOS), falling back to TCP loopback
+    prefer_unix_socket: bool = True
+    # Pipeline requests over one socket when the bridge advertises REQID=1
+    enable_multiplexing: bool = True
+    # Per-instance socket pool: sockets kept per Unity instance (lock-step
+    # bridges need one socket per concurrent call; multiplexed ones share)
+    pool_max_connections: int = 4
+    # cap on concurrent requests per instance; extra callers wait their turn
+    pool_max_in_flight: int = 32
+    # close sockets idle this long (seconds); one socket is always kept warm
+    pool_idle_timeout: float = 60.0
+    # ping a socket idle this long (seconds) before handing it out again
+    pool_health_check_interval: float = 15.0
+    # Health checks and light reads that would queue for a pooled socket use one
+    # extra socket per instance instead, outside the pool and its in-flight cap
+    priority_lane: bool = True
+    # commands sent over that socket (answered without touching the main thread,
+    # or cheap on it)
+    priority_commands: tuple = (
+        "ping", "get_editor_state", "get_active_tool", "get_selection",
+        "get_prefab_stage", "get_project_info", "get_layers", "get_tags", "get_windows",
+    )
+    # Let the bridge stream large responses as continuation chunks (needs REQID=1)
+    enable_chunked_responses: bool = True
+    # chunked responses larger than this are spooled to a temp file and parsed via mmap
+    response_spill_bytes: int = 32 * 1024 * 1024
+    # hard cap on a single chunked response
+    max_response_bytes: int = 1024 * 1024 * 1024
+    # Compress tagged frames when the bridge advertises COMPRESS=<codecs>
+    enable_compression: bool = True
+    # codecs in order of preference; zstd needs the optional zstandard package
+    compression_codecs: tuple = ("zstd", "zlib")
+    # frames smaller than this are sent as-is
+    compression_min_bytes: int = 1024
+    # Take file contents as raw binary frames when the bridge advertises ATTACH=1
+    enable_attachments: bool = True
+    # JSON backend: "auto" picks orjson, then msgspec, then the standard library
+    json_codec: str = "auto"
+    # Status-file index: watch ~/.unity-mcp when watchdog/watchfiles is installed
+    status_watch: bool = True
+    # without a watcher, rescan the status directory at most this often (seconds)
+    status_poll_interval: float = 1.0
+    # with a watcher, still rescan this often in case events were dropped
+    status_rescan_interval: float = 10.0
+    # heartbeats older than this (seconds) mark an instance dead; 0 disables
+    status_stale_after: float = 60.0
+    # same for an instance that reported a reload (no heartbeats until a long
+    # domain reload or import finishes); 0 disables
+    status_reload_stale_after: float = 1800.0
+    # Script content cache: serve script reads and SHA-256s from the server while
+    # the file's mtime and size are unchanged (needs the project root)
+    script_cache_enabled: bool = True
+    # scripts kept, least recently used dropped first
+    script_cache_entries: int = 64
+    # also watch each project's Assets/ when watchdog/watchfiles is installed
+    script_cache_watch: bool = True
+    # read scripts, and hash them, straight from disk instead of through Unity
+    # when the project root is known (works during domain reloads)
+    script_disk_reads: bool = True
+    # Instance discovery probes ports concurrently on up to this many threads
+    discovery_max_workers: int = 16
+    # give up on probes still running after this many seconds (whole scan)
+    discovery_deadline: float = 1.0
+    # reuse a probe result for the same (port, file mtime) for this long (seconds)
+    discovery_probe_cache_ttl: float = 10.0
+    # After a socket failure one caller per instance rediscovers its port and
+    # the rest share the result, reusing it for this long (seconds)
+    rediscover_cooldown: float = 2.0
+    # a failed reconnect is shared the same way, failing other callers fast for this long
+    reconnect_cooldown: float = 0.25
+    # Per-instance circuit breaker: open after this many consecutive connection
+    # failures (one is enough when the instance's heartbeat is stale)
+    breaker_failure_threshold: int = 5
+    # while open, calls fail fast for this long (seconds) before one probe is let through
+    breaker_open_seconds: float = 5.0
+    # the recovery probe's connect + ping must finish within this many seconds
+    breaker_probe_timeout: float = 1.0
+    # Background supervisor keeps a warm connection to every discovered instance
+    supervisor_enabled: bool = True
+    # rediscover, connect and ping every instance this often (seconds)
+    supervisor_interval: float = 2.0
+    # sweep this often (seconds) while an instance is reloading, to reconnect as soon as it is back
+    supervisor_reload_interval: float = 0.25
+    # heartbeat pings must answer within this many seconds
+    supervisor_ping_timeout: float = 1.0
+    # forget instances missing from discovery for this long (seconds)
+    supervisor_reap_after: float = 10.0
+
+    # Record every bridge request and response, with timings, to this file for
+    # replay with benchmarks/replay_capture.py (also UNITY_MCP_CAPTURE or --capture)
+    capture_path: str | None = None
 
     # Logging settings
     log_level: str = "INFO"
@@ -36,6 +128,13 @@ class ServerConfig:
     # Number of polite retries when Unity reports reloading
     # 40 × 250ms ≈ 10s default window
     reload_max_retries: int = 40
+    # Requests that arrive while an instance's status file reports a reload are
+    # parked for up to this long (seconds) instead of polling
+    reload_park_timeout: float = 10.0
+    # parked requests are released in arrival order, this many at a time
+    reload_release_concurrency: int = 4
+    # how often (seconds) one watcher per instance re-reads the status file while requests are parked
+    reload_poll_interval: float = 0.05
 
     # Telemetry settings
     telemetry_enabled: bool = True
@@ -0,0 +1,762 @@
+"""
+Structural outline of C# source: namespaces, types and their members with
+source spans, so method-level edits can be located without asking Unity.
+
+The lexer knows enough C# never to mistake a brace in a comment, string,
+verbatim or interpolated string or char literal for structure. Preprocessor
+directives are dropped and only the first branch of each #if/#elif/#else
+group is parsed (the editor's define set is not known here); inactive
+branches stay inside whatever span encloses them.
+
+Spans follow ManageScript's structured editor: a member starts at the
+beginning of its first line, attributes included, and ends just past its
+closing brace or semicolon. Method and accessor bodies are skipped, not
+parsed.
+
+Outlines are cached by the SHA-256 of the source (get_outline_cache()).
+CSharpOutline.apply_edit() re-parses only the members an edit touches,
+within the innermost type or namespace containing it, and shifts the spans
+after it; edits that leave a comment or string open, split a #if group or
+do not parse as whole members fall back to a full parse.
+"""
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+import hashlib
+import re
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+_TOKEN = re.compile(r"""
+    \s*(?:
+    (?P<skip>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<id>@?[^\W\d]\w*)
+  | (?P<interp>\$@?"|@\$")
+  | (?P<str>@"(?:[^"]|"")*(?:"|\Z)|"(?:[^"\\\n]|\\.)*(?:"|$)|'(?:[^'\\\n]|\\.)*(?:'|$))
+  | (?P<num>\d[\w.]*)
+  | (?P<pp>\#)
+  | (?P<op>=>|==|!=|<=|>=|&&|\|\||\?\?=?|[-+*/%&|^]=)
+  | (?P<punct>[{}()\[\];=,<>:.?~])
+  | (?P<other>.)
+  | (?P<end>\Z))
+""", re.S | re.M | re.X)
+# What BraceIndex looks at: runs of other characters and identifiers are
+# skipped inside the match, and strings and comments are matched to be skipped
+_BRACE_TOKEN = re.compile(r"""
+    (?:[^\w{}();"'/@$\#]+|(?!(?:class|struct|interface|record)\b)\w+\b)*
+    (?:
+    (?P<skip>//[^\n]*|/\*.*?(?:\*/|\Z))
+  | (?P<interp>\$@?"|@\$")
+  | (?P<str>@"(?:[^"]|"")*(?:"|\Z)|"(?:[^"\\\n]|\\.)*(?:"|$)|'(?:[^'\\\n]|\\.)*(?:'|$))
+  | (?P<pp>\#)
+  | (?P<type>(?<![\w@])(?:class|struct|interface|record(?=\s+@?[^\W\d]))\b)
+  | (?P<open>{) | (?P<close>}) | (?P<semi>;) | (?P<paren>\()
+  | (?P<other>.)
+  | (?P<end>\Z))
+""", re.S | re.M | re.X)
+_DIRECTIVE = re.compile(r"\#[ \t]*(\w*)[^\n]*\n?")
+_CONDITIONAL = re.compile(r"^[ \t]*\#[ \t]*(if|endif)\b[^\n]*\n?", re.M)
+_BRANCH = re.compile(r"^[ \t]*\#[ \t]*(if|elif|else|endif)\b", re.M)
+
+TYPE_KINDS = frozenset({"class", "struct", "interface", "record", "enum"})
+_CONTAINER_KEYWORDS = TYPE_KINDS | {"namespace", "delegate"}
+_TYPE_BODY_KEYWORDS = TYPE_KINDS - {"enum"}
+_MODIFIERS = frozenset({
+    "public", "private", "protected", "internal", "static", "virtual", "override",
+    "sealed", "async", "extern", "unsafe", "new", "partial", "readonly", "volatile",
+    "abstract", "const", "fixed", "ref", "implicit", "explicit",
+})
+_OPENERS = {"(": ")", "[": "]", "{": "}"}
+
+# Token: (kind, start, end); kind is "id", "str", "num", "other" or the
+# punctuation/operator text itself
+Token = Tuple[str, int, int]
+
+
+def _collapse(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _line_initial(text: str, pos: int) -> bool:
+    line_start = text.rfind("\n", 0, pos) + 1
+    return not text[line_start:pos].strip()
+
+
+def _directive_end(text: str, pos: int, end: int) -> int:
+    """Skip a directive line; #elif and #else also skip their branch."""
+    m = _DIRECTIVE.match(text, pos, end)
+    after = m.end()
+    if m.group(1) not in ("elif", "else"):
+        return after
+    depth = 0
+    for d in _CONDITIONAL.finditer(text, after, end):
+        if d.group(1) == "if":
+            depth += 1
+        elif depth:
+            depth -= 1
+        else:
+            return d.end()
+    return end
+
+
+def _self_contained(text: str, start: int, end: int) -> bool:
+    """Whether every #if/#elif/#else/#endif in text[start:end] belongs to a group wholly inside it."""
+    depth = 0
+    for m in _BRANCH.finditer(text, start, end):
+        directive = m.group(1)
+        if directive == "if":
+            depth += 1
+        elif not depth:
+            return False
+        elif directive == "endif":
+            depth -= 1
+    return not depth
+
+
+def _hole_end(text: str, pos: int, end: int) -> int:
+    """Index just past the brace closing an interpolation hole opened before pos."""
+    depth = 0
+    while pos < end:
+        m = _TOKEN.match(text, pos, end)
+        kind = m.lastgroup
+        if kind == "interp":
+            pos = _interpolated_end(text, m.end(), end, "@" in m.group(kind))
+            continue
+        if kind == "end":
+            break
+        pos = m.end()
+        if kind == "punct":
+            if m.group(kind) == "{":
+                depth += 1
+            elif m.group(kind) == "}":
+                if not depth:
+                    return pos
+                depth -= 1
+    return end
+
+
+def _interpolated_end(text: str, pos: int, end: int, verbatim: bool) -> int:
+    """Index just past the closing quote of an interpolated string starting at pos."""
+    i = pos
+    while i < end:
+        c = text[i]
+        if c == '"':
+            if verbatim and text.startswith('""', i):
+                i += 2
+                continue
+            return i + 1
+        if c == "\\" and not verbatim:
+            i += 2
+        elif c == "\n" and not verbatim:
+            return i
+        elif c == "{":
+            if text.startswith("{{", i):
+                i += 2
+            else:
+                i = _hole_end(text, i + 1, end)
+        else:
+            i += 1
+    return end
+
+
+def lex(text: str, start: int = 0, end: Optional[int] = None) -> Tuple[List[Token], bool, bool]:
+    """Tokens of text[start:end] without whitespace, comments and directives.
+
+    Also returns whether a preprocessor directive was seen and whether the
+    range ends inside an unterminated comment or string.
+    """
+    end = len(text) if end is None else end
+    tokens: List[Token] = []
+    directives = False
+    last_end = start
+    last_open = False
+    pos = start
+    while pos < end:
+        for m in _TOKEN.finditer(text, pos, end):
+            kind = m.lastgroup
+            if kind == "end":
+                # Trailing whitespace closes a line comment; nothing else can be open here
+                last_open = last_open and m.start() == m.end()
+                continue
+            start = m.start(kind)
+            if kind == "skip":
+                last_end = m.end()
+                last_open = text.startswith("//", start) or not text.startswith("*/", last_end - 2)
+                continue
+            if kind == "interp":
+                pos = _interpolated_end(text, m.end(), end, "@" in m.group(kind))
+                tokens.append(("str", start, pos))
+                last_end, last_open = pos, True
+                break
+            if kind == "pp" and _line_initial(text, start):
+                directives = True
+                pos = last_end = _directive_end(text, start, end)
+                last_open = False
+                break
+            if kind in ("punct", "op"):
+                kind = m.group(kind)
+            elif kind == "pp":
+                kind = "other"
+            last_end = m.end()
+            tokens.append((kind, start, last_end))
+            last_open = kind == "str"
+        else:
+            break
+    return tokens, directives, last_open and last_end >= end and end < len(text)
+
+
+@dataclass
+class Declaration:
+    """One namespace, type or member. Treat as immutable: outlines share them."""
+    # namespace, class, struct, interface, record, enum, delegate, method,
+    # constructor, destructor, operator, property, indexer, event or field
+    kind: str
+    name: str
+    # Span: from the start of the first line (attributes included) to just
+    # past the closing brace or semicolon
+    start: int
+    end: int
+    # First character after the attributes
+    header_start: int
+    # Offset of the '{' or '=>' opening the body, if there is one
+    body_start: Optional[int] = None
+    # Offset of the '}' closing a namespace or type body (the end of the
+    # source for file-scoped namespaces)
+    body_end: Optional[int] = None
+    # Header without attributes, whitespace collapsed
+    signature: str = ""
+    attributes: str = ""
+    return_type: Optional[str] = None
+    # Parameter list without its parentheses, whitespace collapsed
+    parameters: Optional[str] = None
+    children: List["Declaration"] = field(default_factory=list)
+
+    @property
+    def is_container(self) -> bool:
+        return self.body_end is not None
+
+    def shifted(self, delta: int) -> "Declaration":
+        if not delta:
+            return self
+        return replace(
+            self,
+            start=self.start + delta,
+            end=self.end + delta,
+            header_start=self.header_start + delta,
+            body_start=None if self.body_start is None else self.body_start + delta,
+            body_end=None if self.body_end is None else self.body_end + delta,
+            children=[child.shifted(delta) for child in self.children],
+        )
+
+
+class _Parser:
+    def __init__(self, text: str, tokens: List[Token]):
+        self.text = text
+        self.tokens = tokens
+        self.errors = 0
+
+    def _value(self, i: int) -> str:
+        _, start, end = self.tokens[i]
+        return self.text[start:end]
+
+    def _matching(self, i: int) -> int:
+        """Index of the token closing the bracket opened at token i, or len(tokens)."""
+        tokens = self.tokens
+        stack = [_OPENERS[tokens[i][0]]]
+        for j in range(i + 1, len(tokens)):
+            kind = tokens[j][0]
+            if kind in _OPENERS:
+                stack.append(_OPENERS[kind])
+            elif kind in (")", "]", "}"):
+                if kind != stack.pop():
+                    self.errors += 1
+                if not stack:
+                    return j
+        self.errors += 1
+        return len(tokens)
+
+    def _statement_end(self, i: int) -> int:
+        """Index of the ';' ending the statement that continues at token i."""
+        tokens = self.tokens
+        while i < len(tokens):
+            kind = tokens[i][0]
+            if kind == ";":
+                return i
+            if kind in ("}", ")", "]"):
+                break
+            i = self._matching(i) + 1 if kind in _OPENERS else i + 1
+        self.errors += 1
+        return len(tokens)
+
+    def _span_start(self, token: int) -> int:
+        pos = self.tokens[token][1]
+        line_start = self.text.rfind("\n", 0, pos) + 1
+        return line_start if not self.text[line_start:pos].strip() else pos
+
+    def members(self, i: int, container: Optional[str]) -> Tuple[List[Declaration], int]:
+        """Declarations from token i up to an unmatched '}' or the end."""
+        found: List[Declaration] = []
+        n = len(self.tokens)
+        while i < n:
+            kind = self.tokens[i][0]
+            if kind == "}":
+                return found, i
+            if kind == ";":
+                i += 1
+                continue
+            declaration, i = self._member(i, container)
+            if declaration is not None:
+                found.append(declaration)
+        return found, i
+
+    def _member(self, first: int, container: Optional[str]) -> Tuple[Optional[Declaration], int]:
+        tokens, text = self.tokens, self.text
+        n = len(tokens)
+        i = first
+        while i < n and tokens[i][0] == "[":
+            i = self._matching(i) + 1
+        header = i
+        keyword = keyword_at = params_at = None
+        where = False
+        words: List[int] = []
+        while i < n:
+            kind = tokens[i][0]
+            if kind in ("{", ";", "=", "=>", "}"):
+                break
+            if kind in ("(", "["):
+                if kind == "(" and params_at is None and keyword is None and i > header:
+                    prev = tokens[i - 1][0]
+                    if prev == ">" or (prev == "id" and self._value(i - 1) not in _MODIFIERS) \
+                            or (prev != "id" and "operator" in (self._value(w) for w in words)):
+                        params_at = i
+                i = self._matching(i) + 1
+                continue
+            if kind == "id":
+                word = self._value(i)
+                if word == "where":
+                    where = True
+                elif keyword is None and params_at is None and not where and word in _CONTAINER_KEYWORDS \
+                        and (word != "record" or (i + 1 < n and tokens[i + 1][0] == "id")):
+                    keyword, keyword_at = word, i
+                words.append(i)
+            i += 1
+        if i >= n:
+            self.errors += 1
+            return None, n
+        terminator = tokens[i][0]
+        if terminator == "}" or i == header:
+            self.errors += 1
+            if terminator == "{":
+                return None, self._matching(i) + 1
+            return None, i + (terminator != "}")
+
+        start = self._span_start(first)
+        attributes = text[tokens[first][1]:tokens[header][1]].rstrip() if header > first else ""
+        signature = _collapse(text[tokens[header][1]:tokens[i - 1][2]])
+        first_word = self._value(words[0]) if words else ""
+        declaration = Declaration(kind="", name="", start=start, end=0,
+                                  header_start=tokens[header][1], signature=signature,
+                                  attributes=attributes)
+
+        if first_word in ("using", "extern") and keyword is None and params_at is None:
+            end = self._statement_end(i)
+            return None, end + 1
+
+        if keyword == "namespace":
+            declaration.kind = "namespace"
+            declaration.name = "".join(self._value(j) for j in range(keyword_at + 1, i))
+            if terminator == ";":
+                declaration.body_start = tokens[i][1]
+                declaration.children, j = self.members(i + 1, None)
+                declaration.body_end = declaration.end = len(text)
+                return declaration, j
+            return self._container(declaration, i, None)
+
+        if keyword in TYPE_KINDS:
+            name_at = keyword_at + 1
+            if keyword == "record" and name_at < i and self._value(name_at) in ("class", "struct"):
+                name_at += 1
+            declaration.kind = keyword
+            declaration.name = self._value(name_at) if name_at < i and tokens[name_at][0] == "id" else ""
+            if terminator == "{" and keyword != "enum":
+                return self._container(declaration, i, declaration.name)
+            if terminator == "{":
+                close = self._matching(i)
+                declaration.body_start = tokens[i][1]
+                declaration.end = tokens[close][2] if close < n else len(text)
+                return declaration, close + 1
+            end = self._statement_end(i)
+            declaration.end = tokens[end][2] if end < n else len(text)
+            return declaration, end + 1
+
+        if keyword == "delegate":
+            declaration.kind = "delegate"
+            name_at = keyword_at
+            for j in range(keyword_at + 1, i):
+                if tokens[j][0] in ("(", "<"):
+                    break
+                if tokens[j][0] == "id":
+                    name_at = j
+            declaration.name = self._value(name_at)
+        elif params_at is not None:
+            self._callable(declaration, header, params_at, words, container)
+        else:
+            self._data_member(declaration, header, i, words)
+
+        if terminator == "{":
+            close = self._matching(i)
+            declaration.body_start = tokens[i][1]
+            end = close
+            if declaration.kind == "property" and close + 1 < n and tokens[close + 1][0] == "=":
+                end = self._statement_end(close + 1)
+        elif terminator == "=>":
+            declaration.body_start = tokens[i][1]
+            end = self._statement_end(i + 1)
+        elif terminator == "=":
+            end = self._statement_end(i + 1)
+        else:
+            end = i
+        declaration.end = tokens[end][2] if end < n else len(text)
+        return declaration, end + 1
+
+    def _container(self, declaration: Declaration, brace: int, name: Optional[str]) -> Tuple[Declaration, int]:
+        tokens = self.tokens
+        declaration.body_start = tokens[brace][1]
+        declaration.children, close = self.members(brace + 1, name)
+        if close >= len(tokens):
+            self.errors += 1
+            declaration.body_end = declaration.end = len(self.text)
+            return declaration, close
+        declaration.body_end = tokens[close][1]
+        declaration.end = tokens[close][2]
+        if close + 1 < len(tokens) and tokens[close + 1][0] == ";":
+            close += 1
+            declaration.end = tokens[close][2]
+        return declaration, close + 1
+
+    def _callable(self, declaration: Declaration, header: int, params_at: int,
+                  words: List[int], container: Optional[str]) -> None:
+        tokens, text = self.tokens, self.text
+        close = self._matching(params_at)
+        declaration.parameters = _collapse(text[tokens[params_at][2]:tokens[close][1]]) if close < len(tokens) else ""
+        name_at = params_at - 1
+        if tokens[name_at][0] == ">":
+            depth = 0
+            while name_at > header:
+                kind = tokens[name_at][0]
+                depth += kind == ">"
+                depth -= kind == "<"
+                name_at -= 1
+                if not depth:
+                    break
+        operator_at = next((w for w in words if w < params_at and self._value(w) == "operator"), None)
+        if operator_at is not None:
+            declaration.kind = "operator"
+            declaration.name = "operator " + _collapse(text[tokens[operator_at][2]:tokens[params_at][1]])
+            name_at = operator_at
+        else:
+            declaration.name = self._value(name_at)
+            if name_at > header and tokens[name_at - 1][0] == "~":
+                declaration.kind = "destructor"
+                declaration.name = "~" + declaration.name
+                return
+            leading = [w for w in words if w < name_at]
+            if declaration.name == container and all(self._value(w) in _MODIFIERS for w in leading) \
+                    and all(tokens[j][0] == "id" for j in range(header, name_at)):
+                declaration.kind = "constructor"
+                return
+            declaration.kind = "method"
+        declaration.return_type = self._return_type(header, name_at)
+
+    def _data_member(self, declaration: Declaration, header: int, terminator: int, words: List[int]) -> None:
+        tokens = self.tokens
+        values = [self._value(w) for w in words]
+        kind = tokens[terminator][0]
+        name_at = terminator - 1
+        angle = 0
+        j = header
+        while j < terminator:
+            token = tokens[j][0]
+            if token == "[" and j > header and self._value(j - 1) == "this":
+                declaration.kind, declaration.name = "indexer", "this"
+                declaration.return_type = self._return_type(header, j - 1)
+                return
+            if token in ("(", "["):
+                j = self._matching(j) + 1
+                continue
+            if token == "<":
+                angle += 1
+            elif token == ">":
+                angle -= 1
+            elif token == "," and angle <= 0:
+                name_at = j - 1
+                break
+            j += 1
+        declaration.name = self._value(name_at) if tokens[name_at][0] == "id" else ""
+        if "event" in values:
+            declaration.kind = "event"
+        elif kind in ("{", "=>"):
+            declaration.kind = "property"
+        else:
+            declaration.kind = "field"
+        declaration.return_type = self._return_type(header, name_at)
+
+    def _return_type(self, header: int, name_at: int) -> Optional[str]:
+        tokens = self.tokens
+        i = header
+        while i < name_at and tokens[i][0] == "id" and self._value(i) in _MODIFIERS | {"event"}:
+            i += 1
+        # Explicit interface implementations: the interface is not part of the type
+        while name_at - 2 > i and tokens[name_at - 1][0] == "." and tokens[name_at - 2][0] == "id":
+            name_at -= 2
+        if i >= name_at:
+            return None
+        return _collapse(self.text[tokens[i][1]:tokens[name_at - 1][2]])
+
+
+class BraceIndex:
+    """Code braces of a C# source from one scan, for resolving brace anchors.
+
+    Braces in comments, strings and inactive #if branches are not code and
+    are left out, as lex() leaves them out; the rest are recorded in order
+    with their nesting depth (0 for a top-level '{' and the '}' that closes
+    it) and whether they delimit a class, struct, interface or record body.
+    Only braces, parentheses, semicolons and type keywords are looked at, so
+    this costs a fraction of lex().
+    """
+
+    def __init__(self, text: str):
+        self.offsets: List[int] = []
+        self.closing: List[bool] = []
+        self.depths: List[int] = []
+        self.type_bodies: List[bool] = []
+        stack: List[bool] = []
+        # A type keyword since the last statement boundary and before any '('
+        # (so a method's 'where T : class' does not count)
+        pending = parens = False
+        pos, end = 0, len(text)
+        while pos < end:
+            for m in _BRACE_TOKEN.finditer(text, pos):
+                kind = m.lastgroup
+                start = m.start(kind)
+                if kind == "interp":
+                    pos = _interpolated_end(text, m.end(), end, "@" in m.group(kind))
+                    break
+                if kind == "pp":
+                    if not _line_initial(text, start):
+                        continue
+                    pos = _directive_end(text, start, end)
+                    break
+                if kind == "open":
+                    self._add(start, False, len(stack), pending)
+                    stack.append(pending)
+                    pending = parens = False
+                elif kind == "close":
+                    body = stack.pop() if stack else False
+                    self._add(start, True, len(stack), body)
+                    pending = parens = False
+                elif kind == "semi":
+                    pending = parens = False
+                elif kind == "paren":
+                    parens = True
+                elif kind == "type":
+                    pending = pending or not parens
+            else:
+                break
+
+    def _add(self, offset: int, closing: bool, depth: int, type_body: bool) -> None:
+        self.offsets.append(offset)
+        self.closing.append(closing)
+        self.depths.append(depth)
+        self.type_bodies.append(type_body)
+
+    def first_closing(self, start: int, end: int) -> Optional[int]:
+        """Index of the first code '}' in text[start:end], if there is one."""
+        i = bisect_left(self.offsets, start)
+        while i < len(self.offsets) and self.offsets[i] < end:
+            if self.closing[i]:
+                return i
+            i += 1
+        return None
+
+
+def _parse(text: str) -> Tuple[List[Declaration], int]:
+    tokens, _, _ = lex(text)
+    parser = _Parser(text, tokens)
+    declarations: List[Declaration] = []
+    i = 0
+    while i < len(tokens):
+        found, i = parser.members(i, None)
+        declarations.extend(found)
+        if i < len(tokens):
+            parser.errors += 1  # Stray '}'
+            i += 1
+    return declarations, parser.errors
+
+
+class CSharpOutline:
+    """Declarations of one C# source text; see the module docstring."""
+
+    def __init__(self, text: str, declarations: Optional[List[Declaration]] = None,
+                 errors: int = 0, sha: Optional[str] = None):
+        if declarations is None:
+            declarations, errors = _parse(text)
+        self.text = text
+        self.declarations = declarations
+        # Unbalanced brackets or unterminated declarations; spans after the
+        # first error are best effort
+        self.errors = errors
+        self._sha = sha
+        self._line_starts: Optional[List[int]] = None
+
+    @property
+    def sha(self) -> str:
+        if self._sha is None:
+            self._sha = hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+        return self._sha
+
+    def walk(self) -> Iterator[Tuple[Declaration, Tuple[Declaration, ...]]]:
+        """Every declaration, depth first, with its enclosing declarations."""
+        stack = [(d, ()) for d in reversed(self.declarations)]
+        while stack:
+            declaration, parents = stack.pop()
+            yield declaration, parents
+            inner = parents + (declaration,)
+            stack.extend((child, inner) for child in reversed(declaration.children))
+
+    def find_types(self, name: str, namespace: Optional[str] = None) -> List[Declaration]:
+        """Types named name, only those directly or indirectly in namespace if given."""
+        found = []
+        for declaration, parents in self.walk():
+            if declaration.kind not in TYPE_KINDS or declaration.name != name:
+                continue
+            if namespace:
+                names = ".".join(p.name for p in parents if p.kind == "namespace")
+                if names != namespace and not names.endswith("." + namespace):
+                    continue
+            found.append(declaration)
+        return found
+
+    def find_members(self, container: Declaration, name: str, return_type: Optional[str] = None,
+                     parameters: Optional[str] = None, attributes_contains: Optional[str] = None,
+                     kinds: Tuple[str, ...] = ("method",)) -> List[Declaration]:
+        """Members of container matching ManageScript's method filters."""
+        if parameters is not None:
+            parameters = parameters.strip()
+            if parameters.startswith("(") and parameters.endswith(")"):
+                parameters = parameters[1:-1]
+            parameters = _collapse(parameters)
+        if return_type:
+            return_type = _collapse(return_type)
+        return [
+            m for m in container.children
+            if m.kind in kinds and m.name == name
+            and (not return_type or m.return_type == return_type)
+            and (parameters is None or m.parameters == parameters)
+            and (not attributes_contains or attributes_contains in m.attributes)
+        ]
+
+    def line_col(self, offset: int) -> Tuple[int, int]:
+        """1-based line and column of a character offset."""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer("\n", self.text)]
+        line = bisect_right(self._line_starts, offset)
+        return line, offset - self._line_starts[line - 1] + 1
+
+    def apply_edit(self, start: int, end: int, new_text: str) -> "CSharpOutline":
+        """Outline of the text with text[start:end] replaced by new_text."""
+        text = self.text[:start] + new_text + self.text[end:]
+        if self.errors:
+            return CSharpOutline(text)
+        delta = len(new_text) - (end - start)
+        path: List[Declaration] = []
+        siblings = self.declarations
+        low, high = 0, len(self.text)
+        while True:
+            inner = next((d for d in siblings if d.is_container and d.body_start < start
+                          and end <= d.body_end and d.kind != "enum"), None)
+            if inner is None:
+                break
+            path.append(inner)
+            siblings = inner.children
+            low, high = inner.body_start + 1, inner.body_end
+        # Members the edit overlaps or touches are parsed again, with the gaps around them;
+        # so is one starting later on the same line, whose span starts at the line's start
+        first = bisect_left([d.end for d in siblings], start)
+        last = first
+        while last < len(siblings) and (siblings[last].start <= end
+                                        or "\n" not in self.text[end:siblings[last].start]):
+            last += 1
+        region_start = siblings[first - 1].end if first else low
+        region_end = siblings[last].start if last < len(siblings) else high
+        if not (_self_contained(self.text, region_start, region_end)
+                and _self_contained(text, region_start, region_end + delta)):
+            return CSharpOutline(text)
+        tokens, _, unterminated = lex(text, region_start, region_end + delta)
+        if unterminated:
+            return CSharpOutline(text)
+        parser = _Parser(text, tokens)
+        container = path[-1].name if path and path[-1].kind != "namespace" else None
+        found, i = parser.members(0, container)
+        if parser.errors or i != len(tokens):
+            return CSharpOutline(text)
+
+        spliced = siblings[:first] + found + [d.shifted(delta) for d in siblings[last:]]
+        for level in range(len(path) - 1, -1, -1):
+            node = path[level]
+            node = replace(node, end=node.end + delta, body_end=node.body_end + delta, children=spliced)
+            outer = path[level - 1].children if level else self.declarations
+            at = next(k for k, d in enumerate(outer) if d is path[level])
+            spliced = outer[:at] + [node] + [d.shifted(delta) for d in outer[at + 1:]]
+        return CSharpOutline(text, spliced, 0)
+
+
+class OutlineCache:
+    """Outlines of recently seen sources by SHA-256, least recently used dropped first."""
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._outlines: "OrderedDict[str, CSharpOutline]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def outline(self, text: str, sha: Optional[str] = None) -> CSharpOutline:
+        """The outline of text, parsed only if no outline of the same contents is cached."""
+        sha = sha or hashlib.sha256(text.encode("utf-8")).hexdigest()
+        with self._lock:
+            cached = self._outlines.get(sha)
+            if cached is not None:
+                self._outlines.move_to_end(sha)
+                self.hits += 1
+                return cached
+            self.misses += 1
+        outline = CSharpOutline(text, sha=sha)
+        self.put(outline)
+        return outline
+
+    def put(self, outline: CSharpOutline) -> None:
+        """Cache an outline, e.g. one apply_edit() derived for contents about to be written."""
+        with self._lock:
+            self._outlines[outline.sha] = outline
+            self._outlines.move_to_end(outline.sha)
+            while len(self._outlines) > self.capacity:
+                self._outlines.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._outlines), "hits": self.hits, "misses": self.misses}
+
+
+_outline_cache: Optional[OutlineCache] = None
+_outline_cache_lock = threading.Lock()
+
+
+def get_outline_cache() -> OutlineCache:
+    """The process-wide outline cache."""
+    global _outline_cache
+    if _outline_cache is None:
+        with _outline_cache_lock:
+            if _outline_cache is None:
+                _outline_cache = OutlineCache()
+    return _outline_cache
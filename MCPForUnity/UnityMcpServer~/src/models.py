@@ -20,6 +20,7 @@ class UnityInstanceInfo(BaseModel):
     status: str  # "running", "reloading", "offline"
     last_heartbeat: datetime | None = None
     unity_version: str | None = None
+    unix_socket: str | None = None  # Bridge's Unix domain socket path, if it has one
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -31,5 +32,6 @@ class UnityInstanceInfo(BaseModel):
             "port": self.port,
             "status": self.status,
             "last_heartbeat": self.last_heartbeat.isoformat() if self.last_heartbeat else None,
-            "unity_version": self.unity_version
+            "unity_version": self.unity_version,
+            "unix_socket": self.unix_socket
         }
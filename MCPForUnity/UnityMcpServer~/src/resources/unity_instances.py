@@ -4,6 +4,7 @@ Resource to list all available Unity Editor instances.
 from typing import Any
 
 from fastmcp import Context
+from instance_supervisor import get_instance_supervisor
 from registry import mcp_for_unity_resource
 from unity_connection import get_unity_connection_pool
 
@@ -26,6 +27,15 @@ async def unity_instances(ctx: Context) -> dict[str, Any]:
     - status: Current status (running, reloading, etc.)
     - last_heartbeat: Last heartbeat timestamp
     - unity_version: Unity version (if available)
+    - connection_pool: Socket pool metrics (size, in_flight, saturation,
+      wait times, negotiated compression and its ratio and CPU cost per
+      command type), present once the server has connected to the instance
+    - circuit: Circuit breaker state (closed, open or half_open), consecutive
+      connection failures, retry_after_ms while open and the last error;
+      "closed" for instances the server has not talked to yet
+    - health: The instance supervisor's view (state, heartbeat_seq and
+      heartbeat_age from the status file, ping latency_ms and its moving
+      average, connects and reloads seen), present once it has swept
 
     Returns:
         Dictionary containing list of instances and metadata
@@ -43,10 +53,23 @@ async def unity_instances(ctx: Context) -> dict[str, Any]:
 
         duplicates = [name for name, count in name_counts.items() if count > 1]
 
+        pool_metrics = pool.get_metrics()
+        circuits = pool.get_circuit_states()
+        health = get_instance_supervisor().get_health()
+        instance_dicts = []
+        for inst in instances:
+            info = inst.to_dict()
+            if inst.id in pool_metrics:
+                info["connection_pool"] = pool_metrics[inst.id]
+            info["circuit"] = circuits.get(inst.id, {"state": "closed"})
+            if inst.id in health:
+                info["health"] = health[inst.id]
+            instance_dicts.append(info)
+
         result = {
             "success": True,
             "instance_count": len(instances),
-            "instances": [inst.to_dict() for inst in instances],
+            "instances": instance_dicts,
         }
 
         if duplicates:
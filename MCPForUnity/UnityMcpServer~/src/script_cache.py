@@ -0,0 +1,441 @@
+"""
+Server-side cache of C# script contents, so edit/read cycles on the same
+script skip the Unity main-thread read.
+
+Entries are keyed by project root and project-relative path
+("Assets/Scripts/Player.cs") and hold the text as Unity's File.ReadAllText
+returns it, its SHA-256 as Unity computes it (the value precondition_sha256
+is checked against) and a lazily built line index. Every lookup stats the
+file and drops the entry if its mtime or size changed; with watchdog or
+watchfiles installed, each project's Assets/ is also watched and entries
+are dropped as soon as their file changes.
+
+Script reads go to disk first: when the project root is known and the file
+is valid UTF-8 under Assets/, it is mapped, hashed in place and decoded
+without a round trip to the editor, so reads keep working during domain
+reloads and while the main thread is busy. Anything else (no project
+root, a missing file, another encoding) falls back to a Unity read.
+
+Entries come from those disk reads, from Unity reads (kept only if the
+file did not change while the read was in flight), and from the server's
+own writes: the server applies the spans it sent to the text they were
+computed against (apply_text_spans) and, after a successful
+apply_text_edits, stores the result in place when Unity's reported
+SHA-256 matches it; otherwise the entry is dropped. A stale entry
+can at worst cost a precondition failure, never a lost write, since every
+write carries the SHA-256 it was computed against.
+
+The project root comes from UNITY_PROJECT_ROOT or the instance's status
+file; when neither gives one nothing is cached.
+"""
+import atexit
+from bisect import bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import hashlib
+import logging
+import mmap
+import os
+from pathlib import Path
+import posixpath
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import config
+from status_index import HAS_WATCHDOG, HAS_WATCHFILES, FileSystemEventHandler, Observer, get_status_index
+from unity_connection import hash_from_instance_id
+
+logger = logging.getLogger("mcp-for-unity-server")
+
+if HAS_WATCHFILES:
+    import watchfiles
+
+_SCRIPT_NAME = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+# (project root, project-relative path)
+Key = Tuple[str, str]
+
+
+def _project_dir(path: str | None) -> Path | None:
+    if not path:
+        return None
+    pr = Path(path).expanduser()
+    if not pr.is_absolute():
+        pr = Path.cwd() / pr
+    pr = pr.resolve()
+    return pr if (pr / "Assets").is_dir() else None
+
+
+def project_root(unity_instance: str | None) -> Path | None:
+    """The instance's project root, from its status file or UNITY_PROJECT_ROOT; None when unknown."""
+    index = get_status_index()
+    target_hash = hash_from_instance_id(unity_instance)
+    if target_hash:
+        entry = index.get(target_hash)
+    else:
+        # Without an instance id only an unambiguous status file will do
+        entries = index.entries()
+        entry = entries[0] if len(entries) == 1 else None
+    if entry is not None:
+        # Unity writes Application.dataPath, the project's Assets folder
+        assets = entry.data.get('project_path')
+        if isinstance(assets, str) and assets:
+            root = _project_dir(os.path.dirname(assets.rstrip('/\\')))
+            if root is not None:
+                return root
+    return _project_dir(os.environ.get("UNITY_PROJECT_ROOT"))
+
+
+def script_path(name: str, path: str | None) -> str | None:
+    """Project-relative path of a script the way ManageScript resolves name and path, or None if it would refuse them."""
+    if not name or not _SCRIPT_NAME.match(name):
+        return None
+    rel = (path or "Scripts").replace("\\", "/").strip() or "Scripts"
+    if rel[:7].lower() == "assets/":
+        rel = rel[7:]
+    rel = posixpath.normpath("Assets/" + rel.lstrip("/") + f"/{name}.cs")
+    if not rel.startswith("Assets/"):
+        return None
+    return rel
+
+
+def _crosses_link(root: Path, rel: str) -> bool:
+    """True when the script's folder or any folder above it, up to and including Assets, is a link.
+
+    ManageScript's TryResolveUnderAssets refuses such paths, so reading them here
+    would expose files Unity will not touch.
+    """
+    folder = posixpath.dirname(rel)
+    while folder:
+        path = root / folder
+        try:
+            if path.is_symlink() or getattr(os.path, "isjunction", lambda _: False)(path):
+                return True
+        except OSError:
+            return True
+        folder = posixpath.dirname(folder)
+    return False
+
+
+def decode_script(data) -> str | None:
+    """Script bytes (any buffer) as text, as File.ReadAllText decodes UTF-8; None for anything else."""
+    if data[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        return None
+    try:
+        return str(data, "utf-8-sig")
+    except UnicodeDecodeError:
+        return None
+
+
+def _read_file(path: Path) -> Tuple[str, str, os.stat_result] | None:
+    """(text, SHA-256 of its UTF-8 bytes, stat) of a script on disk; None if it cannot be read as UTF-8.
+
+    The file is mapped rather than read, and hashed in place: past an optional BOM
+    its bytes are exactly the UTF-8 encoding of the decoded text.
+    """
+    for _ in range(3):
+        try:
+            with open(path, "rb") as f:
+                before = os.fstat(f.fileno())
+                if before.st_size == 0:
+                    text, digest = "", hashlib.sha256(b"").hexdigest()
+                else:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        text = decode_script(data)
+                        if text is None:
+                            return None
+                        with memoryview(data) as view:
+                            bom = 3 if view[:3] == b"\xef\xbb\xbf" else 0
+                            digest = hashlib.sha256(view[bom:]).hexdigest()
+                after = os.fstat(f.fileno())
+        except (OSError, ValueError):
+            return None
+        if (before.st_mtime_ns, before.st_size) == (after.st_mtime_ns, after.st_size):
+            return text, digest, after
+        # Written to while it was read; take it again
+    return None
+
+
+def apply_text_spans(text: str, edits: List[Dict[str, Any]]) -> str | None:
+    """The text ManageScript's apply_text_edits writes for these edits, before any formatting.
+
+    Edits are {startLine, startCol, endLine, endCol, newText} (1-based, \\r\\n, \\r and
+    \\n each ending a line), all against the same text. None when Unity would refuse
+    them: a position out of range or overlapping spans.
+    """
+    breaks = list(_LINE_BREAK.finditer(text))
+    starts = [0] + [m.end() for m in breaks]
+    ends = [m.start() for m in breaks] + [len(text)]
+
+    def index(line: Any, col: Any) -> int | None:
+        line, col = max(1, int(line)), max(1, int(col))
+        if line > len(starts) or starts[line - 1] + col - 1 > ends[line - 1]:
+            return None
+        return starts[line - 1] + col - 1
+
+    spans = []
+    try:
+        for e in edits:
+            start, end = index(e["startLine"], e["startCol"]), index(e["endLine"], e["endCol"])
+            if start is None or end is None:
+                return None
+            spans.append((min(start, end), max(start, end), e.get("newText") or ""))
+    except (KeyError, TypeError, ValueError):
+        return None
+    spans.sort(key=lambda span: span[0], reverse=True)
+    if any(later[1] > earlier[0] for earlier, later in zip(spans, spans[1:])):
+        return None
+    for start, end, new_text in spans:
+        text = text[:start] + new_text + text[end:]
+    return text
+
+
+@dataclass
+class ScriptEntry:
+    """One cached script. Treat as immutable: writes replace the entry."""
+    root: Path
+    rel: str
+    text: str
+    sha256: str
+    mtime_ns: int
+    size: int
+    _lines: Optional[List[str]] = field(default=None, repr=False)
+    _line_starts: Optional[List[int]] = field(default=None, repr=False)
+
+    @property
+    def path(self) -> Path:
+        return self.root / self.rel
+
+    def read_data(self) -> Dict[str, Any]:
+        """The data of a manage_script read response for this script."""
+        return {"uri": f"unity://path/{self.rel}", "path": self.rel, "contents": self.text}
+
+    @property
+    def length_bytes(self) -> int:
+        """UTF-8 length of the text without a BOM, as get_sha reports it."""
+        return len(self.text.encode("utf-8"))
+
+    @property
+    def lines(self) -> List[str]:
+        """text.splitlines()"""
+        if self._lines is None:
+            self._lines = self.text.splitlines()
+        return self._lines
+
+    def line_col(self, offset: int) -> Tuple[int, int]:
+        """1-based line and column of a character offset, counting '\\n' as the only line break."""
+        if self._line_starts is None:
+            self._line_starts = [0] + [m.end() for m in re.finditer("\n", self.text)]
+        line = bisect_right(self._line_starts, max(offset, 0))
+        return line, max(offset, 0) - self._line_starts[line - 1] + 1
+
+
+class _WatchdogHandler(FileSystemEventHandler):
+    def __init__(self, cache: "ScriptCache", root: Path):
+        super().__init__()
+        self._cache = cache
+        self._root = root
+
+    def on_any_event(self, event) -> None:
+        for path in (getattr(event, 'src_path', None), getattr(event, 'dest_path', None)):
+            if path:
+                self._cache.changed(self._root, Path(os.fsdecode(path)))
+
+
+class ScriptCache:
+    """Script contents by project and path, least recently used dropped first; safe to use from any thread."""
+
+    def __init__(self, capacity: int | None = None, watch: bool | None = None):
+        self.capacity = capacity
+        self._watch = watch
+        self._entries: "OrderedDict[Key, ScriptEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Watcher (and its kind and stop event) per project root
+        self._watchers: Dict[str, Tuple[Any, str, Optional[threading.Event]]] = {}
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "stale": 0, "stored": 0, "events": 0, "disk_reads": 0}
+
+    @staticmethod
+    def locate(unity_instance: str | None, name: str, path: str | None) -> Optional[Tuple[Path, str]]:
+        """(project root, project-relative path) of a script, or None when either is unknown
+        or the path runs through a linked folder ManageScript would refuse."""
+        rel = script_path(name, path)
+        if rel is None:
+            return None
+        root = project_root(unity_instance)
+        if root is None or _crosses_link(root, rel):
+            return None
+        return root, rel
+
+    @staticmethod
+    def stat(root: Path, rel: str) -> os.stat_result | None:
+        try:
+            return os.stat(root / rel)
+        except OSError:
+            return None
+
+    def get(self, root: Path, rel: str) -> ScriptEntry | None:
+        """The cached entry if the file has not changed since it was stored."""
+        if not getattr(config, 'script_cache_enabled', True):
+            return None
+        key = (str(root), rel)
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        stat = self.stat(root, rel)
+        with self._lock:
+            if stat is None or (stat.st_mtime_ns, stat.st_size) != (entry.mtime_ns, entry.size):
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                self.stats["stale"] += 1
+                self.stats["misses"] += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+        return entry
+
+    def load(self, root: Path, rel: str) -> ScriptEntry | None:
+        """The cached entry, or the file read from disk (and cached); None if it cannot be read as UTF-8."""
+        entry = self.get(root, rel)
+        if entry is not None or not getattr(config, 'script_disk_reads', True):
+            return entry
+        read = _read_file(root / rel)
+        if read is None:
+            return None
+        self.stats["disk_reads"] += 1
+        text, digest, stat = read
+        return self._store(root, rel, text, digest, stat)
+
+    def remember(self, root: Path, rel: str, text: str, before: os.stat_result | None) -> ScriptEntry | None:
+        """Cache contents Unity returned for a read, if the file is unchanged since `before` was taken."""
+        if not getattr(config, 'script_cache_enabled', True):
+            return None
+        after = self.stat(root, rel)
+        if before is None or after is None or (before.st_mtime_ns, before.st_size) != (after.st_mtime_ns, after.st_size):
+            return None
+        return self._store(root, rel, text, None, after)
+
+    def update(self, root: Path, rel: str, text: str | None, sha256: str | None) -> ScriptEntry | None:
+        """Store the text a successful write left on disk, if it has the SHA-256 Unity reported for it."""
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest() if text is not None else None
+        stat = self.stat(root, rel)
+        if stat is None or not sha256 or sha256 != digest:
+            # Unity wrote something else (formatted it, or rerouted the edit), or did not
+            # say what it wrote; read it again next time
+            self.invalidate(root, rel)
+            return None
+        return self._store(root, rel, text, digest, stat)
+
+    def invalidate(self, root: Path, rel: str | None = None) -> None:
+        """Drop one script, or every script of a project."""
+        with self._lock:
+            if rel is not None:
+                self._entries.pop((str(root), rel), None)
+                return
+            for key in [k for k in self._entries if k[0] == str(root)]:
+                del self._entries[key]
+
+    def changed(self, root: Path, path: Path) -> None:
+        """Drop the entry for a file a watcher saw change."""
+        try:
+            rel = path.resolve().relative_to(root).as_posix()
+        except (OSError, ValueError):
+            return
+        self.stats["events"] += 1
+        self.invalidate(root, rel)
+
+    def _store(self, root: Path, rel: str, text: str, sha256: str | None, stat: os.stat_result) -> ScriptEntry:
+        entry = ScriptEntry(root, rel, text, sha256 or hashlib.sha256(text.encode("utf-8")).hexdigest(),
+                            stat.st_mtime_ns, stat.st_size)
+        if not getattr(config, 'script_cache_enabled', True):
+            return entry
+        capacity = self.capacity or getattr(config, 'script_cache_entries', 64)
+        key = (str(root), rel)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > capacity:
+                self._entries.popitem(last=False)
+            self.stats["stored"] += 1
+            if key[0] not in self._watchers:
+                self._start_watcher(root)
+        return entry
+
+    def _start_watcher(self, root: Path) -> None:
+        # Recorded even when nothing starts, so a project is only tried once
+        self._watchers[str(root)] = (None, "", None)
+        if not (self._watch if self._watch is not None else getattr(config, 'script_cache_watch', True)):
+            return
+        assets = root / "Assets"
+        try:
+            if HAS_WATCHDOG:
+                observer = Observer()
+                observer.schedule(_WatchdogHandler(self, root), str(assets), recursive=True)
+                observer.daemon = True
+                observer.start()
+                self._watchers[str(root)] = (observer, 'watchdog', None)
+            elif HAS_WATCHFILES:
+                stop = threading.Event()
+                thread = threading.Thread(target=self._watchfiles_loop, args=(root, assets, stop),
+                                          name="unity-script-watch", daemon=True)
+                thread.start()
+                self._watchers[str(root)] = (thread, 'watchfiles', stop)
+            else:
+                return
+            logger.debug(f"Watching {assets} for script changes ({self._watchers[str(root)][1]})")
+        except Exception as e:
+            logger.debug(f"Could not watch {assets}; checking mtimes only: {e}")
+
+    def _watchfiles_loop(self, root: Path, assets: Path, stop: threading.Event) -> None:
+        try:
+            for changes in watchfiles.watch(assets, stop_event=stop, debounce=50, step=20,
+                                            rust_timeout=200, recursive=True, raise_interrupt=False):
+                for _, path in changes:
+                    self.changed(root, Path(path))
+        except Exception as e:
+            logger.debug(f"Script watcher for {assets} stopped: {e}")
+
+    def watching(self, root: Path) -> str | None:
+        """Name of the watcher backend for a project, or None when only mtimes are checked."""
+        with self._lock:
+            watcher = self._watchers.get(str(root))
+        return (watcher[1] or None) if watcher else None
+
+    def close(self, wait: float = 0.0) -> None:
+        """Stop every watcher, waiting up to `wait` seconds for each to exit."""
+        with self._lock:
+            watchers, self._watchers = self._watchers, {}
+        for watcher, kind, stop in watchers.values():
+            if watcher is None:
+                continue
+            if kind == 'watchdog':
+                watcher.stop()
+            elif stop is not None:
+                stop.set()
+            if wait:
+                watcher.join(wait)
+
+
+_script_cache: Optional[ScriptCache] = None
+_script_cache_lock = threading.Lock()
+
+
+def get_script_cache() -> ScriptCache:
+    """The process-wide script cache."""
+    global _script_cache
+    if _script_cache is None:
+        with _script_cache_lock:
+            if _script_cache is None:
+                _script_cache = ScriptCache()
+    return _script_cache
+
+
+@atexit.register
+def _close_script_cache() -> None:
+    # Same as the status index: stop watcher threads before the interpreter finalizes
+    if _script_cache is not None:
+        _script_cache.close(wait=2.0)
@@ -9,7 +9,8 @@ from typing import AsyncIterator, Dict, Any
 from config import config
 from tools import register_all_tools
 from resources import register_all_resources
-from unity_connection import get_unity_connection_pool, UnityConnectionPool
+from unity_connection import get_unity_connection_pool, start_capture, stop_capture, UnityConnectionPool
+from instance_supervisor import get_instance_supervisor
 from unity_instance_middleware import UnityInstanceMiddleware, set_unity_instance_middleware
 import time
 
@@ -96,12 +97,44 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
             logger.debug("Deferred startup telemetry failed", exc_info=True)
     threading.Timer(1.0, _emit_startup).start()
 
+    capture_path = os.environ.get("UNITY_MCP_CAPTURE", "").strip() or config.capture_path
+    if capture_path:
+        try:
+            start_capture(capture_path)
+        except Exception as e:
+            logger.warning("Could not start traffic capture to %s: %s", capture_path, e)
+
     try:
         skip_connect = os.environ.get(
             "UNITY_MCP_SKIP_STARTUP_CONNECT", "").lower() in ("1", "true", "yes", "on")
         if skip_connect:
             logger.info(
                 "Skipping Unity connection on startup (UNITY_MCP_SKIP_STARTUP_CONNECT=1)")
+        elif config.supervisor_enabled:
+            # Connect to every instance in the background rather than blocking
+            # startup on the default one
+            _unity_connection_pool = get_unity_connection_pool()
+
+            def _report_first_sweep(future):
+                instances = future.result()["instances"]
+                ready = [i for i, health in instances.items() if health["state"] == "ready"]
+                if not ready:
+                    logger.warning("No Unity instances found on startup")
+                    return
+                logger.info(f"Connected to {len(ready)} Unity instance(s) on startup: {ready}")
+                connection_time_ms = (time.perf_counter() - start_clk) * 1000
+                threading.Timer(1.0, lambda: record_telemetry(
+                    RecordType.UNITY_CONNECTION,
+                    {
+                        "status": "connected",
+                        "connection_time_ms": connection_time_ms,
+                        "instance_count": len(instances)
+                    }
+                )).start()
+
+            supervisor = get_instance_supervisor()
+            supervisor.first_sweep.add_done_callback(_report_first_sweep)
+            supervisor.start()
         else:
             # Initialize connection pool and discover instances
             _unity_connection_pool = get_unity_connection_pool()
@@ -163,8 +196,12 @@ async def server_lifespan(server: FastMCP) -> AsyncIterator[Dict[str, Any]]:
         # Note: Tools will use get_unity_connection_pool() directly
         yield {"pool": _unity_connection_pool}
     finally:
+        get_instance_supervisor().stop()
         if _unity_connection_pool:
             _unity_connection_pool.disconnect_all()
+        capture = stop_capture()
+        if capture is not None:
+            logger.info(f"Traffic capture closed: {capture}")
         logger.info("MCP for Unity Server shut down")
 
 # Initialize MCP server
@@ -228,6 +265,7 @@ Environment Variables:
   UNITY_MCP_DEFAULT_INSTANCE   Default Unity instance to target (project name, hash, or 'Name@hash')
   UNITY_MCP_SKIP_STARTUP_CONNECT   Skip initial Unity connection attempt (set to 1/true/yes/on)
   UNITY_MCP_TELEMETRY_ENABLED   Enable telemetry (set to 1/true/yes/on)
+  UNITY_MCP_CAPTURE   Record bridge traffic to this file (replay with benchmarks/replay_capture.py)
 
 Examples:
   # Use specific Unity project as default
@@ -245,8 +283,19 @@ Examples:
              "Overrides UNITY_MCP_DEFAULT_INSTANCE environment variable."
     )
 
+    parser.add_argument(
+        "--capture",
+        type=str,
+        metavar="PATH",
+        help="Record every bridge request and response, with timings, to PATH. "
+             "Overrides UNITY_MCP_CAPTURE environment variable."
+    )
+
     args = parser.parse_args()
 
+    if args.capture:
+        os.environ["UNITY_MCP_CAPTURE"] = args.capture
+
     # Set environment variable if --default-instance is provided
     if args.default_instance:
         os.environ["UNITY_MCP_DEFAULT_INSTANCE"] = args.default_instance
@@ -2,6 +2,10 @@ import os
 import sys
 import types
 
+import pytest
+
+from .stand_in_bridge import disconnect_bridged_pools
+
 # Ensure telemetry is disabled during test collection and execution to avoid
 # any background network or thread startup that could slow or block pytest.
 os.environ.setdefault("DISABLE_TELEMETRY", "true")
@@ -64,3 +68,10 @@ fastmcp.server = fastmcp_server
 fastmcp_server.middleware = fastmcp_server_middleware
 sys.modules.setdefault("fastmcp.server", fastmcp_server)
 sys.modules.setdefault("fastmcp.server.middleware", fastmcp_server_middleware)
+
+
+@pytest.fixture(autouse=True)
+def _disconnect_stand_in_pools():
+    # Connections opened through use_bridge() must not outlive the test
+    yield
+    disconnect_bridged_pools()
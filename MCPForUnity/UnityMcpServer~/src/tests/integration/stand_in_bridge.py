@@ -0,0 +1,411 @@
+"""
+Stand-in for the Unity-side MCP bridge used by transport tests.
+
+Speaks the same handshake and 8-byte big-endian length framing as
+MCPForUnityBridge.cs, answers `ping` directly and routes JSON commands to a
+pluggable handler, so the Python transport can be exercised without Unity.
+"""
+import base64
+from collections import OrderedDict
+import json
+import os
+import socket
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Callable, Union
+
+WELCOME = b"WELCOME UNITY-MCP 1 FRAMING=1\n"
+WELCOME_REQID = b"WELCOME UNITY-MCP 1 FRAMING=1 REQID=1 CHUNKED=1\n"
+PONG = b'{"status":"success","result":{"message":"pong"}}'
+EXT_HEADER = struct.Struct(">BBI")
+FLAG_MORE = 0x01
+FLAG_ACCEPT_CHUNKS = 0x02
+CODEC_MASK = 0x0C
+FLAG_ACCEPT_ATTACHMENTS = 0x40
+FLAG_ATTACHMENT = 0x80
+# codec name -> (frame flag, accept flag, compress, decompress)
+CODECS = {"zlib": (0x04, 0x10, zlib.compress, zlib.decompress)}
+try:
+    import zstandard
+
+    CODECS["zstd"] = (0x08, 0x20, lambda data: zstandard.ZstdCompressor().compress(data),
+                      lambda data: zstandard.ZstdDecompressor().decompress(data))
+except ImportError:
+    pass
+
+
+def echo_handler(command: dict[str, Any]) -> dict[str, Any]:
+    """Default handler: succeed and echo the command back."""
+    return {"status": "success", "result": {"type": command.get("type"), "params": command.get("params")}}
+
+
+class _DropResponse(Exception):
+    """The command was applied, but its response is lost with the connection."""
+
+
+def _encode_blobs(value: Any, attachments: list[bytes] | None) -> Any:
+    """Turn bytes in a response into attachment references, or base64 without attachments."""
+    if isinstance(value, (bytes, bytearray)):
+        if attachments is None:
+            return base64.b64encode(value).decode("ascii")
+        attachments.append(bytes(value))
+        return {"$attachment": len(attachments) - 1}
+    if isinstance(value, dict):
+        return {key: _encode_blobs(item, attachments) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_encode_blobs(item, attachments) for item in value]
+    return value
+
+
+def _recv_exact(conn: socket.socket, count: int) -> bytes | None:
+    buf = bytearray()
+    while len(buf) < count:
+        chunk = conn.recv(count - len(buf))
+        if not chunk:
+            return None
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+class StandInBridge:
+    """Threaded TCP server that mimics the Unity bridge.
+
+    Args:
+        handler: Maps a decoded command dict to a response envelope dict, or
+            to already-encoded response bytes.
+        delay: Seconds to wait before answering each JSON command, or a
+            callable computing the delay from the command.
+        welcome: Handshake line sent on connect.
+        multiplex: Advertise REQID=1 and answer tagged frames concurrently,
+            in completion order rather than arrival order.
+        chunk_size: Split tagged responses into continuation frames of this
+            many bytes when the request accepts chunks.
+        chunk_delay: Seconds to pause between continuation frames.
+        compress: Codecs to advertise with COMPRESS= (tagged frames only);
+            responses of at least compress_min_bytes use the first codec the
+            request accepts.
+        heartbeat: While a lock-step command is delayed, send an empty
+            heartbeat frame every this many seconds.
+        unix_socket: Also listen on a Unix domain socket at this path, like
+            the bridge does on Linux and macOS; connections are served the same.
+        attachments: Advertise ATTACH=1 (tagged frames only). bytes values in
+            a handler's response go out as attachment frames when the request
+            accepts them, and as base64 strings otherwise.
+        dedupe: Advertise DEDUPE=1 and answer a repeated idempotencyKey with
+            the cached response (the last dedupe_capacity keys) instead of
+            calling the handler again.
+        drop_responses: Close the connection instead of answering the first
+            this many JSON commands, after the handler has run, as when a
+            domain reload cuts a reply off.
+        timing: Add the bridge's "timing" object to JSON command responses;
+            the delay and the handler count as execution time.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[dict[str, Any]], Union[dict[str, Any], bytes]] = echo_handler,
+        *,
+        delay: Union[float, Callable[[dict[str, Any]], float]] = 0.0,
+        welcome: bytes | None = None,
+        multiplex: bool = False,
+        chunk_size: int = 1024 * 1024,
+        chunk_delay: float = 0.0,
+        compress: tuple[str, ...] = (),
+        compress_min_bytes: int = 1024,
+        heartbeat: float = 0.0,
+        unix_socket: str | None = None,
+        attachments: bool = False,
+        dedupe: bool = False,
+        dedupe_capacity: int = 256,
+        drop_responses: int = 0,
+        timing: bool = False,
+    ):
+        self.handler = handler
+        self.heartbeat = heartbeat
+        self.heartbeats_sent = 0
+        self.delay = delay
+        self.multiplex = multiplex
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.chunked_responses = 0
+        self.compress = [name for name in compress if name in CODECS]
+        self.compress_min_bytes = compress_min_bytes
+        if welcome is None:
+            welcome = WELCOME_REQID if multiplex else WELCOME
+            if multiplex and self.compress:
+                welcome = welcome.rstrip(b"\n") + b" COMPRESS=" + ",".join(self.compress).encode() + b"\n"
+            if multiplex and attachments:
+                welcome = welcome.rstrip(b"\n") + b" ATTACH=1\n"
+            if dedupe:
+                welcome = welcome.rstrip(b"\n") + b" DEDUPE=1\n"
+        self.welcome = welcome
+        self.dedupe = dedupe
+        self.dedupe_capacity = dedupe_capacity
+        self._replies: OrderedDict[str, tuple[bytes, list[bytes]]] = OrderedDict()
+        self.drop_responses = drop_responses
+        self.timing = timing
+        self.applied = 0
+        self.replayed = 0
+        self.dropped = 0
+        self.attachments_sent = 0
+        self.compressed_requests = 0
+        self.compressed_responses = 0
+        self.tagged_frames = 0
+        self.connections = 0
+        self.pings = 0
+        self.commands: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._clients: list[socket.socket] = []
+        self._stopped = threading.Event()
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(64)
+        self.port = self._sock.getsockname()[1]
+        self.unix_socket = unix_socket
+        self.unix_connections = 0
+        self._unix_sock: socket.socket | None = None
+        if unix_socket is not None:
+            if os.path.exists(unix_socket):
+                os.unlink(unix_socket)
+            self._unix_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._unix_sock.bind(unix_socket)
+            self._unix_sock.listen(64)
+
+    def __enter__(self) -> "StandInBridge":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        threading.Thread(target=self._accept_loop, args=(self._sock,), daemon=True).start()
+        if self._unix_sock is not None:
+            threading.Thread(target=self._accept_loop, args=(self._unix_sock,), daemon=True).start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        for listener in (self._sock, self._unix_sock):
+            try:
+                if listener is not None:
+                    listener.close()
+            except Exception:
+                pass
+        if self.unix_socket is not None and os.path.exists(self.unix_socket):
+            os.unlink(self.unix_socket)
+        self.drop_clients()
+
+    def drop_clients(self) -> None:
+        """Close every accepted socket while keeping the listener up."""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+                client.close()
+            except Exception:
+                pass
+
+    def _accept_loop(self, listener: socket.socket) -> None:
+        while not self._stopped.is_set():
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            with self._lock:
+                self.connections += 1
+                if conn.family == getattr(socket, "AF_UNIX", None):
+                    self.unix_connections += 1
+                self._clients.append(conn)
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _respond(self, payload: bytes, attachments: list[bytes] | None = None) -> bytes:
+        received = time.perf_counter()
+        if payload.strip() == b"ping":
+            with self._lock:
+                self.pings += 1
+            return PONG
+        command = json.loads(payload.decode("utf-8"))
+        key = command.get("idempotencyKey") if self.dedupe else None
+        with self._lock:
+            self.commands.append(command)
+            replay = self._replies.get(key) if key is not None else None
+            if replay is not None:
+                self._replies.move_to_end(key)
+                self.replayed += 1
+        if replay is not None:
+            if attachments is not None:
+                attachments.extend(replay[1])
+            return replay[0]
+        dequeued = time.perf_counter()
+        delay = self.delay(command) if callable(self.delay) else self.delay
+        if delay:
+            time.sleep(delay)
+        response = self.handler(command)
+        executed = time.perf_counter()
+        if not isinstance(response, bytes):
+            response = json.dumps(_encode_blobs(response, attachments)).encode("utf-8")
+        with self._lock:
+            self.applied += 1
+            if key is not None:
+                self._replies[key] = (response, list(attachments or ()))
+                while len(self._replies) > self.dedupe_capacity:
+                    self._replies.popitem(last=False)
+            if self.dropped < self.drop_responses:
+                self.dropped += 1
+                raise _DropResponse()
+        if self.timing:
+            end = response.rindex(b"}")
+            timing = {"queueMs": (dequeued - received) * 1e3, "execMs": (executed - dequeued) * 1e3,
+                      "serializeMs": (time.perf_counter() - executed) * 1e3,
+                      "bridgeMs": (time.perf_counter() - received) * 1e3}
+            response = response[:end] + b',"timing":' + json.dumps(timing).encode("utf-8") + response[end:]
+        return response
+
+    def _respond_tagged(self, conn: socket.socket, write_lock: threading.Lock, frame: bytes) -> None:
+        _, flags, request_id = EXT_HEADER.unpack_from(frame)
+        body = frame[EXT_HEADER.size:]
+        if flags & CODEC_MASK:
+            codec = next(c for c in CODECS.values() if c[0] == flags & CODEC_MASK)
+            body = codec[3](body)
+            with self._lock:
+                self.compressed_requests += 1
+        attachments = [] if flags & FLAG_ACCEPT_ATTACHMENTS else None
+        try:
+            body = self._respond(body, attachments)
+        except _DropResponse:
+            try:
+                conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            return
+        codec = next((CODECS[name] for name in self.compress if flags & CODECS[name][1]), None)
+        step = self.chunk_size if flags & FLAG_ACCEPT_CHUNKS else max(len(body), 1)
+        if len(body) > step:
+            with self._lock:
+                self.chunked_responses += 1
+        try:
+            for data in attachments or ():
+                frame = EXT_HEADER.pack(1, FLAG_ATTACHMENT, request_id) + data
+                with write_lock:
+                    conn.sendall(struct.pack(">Q", len(frame)) + frame)
+                with self._lock:
+                    self.attachments_sent += 1
+            for offset in range(0, max(len(body), 1), step):
+                chunk = body[offset:offset + step]
+                out_flags = FLAG_MORE if offset + step < len(body) else 0
+                if codec is not None and len(chunk) >= self.compress_min_bytes:
+                    chunk = codec[2](chunk)
+                    out_flags |= codec[0]
+                    with self._lock:
+                        self.compressed_responses += 1
+                response = EXT_HEADER.pack(1, out_flags, request_id) + chunk
+                with write_lock:
+                    conn.sendall(struct.pack(">Q", len(response)) + response)
+                if out_flags & FLAG_MORE and self.chunk_delay:
+                    time.sleep(self.chunk_delay)
+        except OSError:
+            pass
+
+    def _respond_with_heartbeats(self, conn: socket.socket, payload: bytes) -> bytes:
+        if not self.heartbeat:
+            return self._respond(payload)
+        result: list[bytes | _DropResponse] = []
+
+        def work() -> None:
+            try:
+                result.append(self._respond(payload))
+            except _DropResponse as e:
+                result.append(e)
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        while True:
+            worker.join(self.heartbeat)
+            if not worker.is_alive():
+                if isinstance(result[0], _DropResponse):
+                    raise result[0]
+                return result[0]
+            conn.sendall(struct.pack(">Q", 0))
+            with self._lock:
+                self.heartbeats_sent += 1
+
+    def _serve(self, conn: socket.socket) -> None:
+        try:
+            if conn.family != getattr(socket, "AF_UNIX", None):
+                conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            conn.sendall(self.welcome)
+            write_lock = threading.Lock()
+            while not self._stopped.is_set():
+                header = _recv_exact(conn, 8)
+                if header is None:
+                    return
+                payload = _recv_exact(conn, struct.unpack(">Q", header)[0])
+                if payload is None:
+                    return
+                if self.multiplex and payload[:1] == b"\x01":
+                    with self._lock:
+                        self.tagged_frames += 1
+                    threading.Thread(target=self._respond_tagged,
+                                     args=(conn, write_lock, payload), daemon=True).start()
+                    continue
+                response = self._respond_with_heartbeats(conn, payload)
+                with write_lock:
+                    conn.sendall(struct.pack(">Q", len(response)) + response)
+        except (OSError, _DropResponse):
+            pass
+        finally:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+# Pools installed by use_bridge(), disconnected after each test by conftest.py
+_pools: list[Any] = []
+
+
+def use_bridge(monkeypatch, tmp_path, bridge: StandInBridge) -> str:
+    """Route the global connection pool to a stand-in bridge; return its instance id.
+
+    The pool is disconnected when the test finishes.
+    """
+    import unity_connection
+    from models import UnityInstanceInfo
+    from port_discovery import PortDiscovery
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    instance = UnityInstanceInfo(
+        id="StandIn@abc123", name="StandIn", path=str(tmp_path / "Assets"),
+        hash="abc123", port=bridge.port, status="running",
+    )
+    monkeypatch.setattr(PortDiscovery, "discover_all_unity_instances",
+                        staticmethod(lambda: [instance]))
+    pool = unity_connection.UnityConnectionPool()
+    _pools.append(pool)
+    monkeypatch.setattr(unity_connection, "_unity_connection_pool", pool)
+    return instance.id
+
+
+def disconnect_bridged_pools() -> None:
+    """Close every connection opened through use_bridge() pools."""
+    while _pools:
+        _pools.pop().disconnect_all()
+
+
+async def send(instance_id: str, command_type: str = "manage_scene",
+               params: dict[str, Any] | None = None, **kwargs: Any) -> Any:
+    """One async_send_command_with_retry call to instance_id."""
+    import unity_connection
+
+    return await unity_connection.async_send_command_with_retry(
+        command_type, params or {}, instance_id=instance_id, **kwargs)
+
+
+def pool_metrics(instance_id: str) -> dict[str, Any]:
+    """The global pool's metrics for instance_id."""
+    import unity_connection
+
+    return unity_connection.get_unity_connection_pool().get_metrics()[instance_id]
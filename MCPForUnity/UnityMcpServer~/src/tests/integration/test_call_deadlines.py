@@ -0,0 +1,160 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+import anyio
+import anyio.to_thread
+import pytest
+
+import status_index
+import unity_connection
+from config import config
+from status_index import StatusIndex
+from unity_connection import DeadlineExceeded, call_deadline
+
+from .stand_in_bridge import StandInBridge, send, use_bridge
+
+
+@pytest.fixture()
+def deadline_pool(monkeypatch):
+    monkeypatch.setattr(config, "pool_max_connections", 1)
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+
+
+def _stall_first(seconds):
+    # Only the first command stalls, so a follow-up call shows the socket was freed
+    stalled = []
+
+    def delay(command):
+        if command["params"].get("stall"):
+            stalled.append(command)
+            return seconds
+        return 0.0
+    return delay
+
+
+@pytest.mark.asyncio
+async def test_deadline_cuts_a_stalled_call_short_and_frees_the_socket(monkeypatch, tmp_path, deadline_pool):
+    monkeypatch.setattr(config, "connection_timeout", 5.0)
+    with StandInBridge(delay=_stall_first(3.0)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        started = time.monotonic()
+        response = await send(instance_id, params={"stall": True}, timeout=0.3)
+        assert 0.3 <= time.monotonic() - started < 1.0
+        assert not response.success and response.data["state"] == "timeout"
+        # No retry was made, and the breaker did not count Unity being slow
+        assert len(bridge.commands) == 1
+        assert unity_connection.get_unity_connection_pool().get_circuit_states()[instance_id]["consecutive_failures"] == 0
+
+        # The only socket in the pool is usable again
+        assert (await send(instance_id, params={"n": 1}, timeout=1.0))["params"] == {"n": 1}
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_keep_a_slow_call_alive(monkeypatch, tmp_path, deadline_pool):
+    monkeypatch.setattr(config, "connection_timeout", 0.3)
+    with StandInBridge(delay=_stall_first(0.8), heartbeat=0.1) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = await send(instance_id, params={"stall": True}, timeout=3.0)
+        assert result["params"] == {"stall": True}
+        assert bridge.heartbeats_sent >= 5
+        assert len(bridge.commands) == 1
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_do_not_extend_the_deadline(monkeypatch, tmp_path, deadline_pool):
+    monkeypatch.setattr(config, "connection_timeout", 0.3)
+    with StandInBridge(delay=_stall_first(1.5), heartbeat=0.1) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        started = time.monotonic()
+        response = await send(instance_id, params={"stall": True}, timeout=0.5)
+        assert time.monotonic() - started < 1.0
+        assert response.data["state"] == "timeout"
+
+
+@pytest.mark.asyncio
+async def test_cancelling_the_caller_frees_the_connection(monkeypatch, tmp_path, deadline_pool):
+    with StandInBridge(delay=_stall_first(3.0)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        call = asyncio.ensure_future(send(instance_id, params={"stall": True}))
+        await asyncio.sleep(0.2)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        started = time.monotonic()
+        assert (await send(instance_id, params={"n": 1}))["params"] == {"n": 1}
+        assert time.monotonic() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_sync_tool_thread_is_released(monkeypatch, tmp_path, deadline_pool):
+    monkeypatch.setattr(config, "connection_timeout", 5.0)
+    with StandInBridge(delay=_stall_first(3.0)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+
+        def sync_tool():
+            return unity_connection.send_command_with_retry(
+                "manage_scene", {"stall": True}, instance_id=instance_id)
+
+        started = time.monotonic()
+        with anyio.move_on_after(0.2):
+            await anyio.to_thread.run_sync(sync_tool, abandon_on_cancel=False)
+        # The worker thread noticed the cancellation instead of waiting out Unity
+        assert time.monotonic() - started < 1.0
+        assert (await send(instance_id, params={"n": 1}, timeout=1.0))["params"] == {"n": 1}
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_a_reload_park(monkeypatch, tmp_path, deadline_pool):
+    monkeypatch.setattr(config, "reload_park_timeout", 10.0)
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await send(instance_id, params={"n": 0})
+        bridge.commands.clear()
+        directory = tmp_path / ".unity-mcp"
+        directory.mkdir(exist_ok=True)
+        (directory / "unity-mcp-status-abc123.json").write_text(json.dumps({
+            "unity_port": bridge.port, "reloading": True, "reason": "reloading",
+            "last_heartbeat": datetime.now(timezone.utc).isoformat()}))
+
+        started = time.monotonic()
+        response = await send(instance_id, params={"n": 1}, timeout=0.3)
+        assert 0.3 <= time.monotonic() - started < 1.0
+        assert response.data["state"] == "timeout"
+        assert bridge.commands == []
+
+
+def test_nested_deadlines_only_tighten():
+    with call_deadline(5.0):
+        with call_deadline(60.0):
+            assert unity_connection._time_left() <= 5.0
+        with call_deadline(0.0):
+            with pytest.raises(DeadlineExceeded):
+                unity_connection._time_left()
+    assert unity_connection._time_left(2.0) == 2.0
+
+
+@pytest.mark.asyncio
+async def test_sync_call_cancelled_before_it_is_sent_never_runs():
+    ran, raised = [], []
+
+    async def mutation():
+        ran.append(True)
+
+    def sync_tool():
+        # The request is cancelled while the tool is still preparing its call
+        time.sleep(0.3)
+        try:
+            unity_connection._transport.run(mutation())
+        except BaseException as exc:
+            raised.append(exc)
+            raise
+
+    with anyio.move_on_after(0.1):
+        await anyio.to_thread.run_sync(sync_tool, abandon_on_cancel=False)
+    await asyncio.sleep(0.1)
+    assert len(raised) == 1 and isinstance(raised[0], anyio.get_cancelled_exc_class())
+    assert ran == []
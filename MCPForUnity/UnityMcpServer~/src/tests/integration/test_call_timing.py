@@ -0,0 +1,75 @@
+import pytest
+
+import status_index
+import unity_connection
+from config import config
+from status_index import StatusIndex
+
+from .stand_in_bridge import StandInBridge, use_bridge
+
+CLIENT_PHASES = {"serialize", "send", "wait", "receive", "parse", "total"}
+UNITY_PHASES = {"queue", "execute", "unity_serialize", "bridge", "transfer"}
+
+
+@pytest.fixture()
+def timed(monkeypatch):
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+
+
+def _timings(instance_id):
+    return unity_connection.get_unity_connection_pool().get_metrics()[instance_id]["timing_by_command"]
+
+
+def _delay(command):
+    return 0.1 if command["params"].get("slow") else 0.0
+
+
+@pytest.mark.parametrize("multiplex", [True, False])
+def test_bridge_timing_is_merged_into_the_breakdown(monkeypatch, tmp_path, timed, multiplex):
+    with StandInBridge(delay=_delay, multiplex=multiplex, timing=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = unity_connection.send_command_with_retry(
+            "manage_scene", {"action": "load", "slow": True}, instance_id=instance_id)
+        # The timing object is metadata, not part of the result
+        assert result == {"type": "manage_scene", "params": {"action": "load", "slow": True}}
+        unity_connection.send_command_with_retry("manage_asset", {"n": 1}, instance_id=instance_id)
+
+    timings = _timings(instance_id)
+    scene = timings["manage_scene"]
+    assert scene["calls"] == scene["with_unity_timing"] == 1
+    assert set(scene["last_ms"]) == CLIENT_PHASES | UNITY_PHASES
+    last = scene["last_ms"]
+    assert last["execute"] >= 100
+    assert last["bridge"] >= last["execute"]
+    assert last["wait"] >= last["bridge"]
+    assert last["transfer"] == pytest.approx(last["wait"] - last["bridge"], abs=0.01)
+    assert last["total"] >= last["wait"] + last["send"]
+    assert timings["manage_asset"]["last_ms"]["execute"] < 100
+
+
+def test_breakdown_degrades_to_client_phases_without_bridge_timing(monkeypatch, tmp_path, timed):
+    with StandInBridge(delay=_delay, multiplex=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        for n in range(3):
+            unity_connection.send_command_with_retry("manage_scene", {"slow": n == 0}, instance_id=instance_id)
+
+    scene = _timings(instance_id)["manage_scene"]
+    assert scene["calls"] == 3 and scene["with_unity_timing"] == 0
+    assert set(scene["avg_ms"]) == set(scene["max_ms"]) == CLIENT_PHASES
+    assert scene["max_ms"]["wait"] >= 100 > scene["last_ms"]["wait"]
+
+
+def test_chunked_responses_report_their_receive_time(monkeypatch, tmp_path, timed):
+    def handler(command):
+        return {"status": "success", "result": {"text": "x" * 64 * 1024}}
+
+    with StandInBridge(handler, multiplex=True, chunk_size=16 * 1024, chunk_delay=0.02, timing=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        unity_connection.send_command_with_retry("read_console", {"action": "get"}, instance_id=instance_id)
+
+    last = _timings(instance_id)["read_console"]["last_ms"]
+    # Four chunks, three pauses between them
+    assert last["receive"] >= 55
+    assert last["total"] >= last["wait"] + last["receive"]
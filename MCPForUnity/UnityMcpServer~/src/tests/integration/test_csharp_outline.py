@@ -0,0 +1,246 @@
+import dataclasses
+import hashlib
+import random
+
+import pytest
+
+import status_index
+import unity_connection
+from benchmarks.bench_csharp_outline import generate_script
+from config import config
+from csharp_outline import BraceIndex, CSharpOutline, OutlineCache, lex
+from status_index import StatusIndex
+
+from .stand_in_bridge import StandInBridge, use_bridge
+from .test_helpers import DummyContext
+
+SOURCE = '''using UnityEngine;
+
+namespace Game.Core
+{
+    [RequireComponent(typeof(Rigidbody))]
+    public class Mover : MonoBehaviour
+    {
+        // a { in a comment
+        /* and a } here */
+        public float speed = 2f;
+        private Dictionary<string, List<int>> map = new Dictionary<string, List<int>> { { "a", null } };
+        public int Count { get; private set; } = 3;
+        public string Label => $"mover {speed:0.0} {{x}} {(speed > 1 ? "}" : "{")}";
+        string path = @"C:\\{dir}\\""quoted""";
+        char brace = '{';
+
+        public Mover() { }
+
+        [ContextMenu("Go")]
+        void Update()
+        {
+            var s = "}";
+#if UNITY_EDITOR
+            if (s != null) {
+#else
+            if (s == null) {
+#endif
+                Debug.Log(s);
+            }
+        }
+
+        public T Get<T>(int index) where T : class => null;
+        public void Move(Vector3 delta) { transform.position += delta; }
+        public void Move(float x) { Move(new Vector3(x, 0, 0)); }
+        public int this[int i] { get { return i; } }
+
+        private class Inner { void Hidden() { } }
+    }
+}
+'''
+
+
+def _declarations(outline):
+    return [(len(parents), d.kind, d.name) for d, parents in outline.walk()]
+
+
+def _snapshot(outline):
+    return [(len(p), dataclasses.replace(d, children=[])) for d, p in outline.walk()], outline.errors
+
+
+def test_outline_sees_through_strings_comments_and_directives():
+    outline = CSharpOutline(SOURCE)
+    assert outline.errors == 0
+    assert _declarations(outline) == [
+        (0, "namespace", "Game.Core"),
+        (1, "class", "Mover"),
+        (2, "field", "speed"),
+        (2, "field", "map"),
+        (2, "property", "Count"),
+        (2, "property", "Label"),
+        (2, "field", "path"),
+        (2, "field", "brace"),
+        (2, "constructor", "Mover"),
+        (2, "method", "Update"),
+        (2, "method", "Get"),
+        (2, "method", "Move"),
+        (2, "method", "Move"),
+        (2, "indexer", "this"),
+        (2, "class", "Inner"),
+        (3, "method", "Hidden"),
+    ]
+    mover, = outline.find_types("Mover", "Game.Core")
+    assert outline.find_types("Mover", "Other") == []
+    get, = outline.find_members(mover, "Get")
+    assert (get.return_type, get.parameters) == ("T", "int index")
+    assert [m.parameters for m in outline.find_members(mover, "Move")] == ["Vector3 delta", "float x"]
+    assert len(outline.find_members(mover, "Move", parameters="(float x)")) == 1
+
+
+def test_spans_follow_the_structured_editor():
+    outline = CSharpOutline(SOURCE)
+    mover, = outline.find_types("Mover")
+    update, = outline.find_members(mover, "Update", attributes_contains="ContextMenu")
+    # From the start of the attribute line to the closing brace
+    span = SOURCE[update.start:update.end]
+    assert span.startswith('        [ContextMenu("Go")]\n        void Update()')
+    assert span.endswith("Debug.Log(s);\n            }\n        }")
+    assert outline.line_col(update.header_start) == (20, 9)
+
+    count = next(d for d in mover.children if d.name == "Count")
+    assert SOURCE[count.start:count.end].strip() == "public int Count { get; private set; } = 3;"
+    get, = outline.find_members(mover, "Get")
+    assert SOURCE[get.start:get.end].endswith("where T : class => null;")
+    assert SOURCE[mover.body_end] == "}" and SOURCE[mover.end - 1] == "}"
+
+
+def test_incremental_updates_match_a_full_parse():
+    fragments = ["{", "}", '"', "/*", "*/", "//", "\n", "'", "", "[Attr]", "=> 1;",
+                 "void X() { }\n", "public int P { get; set; }\n", "class C { }",
+                 '$@"{"}"}"', "#if A\n", "#else\n", "#endif\n", "\n#if B\nint q;\n#endif\n"]
+    rng = random.Random(21)
+    for text, rounds in ((SOURCE, 250), (generate_script(300), 40)):
+        for _ in range(rounds):
+            outline = CSharpOutline(text)
+            for _ in range(4):
+                start = rng.randrange(len(outline.text) + 1)
+                end = min(len(outline.text), start + rng.choice([0, 0, 1, 5, 40]))
+                outline = outline.apply_edit(start, end, rng.choice(fragments))
+                assert _snapshot(outline) == _snapshot(CSharpOutline(outline.text))
+
+
+def test_brace_index_sees_the_braces_the_lexer_sees():
+    fragments = ["{", "}", '"', "/*", "*/", "//", "\n", "'", "@", "$", "#", "\\", "class ",
+                 '$@"{"}"}"', '@"', "#if A\n", "#else\n", "#endif\n"]
+    rng = random.Random(23)
+    for text in (SOURCE, generate_script(200)):
+        for _ in range(60):
+            for _ in range(4):
+                at = rng.randrange(len(text) + 1)
+                text = text[:at] + rng.choice(fragments) + text[at:]
+            index = BraceIndex(text)
+            assert index.offsets == [start for kind, start, _ in lex(text)[0] if kind in ("{", "}")]
+
+
+def test_member_edits_reparse_only_the_member(monkeypatch):
+    import csharp_outline
+
+    text = generate_script(2000)
+    outline = CSharpOutline(text)
+    cls = outline.find_types("Generated1")[0]
+    method, = outline.find_members(cls, "Step7")
+    monkeypatch.setattr(csharp_outline, "_parse", lambda text: pytest.fail("full parse"))
+    edited = outline.apply_edit(method.start, method.end, "        void Step7() => Debug.Log(\"#if\");\n")
+    moved, = edited.find_members(edited.find_types("Generated2")[0], "Step39")
+    before, = outline.find_members(outline.find_types("Generated2")[0], "Step39")
+    assert moved.start == before.start + len(edited.text) - len(text)
+    assert edited.text[moved.start:moved.end] == text[before.start:before.end]
+
+
+def test_outline_cache_is_keyed_by_contents():
+    cache = OutlineCache(capacity=2)
+    first = cache.outline(SOURCE)
+    assert cache.outline(SOURCE, hashlib.sha256(SOURCE.encode()).hexdigest()) is first
+    cache.outline("class A { }")
+    cache.outline("class B { }")
+    assert cache.outline(SOURCE) is not first
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 4}
+
+
+@pytest.fixture()
+def bridged(monkeypatch):
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+
+
+def _script_handler(contents: str):
+    def handler(command):
+        params = command["params"]
+        if params.get("action") == "read":
+            return {"status": "success", "result": {"success": True, "data": {"contents": contents}}}
+        return {"status": "success", "result": {"success": True, "data": {"echo": params}}}
+    return handler
+
+
+def test_method_edits_are_sent_as_one_precise_text_edit(monkeypatch, tmp_path, bridged):
+    import tools.script_apply_edits as script_apply_edits
+
+    with StandInBridge(_script_handler(SOURCE), multiplex=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        resp = script_apply_edits.script_apply_edits(
+            DummyContext(), name="Mover", path="Assets/Scripts", edits=[
+                {"op": "replace_method", "methodName": "Update",
+                 "replacement": "        void Update() { Debug.Log(\"{\"); }"},
+                {"op": "insert_method", "position": "after", "afterMethodName": "Update",
+                 "replacement": "        void Start() { }"},
+                {"op": "delete_method", "methodName": "Move", "parametersSignature": "(float x)"},
+            ], options={"applyMode": "sequential"})
+    assert resp["success"], resp
+    assert resp["data"]["routing"] == "structured/local"
+    actions = [c["params"]["action"] for c in bridge.commands if c["type"] == "manage_script"]
+    assert actions == ["read", "apply_text_edits"]
+    params = bridge.commands[-1]["params"]
+    assert params["precondition_sha256"] == hashlib.sha256(SOURCE.encode()).hexdigest()
+    assert params["options"]["refresh"] == "immediate"
+    edit, = params["edits"]
+    assert edit["startLine"] == 19 and edit["endLine"] == 34
+
+    result = script_apply_edits._apply_edits_locally(SOURCE, [{
+        "op": "replace_range", "text": edit["newText"],
+        **{k: edit[k] for k in ("startLine", "startCol", "endLine", "endCol")}}])
+    outline = CSharpOutline(result)
+    mover, = outline.find_types("Mover")
+    assert [d.name for d in mover.children if d.kind == "method"] == ["Update", "Start", "Get", "Move"]
+    assert 'void Update() { Debug.Log("{"); }\n\n        void Start() { }\n' in result
+
+
+def test_unresolved_method_edits_go_to_the_structured_editor(monkeypatch, tmp_path, bridged):
+    import tools.script_apply_edits as script_apply_edits
+
+    with StandInBridge(_script_handler(SOURCE), multiplex=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        # Two overloads match, and an unbalanced replacement would not parse
+        for edit in ({"op": "delete_method", "methodName": "Move"},
+                     {"op": "replace_method", "methodName": "Update", "replacement": "void Update() {"}):
+            resp = script_apply_edits.script_apply_edits(
+                DummyContext(), name="Mover", path="Assets/Scripts", edits=[edit])
+            assert resp["data"]["routing"] == "structured"
+    actions = [c["params"]["action"] for c in bridge.commands if c["type"] == "manage_script"]
+    assert actions == ["read", "edit", "read", "edit"]
+
+
+def test_method_edits_unity_would_apply_differently_go_to_the_structured_editor(monkeypatch, tmp_path, bridged):
+    import tools.script_apply_edits as script_apply_edits
+
+    before = {"op": "insert_method", "position": "before", "beforeMethodName": "Update",
+              "replacement": "        void Start() { }"}
+    batch = [{"op": "replace_method", "methodName": "Update", "replacement": "        void Update() { }"},
+             {"op": "delete_method", "methodName": "Get"}]
+    with StandInBridge(_script_handler(SOURCE), multiplex=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        # Unity has no "before" insert, and resolves atomic batches (the default) against the original
+        for edits, options in (([before], None), (batch, None), (batch, {"applyMode": "atomic"})):
+            resp = script_apply_edits.script_apply_edits(
+                DummyContext(), name="Mover", path="Assets/Scripts", edits=edits, options=options)
+            assert resp["data"]["routing"] == "structured"
+    edits = [c["params"] for c in bridge.commands
+             if c["type"] == "manage_script" and c["params"]["action"] != "read"]
+    assert [p["action"] for p in edits] == ["edit"] * 3
+    assert edits[2]["options"]["applyMode"] == "atomic"
@@ -127,6 +127,51 @@ public class TestClass : MonoBehaviour
         5, f"method inserted too early (idx={idx}, total_lines={total_lines})"
 
 
+def test_class_end_inside_a_namespace():
+    """The class's closing brace wins over the namespace's, even though it is indented."""
+
+    code = '''namespace Game
+{
+    public class Spawner : MonoBehaviour
+    {
+        string open = "{";
+
+        T Make<T>() where T : class
+        {
+            return null;
+        }
+    }
+}
+// }
+'''
+    match = script_apply_edits_module._find_best_anchor_match(
+        r"^\s*}\s*$", code, re.MULTILINE, prefer_last=True)
+    assert match is not None
+    assert code[:match.end()].count("\n") == 10
+
+
+def test_brace_index_ignores_strings_comments_and_inactive_branches():
+    from csharp_outline import BraceIndex
+
+    code = '''class A
+{
+    /* } */ string s = $"{1}}}";
+#if X
+    void F() {
+#else
+    void F() { var g = @"}";
+#endif
+    }
+    record struct R(int X) { }
+}
+'''
+    index = BraceIndex(code)
+    assert [code[o] for o in index.offsets] == ["{", "{", "}", "{", "}", "}"]
+    assert index.depths == [0, 1, 1, 1, 1, 0]
+    assert index.type_bodies == [True, False, False, True, True, True]
+    assert index.first_closing(0, code.index("#if")) is None
+
+
 if __name__ == "__main__":
     print("Testing improved anchor matching...")
     print("="*60)
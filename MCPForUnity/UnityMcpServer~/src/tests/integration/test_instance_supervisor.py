@@ -0,0 +1,128 @@
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import status_index
+import unity_connection
+from config import config
+from instance_supervisor import InstanceSupervisor
+from models import UnityInstanceInfo
+from port_discovery import PortDiscovery
+from status_index import StatusIndex
+
+from .stand_in_bridge import StandInBridge, use_bridge
+
+
+@pytest.fixture()
+def supervised(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+    supervisor = InstanceSupervisor()
+    yield supervisor
+    supervisor.stop()
+
+
+def _sweep(supervisor):
+    unity_connection._transport.run(supervisor.sweep())
+    return supervisor.get_health()
+
+
+def _write_status(tmp_path, port, seq, reloading=False, project_hash="abc123"):
+    directory = tmp_path / ".unity-mcp"
+    directory.mkdir(exist_ok=True)
+    (directory / f"unity-mcp-status-{project_hash}.json").write_text(json.dumps({
+        "unity_port": port, "reloading": reloading, "reason": "reloading" if reloading else "ready",
+        "seq": seq, "last_heartbeat": datetime.now(timezone.utc).isoformat()}))
+
+
+def test_sweep_warms_every_instance_so_first_calls_skip_the_handshake(monkeypatch, tmp_path, supervised):
+    with StandInBridge() as first, StandInBridge() as second:
+        use_bridge(monkeypatch, tmp_path, first)
+        instances = [
+            UnityInstanceInfo(id=f"Proj{i}@hash{i}", name=f"Proj{i}", path=f"/Proj{i}/Assets",
+                              hash=f"hash{i}", port=bridge.port, status="running")
+            for i, bridge in enumerate((first, second))
+        ]
+        monkeypatch.setattr(PortDiscovery, "discover_all_unity_instances", staticmethod(lambda: instances))
+        _write_status(tmp_path, first.port, seq=7, project_hash="hash0")
+
+        health = _sweep(supervised)
+        assert health["Proj0@hash0"]["state"] == health["Proj1@hash1"]["state"] == "ready"
+        assert health["Proj0@hash0"]["heartbeat_seq"] == 7
+        assert health["Proj1@hash1"]["latency_ms"] > 0
+        assert first.connections == second.connections == 1
+
+        # Switching to the second instance reuses the warm socket, with no health-check ping
+        pings = second.pings
+        result = unity_connection.send_command_with_retry("manage_scene", {"n": 1}, instance_id="Proj1@hash1")
+        assert result["params"] == {"n": 1}
+        assert second.connections == 1 and second.pings == pings
+
+
+def test_reconnects_as_soon_as_a_reload_ends(monkeypatch, tmp_path, supervised):
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        _write_status(tmp_path, bridge.port, seq=40)
+        assert _sweep(supervised)[instance_id]["state"] == "ready"
+
+        # Domain reload: the bridge drops its clients and says so in its status file
+        _write_status(tmp_path, bridge.port, seq=41, reloading=True)
+        bridge.drop_clients()
+        health = _sweep(supervised)[instance_id]
+        assert health["state"] == "reloading" and health["reloads"] == 1
+        assert bridge.connections == 1
+
+        # Back up with a fresh heartbeat counter: the supervisor reconnects before any caller
+        _write_status(tmp_path, bridge.port, seq=1)
+        health = _sweep(supervised)[instance_id]
+        assert health["state"] == "ready" and health["reloads"] == 1
+        assert bridge.connections == 2
+        result = unity_connection.send_command_with_retry("manage_scene", {"n": 2}, instance_id=instance_id)
+        assert result["params"] == {"n": 2}
+        assert bridge.connections == 2
+
+
+def test_missed_reload_is_counted_from_the_heartbeat_sequence(monkeypatch, tmp_path, supervised):
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        _write_status(tmp_path, bridge.port, seq=90)
+        _sweep(supervised)
+        _write_status(tmp_path, bridge.port, seq=3)
+        assert _sweep(supervised)[instance_id]["reloads"] == 1
+
+
+def test_vanished_instances_are_reaped(monkeypatch, tmp_path, supervised):
+    monkeypatch.setattr(config, "supervisor_reap_after", 0.2)
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        _sweep(supervised)
+        assert instance_id in unity_connection.get_unity_connection_pool().get_metrics()
+
+        monkeypatch.setattr(PortDiscovery, "discover_all_unity_instances", staticmethod(lambda: []))
+        assert _sweep(supervised)[instance_id]["state"] == "missing"
+        time.sleep(0.25)
+        assert _sweep(supervised) == {}
+        assert instance_id not in unity_connection.get_unity_connection_pool().get_metrics()
+
+
+def test_background_task_sweeps_until_stopped(monkeypatch, tmp_path, supervised):
+    monkeypatch.setattr(config, "supervisor_interval", 0.05)
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        supervised.start()
+        snapshot = supervised.first_sweep.result(timeout=5)
+        assert snapshot["instances"][instance_id]["state"] == "ready"
+        time.sleep(0.3)
+        supervised.stop()
+        assert not supervised.running
+        assert supervised.snapshot()["sweeps"] >= 3
+
+
+def test_stopping_an_idle_supervisor_leaves_the_transport_loop_alone(monkeypatch):
+    transport = unity_connection._TransportLoop()
+    monkeypatch.setattr(unity_connection, "_transport", transport)
+    InstanceSupervisor().stop()
+    assert transport._thread is None
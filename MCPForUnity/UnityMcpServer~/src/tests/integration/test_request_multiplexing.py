@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+
+import unity_connection
+from config import config
+
+from .stand_in_bridge import StandInBridge, send, use_bridge
+
+
+def _slow_run_tests(command):
+    return 0.5 if command.get("type") == "run_tests" else 0.0
+
+
+@pytest.mark.asyncio
+async def test_slow_command_does_not_block_fast_one(monkeypatch, tmp_path):
+    with StandInBridge(delay=_slow_run_tests, multiplex=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        slow = asyncio.ensure_future(send(instance_id, "run_tests"))
+        await asyncio.sleep(0.05)
+
+        started = time.monotonic()
+        fast = await send(instance_id, "get_editor_state")
+        assert fast["type"] == "get_editor_state"
+        assert time.monotonic() - started < 0.3
+        assert not slow.done()
+
+        assert (await slow)["type"] == "run_tests"
+        assert bridge.connections == 1
+        assert bridge.tagged_frames == 2
+
+
+@pytest.mark.asyncio
+async def test_responses_complete_out_of_order(monkeypatch, tmp_path):
+    delays = {0: 0.3, 1: 0.2, 2: 0.1, 3: 0.0}
+    with StandInBridge(delay=lambda c: delays[c["params"]["n"]], multiplex=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        finished = []
+
+        async def call(n):
+            result = await send(instance_id, "manage_gameobject", {"n": n})
+            finished.append(result["params"]["n"])
+
+        await asyncio.gather(*(call(n) for n in delays))
+        assert finished == [3, 2, 1, 0]
+        assert bridge.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_request_leaves_socket_usable(monkeypatch, tmp_path):
+    with StandInBridge(delay=_slow_run_tests, multiplex=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        slow = asyncio.ensure_future(send(instance_id, "run_tests"))
+        await asyncio.sleep(0.05)
+        slow.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await slow
+
+        # The late run_tests answer is discarded and the socket keeps serving
+        assert (await send(instance_id, "get_editor_state"))["type"] == "get_editor_state"
+        await asyncio.sleep(0.6)
+        assert (await send(instance_id, "get_selection"))["type"] == "get_selection"
+        assert bridge.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_old_bridge_keeps_lock_step(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "pool_max_connections", 1)
+    with StandInBridge(delay=0.1) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        started = time.monotonic()
+        results = await asyncio.gather(*(send(instance_id, "manage_scene", {"n": n}) for n in range(3)))
+        assert [r["params"]["n"] for r in results] == [0, 1, 2]
+        assert time.monotonic() - started >= 0.3
+        assert bridge.tagged_frames == 0
+        conn = await unity_connection._transport.run_async(
+            unity_connection.get_unity_connection_pool().async_get_connection(instance_id))
+        assert conn.use_framing and not conn.multiplexed
+
+
+@pytest.mark.asyncio
+async def test_multiplexing_can_be_disabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "enable_multiplexing", False)
+    with StandInBridge(multiplex=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        assert (await send(instance_id, "manage_scene"))["type"] == "manage_scene"
+        assert bridge.tagged_frames == 0
@@ -0,0 +1,136 @@
+import gzip
+import json
+
+import pytest
+
+import retry_policy
+import status_index
+import unity_connection
+from benchmarks.replay_capture import replay
+from config import config
+from retry_policy import RetryPolicy, RetryPolicyRegistry
+from status_index import StatusIndex
+
+from .stand_in_bridge import StandInBridge, echo_handler, use_bridge
+
+
+@pytest.fixture()
+def capture(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+    path = tmp_path / "session.cap"
+    unity_connection.start_capture(str(path))
+    yield path
+    unity_connection.stop_capture()
+
+
+def _handler(command):
+    params = command["params"]
+    if params.get("action") == "read":
+        return {"status": "success", "result": {"contents": b"// script\n" * 100}}
+    if params.get("action") == "fail":
+        return {"status": "error", "error": "no such object"}
+    return echo_handler(command)
+
+
+def _delay(command):
+    return 0.15 if command["params"].get("slow") else 0.0
+
+
+def _record_session(monkeypatch, tmp_path):
+    with StandInBridge(_handler, delay=_delay, multiplex=True, attachments=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        send = unity_connection.send_command_with_retry
+        send("manage_scene", {"action": "get_hierarchy", "n": 1}, instance_id=instance_id)
+        send("manage_gameobject", {"action": "create", "slow": True}, instance_id=instance_id)
+        send("manage_script", {"action": "read", "name": "Player"}, instance_id=instance_id)
+        with pytest.raises(Exception, match="no such object"):
+            send("manage_gameobject", {"action": "fail"}, instance_id=instance_id)
+    return unity_connection.stop_capture()
+
+
+def test_capture_records_every_round_trip_with_timings(monkeypatch, tmp_path, capture):
+    stats = _record_session(monkeypatch, tmp_path)
+    assert stats["path"] == str(capture) and stats["dropped"] == 0
+
+    exchanges = [e for e in unity_connection.read_capture(str(capture)) if e.command_type != "ping"]
+    assert stats["records"] >= len(exchanges)
+    for exchange in exchanges:
+        assert exchange.instance_id == "StandIn@abc123"
+        assert exchange.started >= 0 and exchange.error is None
+
+    create = next(e for e in exchanges if b'"create"' in e.request)
+    assert create.command_type == "manage_gameobject"
+    assert b"idempotencyKey" in create.request
+    assert create.elapsed >= 0.15
+    assert b'"status":"success"' in create.response.replace(b" ", b"")
+
+    read = next(e for e in exchanges if b'"read"' in e.request)
+    assert read.attachments == [b"// script\n" * 100]
+    assert b"$attachment" in read.response
+    # Unity-reported errors are recorded as responses like any other
+    assert any(b"no such object" in e.response for e in exchanges)
+
+
+def test_failed_round_trips_are_recorded_with_their_error(monkeypatch, tmp_path, capture):
+    monkeypatch.setattr(config, "connection_timeout", 0.2)
+    monkeypatch.setattr(config, "max_retries", 0)
+    with StandInBridge(delay=1.0, multiplex=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        registry = RetryPolicyRegistry()
+        registry.register("slow_command", RetryPolicy(idempotent=True, attempts=0))
+        monkeypatch.setattr(retry_policy, "_retry_policies", registry)
+        with pytest.raises(Exception):
+            unity_connection.send_command_with_retry("slow_command", {"n": 1}, instance_id=instance_id)
+    unity_connection.stop_capture()
+    failed = [e for e in unity_connection.read_capture(str(capture)) if e.command_type == "slow_command"]
+    assert failed and failed[0].response is None and failed[0].error
+
+
+def test_replay_serves_the_session_at_recorded_or_accelerated_pacing(monkeypatch, tmp_path, capture):
+    _record_session(monkeypatch, tmp_path)
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+
+    summary = replay(str(capture), speed=1.0)
+    assert summary["misses"] == summary["failures"] == summary["skipped"] == 0
+    assert summary["replayed"] == summary["recorded"]
+    assert summary["commands"]["manage_gameobject"]["max_ms"] >= 150
+    assert summary["commands"]["manage_script"]["calls"] == 1
+
+    fast = replay(str(capture), speed=0)
+    assert fast["misses"] == 0 and fast["replayed"] == summary["replayed"]
+    assert fast["commands"]["manage_gameobject"]["max_ms"] < 150
+
+
+def test_read_capture_rejects_other_files(tmp_path):
+    path = tmp_path / "not-a-capture.gz"
+    with gzip.open(path, "wb") as f:
+        f.write(b"something else entirely")
+    with pytest.raises(ValueError, match="not a Unity MCP traffic capture"):
+        list(unity_connection.read_capture(str(path)))
+
+
+def test_spilled_responses_are_streamed_into_the_capture(monkeypatch, tmp_path, capture):
+    monkeypatch.setattr(config, "response_spill_bytes", 64 * 1024)
+    spilled = []
+    original = unity_connection.TrafficCapture._copy_spill
+
+    def copy_spill(self, spill):
+        spilled.append(spill.size)
+        return original(self, spill)
+
+    monkeypatch.setattr(unity_connection.TrafficCapture, "_copy_spill", copy_spill)
+    items = [{"name": f"GameObject{i}", "id": i} for i in range(20000)]
+    with StandInBridge(lambda command: {"status": "success", "result": {"hierarchy": items}},
+                       multiplex=True, chunk_size=16 * 1024) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = unity_connection.send_command_with_retry(
+            "manage_scene", {"action": "get_hierarchy"}, instance_id=instance_id)
+    assert result == {"hierarchy": items}
+    stats = unity_connection.stop_capture()
+    assert stats["dropped"] == 0
+
+    exchange, = [e for e in unity_connection.read_capture(str(capture)) if e.command_type == "manage_scene"]
+    assert spilled == [len(exchange.response)] and spilled[0] > 64 * 1024
+    assert json.loads(exchange.response)["result"] == {"hierarchy": items}
@@ -0,0 +1,69 @@
+import json
+import socket
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+import status_index
+import unity_connection
+from config import config
+from status_index import StatusIndex
+
+from .stand_in_bridge import StandInBridge, use_bridge
+
+pytestmark = pytest.mark.skipif(
+    not hasattr(socket, "AF_UNIX") or sys.platform == "win32",
+    reason="Unix domain sockets are only used on Linux and macOS")
+
+
+@pytest.fixture()
+def uds_home(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+    directory = tmp_path / ".unity-mcp"
+    directory.mkdir()
+    return directory
+
+
+def _advertise(directory, port, path):
+    (directory / "unity-mcp-status-abc123.json").write_text(json.dumps({
+        "unity_port": port, "reloading": False, "unix_socket": str(path),
+        "last_heartbeat": datetime.now(timezone.utc).isoformat()}))
+
+
+def _send(instance_id, n):
+    return unity_connection.send_command_with_retry("manage_scene", {"n": n}, instance_id=instance_id)
+
+
+def test_advertised_unix_socket_is_preferred(monkeypatch, tmp_path, uds_home):
+    path = uds_home / "abc123.sock"
+    with StandInBridge(unix_socket=str(path)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        _advertise(uds_home, bridge.port, path)
+        assert _send(instance_id, 1)["params"] == {"n": 1}
+        assert bridge.unix_connections == bridge.connections == 1
+        assert unity_connection.get_unity_connection_pool().get_metrics()[instance_id]["transport"] == "unix"
+
+
+def test_missing_unix_socket_falls_back_to_tcp(monkeypatch, tmp_path, uds_home):
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        # Left behind by an editor that exited without cleaning up
+        stale = uds_home / "stale.sock"
+        stale.write_text("")
+        _advertise(uds_home, bridge.port, stale)
+        assert _send(instance_id, 2)["params"] == {"n": 2}
+        assert bridge.connections == 1 and bridge.unix_connections == 0
+        assert unity_connection.get_unity_connection_pool().get_metrics()[instance_id]["transport"] == "tcp"
+
+
+def test_unix_socket_can_be_turned_off(monkeypatch, tmp_path, uds_home):
+    monkeypatch.setattr(config, "prefer_unix_socket", False)
+    path = uds_home / "abc123.sock"
+    with StandInBridge(unix_socket=str(path)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        _advertise(uds_home, bridge.port, path)
+        assert _send(instance_id, 3)["params"] == {"n": 3}
+        assert bridge.unix_connections == 0
@@ -2,6 +2,7 @@ import json
 from typing import Annotated, Any, Literal
 
 from fastmcp import Context
+import json_codec
 from registry import mcp_for_unity_tool
 from tools import get_unity_instance_from_context, send_with_unity_instance
 from unity_connection import send_command_with_retry
@@ -154,7 +155,7 @@ def manage_gameobject(
     # Coerce 'component_properties' from JSON string to dict for client compatibility
     if isinstance(component_properties, str):
         try:
-            component_properties = json.loads(component_properties)
+            component_properties = json_codec.loads(component_properties)
             ctx.info("manage_gameobject: coerced component_properties from JSON string to dict")
         except json.JSONDecodeError as e:
             return {"success": False, "message": f"Invalid JSON in component_properties: {e}"}
@@ -164,7 +165,7 @@ def manage_gameobject(
 
     if isinstance(binding_value, str):
         try:
-            binding_value = json.loads(binding_value)
+            binding_value = json_codec.loads(binding_value)
             ctx.info("manage_gameobject: coerced binding_value from JSON string")
         except json.JSONDecodeError:
             pass
@@ -5,7 +5,9 @@ from urllib.parse import urlparse, unquote
 
 from fastmcp import FastMCP, Context
 
+import json_codec
 from registry import mcp_for_unity_tool
+from script_cache import apply_text_spans, get_script_cache
 from tools import get_unity_instance_from_context, send_with_unity_instance
 import unity_connection
 
@@ -103,28 +105,37 @@ def apply_text_edits(
 
     normalized_edits: list[dict[str, Any]] = []
     warnings: list[str] = []
+    cache = get_script_cache()
+    located = cache.locate(unity_instance, name, directory)
     if _needs_normalization(edits):
         # Read file to support index->line/col conversion when needed
-        read_resp = send_with_unity_instance(
-            unity_connection.send_command_with_retry,
-            unity_instance,
-            "manage_script",
-            {
-                "action": "read",
-                "name": name,
-                "path": directory,
-            },
-        )
-        if not (isinstance(read_resp, dict) and read_resp.get("success")):
-            return read_resp if isinstance(read_resp, dict) else {"success": False, "message": str(read_resp)}
-        data = read_resp.get("data", {})
-        contents = data.get("contents")
-        if not contents and data.get("contentsEncoded"):
-            try:
-                contents = base64.b64decode(data.get("encodedContents", "").encode(
-                    "utf-8")).decode("utf-8", "replace")
-            except Exception:
-                contents = contents or ""
+        entry = cache.load(*located) if located else None
+        if entry is not None:
+            contents = entry.text
+        else:
+            before = cache.stat(*located) if located else None
+            read_resp = send_with_unity_instance(
+                unity_connection.send_command_with_retry,
+                unity_instance,
+                "manage_script",
+                {
+                    "action": "read",
+                    "name": name,
+                    "path": directory,
+                },
+            )
+            if not (isinstance(read_resp, dict) and read_resp.get("success")):
+                return read_resp if isinstance(read_resp, dict) else {"success": False, "message": str(read_resp)}
+            data = read_resp.get("data", {})
+            contents = unity_connection.attachment_text(data.get("contents"))
+            if not contents and data.get("contentsEncoded"):
+                try:
+                    contents = base64.b64decode(data.get("encodedContents", "").encode(
+                        "utf-8")).decode("utf-8", "replace")
+                except Exception:
+                    contents = contents or ""
+            if located and contents is not None:
+                cache.remember(*located, contents, before)
 
         # Helper to map 0-based character index to 1-based line/col
         def line_col_from_index(idx: int) -> tuple[int, int]:
@@ -311,12 +322,24 @@ def apply_text_edits(
         "options": opts,
     }
     params = {k: v for k, v in params.items() if v is not None}
+    # The text the edits apply to, when it is cached and is what the precondition names
+    base = cache.get(*located) if located and precondition_sha256 else None
+    if base is not None and base.sha256 != precondition_sha256.lower():
+        base = None
     resp = send_with_unity_instance(
         unity_connection.send_command_with_retry,
         unity_instance,
         "manage_script",
         params,
     )
+    if located:
+        # Keep the edited text if Unity reports the same SHA-256 for what it wrote
+        if isinstance(resp, dict) and resp.get("success") and base is not None:
+            data = resp.get("data")
+            cache.update(*located, apply_text_spans(base.text, normalized_edits),
+                         data.get("sha256") if isinstance(data, dict) else None)
+        else:
+            cache.invalidate(*located)
     if isinstance(resp, dict):
         data = resp.setdefault("data", {})
         data.setdefault("normalizedEdits", normalized_edits)
@@ -327,7 +350,6 @@ def apply_text_edits(
             try:
                 import threading
                 import time
-                import json
                 import glob
                 import os
 
@@ -337,8 +359,8 @@ def apply_text_edits(
                             "~/.unity-mcp/unity-mcp-status-*.json")), key=os.path.getmtime, reverse=True)
                         if not files:
                             return None
-                        with open(files[0], "r") as f:
-                            return json.loads(f.read())
+                        with open(files[0], "rb") as f:
+                            return json_codec.loads(f.read())
                     except Exception:
                         return None
 
@@ -485,6 +507,21 @@ def manage_script(
     unity_instance = get_unity_instance_from_context(ctx)
     ctx.info(f"Processing manage_script: {action} (unity_instance={unity_instance or 'default'})")
     try:
+        cache = get_script_cache()
+        located = cache.locate(unity_instance, name, path)
+        before = None
+        if located and action == 'read':
+            entry = cache.load(*located)
+            if entry is not None:
+                return {
+                    "success": True,
+                    "message": f"Script '{name}.cs' read successfully.",
+                    "data": entry.read_data(),
+                }
+            before = cache.stat(*located)
+        elif located:
+            cache.invalidate(*located)
+
         # Prepare parameters for Unity
         params = {
             "action": action,
@@ -514,12 +551,18 @@ def manage_script(
 
         if isinstance(response, dict):
             if response.get("success"):
+                data = response.get("data") or {}
+                if isinstance(data, dict) and "contents" in data:
+                    # Sent as a binary attachment when the bridge supports it
+                    data["contents"] = unity_connection.attachment_text(data["contents"])
                 if response.get("data", {}).get("contentsEncoded"):
                     decoded_contents = base64.b64decode(
                         response["data"]["encodedContents"]).decode('utf-8')
                     response["data"]["contents"] = decoded_contents
                     del response["data"]["encodedContents"]
                     del response["data"]["contentsEncoded"]
+                if located and action == 'read' and isinstance(data, dict) and isinstance(data.get("contents"), str):
+                    cache.remember(*located, data["contents"], before)
 
                 return {
                     "success": True,
@@ -578,6 +621,11 @@ def get_sha(
     ctx.info(f"Processing get_sha: {uri} (unity_instance={unity_instance or 'default'})")
     try:
         name, directory = _split_uri(uri)
+        cache = get_script_cache()
+        located = cache.locate(unity_instance, name, directory)
+        entry = cache.load(*located) if located else None
+        if entry is not None:
+            return {"success": True, "data": {"sha256": entry.sha256, "lengthBytes": entry.length_bytes}}
         params = {"action": "get_sha", "name": name, "path": directory}
         resp = send_with_unity_instance(
             unity_connection.send_command_with_retry,
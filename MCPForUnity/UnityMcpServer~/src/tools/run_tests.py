@@ -69,9 +69,13 @@ async def run_tests(
 
     params: dict[str, Any] = {"mode": mode}
     ts = _coerce_int(timeout_seconds)
+    deadline = None
     if ts is not None:
         params["timeoutSeconds"] = ts
+        # Leave Unity a moment to report a run that hit its own timeout
+        deadline = ts + 10
 
-    response = await async_send_with_unity_instance(async_send_command_with_retry, unity_instance, "run_tests", params)
+    response = await async_send_with_unity_instance(
+        async_send_command_with_retry, unity_instance, "run_tests", params, timeout=deadline)
     await ctx.info(f'Response {response}')
     return RunTestsResponse(**response) if isinstance(response, dict) else response
@@ -1,17 +1,169 @@
 import base64
+import bisect
 import hashlib
+import itertools
 import re
 from typing import Annotated, Any
 
 from fastmcp import Context
 
+from csharp_outline import BraceIndex, CSharpOutline, get_outline_cache
 from registry import mcp_for_unity_tool
+from script_cache import ScriptEntry, apply_text_spans, get_script_cache
 from tools import get_unity_instance_from_context, send_with_unity_instance
-from unity_connection import send_command_with_retry
+from unity_connection import attachment_text, send_command_with_retry
+
+
+# Characters str.splitlines() breaks on; replace_range counts lines the same way
+_LINE_BREAK_CHARS = frozenset("\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029")
+
+
+class _EditBuffer:
+    """
+    Piece table over a script being edited by _apply_edits_locally.
+
+    The text is a list of (source, start, end) slices of the original and of
+    inserted strings, with each piece's length and line-break count kept in
+    parallel lists. A range edit splices the lists instead of copying the
+    text, and line/column positions are mapped through per-source line-break
+    indexes in O(log n), so a batch of range edits builds the string once,
+    at the end. Anchor and regex edits need the whole text to search and
+    materialize it first.
+    """
+
+    def __init__(self, text: str):
+        # Line-break end positions by source string, built on first lookup
+        self._break_ends: dict[int, tuple[str, list[int]]] = {}
+        self.set_text(text)
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = "".join([source[a:b] for source, a, b in self._pieces])
+        return self._text
+
+    def set_text(self, text: str) -> None:
+        self._pieces = [(text, 0, len(text))] if text else []
+        self._sizes = [len(text)] if text else []
+        # None until a line lookup needs the count
+        self._counts: list[int | None] = [None] if text else []
+        self._text: str | None = text
+        self._length = len(text)
+        self._offsets: list[int] | None = None
+        self._breaks: list[int] | None = None
+
+    def last_char(self) -> str:
+        if not self._pieces:
+            return ""
+        source, _, b = self._pieces[-1]
+        return source[b - 1]
+
+    def splice(self, start: int, end: int, text: str) -> None:
+        """Replace with text[:start] + text + text[end:], slicing semantics included."""
+        start = min(max(start, 0), self._length)
+        end = min(max(end, 0), self._length)
+        if start > end:
+            # Repeats the text between them; rare enough to do on the string
+            whole = self.text
+            self.set_text(whole[:start] + text + whole[end:])
+            return
+        lo, head, _ = self._split(start)
+        hi, _, tail = self._split(end)
+        pieces = [piece for piece in (head, (text, 0, len(text)), tail) if piece and piece[2] > piece[1]]
+        self._replace(lo, min(hi + 1, len(self._pieces)), pieces)
+        # A \r and \n meeting at a new seam are one line break: give them a piece of their own
+        for k in range(lo + len(pieces), lo - 1, -1):
+            self._mend_seam(k)
+        self._length = start + len(text) + self._length - end
+        self._text = None
+
+    def line_count(self) -> int:
+        """len(text.splitlines())"""
+        breaks = self._cumulative_breaks()[-1]
+        return breaks + (1 if self._length and self.last_char() not in _LINE_BREAK_CHARS else 0)
+
+    def line_start(self, line: int) -> int:
+        """Offset of the start of a 1-based line (line_count() + 1 is the end)."""
+        if line <= 1:
+            return 0
+        breaks = self._cumulative_breaks()
+        i = bisect.bisect_left(breaks, line - 1) - 1
+        if i >= len(self._pieces):
+            return self._length
+        source, a, b = self._pieces[i]
+        nth = line - 2 - breaks[i]
+        if nth == self._counts[i] - 1 and self._split_crlf(source, b):
+            end = b
+        else:
+            ends = self._ends(source)
+            end = ends[bisect.bisect_right(ends, a) + nth]
+        return self._piece_offsets()[i] + end - a
+
+    def _split(self, offset: int) -> tuple[int, tuple[str, int, int] | None, tuple[str, int, int] | None]:
+        """Index of the piece holding offset, and that piece's parts before and after it."""
+        if offset >= self._length:
+            return len(self._pieces), None, None
+        offsets = self._piece_offsets()
+        i = bisect.bisect_right(offsets, offset) - 1
+        source, a, b = self._pieces[i]
+        at = a + offset - offsets[i]
+        return i, (source, a, at), (source, at, b)
+
+    def _replace(self, lo: int, hi: int, pieces: list[tuple[str, int, int]]) -> None:
+        self._pieces[lo:hi] = pieces
+        self._sizes[lo:hi] = [b - a for _, a, b in pieces]
+        self._counts[lo:hi] = [None] * len(pieces)
+        self._offsets = self._breaks = None
+
+    def _mend_seam(self, k: int) -> None:
+        if 0 < k < len(self._pieces):
+            l_source, l_a, l_b = self._pieces[k - 1]
+            r_source, r_a, r_b = self._pieces[k]
+            if l_source[l_b - 1] == "\r" and r_source[r_a] == "\n":
+                pieces = [(l_source, l_a, l_b - 1), ("\r\n", 0, 2), (r_source, r_a + 1, r_b)]
+                self._replace(k - 1, k + 1, [piece for piece in pieces if piece[2] > piece[1]])
+
+    @staticmethod
+    def _split_crlf(source: str, b: int) -> bool:
+        """Whether a piece ending at b was cut between \r and \n (and so ends with a break)."""
+        return source[b - 1] == "\r" and source.startswith("\n", b)
+
+    def _ends(self, source: str) -> list[int]:
+        cached = self._break_ends.get(id(source))
+        if cached is None or cached[0] is not source:
+            ends = list(itertools.accumulate(map(len, source.splitlines(keepends=True))))
+            if ends and source[-1] not in _LINE_BREAK_CHARS:
+                ends.pop()
+            cached = self._break_ends[id(source)] = (source, ends)
+        return cached[1]
+
+    def _piece_offsets(self) -> list[int]:
+        if self._offsets is None:
+            self._offsets = list(itertools.accumulate(self._sizes, initial=0))
+        return self._offsets
+
+    def _cumulative_breaks(self) -> list[int]:
+        if self._breaks is None:
+            counts = self._counts
+            k = 0
+            while True:
+                try:
+                    k = counts.index(None, k)
+                except ValueError:
+                    break
+                source, a, b = self._pieces[k]
+                ends = self._ends(source)
+                counts[k] = (bisect.bisect_right(ends, b) - bisect.bisect_right(ends, a)
+                             + self._split_crlf(source, b))
+            self._breaks = list(itertools.accumulate(counts, initial=0))
+        return self._breaks
 
 
 def _apply_edits_locally(original_text: str, edits: list[dict[str, Any]]) -> str:
-    text = original_text
+    buffer = _EditBuffer(original_text)
     for edit in edits or []:
         op = (
             (edit.get("op")
@@ -31,15 +183,14 @@ def _apply_edits_locally(original_text: str, edits: list[dict[str, Any]]) -> str
 
         if op == "prepend":
             prepend_text = edit.get("text", "")
-            text = (prepend_text if prepend_text.endswith(
-                "\n") else prepend_text + "\n") + text
+            buffer.splice(0, 0, prepend_text if prepend_text.endswith("\n") else prepend_text + "\n")
         elif op == "append":
             append_text = edit.get("text", "")
-            if not text.endswith("\n"):
-                text += "\n"
-            text += append_text
-            if not text.endswith("\n"):
-                text += "\n"
+            if buffer.last_char() != "\n":
+                buffer.splice(len(buffer), len(buffer), "\n")
+            buffer.splice(len(buffer), len(buffer), append_text)
+            if buffer.last_char() != "\n":
+                buffer.splice(len(buffer), len(buffer), "\n")
         elif op == "anchor_insert":
             anchor = edit.get("anchor", "")
             position = (edit.get("position") or "before").lower()
@@ -49,32 +200,30 @@ def _apply_edits_locally(original_text: str, edits: list[dict[str, Any]]) -> str
 
             # Find the best match using improved heuristics
             match = _find_best_anchor_match(
-                anchor, text, flags, bool(edit.get("prefer_last", True)))
+                anchor, buffer.text, flags, bool(edit.get("prefer_last", True)))
             if not match:
                 if edit.get("allow_noop", True):
                     continue
                 raise RuntimeError(f"anchor not found: {anchor}")
             idx = match.start() if position == "before" else match.end()
-            text = text[:idx] + insert_text + text[idx:]
+            buffer.splice(idx, idx, insert_text)
         elif op == "replace_range":
             start_line = int(edit.get("startLine", 1))
             start_col = int(edit.get("startCol", 1))
             end_line = int(edit.get("endLine", start_line))
             end_col = int(edit.get("endCol", 1))
             replacement = edit.get("text", "")
-            lines = text.splitlines(keepends=True)
-            max_line = len(lines) + 1  # 1-based, exclusive end
+            line_count = buffer.line_count()
+            max_line = line_count + 1  # 1-based, exclusive end
             if (start_line < 1 or end_line < start_line or end_line > max_line
                     or start_col < 1 or end_col < 1):
                 raise RuntimeError("replace_range out of bounds")
 
             def index_of(line: int, col: int) -> int:
-                if line <= len(lines):
-                    return sum(len(l) for l in lines[: line - 1]) + (col - 1)
-                return sum(len(l) for l in lines)
-            a = index_of(start_line, start_col)
-            b = index_of(end_line, end_col)
-            text = text[:a] + replacement + text[b:]
+                if line <= line_count:
+                    return buffer.line_start(line) + (col - 1)
+                return len(buffer)
+            buffer.splice(index_of(start_line, start_col), index_of(end_line, end_col), replacement)
         elif op == "regex_replace":
             pattern = edit.get("pattern", "")
             repl = edit.get("replacement", "")
@@ -84,12 +233,27 @@ def _apply_edits_locally(original_text: str, edits: list[dict[str, Any]]) -> str
             flags = re.MULTILINE
             if edit.get("ignore_case"):
                 flags |= re.IGNORECASE
-            text = re.sub(pattern, repl_py, text, count=count, flags=flags)
+            buffer.set_text(re.sub(pattern, repl_py, buffer.text, count=count, flags=flags))
         else:
             allowed = "anchor_insert, prepend, append, replace_range, regex_replace"
             raise RuntimeError(
                 f"unknown edit op: {op}; allowed: {allowed}. Use 'op' (aliases accepted: type/mode/operation).")
-    return text
+    return buffer.text
+
+
+def _contents_sha256(contents: str, raw: Any = None) -> str:
+    """SHA-256 of a script as Unity computes it (UTF-8 without BOM).
+
+    raw is the attachment the contents were decoded from, if any; its bytes are
+    hashed in place when they are the contents' UTF-8 encoding (no byte order mark,
+    nothing replaced while decoding). Cached scripts carry their hash.
+    """
+    if isinstance(raw, ScriptEntry):
+        return raw.sha256
+    if (isinstance(raw, memoryview) and raw[:2] not in (b"\xef\xbb", b"\xff\xfe", b"\xfe\xff", b"\x00\x00")
+            and "\ufffd" not in contents):
+        return hashlib.sha256(raw).hexdigest()
+    return hashlib.sha256(contents.encode("utf-8")).hexdigest()
 
 
 def _find_best_anchor_match(pattern: str, text: str, flags: int, prefer_last: bool = True):
@@ -97,11 +261,11 @@ def _find_best_anchor_match(pattern: str, text: str, flags: int, prefer_last: bo
     Find the best anchor match using improved heuristics.
 
     For patterns like \\s*}\\s*$ that are meant to find class-ending braces,
-    this function uses heuristics to choose the most semantically appropriate match:
+    this function uses the code's structure to choose the most semantically appropriate match:
 
     1. If prefer_last=True, prefer the last match (common for class-end insertions)
-    2. Use indentation levels to distinguish class vs method braces
-    3. Consider context to avoid matches inside strings/comments
+    2. Use brace depth to distinguish class vs method braces
+    3. Skip braces inside strings/comments
 
     Args:
         pattern: Regex pattern to search for
@@ -136,14 +300,15 @@ def _find_best_anchor_match(pattern: str, text: str, flags: int, prefer_last: bo
 
 def _find_best_closing_brace_match(matches, text: str):
     """
-    Find the best closing brace match using C# structure heuristics.
+    Find the best closing brace match using C# structure.
 
-    Enhanced heuristics for scope-aware matching:
-    1. Prefer matches with lower indentation (likely class-level)
-    2. Prefer matches closer to end of file  
-    3. Avoid matches that seem to be inside method bodies
-    4. For #endregion patterns, ensure class-level context
-    5. Validate insertion point is at appropriate scope
+    One lexer pass over the text (csharp_outline.BraceIndex) records every
+    code brace with its depth and whether it closes a type body; each match
+    is then ranked by lookup, preferring in order:
+    1. Matches on a brace that closes a class, struct, interface or record
+    2. Other matches on a code brace
+    3. Matches whose braces are all in comments or strings
+    and within each group the outermost brace, then the last match.
 
     Args:
         matches: List of regex match objects
@@ -155,53 +320,163 @@ def _find_best_closing_brace_match(matches, text: str):
     if not matches:
         return None
 
-    scored_matches = []
-    lines = text.splitlines()
+    index = BraceIndex(text)
 
-    for match in matches:
-        score = 0
-        start_pos = match.start()
+    def rank(match):
+        brace = index.first_closing(match.start(), match.end())
+        if brace is None:
+            return 0, 0, match.start()
+        return 1 + index.type_bodies[brace], -index.depths[brace], match.start()
 
-        # Find which line this match is on
-        lines_before = text[:start_pos].count('\n')
-        line_num = lines_before
+    return max(matches, key=rank)
 
-        if line_num < len(lines):
-            line_content = lines[line_num]
 
-            # Calculate indentation level (lower is better for class braces)
-            indentation = len(line_content) - len(line_content.lstrip())
+METHOD_OPS = {"replace_method", "insert_method", "delete_method"}
+_METHOD_KINDS = ("method", "constructor")
 
-            # Prefer lower indentation (class braces are typically less indented than method braces)
-            # Max 20 points for indentation=0
-            score += max(0, 20 - indentation)
 
-            # Prefer matches closer to end of file (class closing braces are typically at the end)
-            distance_from_end = len(lines) - line_num
-            # More points for being closer to end
-            score += max(0, 10 - distance_from_end)
+def _extract_replacement(edit: dict[str, Any]) -> str | None:
+    """The replacement text of a structured edit, as ManageScript reads it."""
+    if edit.get("replacement"):
+        return edit["replacement"]
+    if edit.get("replacementBase64"):
+        try:
+            return base64.b64decode(edit["replacementBase64"]).decode("utf-8")
+        except Exception:
+            return None
+    return None
 
-            # Look at surrounding context to avoid method braces
-            context_start = max(0, line_num - 3)
-            context_end = min(len(lines), line_num + 2)
-            context_lines = lines[context_start:context_end]
 
-            # Penalize if this looks like it's inside a method (has method-like patterns above)
-            for context_line in context_lines:
-                if re.search(r'\b(void|public|private|protected)\s+\w+\s*\(', context_line):
-                    score -= 5  # Penalty for being near method signatures
+def _normalize_newlines(text: str) -> str:
+    return text.replace("\r\n", "\n").replace("\r", "\n")
 
-            # Bonus if this looks like a class-ending brace (very minimal indentation and near EOF)
-            if indentation <= 4 and distance_from_end <= 3:
-                score += 15  # Bonus for likely class-ending brace
 
-        scored_matches.append((score, match))
+def _compute_method_edits(outline: CSharpOutline, edits: list[dict[str, Any]]) -> tuple[CSharpOutline, int, int] | None:
+    """
+    Apply replace_method/insert_method/delete_method edits to the outlined text
+    one after another, with the spans and spacing ManageScript's structured
+    editor uses.
+
+    Returns the edited outline and how many leading and trailing characters
+    are unchanged, or None when a class or method does not resolve to exactly
+    one declaration here, an insert asks for a position other than start, end
+    or after, or an edit leaves the class without the expected members;
+    Unity's structured editor then handles the batch.
+    """
+    if outline.errors:
+        return None
+    prefix = suffix = len(outline.text)
+    for e in edits:
+        op = e.get("op")
+        types = outline.find_types(e.get("className") or "", e.get("namespace"))
+        if len(types) != 1:
+            return None
+        cls = types[0]
+        expected = len(cls.children)
+        if op == "insert_method":
+            snippet = _extract_replacement(e)
+            if not snippet or not snippet.strip():
+                return None
+            text = _normalize_newlines("\n\n" + snippet.rstrip() + "\n")
+            position = (e.get("position") or "end").lower()
+            if position == "after":
+                anchors = outline.find_members(
+                    cls, e.get("afterMethodName") or "", e.get("afterReturnType"),
+                    e.get("afterParametersSignature"), e.get("afterAttributesContains"),
+                    kinds=_METHOD_KINDS)
+                if len(anchors) != 1:
+                    return None
+                start = anchors[0].end
+            elif position == "start":
+                start = cls.body_start + 1
+            elif position == "end":
+                start = cls.body_end
+            else:
+                # ManageScript has no "before"; leave other positions to it
+                return None
+            end = start
+            expected += 1
+        else:
+            methods = outline.find_members(
+                cls, e.get("methodName") or "", e.get("returnType"), e.get("parametersSignature"),
+                e.get("attributesContains"), kinds=_METHOD_KINDS)
+            if len(methods) != 1:
+                return None
+            start, end = methods[0].start, methods[0].end
+            if op == "replace_method":
+                replacement = _extract_replacement(e)
+                if replacement is None:
+                    return None
+                text = _normalize_newlines(replacement)
+            else:
+                text = ""
+                expected -= 1
+        edited = outline.apply_edit(start, end, text)
+        types = edited.find_types(e.get("className") or "", e.get("namespace"))
+        if edited.errors or len(types) != 1 or len(types[0].children) != expected:
+            return None
+        prefix = min(prefix, start)
+        suffix = min(suffix, len(outline.text) - end)
+        outline = edited
+    return outline, prefix, suffix
+
+
+def _read_script(unity_instance: str | None, name: str, path: str, namespace: str | None,
+                 script_type: str) -> tuple[Any, str | None, Any]:
+    """Read a script: (response, decoded contents or None, raw contents).
+
+    Served from the script cache or straight from disk when the project root is known,
+    through Unity otherwise.
+    """
+    cache = get_script_cache()
+    located = cache.locate(unity_instance, name, path)
+    before = None
+    if located is not None:
+        entry = cache.load(*located)
+        if entry is not None:
+            return {"success": True, "data": entry.read_data()}, entry.text, entry
+        before = cache.stat(*located)
 
-    # Return the match with the highest score
-    scored_matches.sort(key=lambda x: x[0], reverse=True)
-    best_match = scored_matches[0][1]
+    read_resp = send_command_with_retry("manage_script", {
+        "action": "read",
+        "name": name,
+        "path": path,
+        "namespace": namespace,
+        "scriptType": script_type,
+    }, instance_id=unity_instance)
+    if not isinstance(read_resp, dict) or not read_resp.get("success"):
+        return read_resp, None, None
 
-    return best_match
+    data = read_resp.get("data") or read_resp.get(
+        "result", {}).get("data") or {}
+    raw_contents = data.get("contents")
+    contents = attachment_text(raw_contents)
+    if contents is None and data.get("contentsEncoded") and data.get("encodedContents"):
+        contents = base64.b64decode(
+            data["encodedContents"]).decode("utf-8")
+    if located is not None and contents is not None:
+        cache.remember(*located, contents, before)
+    return read_resp, contents, raw_contents
+
+
+def _track_write(unity_instance: str | None, name: str, path: str, resp: Any, new_text: str | None = None,
+                 spans: tuple[str, list[dict[str, Any]]] | None = None) -> None:
+    """Keep the script cache in step with a write.
+
+    The new text is new_text, or the (text, apply_text_edits spans) that were sent
+    applied to it; it is stored when Unity reports its SHA-256, else the entry is dropped.
+    """
+    cache = get_script_cache()
+    located = cache.locate(unity_instance, name, path)
+    if located is None:
+        return
+    if isinstance(resp, dict) and resp.get("success") and (new_text is not None or spans is not None):
+        if new_text is None:
+            new_text = apply_text_spans(*spans)
+        data = resp.get("data") or {}
+        cache.update(*located, new_text, data.get("sha256") if isinstance(data, dict) else None)
+    else:
+        cache.invalidate(*located)
 
 
 def _infer_class_name(script_name: str) -> str:
@@ -573,6 +848,65 @@ def script_apply_edits(
     all_text = ops_set.issubset(TEXT)
     mixed = not (all_struct or all_text)
 
+    # Method-level batches are resolved here against a cached outline of the script and sent as one
+    # precise text edit; anything the outline cannot resolve goes to Unity's structured editor below.
+    if ops_set and ops_set <= METHOD_OPS:
+        read_resp, contents, raw_contents = _read_script(unity_instance, name, path, namespace, script_type)
+        if contents is not None:
+            outline_cache = get_outline_cache()
+            original = outline_cache.outline(contents, _contents_sha256(contents, raw_contents))
+            # Unity applies batches atomically unless told otherwise, resolving every edit against
+            # the original text; only single edits and sequential batches match the local pass.
+            sequential = len(edits) == 1 or str((options or {}).get("applyMode") or "").lower() == "sequential"
+            local = _compute_method_edits(original, edits) if sequential else None
+            if local is not None:
+                edited, prefix, suffix = local
+                if edited.text == contents:
+                    return _with_norm({
+                        "success": True,
+                        "message": "No-op: contents unchanged",
+                        "data": {"no_op": True, "evidence": {"reason": "identical_content"}}
+                    }, normalized_for_echo, routing="structured/local")
+                if (options or {}).get("preview"):
+                    import difflib
+                    diff = list(difflib.unified_diff(
+                        contents.splitlines(), edited.text.splitlines(), fromfile="before", tofile="after", n=3))
+                    if len(diff) > 2000:
+                        diff = diff[:2000] + ["... (diff truncated) ..."]
+                    return {"success": True, "message": "Preview only (no write)", "data": {"diff": "\n".join(diff), "normalizedEdits": normalized_for_echo}}
+                start_line, start_col = original.line_col(prefix)
+                end_line, end_col = original.line_col(len(contents) - suffix)
+                params_local: dict[str, Any] = {
+                    "action": "apply_text_edits",
+                    "name": name,
+                    "path": path,
+                    "namespace": namespace,
+                    "scriptType": script_type,
+                    "edits": [{
+                        "startLine": start_line,
+                        "startCol": start_col,
+                        "endLine": end_line,
+                        "endCol": end_col,
+                        "newText": edited.text[prefix:len(edited.text) - suffix],
+                    }],
+                    "precondition_sha256": original.sha,
+                    "options": {
+                        # Same immediate refresh default as the structured editor
+                        "refresh": (options or {}).get("refresh", "immediate"),
+                        "validate": (options or {}).get("validate", "standard"),
+                    },
+                }
+                resp_local = send_with_unity_instance(
+                    send_command_with_retry,
+                    unity_instance,
+                    "manage_script",
+                    params_local,
+                )
+                if isinstance(resp_local, dict) and resp_local.get("success"):
+                    outline_cache.put(edited)
+                _track_write(unity_instance, name, path, resp_local, edited.text)
+                return _with_norm(resp_local if isinstance(resp_local, dict) else {"success": False, "message": str(resp_local)}, normalized_for_echo, routing="structured/local")
+
     # If everything is structured (method/class/anchor ops), forward directly to Unity's structured editor.
     if all_struct:
         opts2 = dict(options or {})
@@ -595,25 +929,13 @@ def script_apply_edits(
         )
         if isinstance(resp_struct, dict) and resp_struct.get("success"):
             pass  # Optional sentinel reload removed (deprecated)
+        _track_write(unity_instance, name, path, resp_struct)
         return _with_norm(resp_struct if isinstance(resp_struct, dict) else {"success": False, "message": str(resp_struct)}, normalized_for_echo, routing="structured")
 
     # 1) read from Unity
-    read_resp = send_command_with_retry("manage_script", {
-        "action": "read",
-        "name": name,
-        "path": path,
-        "namespace": namespace,
-        "scriptType": script_type,
-    }, instance_id=unity_instance)
+    read_resp, contents, raw_contents = _read_script(unity_instance, name, path, namespace, script_type)
     if not isinstance(read_resp, dict) or not read_resp.get("success"):
         return read_resp if isinstance(read_resp, dict) else {"success": False, "message": str(read_resp)}
-
-    data = read_resp.get("data") or read_resp.get(
-        "result", {}).get("data") or {}
-    contents = data.get("contents")
-    if contents is None and data.get("contentsEncoded") and data.get("encodedContents"):
-        contents = base64.b64decode(
-            data["encodedContents"]).decode("utf-8")
     if contents is None:
         return {"success": False, "message": "No contents returned from Unity read."}
 
@@ -715,7 +1037,7 @@ def script_apply_edits(
                 else:
                     return _with_norm(_err("unknown_op", f"Unsupported text edit op: {opx}", normalized=normalized_for_echo, routing="mixed/text-first"), normalized_for_echo, routing="mixed/text-first")
 
-            sha = hashlib.sha256(base_text.encode("utf-8")).hexdigest()
+            sha = _contents_sha256(base_text, raw_contents)
             if at_edits:
                 params_text: dict[str, Any] = {
                     "action": "apply_text_edits",
@@ -733,6 +1055,7 @@ def script_apply_edits(
                     "manage_script",
                     params_text,
                 )
+                _track_write(unity_instance, name, path, resp_text, spans=(base_text, at_edits))
                 if not (isinstance(resp_text, dict) and resp_text.get("success")):
                     return _with_norm(resp_text if isinstance(resp_text, dict) else {"success": False, "message": str(resp_text)}, normalized_for_echo, routing="mixed/text-first")
                 # Optional sentinel reload removed (deprecated)
@@ -760,6 +1083,7 @@ def script_apply_edits(
             )
             if isinstance(resp_struct, dict) and resp_struct.get("success"):
                 pass  # Optional sentinel reload removed (deprecated)
+            _track_write(unity_instance, name, path, resp_struct)
             return _with_norm(resp_struct if isinstance(resp_struct, dict) else {"success": False, "message": str(resp_struct)}, normalized_for_echo, routing="mixed/text-first")
 
         return _with_norm({"success": True, "message": "Applied text edits (no structured ops)"}, normalized_for_echo, routing="mixed/text-first")
@@ -870,7 +1194,7 @@ def script_apply_edits(
             if not at_edits:
                 return _with_norm({"success": False, "code": "no_spans", "message": "No applicable text edit spans computed (anchor not found or zero-length)."}, normalized_for_echo, routing="text")
 
-            sha = hashlib.sha256(base_text.encode("utf-8")).hexdigest()
+            sha = _contents_sha256(base_text, raw_contents)
             params: dict[str, Any] = {
                 "action": "apply_text_edits",
                 "name": name,
@@ -893,6 +1217,7 @@ def script_apply_edits(
             )
             if isinstance(resp, dict) and resp.get("success"):
                 pass  # Optional sentinel reload removed (deprecated)
+            _track_write(unity_instance, name, path, resp, spans=(base_text, at_edits))
             return _with_norm(
                 resp if isinstance(resp, dict) else {
                     "success": False, "message": str(resp)},
@@ -952,7 +1277,7 @@ def script_apply_edits(
     # Compute the SHA of the current file contents for the precondition
     old_lines = contents.splitlines(keepends=True)
     end_line = len(old_lines) + 1  # 1-based exclusive end
-    sha = hashlib.sha256(contents.encode("utf-8")).hexdigest()
+    sha = _contents_sha256(contents, raw_contents)
 
     # Apply a whole-file text edit rather than the deprecated 'update' action
     params = {
@@ -982,6 +1307,7 @@ def script_apply_edits(
     )
     if isinstance(write_resp, dict) and write_resp.get("success"):
         pass  # Optional sentinel reload removed (deprecated)
+    _track_write(unity_instance, name, path, write_resp, new_contents)
     return _with_norm(
         write_resp if isinstance(write_resp, dict)
         else {"success": False, "message": str(write_resp)},
@@ -1,21 +1,49 @@
 from config import config
+import asyncio
+import codecs
+from collections import deque
+import concurrent.futures
 import contextlib
-from dataclasses import dataclass
+import contextvars
+from dataclasses import dataclass, field
 import errno
+import gzip
 import json
+import json_codec
 import logging
+import mmap
 import os
-from pathlib import Path
 from port_discovery import PortDiscovery
+from retry_policy import get_retry_policies
+from status_index import get_status_index
+import queue
 import random
+import re
 import socket
 import struct
+import sys
+import tempfile
 import threading
 import time
-from typing import Any, Dict, Optional, List
+import uuid
+from typing import Any, AsyncIterator, Callable, Coroutine, Dict, Iterator, Optional, List, TypeVar
+import zlib
 
 from models import MCPResponse, UnityInstanceInfo
 
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None  # type: ignore
+    HAS_ZSTD = False
+
+try:
+    import anyio.from_thread
+    HAS_ANYIO = True
+except ImportError:
+    anyio = None  # type: ignore
+    HAS_ANYIO = False
 
 # Configure logging using settings from config
 logging.basicConfig(
@@ -30,384 +58,2720 @@ _connection_lock = threading.Lock()
 # Maximum allowed framed payload size (64 MiB)
 FRAMED_MAX = 64 * 1024 * 1024
 
+# Extended (request-id tagged) frames: the payload starts with a marker byte,
+# a flags byte and a big-endian uint32 request id. Bridges advertise support
+# with REQID=1 in the handshake; untagged frames keep lock-step semantics.
+EXT_FRAME_MARKER = 0x01
+_EXT_HEADER = struct.Struct('>BBI')
+_FRAME_HEADER = struct.Struct('>Q')
+
+# Tagged frame flags. A request sets ACCEPT_CHUNKS when the bridge advertised
+# CHUNKED=1; the bridge may then split a large response into several frames
+# with the same request id, every one but the last marked MORE.
+_EXT_FLAG_MORE = 0x01
+_EXT_FLAG_ACCEPT_CHUNKS = 0x02
+# Compression (negotiated via COMPRESS=<codec,...>): bits 2-3 name the codec
+# a frame's body is compressed with, bits 4-5 the codecs a request accepts
+# for its response
+_EXT_CODEC_MASK = 0x0C
+# Attachments (negotiated via ATTACH=1): a request sets ACCEPT_ATTACHMENTS, and
+# the bridge may then send raw bytes ahead of the response, one frame flagged
+# ATTACHMENT each, which the JSON refers to as {"$attachment": <index>}
+_EXT_FLAG_ACCEPT_ATTACHMENTS = 0x40
+_EXT_FLAG_ATTACHMENT = 0x80
+_ATTACHMENT_KEY = '$attachment'
+# Bridges may add a timing object to a response envelope (see CallTimingStats)
+_TIMING_KEY = 'timing'
+# Spilled responses are fed to the JSON decoder through mmap in windows this big
+_SPILL_WINDOW = 1024 * 1024
+
+# Receive buffers: every socket reads into a fixed scratch buffer; frames that
+# do not fit get a dedicated buffer, pooled per power-of-two size up to 4 MiB
+_SCRATCH_SIZE = 256 * 1024
+_POOLED_BUFFER_MAX = 4 * 1024 * 1024
+_POOLED_BUFFERS_PER_SIZE = 2
+
+# Python 3.12+ sends transport.writelines() parts with one sendmsg(); older
+# versions join them first, so large payloads are written without joining
+_WRITELINES_SENDMSG = sys.version_info >= (3, 12)
+_JOIN_MAX = 64 * 1024
+
+T = TypeVar("T")
+
+
+# -----------------------------
+# Transport event loop
+# -----------------------------
+
+class _TransportLoop:
+    """Background event loop that owns every Unity socket.
+
+    All framed I/O runs as coroutines on this single loop, so a pending Unity
+    call costs one suspended task instead of one blocked thread. Synchronous
+    callers hand their coroutine over and wait on a future; async callers on
+    another loop await the same future without blocking anything.
+    """
+
+    def __init__(self):
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        """Return the transport loop, starting its thread on first use."""
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            return loop
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def _run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                thread = threading.Thread(
+                    target=_run, name="unity-transport", daemon=True)
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+                logger.debug("Started Unity transport event loop")
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Run a coroutine on the transport loop and block until it finishes.
+
+        On an AnyIO worker thread (a sync tool run by the MCP server) the wait
+        notices when the request is cancelled and cancels the transport-side
+        task, so the socket is freed instead of the thread staying blocked.
+        """
+        loop = self.get_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            coro.close()
+            raise RuntimeError(
+                "Blocking Unity call issued from the transport loop; use the async API instead")
+        try:
+            poll = _CANCEL_POLL_INTERVAL if _in_anyio_worker() else None
+        except BaseException:
+            # Cancelled before anything was sent
+            coro.close()
+            raise
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            while not concurrent.futures.wait([future], poll).done:
+                anyio.from_thread.check_cancelled()
+        except BaseException:
+            future.cancel()
+            raise
+        return future.result()
+
+    async def run_async(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Await a coroutine on the transport loop from any event loop.
+
+        Cancelling the awaiting task cancels the transport-side task as well.
+        """
+        loop = self.get_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def _in_anyio_worker() -> bool:
+    if not HAS_ANYIO:
+        return False
+    try:
+        anyio.from_thread.check_cancelled()
+        return True
+    except RuntimeError:
+        return False
+
+
+_transport = _TransportLoop()
+
+
+def get_transport_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop that owns all Unity connections."""
+    return _transport.get_loop()
+
+
+# -----------------------------
+# Status file helpers
+# -----------------------------
+
+def _read_status_file(target_hash: str | None = None) -> dict | None:
+    """Return the newest Unity status, preferring the one for target_hash.
+
+    Served from the in-process status index, so this is a dict lookup rather
+    than a directory scan.
+    """
+    try:
+        index = get_status_index()
+        entry = index.get(target_hash) if target_hash else None
+        if entry is None:
+            # Fallback: return most recent regardless of hash
+            entry = index.latest(include_stale=True)
+        return entry.data if entry is not None else None
+    except Exception:
+        return None
+
+
+def _parse_handshake(text: str) -> Dict[str, str]:
+    """Parse the bridge greeting (e.g. 'WELCOME UNITY-MCP 1 FRAMING=1 REQID=1') into capabilities."""
+    capabilities: Dict[str, str] = {}
+    for token in text.split():
+        key, sep, value = token.partition('=')
+        if sep:
+            capabilities[key.upper()] = value
+    return capabilities
+
+
+def hash_from_instance_id(instance_id: str | None) -> str | None:
+    """Extract the hash suffix from an instance id (e.g., Project@hash)."""
+    if instance_id and '@' in instance_id:
+        maybe_hash = instance_id.split('@', 1)[1].strip()
+        if maybe_hash:
+            return maybe_hash
+    return None
+
+
+def _legacy_response_complete(data: bytes) -> bool:
+    """Return True once an unframed (legacy) response holds a complete JSON document."""
+    decoded_data = data.decode('utf-8')
+
+    # Special case for ping-pong
+    if decoded_data.strip().startswith('{"status":"success","result":{"message":"pong"'):
+        logger.debug("Received ping response")
+        return True
+
+    # Handle escaped quotes in the content
+    if '"content":' in decoded_data:
+        # Find the content field and its value
+        content_start = decoded_data.find('"content":') + 9
+        content_end = decoded_data.rfind('"', content_start)
+        if content_end > content_start:
+            # Replace escaped quotes in content with regular quotes
+            content = decoded_data[content_start:content_end]
+            content = content.replace('\\"', '"')
+            decoded_data = decoded_data[:content_start] + \
+                content + decoded_data[content_end:]
+
+    try:
+        json_codec.loads(decoded_data)
+    except json.JSONDecodeError:
+        # We haven't received a complete valid JSON response yet
+        return False
+    return True
+
+
+class UnityCommandError(Exception):
+    """Unity received the command and answered with an error."""
+
+
+def _is_fast_error(e: BaseException) -> bool:
+    """Transient socket failures that deserve a quick retry."""
+    if isinstance(e, (ConnectionRefusedError, ConnectionResetError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    err_no = getattr(e, 'errno', None)
+    return err_no in (errno.ECONNREFUSED, errno.ECONNRESET, errno.ETIMEDOUT)
+
+
+# -----------------------------
+# Call deadlines
+# -----------------------------
+
+# Absolute time.monotonic() deadline of the Unity call in progress, if any.
+# run_coroutine_threadsafe() copies the caller's context, so a deadline set in
+# a tool's thread reaches the transport task.
+_call_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "unity_call_deadline", default=None)
+
+# Blocking callers on AnyIO worker threads check for cancellation this often
+_CANCEL_POLL_INTERVAL = 0.1
+
+
+class DeadlineExceeded(TimeoutError):
+    """The call's deadline (see call_deadline()) passed before Unity answered."""
+
+
+@contextlib.contextmanager
+def call_deadline(timeout: float | None):
+    """Bound every Unity call made inside the block to `timeout` seconds in total.
+
+    The deadline covers retries, reload waits, reconnects and socket reads.
+    Nested deadlines can only tighten it; None leaves it as it is.
+    """
+    if timeout is None:
+        yield
+        return
+    deadline = time.monotonic() + max(0.0, float(timeout))
+    current = _call_deadline.get()
+    token = _call_deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _call_deadline.reset(token)
+
+
+def _time_left(cap: float | None = None) -> float | None:
+    """Seconds until the call deadline, at most cap (None: no limit).
+
+    Raises DeadlineExceeded once the deadline has passed.
+    """
+    deadline = _call_deadline.get()
+    if deadline is None:
+        return cap
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise DeadlineExceeded("Unity call exceeded its deadline")
+    return left if cap is None else min(cap, left)
+
+
+async def _wait_live(aw: Coroutine[Any, Any, T], idle: float | None) -> T:
+    """Await aw for up to idle seconds, but never past the call deadline."""
+    try:
+        left = _time_left(idle)
+    except DeadlineExceeded:
+        aw.close()
+        raise
+    try:
+        return await asyncio.wait_for(aw, left)
+    except asyncio.TimeoutError as e:
+        if idle is None or left < idle:
+            raise DeadlineExceeded("Unity call exceeded its deadline") from e
+        raise TimeoutError("Timeout receiving Unity response") from e
+
+
+# -----------------------------
+# Shared reconnects
+# -----------------------------
+
+class _SingleFlight:
+    """Coalesces concurrent calls per key: one leader runs, the rest share its result.
+
+    A finished result is handed to later callers for `cooldown` seconds. The
+    work runs as its own task, so a leader that gets cancelled does not take
+    the followers down with it.
+
+    Must only be used from the transport loop (see get_transport_loop()).
+    """
+
+    def __init__(self):
+        self._calls: Dict[Any, asyncio.Future] = {}
+        self._results: Dict[Any, tuple] = {}
+        self.stats: Dict[str, int] = {"leaders": 0, "followers": 0, "cached": 0}
+
+    async def run(self, key: Any, fn: Callable[[], Coroutine[Any, Any, T]], cooldown: float) -> T:
+        finished = self._results.get(key)
+        if finished is not None and time.monotonic() - finished[0] < cooldown:
+            self.stats["cached"] += 1
+            return finished[1]
+        future = self._calls.get(key)
+        if future is None or future.get_loop() is not asyncio.get_running_loop():
+            self.stats["leaders"] += 1
+            future = asyncio.ensure_future(fn())
+            self._calls[key] = future
+            future.add_done_callback(lambda f: self._done(key, f))
+        else:
+            self.stats["followers"] += 1
+        return await asyncio.shield(future)
+
+    def _done(self, key: Any, future: asyncio.Future) -> None:
+        if self._calls.get(key) is future:
+            del self._calls[key]
+        # Reading the exception also marks it retrieved when nobody is left waiting
+        if not future.cancelled() and future.exception() is None:
+            self._results[key] = (time.monotonic(), future.result())
+
+    def forget(self, key: Any) -> None:
+        self._results.pop(key, None)
+
+
+_single_flight = _SingleFlight()
+
+
+# -----------------------------
+# Zero-copy receive path
+# -----------------------------
+
+class _BufferPool:
+    """Free list of receive buffers for frames larger than the scratch buffer.
+
+    Buffers come in power-of-two sizes and are handed back with release() once
+    the frame has been parsed. Only sizes up to _POOLED_BUFFER_MAX are kept, so
+    a rare 64 MiB frame does not pin its memory for the life of the process.
+    """
+
+    def __init__(self):
+        self._free: Dict[int, List[bytearray]] = {}
+
+    def acquire(self, size: int) -> bytearray:
+        if size > _POOLED_BUFFER_MAX:
+            return bytearray(size)
+        capacity = 1 << (size - 1).bit_length()
+        free = self._free.get(capacity)
+        return free.pop() if free else bytearray(capacity)
+
+    def release(self, frame: Any) -> None:
+        """Return the buffer behind a received frame; other frame types are ignored."""
+        if not isinstance(frame, memoryview):
+            return
+        buf = frame.obj
+        frame.release()
+        if not isinstance(buf, bytearray) or len(buf) > _POOLED_BUFFER_MAX:
+            return
+        free = self._free.setdefault(len(buf), [])
+        if len(free) < _POOLED_BUFFERS_PER_SIZE and all(b is not buf for b in free):
+            free.append(buf)
+
+
+_buffers = _BufferPool()
+
+
+def _load_frame(frame: Any) -> Any:
+    """Parse a JSON response frame and recycle its receive buffer.
+
+    Codecs that parse bytes in place read the buffer directly. Otherwise the
+    buffer is released as soon as it is decoded to text, so a large frame's
+    bytes are gone before the parsed result is allocated.
+    """
+    if isinstance(frame, _SpilledResponse):
+        return frame.load()
+    if json_codec.codec.decodes_buffers:
+        try:
+            return json_codec.loads(frame)
+        finally:
+            _buffers.release(frame)
+    try:
+        text = str(frame, 'utf-8')
+    finally:
+        _buffers.release(frame)
+    return json_codec.loads(text)
+
+
+class _FrameProtocol(asyncio.BufferedProtocol):
+    """Receive side of a Unity socket, built on recv_into().
+
+    Incoming bytes land in a preallocated scratch buffer and are split into the
+    handshake line, then length-prefixed frames (or raw chunks in legacy mode).
+    A frame too big for the scratch buffer gets its own buffer from _buffers and
+    the rest of its payload is received straight into it, so large responses
+    are never regrown or copied on the way in. Small frames are returned as
+    bytes, large ones as a memoryview over their buffer.
+    """
+
+    def __init__(self):
+        self.transport: asyncio.Transport | None = None
+        self._scratch = bytearray(_SCRATCH_SIZE)
+        self._start = 0
+        self._end = 0
+        self._mode = 'line'  # line -> hold -> framed | raw
+        self._frame: memoryview | None = None
+        self._filled = 0
+        self._items: deque = deque()
+        self._waiter: asyncio.Future | None = None
+        self._error: Exception | None = None
+        self._paused = False
+        self._drain_waiter: asyncio.Future | None = None
+        self._closed = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if self._error is None:
+            self._error = ConnectionError("Connection closed before reading expected bytes")
+        self._wake()
+        waiter, self._drain_waiter = self._drain_waiter, None
+        if waiter is not None and not waiter.done():
+            waiter.set_exception(ConnectionResetError("Connection lost"))
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def pause_writing(self) -> None:
+        self._paused = True
+
+    def resume_writing(self) -> None:
+        self._paused = False
+        waiter, self._drain_waiter = self._drain_waiter, None
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        if self._frame is not None:
+            return self._frame[self._filled:]
+        size = len(self._scratch)
+        if self._start == self._end:
+            self._start = self._end = 0
+        elif self._start and size - self._end < size // 4:
+            # Slide the unparsed tail to the front (same-size copy, no realloc)
+            pending = self._end - self._start
+            self._scratch[:pending] = self._scratch[self._start:self._end]
+            self._start, self._end = 0, pending
+        if self._end == size:
+            raise ValueError("Unity handshake line exceeds receive buffer")
+        return memoryview(self._scratch)[self._end:]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        if self._frame is not None:
+            self._filled += nbytes
+            if self._filled == len(self._frame):
+                frame, self._frame = self._frame, None
+                self._push(frame)
+            return
+        self._end += nbytes
+        self._parse()
+
+    def set_mode(self, mode: str) -> None:
+        """Switch from the handshake to 'framed' or 'raw' (legacy) parsing."""
+        self._mode = mode
+        self._parse()
+
+    def _copy(self, start: int, end: int) -> bytes:
+        with memoryview(self._scratch) as view:
+            return bytes(view[start:end])
+
+    def _parse(self) -> None:
+        if self._mode == 'line':
+            newline = self._scratch.find(b'\n', self._start, self._end)
+            if newline < 0:
+                return
+            self._push(self._copy(self._start, newline + 1))
+            self._start = newline + 1
+            # Hold anything after the greeting until the framing mode is known
+            self._mode = 'hold'
+        elif self._mode == 'raw':
+            if self._end > self._start:
+                self._push(self._copy(self._start, self._end))
+            self._start = self._end = 0
+        elif self._mode == 'framed':
+            self._parse_frames()
+
+    def _parse_frames(self) -> None:
+        while self._end - self._start >= 8:
+            length = _FRAME_HEADER.unpack_from(self._scratch, self._start)[0]
+            if length > FRAMED_MAX:
+                self._fail(ValueError(f"Invalid framed length: {length}"))
+                return
+            body = self._start + 8
+            if body + length <= self._end:
+                self._push(self._copy(body, body + length))
+                self._start = body + length
+                continue
+            if length > len(self._scratch) // 2:
+                # Large frame: move the bytes we already have into a buffer of
+                # the frame's size and receive the remainder directly into it
+                have = self._end - body
+                frame = memoryview(_buffers.acquire(length))[:length]
+                frame[:have] = self._scratch[body:self._end]
+                self._frame, self._filled = frame, have
+                self._start = self._end = 0
+            return
+
+    def _push(self, item: Any) -> None:
+        self._items.append(item)
+        self._wake()
+
+    def _wake(self) -> None:
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _fail(self, error: Exception) -> None:
+        self._error = error
+        self._wake()
+        if self.transport is not None:
+            self.transport.close()
+
+    async def read_item(self) -> Any:
+        """Return the next line, frame or raw chunk; raises once the socket is gone."""
+        while not self._items:
+            if self._error is not None:
+                raise self._error
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._items.popleft()
+
+    async def drain(self) -> None:
+        if self._error is not None or self.transport.is_closing():
+            raise ConnectionResetError("Connection lost")
+        if self._paused:
+            self._drain_waiter = asyncio.get_running_loop().create_future()
+            await self._drain_waiter
+
+    async def wait_closed(self) -> None:
+        await self._closed
+
+
+# -----------------------------
+# Incremental JSON decoding
+# -----------------------------
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_ELEMENT_SEPARATOR = re.compile(r'[ \t\n\r]*,[ \t\n\r]*')
+_MISSING = object()
+
+
+class IncrementalJSONDecoder:
+    """Decode a JSON document that arrives in pieces.
+
+    Objects and arrays fewer than item_depth levels deep form the skeleton,
+    which is walked token by token as text arrives. Every element of a skeleton
+    array is decoded on its own with json's C scanner as soon as it is complete
+    and returned from feed() as a (path, value) pair, e.g.
+    (('result', 'hierarchy', 0), {...}) for a bridge response envelope, so
+    callers can process, forward or stop on a large result before it has fully
+    arrived. After close(), document holds the whole value; with keep=False
+    skeleton arrays are left empty instead of retaining the elements already
+    handed out.
+    """
+
+    # Re-decoding an incomplete element waits until the buffered text has
+    # doubled, so one huge element costs amortized linear time
+    _MIN_RETRY_CHARS = 256
+
+    def __init__(self, item_depth: int = 3, keep: bool = True):
+        self.item_depth = item_depth
+        self.keep = keep
+        self._utf8 = codecs.getincrementaldecoder('utf-8')()
+        self._decoder = json.JSONDecoder()
+        self._text = ''
+        self._pieces: List[str] = []
+        self._pending_chars = 0
+        self._pos = 0
+        self._retry_at = 0
+        # Open skeleton containers: [container, path, state, key]
+        self._stack: List[list] = []
+        self._root: Any = _MISSING
+
+    @property
+    def done(self) -> bool:
+        return self._root is not _MISSING and not self._stack
+
+    def feed(self, data: Any) -> List[tuple]:
+        """Add the next piece of UTF-8 bytes; return newly completed array elements."""
+        piece = self._utf8.decode(data)
+        if piece:
+            self._pieces.append(piece)
+            self._pending_chars += len(piece)
+        if len(self._text) - self._pos + self._pending_chars < self._retry_at:
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> List[tuple]:
+        """Finish decoding and return the last elements; raises if the document is incomplete."""
+        piece = self._utf8.decode(b'', final=True)
+        if piece:
+            self._pieces.append(piece)
+        events = self._parse(final=True)
+        if not self.done:
+            raise json.JSONDecodeError("Incomplete JSON document", self._text, len(self._text))
+        if _WHITESPACE.match(self._text, self._pos).end() != len(self._text):
+            raise json.JSONDecodeError("Extra data", self._text, self._pos)
+        return events
+
+    @property
+    def document(self) -> Any:
+        """The decoded document (complete once close() has returned)."""
+        return None if self._root is _MISSING else self._root
+
+    def _join(self) -> str:
+        if self._pieces:
+            self._text = self._text[self._pos:] + ''.join(self._pieces)
+            self._pieces.clear()
+            self._pending_chars = 0
+            self._pos = 0
+        return self._text
+
+    def _decode_value(self, text: str, pos: int, final: bool) -> tuple:
+        """Decode the value at pos, or return (_MISSING, pos) if it is not complete yet."""
+        try:
+            value, end = self._decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            value, end = _MISSING, pos
+        else:
+            # A number running into the end of the buffer may continue in the next piece
+            if end == len(text) and not final and isinstance(value, (int, float)) and not isinstance(value, bool):
+                value, end = _MISSING, pos
+        if value is _MISSING:
+            buffered = len(text) - pos
+            self._retry_at = buffered + max(buffered, self._MIN_RETRY_CHARS)
+        return value, end
+
+    def _open(self, char: str, path: tuple) -> list:
+        container = {} if char == '{' else []
+        self._stack.append([container, path, 'first', None])
+        return container
+
+    def _parse(self, final: bool) -> List[tuple]:
+        text = self._join()
+        pos = self._pos
+        events: List[tuple] = []
+        self._retry_at = 0
+        while True:
+            pos = _WHITESPACE.match(text, pos).end()
+            if pos >= len(text) or self.done:
+                break
+            char = text[pos]
+
+            if not self._stack:
+                # Document root
+                if char in '{[' and self.item_depth > 0:
+                    self._root = self._open(char, ())
+                    pos += 1
+                    continue
+                value, pos = self._decode_value(text, pos, final)
+                if value is _MISSING:
+                    break
+                self._root = value
+                continue
+
+            frame = self._stack[-1]
+            container, path, state, key = frame
+            closer = '}' if isinstance(container, dict) else ']'
+            if state in ('first', 'comma') and char == closer:
+                self._stack.pop()
+                pos += 1
+                continue
+            if state == 'comma':
+                if char != ',':
+                    raise json.JSONDecodeError(f"Expecting ',' or '{closer}'", text, pos)
+                frame[2] = 'next'
+                pos += 1
+                continue
+
+            if isinstance(container, dict):
+                if state in ('first', 'next'):
+                    if char != '"':
+                        raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, pos)
+                    try:
+                        frame[3], end = json.decoder.scanstring(text, pos + 1)
+                    except json.JSONDecodeError:
+                        if final:
+                            raise
+                        break
+                    frame[2] = 'colon'
+                    pos = end
+                    continue
+                if state == 'colon':
+                    if char != ':':
+                        raise json.JSONDecodeError("Expecting ':' delimiter", text, pos)
+                    frame[2] = 'value'
+                    pos += 1
+                    continue
+                # state == 'value'
+                if char in '{[' and len(self._stack) < self.item_depth:
+                    container[key] = self._open(char, path + (key,))
+                    frame[2] = 'comma'
+                    pos += 1
+                    continue
+                value, pos = self._decode_value(text, pos, final)
+                if value is _MISSING:
+                    break
+                container[key] = value
+                frame[2] = 'comma'
+                continue
+
+            # Array elements: each decoded whole and handed to the caller
+            index = frame[3] or 0
+            while True:
+                value, pos = self._decode_value(text, pos, final)
+                if value is _MISSING:
+                    break
+                events.append((path + (index,), value))
+                if self.keep:
+                    container.append(value)
+                index += 1
+                separator = _ELEMENT_SEPARATOR.match(text, pos)
+                if separator is None:
+                    frame[2] = 'comma'
+                    break
+                frame[2] = 'next'
+                pos = separator.end()
+            frame[3] = index
+            if value is _MISSING:
+                break
+
+        self._pos = pos
+        return events
+
+
+# -----------------------------
+# Payload compression
+# -----------------------------
+
+class _Codec:
+    """A compression codec on the tagged-frame protocol."""
+
+    def __init__(self, name: str, flag: int, accept_flag: int,
+                 compress: Callable[[bytes], bytes],
+                 decompress: Callable[[Any, int], bytes]):
+        self.name = name
+        self.flag = flag
+        self.accept_flag = accept_flag
+        self.compress = compress
+        self.decompress = decompress
+
+
+def _zlib_decompress(data: Any, limit: int) -> bytes:
+    decompressor = zlib.decompressobj()
+    result = decompressor.decompress(data, limit)
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"Decompressed frame exceeds {limit} bytes")
+    if not decompressor.eof:
+        raise ValueError("Truncated zlib frame")
+    return result
+
+
+def _zstd_decompress(data: Any, limit: int) -> bytes:
+    size = zstandard.frame_content_size(data)
+    if size > limit:
+        raise ValueError(f"Decompressed frame exceeds {limit} bytes")
+    result = zstandard.ZstdDecompressor().decompress(data, max_output_size=limit)
+    if len(result) > limit:
+        raise ValueError(f"Decompressed frame exceeds {limit} bytes")
+    return result
+
+
+_CODECS: Dict[str, _Codec] = {
+    'zlib': _Codec('zlib', 0x04, 0x10, zlib.compress, _zlib_decompress),
+}
+if HAS_ZSTD:
+    _CODECS['zstd'] = _Codec('zstd', 0x08, 0x20,
+                             lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+                             _zstd_decompress)
+_CODECS_BY_FLAG = {codec.flag: codec for codec in _CODECS.values()}
+
+
+def _negotiate_codecs(offered: str | None) -> List[_Codec]:
+    """Codecs both sides support, in config.compression_codecs preference order."""
+    if not offered or not getattr(config, 'enable_compression', True):
+        return []
+    names = {name.strip().lower() for name in offered.split(',')}
+    return [_CODECS[name] for name in config.compression_codecs
+            if name in names and name in _CODECS]
+
+
+class CompressionStats:
+    """Bytes on the wire versus decoded, and time spent compressing, per command type.
+
+    Every tagged frame on a connection that negotiated compression is counted,
+    compressed or not, so ratio shows what compression saves for each command.
+    """
+
+    def __init__(self):
+        self._by_type: Dict[str, Dict[str, float]] = {}
+
+    def record(self, command_type: str | None, raw: int, wire: int,
+               compress_ms: float = 0.0, decompress_ms: float = 0.0) -> None:
+        entry = self._by_type.get(command_type or 'unknown')
+        if entry is None:
+            entry = self._by_type[command_type or 'unknown'] = {
+                "frames": 0, "compressed_frames": 0, "raw_bytes": 0, "wire_bytes": 0,
+                "compress_ms": 0.0, "decompress_ms": 0.0}
+        entry["frames"] += 1
+        if wire != raw:
+            entry["compressed_frames"] += 1
+        entry["raw_bytes"] += raw
+        entry["wire_bytes"] += wire
+        entry["compress_ms"] += compress_ms
+        entry["decompress_ms"] += decompress_ms
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            command_type: {
+                "frames": int(entry["frames"]),
+                "compressed_frames": int(entry["compressed_frames"]),
+                "raw_bytes": int(entry["raw_bytes"]),
+                "wire_bytes": int(entry["wire_bytes"]),
+                "ratio": round(entry["raw_bytes"] / entry["wire_bytes"], 3) if entry["wire_bytes"] else 1.0,
+                "compress_ms": round(entry["compress_ms"], 3),
+                "decompress_ms": round(entry["decompress_ms"], 3),
+            }
+            for command_type, entry in self._by_type.items()
+        }
+
+
+# Envelope timing fields (milliseconds) and the breakdown phase each becomes
+_UNITY_TIMING_FIELDS = (
+    ('queueMs', 'queue'), ('execMs', 'execute'), ('serializeMs', 'unity_serialize'),
+    ('bridgeMs', 'bridge'))
+
+
+def _call_breakdown(started: float, serialized: float, attempt_started: float,
+                    timing: Dict[str, float], received: float, parsed: float,
+                    unity: Any = None) -> Dict[str, float]:
+    """Milliseconds per phase of one call from time.perf_counter() stamps and the
+    bridge's timing object, if any; see CallTimingStats."""
+    sent = timing.get('sent', attempt_started)
+    first = timing.get('first', received)
+    breakdown = {
+        'serialize': (serialized - started) * 1e3,
+        'send': (sent - attempt_started) * 1e3,
+        'wait': (first - sent) * 1e3,
+        'receive': (received - first) * 1e3,
+        'parse': (parsed - received) * 1e3,
+        'total': (parsed - started) * 1e3,
+    }
+    if isinstance(unity, dict):
+        for field_name, phase in _UNITY_TIMING_FIELDS:
+            value = unity.get(field_name)
+            if isinstance(value, (int, float)) and value >= 0:
+                breakdown[phase] = float(value)
+        if 'bridge' in breakdown:
+            breakdown['transfer'] = max(0.0, breakdown['wait'] - breakdown['bridge'])
+    return breakdown
+
+
+class CallTimingStats:
+    """Where calls spend their time, per command type.
+
+    The client always measures serialize (encoding the request), send (until
+    it is written), wait (until the response starts arriving), receive (the
+    rest of a chunked response), parse and total. When the bridge echoes a
+    timing object in the envelope the wait is broken down further: queue
+    (in Unity's command queue until EditorApplication.update picks it up),
+    execute, unity_serialize, bridge (all of Unity's share) and transfer (the
+    rest of the wait: sockets and framing both ways). Older bridges send no
+    timing object and those phases are simply absent.
+    """
+
+    def __init__(self):
+        self._by_type: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, command_type: str | None, breakdown: Dict[str, float]) -> None:
+        entry = self._by_type.get(command_type or 'unknown')
+        if entry is None:
+            entry = self._by_type[command_type or 'unknown'] = {
+                "calls": 0, "with_unity_timing": 0, "sum": {}, "count": {}, "max": {}, "last": None}
+        entry["calls"] += 1
+        if 'bridge' in breakdown:
+            entry["with_unity_timing"] += 1
+        for phase, ms in breakdown.items():
+            entry["sum"][phase] = entry["sum"].get(phase, 0.0) + ms
+            entry["count"][phase] = entry["count"].get(phase, 0) + 1
+            entry["max"][phase] = max(entry["max"].get(phase, 0.0), ms)
+        entry["last"] = breakdown
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            command_type: {
+                "calls": entry["calls"],
+                "with_unity_timing": entry["with_unity_timing"],
+                "avg_ms": {phase: round(total / entry["count"][phase], 3)
+                           for phase, total in entry["sum"].items()},
+                "max_ms": {phase: round(ms, 3) for phase, ms in entry["max"].items()},
+                "last_ms": {phase: round(ms, 3) for phase, ms in (entry["last"] or {}).items()},
+            }
+            for command_type, entry in list(self._by_type.items())
+        }
+
+
+# -----------------------------
+# Circuit breaker
+# -----------------------------
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker for one Unity instance.
+
+    Consecutive connection-level failures (failed reconnects and timed-out
+    requests) trip it after config.breaker_failure_threshold, or on the first one when the
+    instance's status-file heartbeat is stale. While open, calls are rejected
+    with a retry_after_ms hint instead of running the retry loop. Once
+    config.breaker_open_seconds pass, or as soon as Unity writes a fresh
+    heartbeat, the breaker turns half-open and lets one probe through; the
+    probe's result closes it or opens it again.
+
+    Must only be used from the transport loop (see get_transport_loop()),
+    except is_closed() and snapshot(), which only read and are safe from any
+    thread.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, instance_id: str | None = None):
+        self.instance_id = instance_id
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = float('-inf')  # monotonic, for the open window
+        self._opened_wall = 0.0  # wall clock, compared with status-file mtimes
+        self._probing = False
+        self.last_error: str | None = None
+        self._stats: Dict[str, int] = {"opened": 0, "rejected": 0, "probes": 0}
+
+    def _status_entry(self) -> Any:
+        target_hash = hash_from_instance_id(self.instance_id)
+        if not target_hash:
+            return None
+        try:
+            return get_status_index().get(target_hash)
+        except Exception:
+            return None
+
+    def _effective_state(self) -> str:
+        """The current state, counting an open window that has ended as half-open, without moving to it."""
+        if self._state == self.OPEN and not self._probing:
+            if time.monotonic() - self._opened_at >= config.breaker_open_seconds:
+                return self.HALF_OPEN
+            entry = self._status_entry()
+            if entry is not None and entry.mtime > self._opened_wall and not entry.is_stale():
+                # Unity wrote a heartbeat since we gave up on it; try it now
+                return self.HALF_OPEN
+        return self._state
+
+    @property
+    def state(self) -> str:
+        """The current state, turning half-open once the open window ends; transport loop only."""
+        self._state = self._effective_state()
+        return self._state
+
+    def is_closed(self) -> bool:
+        """True while calls pass freely; reads without changing state, so any thread may call it."""
+        return self._state == self.CLOSED
+
+    def retry_after_ms(self) -> int:
+        remaining = config.breaker_open_seconds - (time.monotonic() - self._opened_at)
+        return max(int(config.reload_retry_ms), int(remaining * 1000))
+
+    def admit(self) -> str:
+        """'pass' to proceed, 'probe' to run the recovery probe, or 'reject'."""
+        state = self.state
+        if state == self.CLOSED:
+            return 'pass'
+        if state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            self._stats["probes"] += 1
+            return 'probe'
+        self._stats["rejected"] += 1
+        return 'reject'
+
+    def record_success(self) -> None:
+        if self._state != self.CLOSED:
+            logger.info(f"Circuit for {self.instance_id} closed")
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self, error: BaseException | str) -> None:
+        self._failures += 1
+        self.last_error = str(error)
+        entry = self._status_entry()
+        stale = entry is not None and entry.is_stale()
+        if self._probing or self._state != self.CLOSED or stale \
+                or self._failures >= max(1, int(config.breaker_failure_threshold)):
+            self._open(stale)
+
+    def _open(self, stale: bool) -> None:
+        if self._state == self.CLOSED:
+            self._stats["opened"] += 1
+            logger.warning(f"Circuit for {self.instance_id} opened after {self._failures} failure(s)"
+                           f"{' with a stale heartbeat' if stale else ''}: {self.last_error}")
+        self._state = self.OPEN
+        self._probing = False
+        self._opened_at = time.monotonic()
+        self._opened_wall = time.time()
+
+    def rejection(self) -> MCPResponse:
+        return MCPResponse(
+            success=False,
+            error=f"Unity instance '{self.instance_id}' is not responding; "
+                  f"failing fast until it recovers (last error: {self.last_error})",
+            data={"state": "unavailable", "circuit": self._state,
+                  "retry_after_ms": self.retry_after_ms()},
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        state = self._effective_state()
+        return {
+            "state": state,
+            "consecutive_failures": self._failures,
+            "retry_after_ms": self.retry_after_ms() if state == self.OPEN else 0,
+            "last_error": self.last_error,
+            **self._stats,
+        }
+
+
+# -----------------------------
+# Reload parking
+# -----------------------------
+
+def _reloading_response(retry_after_ms: int | None = None) -> MCPResponse:
+    return MCPResponse(
+        success=False,
+        error="Unity domain reload in progress, please try again shortly",
+        data={"state": "reloading", "retry_after_ms": int(
+            config.reload_retry_ms if retry_after_ms is None else retry_after_ms)}
+    )
+
+
+class ReloadGate:
+    """Holds requests for one Unity instance while its status file reports a domain reload.
+
+    Requests that arrive during a reload are parked without touching the
+    socket. One watcher per instance re-reads the status file every
+    config.reload_poll_interval and, once Unity reports ready, releases the
+    parked requests in arrival order, config.reload_release_concurrency at a
+    time, so the editor is not hit by the whole backlog at once.
+
+    Must only be used from the transport loop (see get_transport_loop()).
+    """
+
+    def __init__(self, instance_id: str | None = None):
+        self.instance_id = instance_id
+        self._parked: deque = deque()
+        self._watcher: asyncio.Task | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._stats: Dict[str, float] = {"parked": 0, "released": 0, "timed_out": 0, "park_ms_max": 0.0}
+
+    def _entry(self, refresh: bool = False) -> Any:
+        target_hash = hash_from_instance_id(self.instance_id)
+        if not target_hash:
+            return None
+        try:
+            index = get_status_index()
+            entry = index.get(target_hash)
+            if refresh and entry is not None and not index.watching:
+                # Without a watcher the index only rescans every status_poll_interval
+                index.refresh_path(entry.path)
+                entry = index.get(target_hash)
+            return entry
+        except Exception:
+            return None
+
+    def reloading(self, refresh: bool = False) -> bool:
+        entry = self._entry(refresh)
+        # A stale heartbeat means the editor died mid-reload; that is the breaker's business
+        return entry is not None and entry.reloading and not entry.is_stale()
+
+    @contextlib.asynccontextmanager
+    async def passage(self, timeout: float | None = None) -> AsyncIterator[bool]:
+        """Wait out a reload in progress; yields False if it outlasted timeout.
+
+        Yields True straight away when the instance is not reloading. A request
+        that was parked holds one of the release slots until its block exits.
+        """
+        if not self.reloading():
+            yield True
+            return
+        if not await self._park(config.reload_park_timeout if timeout is None else timeout):
+            yield False
+            return
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(max(1, int(config.reload_release_concurrency)))
+        async with self._slots:
+            yield True
+
+    async def _park(self, timeout: float) -> bool:
+        waiter = asyncio.get_running_loop().create_future()
+        self._parked.append(waiter)
+        self._stats["parked"] += 1
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch())
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            self._stats["timed_out"] += 1
+            return False
+        finally:
+            with contextlib.suppress(ValueError):
+                self._parked.remove(waiter)
+            self._stats["park_ms_max"] = max(self._stats["park_ms_max"], (time.monotonic() - started) * 1000.0)
+
+    async def _watch(self) -> None:
+        try:
+            while self._parked:
+                if not self.reloading(refresh=True):
+                    logger.debug(f"{self.instance_id} finished reloading; "
+                                 f"releasing {len(self._parked)} parked request(s)")
+                    while self._parked:
+                        waiter = self._parked.popleft()
+                        if not waiter.done():
+                            waiter.set_result(None)
+                            self._stats["released"] += 1
+                    break
+                await asyncio.sleep(config.reload_poll_interval)
+        finally:
+            self._watcher = None
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "reloading": self.reloading(),
+            "waiting": len(self._parked),
+            "parked": int(self._stats["parked"]),
+            "released": int(self._stats["released"]),
+            "timed_out": int(self._stats["timed_out"]),
+            "park_ms_max": round(self._stats["park_ms_max"], 3),
+        }
+
+
+# -----------------------------
+# Binary attachments
+# -----------------------------
+
+def _resolve_attachments(value: Any, attachments: List[memoryview]) -> Any:
+    """Replace {"$attachment": n} references in a parsed response with the attachments."""
+    if isinstance(value, dict):
+        index = value.get(_ATTACHMENT_KEY)
+        if len(value) == 1 and isinstance(index, int) and 0 <= index < len(attachments):
+            return attachments[index]
+        return {key: _resolve_attachments(item, attachments) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_resolve_attachments(item, attachments) for item in value]
+    return value
+
+
+# Byte order marks File.ReadAllText detects, longest first
+_TEXT_BOMS = (
+    (b"\xff\xfe\x00\x00", "utf-32-le"),
+    (b"\x00\x00\xfe\xff", "utf-32-be"),
+    (b"\xef\xbb\xbf", "utf-8"),
+    (b"\xff\xfe", "utf-16-le"),
+    (b"\xfe\xff", "utf-16-be"),
+)
+
+
+def attachment_text(value: Any) -> Any:
+    """Decode file contents received as an attachment to str, the way File.ReadAllText would.
+
+    Bridges send UTF-8; older ones sent the file's raw bytes, so a UTF-16/32 byte
+    order mark is honoured and invalid UTF-8 is replaced rather than raised.
+    Anything else, such as contents a bridge without attachments inlined as a
+    string, is returned unchanged.
+    """
+    if isinstance(value, (memoryview, bytes, bytearray)):
+        head = bytes(value[:4])
+        for bom, encoding in _TEXT_BOMS:
+            if head.startswith(bom):
+                return codecs.decode(value[len(bom):], encoding, 'replace')
+        return codecs.decode(value, 'utf-8', 'replace')
+    return value
+
+
+# -----------------------------
+# Chunked responses
+# -----------------------------
+
+class _ResponseStream:
+    """The chunks of one tagged response, in the order the demux task received them.
+
+    Attachment frames are not chunks: they are appended to attachments (None
+    when the request did not accept any) as they arrive.
+    """
+
+    def __init__(self, command_type: str | None = None, attachments: List[memoryview] | None = None):
+        self.command_type = command_type
+        self.attachments = attachments
+        self._chunks: deque = deque()
+        self._waiter: asyncio.Future | None = None
+        self._error: Exception | None = None
+        self._complete = False
+
+    def feed(self, chunk: memoryview, last: bool) -> None:
+        self._chunks.append(chunk)
+        self._complete = last
+        self._wake()
+
+    def fail(self, error: Exception) -> None:
+        if not self._complete:
+            self._error = error
+            self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def next_chunk(self) -> tuple:
+        """Return (chunk, last) for the next piece of the response."""
+        while not self._chunks:
+            if self._error is not None:
+                raise self._error
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        chunk = self._chunks.popleft()
+        return chunk, self._complete and not self._chunks
+
+
+class _SpilledResponse:
+    """A chunked response too large to keep in memory, held in an anonymous temp file.
+
+    load() maps the file and parses it in place when the JSON codec can, or
+    feeds it to IncrementalJSONDecoder window by window, so the raw text never
+    has to exist as one bytes or str object.
+    """
+
+    def __init__(self, file: Any, size: int):
+        self.file = file
+        self.size = size
+
+    def __len__(self) -> int:
+        return self.size
+
+    def load(self) -> Any:
+        try:
+            with mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                if json_codec.codec.decodes_buffers:
+                    # The codec parses the mapped bytes in place
+                    with memoryview(view) as data:
+                        return json_codec.loads(data)
+                decoder = IncrementalJSONDecoder()
+                for offset in range(0, self.size, _SPILL_WINDOW):
+                    decoder.feed(view[offset:offset + _SPILL_WINDOW])
+            decoder.close()
+            return decoder.document
+        finally:
+            self.file.close()
+
+
+# -----------------------------
+# Traffic capture
+# -----------------------------
+
+# Capture files: a gzip stream holding the magic bytes, then one record per
+# round trip: this header (start offset and duration in seconds, flags and
+# field lengths), the instance id, command type, request payload, response
+# payload (or error text) and each attachment preceded by a uint32 length.
+_CAPTURE_MAGIC = b'UMCPCAP1'
+_CAPTURE_RECORD = struct.Struct('>ddBHHIIH')
+_CAPTURE_LENGTH = struct.Struct('>I')
+_CAPTURE_FLAG_FAILED = 0x01
+# Round trips waiting for the writer thread; more are dropped and counted
+_CAPTURE_QUEUE_SIZE = 4096
+
 
 @dataclass
-class UnityConnection:
-    """Manages the socket connection to the Unity Editor."""
-    host: str = config.unity_host
-    port: int = None  # Will be set dynamically
-    sock: socket.socket = None  # Socket for Unity communication
-    use_framing: bool = False  # Negotiated per-connection
-    instance_id: str | None = None  # Instance identifier for reconnection
-
-    def __post_init__(self):
-        """Set port from discovery if not explicitly provided"""
-        if self.port is None:
-            self.port = PortDiscovery.discover_unity_port()
-        self._io_lock = threading.Lock()
-        self._conn_lock = threading.Lock()
+class CapturedExchange:
+    """One request and its response, as read back by read_capture()."""
+    # Seconds from the start of the capture to the request being sent
+    started: float
+    # Seconds until the response (or the failure) arrived
+    elapsed: float
+    instance_id: str | None
+    command_type: str | None
+    request: bytes
+    # Raw response payload; None when the round trip failed
+    response: bytes | None
+    attachments: List[bytes] = field(default_factory=list)
+    # Why the round trip failed (timeout, dropped socket, cancellation)
+    error: str | None = None
+
+
+class TrafficCapture:
+    """Writes every request and response, with timings, to a capture file.
+
+    record() only copies the payloads and queues them, so the transport loop
+    never waits on the disk; a background thread compresses and writes. A
+    response spilled to disk is queued as a duplicate of its file descriptor
+    and streamed into the capture in windows. Use start_capture() rather than
+    creating one directly.
+    """
 
-    def connect(self) -> bool:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = gzip.open(path, 'wb', compresslevel=1)
+        self._file.write(_CAPTURE_MAGIC)
+        self._started = time.monotonic()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=_CAPTURE_QUEUE_SIZE)
+        self._stats: Dict[str, int] = {"records": 0, "dropped": 0, "bytes": 0}
+        self._writer = threading.Thread(target=self._write_loop, name="unity-capture", daemon=True)
+        self._writer.start()
+
+    def record(self, conn: "AsyncUnityConnection", command_type: str | None, started: float,
+               request: bytes, response: Any = None, attachments: List[memoryview] | None = None,
+               error: BaseException | None = None) -> None:
+        """Queue one round trip; started is its time.monotonic() send time."""
+        elapsed = time.monotonic() - started
+        if error is not None:
+            body = (str(error) or type(error).__name__).encode('utf-8', 'replace')
+        elif isinstance(response, _SpilledResponse):
+            # load() closes the spill file; the duplicate keeps it readable for the writer
+            body = _SpilledResponse(os.fdopen(os.dup(response.file.fileno()), 'rb'), response.size)
+        else:
+            # The receive buffer is recycled once the response is parsed
+            body = bytes(response)
+        item = (started - self._started, elapsed, error is not None, conn.instance_id, command_type,
+                bytes(request), body, [bytes(a) for a in attachments or ()])
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            if isinstance(body, _SpilledResponse):
+                body.file.close()
+            self._stats["dropped"] += 1
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            started, elapsed, failed, instance_id, command_type, request, body, attachments = item
+            instance = (instance_id or '').encode('utf-8')
+            command = (command_type or '').encode('utf-8')
+            try:
+                self._file.write(_CAPTURE_RECORD.pack(
+                    started, elapsed, _CAPTURE_FLAG_FAILED if failed else 0, len(instance),
+                    len(command), len(request), len(body), len(attachments)))
+                self._file.write(instance + command)
+                self._file.write(request)
+                if isinstance(body, _SpilledResponse):
+                    self._copy_spill(body)
+                else:
+                    self._file.write(body)
+                for data in attachments:
+                    self._file.write(_CAPTURE_LENGTH.pack(len(data)))
+                    self._file.write(data)
+                self._stats["records"] += 1
+                self._stats["bytes"] += len(request) + len(body) + sum(len(a) for a in attachments)
+            except Exception as e:
+                logger.debug(f"Traffic capture write failed: {e}")
+                self._stats["dropped"] += 1
+            finally:
+                if isinstance(body, _SpilledResponse):
+                    body.file.close()
+
+    def _copy_spill(self, spill: _SpilledResponse) -> None:
+        """Stream a spilled response into the capture without reading it whole."""
+        spill.file.seek(0)
+        remaining = spill.size
+        while remaining:
+            window = spill.file.read(min(remaining, _SPILL_WINDOW))
+            if not window:
+                raise ValueError(f"Spill file ended {remaining} bytes short")
+            self._file.write(window)
+            remaining -= len(window)
+
+    def close(self) -> Dict[str, Any]:
+        """Write out what is queued, close the file and return snapshot()."""
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"path": self.path, **self._stats}
+
+
+_capture: Optional[TrafficCapture] = None
+_capture_lock = threading.Lock()
+
+
+def start_capture(path: str | None = None) -> TrafficCapture:
+    """Record all bridge traffic to path (default config.capture_path).
+
+    A capture already running is closed first. Replay one with
+    benchmarks/replay_capture.py.
+    """
+    global _capture
+    path = path or config.capture_path
+    if not path:
+        raise ValueError("No capture path given and config.capture_path is not set")
+    with _capture_lock:
+        previous, _capture = _capture, None
+        if previous is not None:
+            previous.close()
+        _capture = TrafficCapture(path)
+        logger.info(f"Capturing Unity bridge traffic to {path}")
+        return _capture
+
+
+def stop_capture() -> Dict[str, Any] | None:
+    """Stop recording; returns the capture's counters, or None if none was running."""
+    global _capture
+    with _capture_lock:
+        capture, _capture = _capture, None
+    return capture.close() if capture is not None else None
+
+
+def read_capture(path: str) -> Iterator[CapturedExchange]:
+    """Yield the round trips in a capture file, in the order they completed."""
+    with gzip.open(path, 'rb') as f:
+        if f.read(len(_CAPTURE_MAGIC)) != _CAPTURE_MAGIC:
+            raise ValueError(f"{path} is not a Unity MCP traffic capture")
+        while True:
+            header = f.read(_CAPTURE_RECORD.size)
+            if not header:
+                return
+            if len(header) < _CAPTURE_RECORD.size:
+                raise ValueError(f"Truncated capture record in {path}")
+            started, elapsed, flags, instance_len, command_len, request_len, body_len, count = \
+                _CAPTURE_RECORD.unpack(header)
+            instance = f.read(instance_len).decode('utf-8')
+            command = f.read(command_len).decode('utf-8')
+            request = f.read(request_len)
+            body = f.read(body_len)
+            attachments = [f.read(_CAPTURE_LENGTH.unpack(f.read(_CAPTURE_LENGTH.size))[0])
+                           for _ in range(count)]
+            failed = bool(flags & _CAPTURE_FLAG_FAILED)
+            yield CapturedExchange(
+                started=started, elapsed=elapsed, instance_id=instance or None,
+                command_type=command or None, request=request,
+                response=None if failed else body, attachments=attachments,
+                error=body.decode('utf-8', 'replace') if failed else None)
+
+
+# -----------------------------
+# Asyncio transport
+# -----------------------------
+
+class AsyncUnityConnection:
+    """Asyncio-native framed connection to a single Unity Editor instance.
+
+    Must only be used from the transport loop (see get_transport_loop()).
+    """
+
+    def __init__(self, host: str | None = None, port: int | None = None, instance_id: str | None = None):
+        self.host = host or config.unity_host
+        self.port = port
+        self.instance_id = instance_id
+        self.use_framing = False  # Negotiated per-connection
+        self.multiplexed = False  # Request-id tagged frames, negotiated per-connection
+        self.chunked = False  # Continuation-chunked responses, negotiated per-connection
+        self.codecs: List[_Codec] = []  # Compression codecs, negotiated per-connection
+        self.attachments = False  # Binary attachment frames, negotiated per-connection
+        self.dedupes = False  # Bridge replays responses to repeated idempotency keys
+        self.compression_stats = CompressionStats()
+        self.timing_stats = CallTimingStats()
+        self.breaker: CircuitBreaker | None = None  # Shared per instance; set by the pool
+        self.unix_socket: str | None = None  # Path while connected over a Unix domain socket
+        self.capabilities: Dict[str, str] = {}
+        self._transport: asyncio.Transport | None = None
+        self._protocol: _FrameProtocol | None = None
+        self._io_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._conn_lock = asyncio.Lock()
+        self._pending: Dict[int, _ResponseStream] = {}
+        self._next_request_id = 0
+        self._demux_task: asyncio.Task | None = None
+        self._ready = False  # Set once the handshake has completed
+
+    @property
+    def connected(self) -> bool:
+        # Not connected until the handshake is done, so concurrent callers wait
+        # on _conn_lock instead of reading the socket alongside the handshake
+        return self._ready and self._transport is not None and not self._transport.is_closing()
+
+    async def connect(self) -> bool:
         """Establish a connection to the Unity Editor."""
-        if self.sock:
+        if self.connected:
             return True
-        with self._conn_lock:
-            if self.sock:
+        async with self._conn_lock:
+            if self.connected:
                 return True
             try:
                 # Bounded connect to avoid indefinite blocking
-                connect_timeout = float(
-                    getattr(config, "connect_timeout", getattr(config, "connection_timeout", 1.0)))
-                self.sock = socket.create_connection(
-                    (self.host, self.port), connect_timeout)
-                # Disable Nagle's algorithm to reduce small RPC latency
-                with contextlib.suppress(Exception):
-                    self.sock.setsockopt(
-                        socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
-                logger.debug(f"Connected to Unity at {self.host}:{self.port}")
-
-                # Strict handshake: require FRAMING=1
-                try:
-                    require_framing = getattr(config, "require_framing", True)
-                    timeout = float(getattr(config, "handshake_timeout", 1.0))
-                    self.sock.settimeout(timeout)
-                    buf = bytearray()
-                    deadline = time.monotonic() + timeout
-                    while time.monotonic() < deadline and len(buf) < 512:
-                        try:
-                            chunk = self.sock.recv(256)
-                            if not chunk:
-                                break
-                            buf.extend(chunk)
-                            if b"\n" in buf:
-                                break
-                        except socket.timeout:
-                            break
-                    text = bytes(buf).decode('ascii', errors='ignore').strip()
-
-                    if 'FRAMING=1' in text:
-                        self.use_framing = True
-                        logger.debug(
-                            'MCP for Unity handshake received: FRAMING=1 (strict)')
-                    else:
-                        if require_framing:
-                            # Best-effort plain-text advisory for legacy peers
-                            with contextlib.suppress(Exception):
-                                self.sock.sendall(
-                                    b'MCP for Unity requires FRAMING=1\n')
-                            raise ConnectionError(
-                                f'MCP for Unity requires FRAMING=1, got: {text!r}')
-                        else:
-                            self.use_framing = False
-                            logger.warning(
-                                'MCP for Unity handshake missing FRAMING=1; proceeding in legacy mode by configuration')
-                finally:
-                    self.sock.settimeout(config.connection_timeout)
+                connect_timeout = _time_left(float(
+                    getattr(config, "connect_timeout", getattr(config, "connection_timeout", 1.0))))
+                self._transport, self._protocol = await self._open_transport(connect_timeout)
+                await self._handshake()
+                if self.multiplexed:
+                    self._demux_task = asyncio.create_task(
+                        self._demux_responses(self._protocol))
+                self._ready = True
                 return True
             except Exception as e:
                 logger.error(f"Failed to connect to Unity: {str(e)}")
-                try:
-                    if self.sock:
-                        self.sock.close()
-                except Exception:
-                    pass
-                self.sock = None
+                await self._close()
                 return False
 
-    def disconnect(self):
+    def _unix_socket_path(self) -> str | None:
+        """The Unix domain socket this instance's status file advertises, if usable."""
+        target_hash = hash_from_instance_id(self.instance_id)
+        if not target_hash or not config.prefer_unix_socket or not hasattr(socket, 'AF_UNIX'):
+            return None
+        try:
+            entry = get_status_index().get(target_hash)
+        except Exception:
+            return None
+        path = entry.unix_socket if entry is not None else None
+        return path if path and os.path.exists(path) else None
+
+    async def _open_transport(self, timeout: float | None) -> tuple:
+        """Connect over the bridge's Unix domain socket when there is one, else TCP."""
+        loop = asyncio.get_running_loop()
+        path = self._unix_socket_path()
+        if path is not None:
+            try:
+                connection = await asyncio.wait_for(
+                    loop.create_unix_connection(_FrameProtocol, path), timeout)
+                self.unix_socket = path
+                logger.debug(f"Connected to Unity at {path}")
+                return connection
+            except (OSError, asyncio.TimeoutError) as e:
+                logger.debug(f"Unix socket {path} unavailable, using TCP: {e}")
+        self.unix_socket = None
+        connection = await asyncio.wait_for(
+            loop.create_connection(_FrameProtocol, self.host, self.port), timeout)
+        # Disable Nagle's algorithm to reduce small RPC latency
+        with contextlib.suppress(Exception):
+            connection[0].get_extra_info('socket').setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        logger.debug(f"Connected to Unity at {self.host}:{self.port}")
+        return connection
+
+    async def _handshake(self) -> None:
+        """Strict handshake: require FRAMING=1 unless configured otherwise."""
+        require_framing = getattr(config, "require_framing", True)
+        timeout = float(getattr(config, "handshake_timeout", 1.0))
+        try:
+            line = await asyncio.wait_for(self._protocol.read_item(), timeout)
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            line = b""
+        text = line[:512].decode('ascii', errors='ignore').strip()
+        self.capabilities = _parse_handshake(text)
+        self.multiplexed = False
+        self.chunked = False
+        self.codecs = []
+        self.attachments = False
+        self.dedupes = self.capabilities.get('DEDUPE') == '1'
+
+        if 'FRAMING=1' in text:
+            self.use_framing = True
+            self._protocol.set_mode('framed')
+            self.multiplexed = (self.capabilities.get('REQID') == '1'
+                                and getattr(config, 'enable_multiplexing', True))
+            self.chunked = (self.multiplexed and self.capabilities.get('CHUNKED') == '1'
+                            and getattr(config, 'enable_chunked_responses', True))
+            if self.multiplexed:
+                # Compression rides on the tagged frame flags
+                self.codecs = _negotiate_codecs(self.capabilities.get('COMPRESS'))
+            self.attachments = (self.multiplexed and self.capabilities.get('ATTACH') == '1'
+                                and getattr(config, 'enable_attachments', True))
+            logger.debug('MCP for Unity handshake received: FRAMING=1 (strict)%s%s%s%s',
+                         '; multiplexing enabled' if self.multiplexed else '',
+                         '; chunked responses enabled' if self.chunked else '',
+                         f"; compression {','.join(c.name for c in self.codecs)}" if self.codecs else '',
+                         '; attachments enabled' if self.attachments else '')
+        elif require_framing:
+            # Best-effort plain-text advisory for legacy peers
+            with contextlib.suppress(Exception):
+                self._transport.write(b'MCP for Unity requires FRAMING=1\n')
+                await asyncio.wait_for(self._protocol.drain(), timeout)
+            raise ConnectionError(
+                f'MCP for Unity requires FRAMING=1, got: {text!r}')
+        else:
+            self.use_framing = False
+            self._protocol.set_mode('raw')
+            logger.warning(
+                'MCP for Unity handshake missing FRAMING=1; proceeding in legacy mode by configuration')
+
+    async def _close(self) -> None:
+        transport, protocol = self._transport, self._protocol
+        self._ready = False
+        self._transport = None
+        self._protocol = None
+        demux_task, self._demux_task = self._demux_task, None
+        if demux_task is not None and demux_task is not asyncio.current_task():
+            demux_task.cancel()
+        self._fail_pending(ConnectionError("Connection to Unity closed"))
+        if transport is None:
+            return
+        try:
+            transport.close()
+            with contextlib.suppress(Exception):
+                await asyncio.wait_for(protocol.wait_closed(), 1.0)
+        except Exception as e:
+            logger.error(f"Error disconnecting from Unity: {str(e)}")
+
+    async def disconnect(self) -> None:
         """Close the connection to the Unity Editor."""
-        if self.sock:
+        await self._close()
+
+    async def _receive_framed(self, idle: float | None) -> bytes | memoryview:
+        # Consume heartbeats, but do not hang indefinitely if only zero-length frames arrive.
+        # Each frame restarts the idle timeout; none of them moves the call deadline.
+        heartbeat_count = 0
+        deadline = time.monotonic() + getattr(config, 'framed_receive_timeout', 2.0)
+        while True:
+            payload = await _wait_live(self._protocol.read_item(), idle)
+            if len(payload) == 0:
+                # Heartbeat/no-op frame: consume and continue waiting for a data frame
+                logger.debug("Received heartbeat frame (length=0)")
+                heartbeat_count += 1
+                if heartbeat_count >= getattr(config, 'max_heartbeat_frames', 16) or time.monotonic() > deadline:
+                    # Treat as empty successful response to match C# server behavior
+                    logger.debug(
+                        "Heartbeat threshold reached; returning empty response")
+                    return b""
+                continue
+            logger.debug(f"Received framed response ({len(payload)} bytes)")
+            return payload
+
+    async def _receive_legacy(self, buffer_size: int) -> bytes:
+        chunks = []
+        while True:
             try:
-                self.sock.close()
-            except Exception as e:
-                logger.error(f"Error disconnecting from Unity: {str(e)}")
-            finally:
-                self.sock = None
-
-    def _read_exact(self, sock: socket.socket, count: int) -> bytes:
-        data = bytearray()
-        while len(data) < count:
-            chunk = sock.recv(count - len(data))
-            if not chunk:
-                raise ConnectionError(
-                    "Connection closed before reading expected bytes")
-            data.extend(chunk)
-        return bytes(data)
-
-    def receive_full_response(self, sock, buffer_size=config.buffer_size) -> bytes:
-        """Receive a complete response from Unity, handling chunked data."""
-        if self.use_framing:
+                chunk = await self._protocol.read_item()
+            except ConnectionError:
+                if not chunks:
+                    raise ConnectionError(
+                        "Connection closed before receiving data")
+                return b''.join(chunks)
+            chunks.append(chunk)
+            data = b''.join(chunks)
             try:
-                # Consume heartbeats, but do not hang indefinitely if only zero-length frames arrive
-                heartbeat_count = 0
-                deadline = time.monotonic() + getattr(config, 'framed_receive_timeout', 2.0)
-                while True:
-                    header = self._read_exact(sock, 8)
-                    payload_len = struct.unpack('>Q', header)[0]
-                    if payload_len == 0:
-                        # Heartbeat/no-op frame: consume and continue waiting for a data frame
-                        logger.debug("Received heartbeat frame (length=0)")
-                        heartbeat_count += 1
-                        if heartbeat_count >= getattr(config, 'max_heartbeat_frames', 16) or time.monotonic() > deadline:
-                            # Treat as empty successful response to match C# server behavior
-                            logger.debug(
-                                "Heartbeat threshold reached; returning empty response")
-                            return b""
-                        continue
-                    if payload_len > FRAMED_MAX:
-                        raise ValueError(
-                            f"Invalid framed length: {payload_len}")
-                    payload = self._read_exact(sock, payload_len)
-                    logger.debug(
-                        f"Received framed response ({len(payload)} bytes)")
-                    return payload
-            except socket.timeout as e:
-                logger.warning("Socket timeout during framed receive")
-                raise TimeoutError("Timeout receiving Unity response") from e
+                if _legacy_response_complete(data):
+                    logger.info(
+                        f"Received complete response ({len(data)} bytes)")
+                    return data
             except Exception as e:
-                logger.error(f"Error during framed receive: {str(e)}")
-                raise
+                logger.warning(f"Error processing response chunk: {str(e)}")
+                # Continue reading more chunks as this might not be the complete response
 
-        chunks = []
-        # Respect the socket's currently configured timeout
+    async def receive_full_response(self, timeout: float | None = None, buffer_size: int = config.buffer_size) -> bytes | memoryview:
+        """Receive a complete response from Unity, handling chunked data.
+
+        Large framed responses come back as a memoryview over a pooled receive
+        buffer; pass them to _load_frame() (or _buffers.release()) when done.
+        """
+        if timeout is None:
+            timeout = config.connection_timeout
         try:
-            while True:
-                chunk = sock.recv(buffer_size)
-                if not chunk:
-                    if not chunks:
-                        raise Exception(
-                            "Connection closed before receiving data")
-                    break
-                chunks.append(chunk)
+            if self.use_framing:
+                return await self._receive_framed(timeout)
+            return await _wait_live(self._receive_legacy(buffer_size), timeout)
+        except TimeoutError:
+            logger.warning("Socket timeout during receive")
+            raise
+        except Exception as e:
+            logger.error(f"Error during receive: {str(e)}")
+            raise
 
-                # Process the data received so far
-                data = b''.join(chunks)
-                decoded_data = data.decode('utf-8')
+    def _write_frame(self, header: bytes, payload: bytes) -> None:
+        """Queue a frame header and payload; a single sendmsg() where supported."""
+        if _WRITELINES_SENDMSG or len(payload) <= _JOIN_MAX:
+            self._transport.writelines((header, payload))
+        else:
+            self._transport.write(header)
+            self._transport.write(payload)
 
-                # Check if we've received a complete response
-                try:
-                    # Special case for ping-pong
-                    if decoded_data.strip().startswith('{"status":"success","result":{"message":"pong"'):
-                        logger.debug("Received ping response")
-                        return data
-
-                    # Handle escaped quotes in the content
-                    if '"content":' in decoded_data:
-                        # Find the content field and its value
-                        content_start = decoded_data.find('"content":') + 9
-                        content_end = decoded_data.rfind('"', content_start)
-                        if content_end > content_start:
-                            # Replace escaped quotes in content with regular quotes
-                            content = decoded_data[content_start:content_end]
-                            content = content.replace('\\"', '"')
-                            decoded_data = decoded_data[:content_start] + \
-                                content + decoded_data[content_end:]
-
-                    # Validate JSON format
-                    json.loads(decoded_data)
-
-                    # If we get here, we have valid JSON
-                    logger.info(
-                        f"Received complete response ({len(data)} bytes)")
-                    return data
-                except json.JSONDecodeError:
-                    # We haven't received a complete valid JSON response yet
+    async def _write(self, payload: bytes) -> None:
+        if self.use_framing:
+            self._write_frame(_FRAME_HEADER.pack(len(payload)), payload)
+        else:
+            self._transport.write(payload)
+        await self._protocol.drain()
+
+    def _fail_pending(self, error: Exception) -> None:
+        pending, self._pending = self._pending, {}
+        for stream in pending.values():
+            stream.fail(error)
+
+    async def _demux_responses(self, protocol: _FrameProtocol) -> None:
+        """Route tagged response frames to the streams of their waiting requests."""
+        try:
+            while True:
+                frame = await protocol.read_item()
+                if len(frame) == 0:
+                    # Heartbeats only prove liveness on a multiplexed socket
+                    logger.debug("Received heartbeat frame (length=0)")
                     continue
-                except Exception as e:
+                if len(frame) < _EXT_HEADER.size or frame[0] != EXT_FRAME_MARKER:
                     logger.warning(
-                        f"Error processing response chunk: {str(e)}")
-                    # Continue reading more chunks as this might not be the complete response
+                        "Dropping untagged frame (%d bytes) on multiplexed connection", len(frame))
                     continue
-        except socket.timeout:
-            logger.warning("Socket timeout during receive")
-            raise Exception("Timeout receiving Unity response")
+                _, flags, request_id = _EXT_HEADER.unpack_from(frame)
+                stream = self._pending.get(request_id)
+                if stream is None:
+                    # The caller timed out, was cancelled or stopped reading; discard
+                    logger.debug(f"Discarding response for abandoned request {request_id}")
+                    continue
+                attachment = bool(flags & _EXT_FLAG_ATTACHMENT)
+                last = not attachment and not flags & _EXT_FLAG_MORE
+                if last:
+                    del self._pending[request_id]
+                # A view past the tag keeps large frames in their receive buffer
+                body = memoryview(frame)[_EXT_HEADER.size:]
+                if attachment and stream.attachments is None:
+                    logger.warning(f"Dropping unrequested attachment for request {request_id}")
+                    continue
+                if self.codecs:
+                    try:
+                        body = self._decompress(body, flags, stream.command_type)
+                    except Exception as e:
+                        logger.warning(f"Could not decompress response to request {request_id}: {e}")
+                        self._pending.pop(request_id, None)
+                        stream.fail(e)
+                        continue
+                if attachment:
+                    # Handed to the caller as is; the buffer is never recycled under it
+                    stream.attachments.append(body if isinstance(body, memoryview) else memoryview(body))
+                    continue
+                stream.feed(body, last)
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            logger.error(f"Error during receive: {str(e)}")
+            logger.warning(f"Multiplexed receive loop stopped: {e}")
+            self._fail_pending(e)
+            if self._protocol is protocol:
+                await self._close()
+
+    def _compress(self, payload: bytes, command_type: str | None) -> tuple:
+        """Return (flags, body) for a request payload, compressed if it pays off."""
+        flags = 0
+        for codec in self.codecs:
+            flags |= codec.accept_flag
+        body = payload
+        elapsed_ms = 0.0
+        if self.codecs and len(payload) >= config.compression_min_bytes:
+            codec = self.codecs[0]
+            started = time.perf_counter()
+            compressed = codec.compress(payload)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+            if len(compressed) < len(payload):
+                flags |= codec.flag
+                body = compressed
+        if self.codecs:
+            self.compression_stats.record(command_type, len(payload), len(body), compress_ms=elapsed_ms)
+        return flags, body
+
+    def _decompress(self, body: memoryview, flags: int, command_type: str | None) -> memoryview | bytes:
+        wire = len(body)
+        codec_flag = flags & _EXT_CODEC_MASK
+        if not codec_flag:
+            self.compression_stats.record(command_type, wire, wire)
+            return body
+        codec = _CODECS_BY_FLAG.get(codec_flag)
+        if codec is None or codec not in self.codecs:
+            raise ValueError(f"Response compressed with an unnegotiated codec (flags=0x{flags:02x})")
+        started = time.perf_counter()
+        try:
+            result = codec.decompress(body, config.max_response_bytes)
+        finally:
+            _buffers.release(body)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        self.compression_stats.record(command_type, len(result), wire, decompress_ms=elapsed_ms)
+        return result
+
+    async def _send_tagged(self, payload: bytes, command_type: str | None = None,
+                           attachments: List[memoryview] | None = None) -> tuple:
+        """Send a tagged request; return its id and the stream its response arrives on.
+
+        Pass a list as attachments to accept attachment frames into it.
+        """
+        self._next_request_id = (self._next_request_id + 1) & 0xFFFFFFFF or 1
+        request_id = self._next_request_id
+        if not self.attachments:
+            attachments = None
+        stream = _ResponseStream(command_type, attachments)
+        self._pending[request_id] = stream
+        flags, payload = self._compress(payload, command_type)
+        if self.chunked:
+            flags |= _EXT_FLAG_ACCEPT_CHUNKS
+        if attachments is not None:
+            flags |= _EXT_FLAG_ACCEPT_ATTACHMENTS
+        try:
+            async with self._write_lock:
+                self._write_frame(
+                    _FRAME_HEADER.pack(_EXT_HEADER.size + len(payload))
+                    + _EXT_HEADER.pack(EXT_FRAME_MARKER, flags, request_id),
+                    payload)
+                await self._protocol.drain()
+        except BaseException:
+            self._pending.pop(request_id, None)
             raise
+        return request_id, stream
 
-    def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Send a command with retry/backoff and port rediscovery. Pings only when requested."""
+    async def _next_chunk(self, stream: _ResponseStream, timeout: float | None) -> tuple:
+        try:
+            return await _wait_live(
+                stream.next_chunk(), config.connection_timeout if timeout is None else timeout)
+        except TimeoutError:
+            logger.warning("Timeout waiting for multiplexed response")
+            raise
+
+    async def _collect_chunks(self, stream: _ResponseStream, first: memoryview,
+                              timeout: float | None) -> bytearray | _SpilledResponse:
+        """Assemble a chunked response, spilling it to a temp file once it
+        outgrows config.response_spill_bytes."""
+        buffer: bytearray | None = bytearray(first)
+        _buffers.release(first)
+        size = len(buffer)
+        spill = None
+        last = False
+        try:
+            while not last:
+                chunk, last = await self._next_chunk(stream, timeout)
+                size += len(chunk)
+                if size > config.max_response_bytes:
+                    raise ValueError(
+                        f"Unity response exceeds max_response_bytes ({config.max_response_bytes})")
+                if spill is None and size > config.response_spill_bytes:
+                    spill = tempfile.TemporaryFile(prefix='unity-mcp-response-')
+                    spill.write(buffer)
+                    buffer = None
+                if spill is not None:
+                    spill.write(chunk)
+                else:
+                    buffer += chunk
+                _buffers.release(chunk)
+        except BaseException:
+            if spill is not None:
+                spill.close()
+            raise
+        if spill is None:
+            return buffer
+        spill.flush()
+        logger.debug(f"Spilled {size} byte response to a temp file")
+        return _SpilledResponse(spill, size)
+
+    async def _round_trip_tagged(self, payload: bytes, timeout: float | None,
+                                 command_type: str | None = None,
+                                 attachments: List[memoryview] | None = None,
+                                 timing: Dict[str, float] | None = None) -> memoryview | bytearray | _SpilledResponse:
+        """Send a tagged request and wait for its response; other requests may overlap.
+
+        For chunked responses timeout bounds the wait for each chunk, so a large
+        transfer that keeps making progress is not cut off.
+        """
+        request_id, stream = await self._send_tagged(payload, command_type, attachments)
+        if timing is not None:
+            timing['sent'] = time.perf_counter()
+        try:
+            chunk, last = await self._next_chunk(stream, timeout)
+            if timing is not None:
+                timing['first'] = time.perf_counter()
+            if last:
+                return chunk
+            return await self._collect_chunks(stream, chunk, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _round_trip(self, payload: bytes, timeout: float | None = None,
+                          command_type: str | None = None,
+                          attachments: List[memoryview] | None = None,
+                          timing: Dict[str, float] | None = None) -> bytes | memoryview:
+        """Send one request and return its raw response payload.
+
+        Attachments the response carries are appended to attachments, if given
+        and negotiated; otherwise the bridge inlines that data in the JSON.
+        Pass a dict as timing to get the time.perf_counter() stamps 'sent' (the
+        request was written) and 'first' (the response started arriving). While
+        a capture is running (see start_capture()) the round trip is recorded to it.
+        """
+        capture = _capture
+        if capture is None:
+            return await self._exchange(payload, timeout, command_type, attachments, timing)
+        started = time.monotonic()
+        try:
+            response = await self._exchange(payload, timeout, command_type, attachments, timing)
+        except BaseException as e:
+            capture.record(self, command_type, started, payload, error=e)
+            raise
+        capture.record(self, command_type, started, payload, response, attachments)
+        return response
+
+    async def _exchange(self, payload: bytes, timeout: float | None,
+                        command_type: str | None,
+                        attachments: List[memoryview] | None,
+                        timing: Dict[str, float] | None) -> bytes | memoryview:
+        if self.multiplexed:
+            return await self._round_trip_tagged(payload, timeout, command_type, attachments, timing)
+        # Send/receive are serialized to protect the shared socket
+        async with self._io_lock:
+            await self._write(payload)
+            if timing is not None:
+                timing['sent'] = time.perf_counter()
+            response = await self.receive_full_response(timeout=timeout)
+            if timing is not None:
+                timing['first'] = time.perf_counter()
+            return response
+
+    async def stream_command(self, command_type: str, params: Dict[str, Any] = None,
+                             timeout: float | None = None) -> AsyncIterator[bytes | memoryview]:
+        """Send a command and yield the raw response bytes as they arrive.
+
+        Chunks are the bridge's continuation frames; without chunked responses
+        the whole response arrives as one piece. timeout bounds the wait for
+        each chunk. Closing the iterator early abandons the rest of the
+        response without disturbing other requests on a multiplexed socket.
+        No retries: a partially consumed response cannot be replayed.
+        """
+        if not self.connected and not await self.connect():
+            raise ConnectionError("Could not connect to Unity")
+        command = {"type": command_type, "params": params or {}}
+        payload = json_codec.dumps(command)
+        if not self.multiplexed:
+            try:
+                response = await self._round_trip(payload, timeout)
+            except BaseException:
+                # A lock-step socket may hold a half-read frame
+                await self._close()
+                raise
+            yield response
+            return
+        request_id, stream = await self._send_tagged(payload, command_type)
+        try:
+            last = False
+            while not last:
+                chunk, last = await self._next_chunk(stream, timeout)
+                yield chunk
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def iter_result_batches(self, command_type: str, params: Dict[str, Any] = None, *,
+                                  item_depth: int = 3,
+                                  timeout: float | None = None) -> AsyncIterator[List[tuple]]:
+        """Yield the array elements of a command's result, one batch per received chunk.
+
+        Each batch holds (path, item) pairs with paths relative to the result,
+        e.g. ('hierarchy', 0); see IncrementalJSONDecoder for item_depth.
+        Elements are not retained, so callers can forward or drop them as they
+        go and stop early. Raises if Unity reports an error.
+        """
+        decoder = IncrementalJSONDecoder(item_depth=item_depth, keep=False)
+        chunks = self.stream_command(command_type, params, timeout=timeout)
+        try:
+            async for chunk in chunks:
+                batch = [(path[1:], item) for path, item in decoder.feed(chunk)
+                         if path[:1] == ('result',)]
+                if batch:
+                    yield batch
+        finally:
+            await chunks.aclose()
+        batch = [(path[1:], item) for path, item in decoder.close() if path[:1] == ('result',)]
+        envelope = decoder.document
+        if isinstance(envelope, dict) and envelope.get('status') == 'error':
+            raise Exception(envelope.get('error') or envelope.get('message', 'Unknown Unity error'))
+        if batch:
+            yield batch
+
+    async def ping(self, timeout: float = 1.0) -> bool:
+        """Health check: True if the socket answers a ping within timeout."""
+        try:
+            resp = _load_frame(await self._round_trip(b'ping', timeout, 'ping'))
+            return resp.get('status') == 'success'
+        except Exception as e:
+            logger.debug(f"Health check ping failed: {e}")
+            return False
+
+    async def _reconnect(self) -> bool:
+        """connect(), sharing one failed attempt among sockets to the same port.
+
+        When Unity is down every pooled socket would otherwise wait out its
+        own connect timeout; followers of a failed attempt fail straight away
+        and retry after their backoff.
+        """
+        async def attempt() -> bool:
+            connected = await self.connect()
+            if not connected:
+                # Recorded once per shared attempt, not once per waiting socket
+                self._record_failure(ConnectionError(f"could not connect on port {self.port}"))
+            return connected
+
+        key = ("connect", self.host, self.port)
+        if not await _single_flight.run(key, attempt, config.reconnect_cooldown):
+            return False
+        # The leader is connected already; followers open their own socket
+        connected = await self.connect()
+        if not connected:
+            _single_flight.forget(key)
+            self._record_failure(ConnectionError(f"could not connect on port {self.port}"))
+        return connected
+
+    def _record_failure(self, error: BaseException) -> None:
+        """Count a connection-level failure against this instance's circuit breaker."""
+        if self.breaker is None:
+            return
+        status = _read_status_file(hash_from_instance_id(self.instance_id))
+        # A reload drops the socket and the listener on purpose; the editor is not dying
+        if not (status and (status.get('reloading') or status.get('reason') == 'reloading')):
+            self.breaker.record_failure(error)
+
+    async def _rediscover_port(self, error: BaseException) -> None:
+        """Re-discover the port for this instance after a failure.
+
+        Concurrent failures on the same instance (every pooled socket drops
+        at once when Unity reloads) run one discovery scan and share its
+        result for config.rediscover_cooldown.
+        """
+        key = ("rediscover", self.instance_id or self.host)
+        new_port = await _single_flight.run(
+            key, lambda: self._discover_port(error), config.rediscover_cooldown)
+        if new_port is not None:
+            if new_port != self.port:
+                logger.info(f"Unity port changed {self.port} -> {new_port}")
+            self.port = new_port
+
+    async def _discover_port(self, error: BaseException) -> int | None:
+        try:
+            new_port: int | None = None
+            if self.instance_id:
+                # Try to rediscover the specific instance (probing is blocking; keep it off the loop)
+                pool = get_unity_connection_pool()
+                refreshed = await asyncio.to_thread(pool.discover_all_instances, True)
+                match = next((inst for inst in refreshed if inst.id == self.instance_id), None)
+                if match:
+                    new_port = match.port
+                    logger.debug(f"Rediscovered instance {self.instance_id} on port {new_port}")
+                else:
+                    logger.warning(f"Instance {self.instance_id} not found during reconnection")
+
+            # Fallback to generic port discovery if instance-specific discovery failed
+            if new_port is None:
+                if self.instance_id:
+                    raise ConnectionError(
+                        f"Unity instance '{self.instance_id}' could not be rediscovered"
+                    ) from error
+                new_port = await asyncio.to_thread(PortDiscovery.discover_unity_port)
+            return new_port
+        except Exception as de:
+            logger.debug(f"Port discovery failed: {de}")
+            return None
+
+    async def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send a command with retry/backoff and port rediscovery. Pings only when requested.
+
+        How a failed attempt is retried depends on the command's RetryPolicy
+        (see retry_policy): mutations carry an idempotency key and are only
+        resent once they may have reached Unity if the bridge dedupes keys.
+        """
         # Defensive guard: catch empty/placeholder invocations early
         if not command_type:
             raise ValueError("MCP call missing command_type")
         if params is None:
             return MCPResponse(success=False, error="MCP call received with no parameters (client placeholder?)")
-        attempts = max(config.max_retries, 5)
-        base_backoff = max(0.5, config.retry_delay)
+        policy = get_retry_policies().policy_for(command_type, params)
+        attempts = max(config.max_retries, policy.attempts)
 
-        def read_status_file(target_hash: str | None = None) -> dict | None:
-            try:
-                base_path = Path.home().joinpath('.unity-mcp')
-                status_files = sorted(
-                    base_path.glob('unity-mcp-status-*.json'),
-                    key=lambda p: p.stat().st_mtime,
-                    reverse=True,
-                )
-                if not status_files:
-                    return None
-                if target_hash:
-                    for status_path in status_files:
-                        if status_path.stem.endswith(target_hash):
-                            with status_path.open('r') as f:
-                                return json.load(f)
-                # Fallback: return most recent regardless of hash
-                with status_files[0].open('r') as f:
-                    return json.load(f)
-            except Exception:
-                return None
-
-        last_short_timeout = None
-
-        # Extract hash suffix from instance id (e.g., Project@hash)
-        target_hash: str | None = None
-        if self.instance_id and '@' in self.instance_id:
-            maybe_hash = self.instance_id.split('@', 1)[1].strip()
-            if maybe_hash:
-                target_hash = maybe_hash
+        target_hash = hash_from_instance_id(self.instance_id)
 
         # Preflight: if Unity reports reloading, return a structured hint so clients can retry politely
         try:
-            status = read_status_file(target_hash)
+            status = _read_status_file(target_hash)
             if status and (status.get('reloading') or status.get('reason') == 'reloading'):
-                return MCPResponse(
-                    success=False,
-                    error="Unity domain reload in progress, please try again shortly",
-                    data={"state": "reloading", "retry_after_ms": int(
-                        config.reload_retry_ms)}
-                )
+                return _reloading_response()
         except Exception:
             pass
 
+        # Build payload
+        started = time.perf_counter()
+        if command_type == 'ping':
+            payload = b'ping'
+        else:
+            command = {"type": command_type, "params": params or {}}
+            if not policy.idempotent:
+                # The same key on every attempt, so a deduping bridge applies it once
+                command["idempotencyKey"] = uuid.uuid4().hex
+            payload = json_codec.dumps(command)
+        serialized = time.perf_counter()
+
         for attempt in range(attempts + 1):
+            sent = False
             try:
+                _time_left()
                 # Ensure connected (handshake occurs within connect())
-                if not self.sock and not self.connect():
-                    raise Exception("Could not connect to Unity")
+                if not self.connected and not await self._reconnect():
+                    raise ConnectionError("Could not connect to Unity")
 
-                # Build payload
-                if command_type == 'ping':
-                    payload = b'ping'
-                else:
-                    command = {"type": command_type, "params": params or {}}
-                    payload = json.dumps(
-                        command, ensure_ascii=False).encode('utf-8')
-
-                # Send/receive are serialized to protect the shared socket
-                with self._io_lock:
-                    mode = 'framed' if self.use_framing else 'legacy'
-                    with contextlib.suppress(Exception):
-                        logger.debug(
-                            "send %d bytes; mode=%s; head=%s",
-                            len(payload),
-                            mode,
-                            (payload[:32]).decode('utf-8', 'ignore'),
-                        )
-                    if self.use_framing:
-                        header = struct.pack('>Q', len(payload))
-                        self.sock.sendall(header)
-                        self.sock.sendall(payload)
-                    else:
-                        self.sock.sendall(payload)
-
-                    # During retry bursts use a short receive timeout and ensure restoration
-                    restore_timeout = None
-                    if attempt > 0 and last_short_timeout is None:
-                        restore_timeout = self.sock.gettimeout()
-                        self.sock.settimeout(1.0)
-                    try:
-                        response_data = self.receive_full_response(self.sock)
-                        with contextlib.suppress(Exception):
-                            logger.debug("recv %d bytes; mode=%s",
-                                         len(response_data), mode)
-                    finally:
-                        if restore_timeout is not None:
-                            self.sock.settimeout(restore_timeout)
-                            last_short_timeout = None
-
-                # Parse
+                mode = 'multiplexed' if self.multiplexed else 'framed' if self.use_framing else 'legacy'
+                with contextlib.suppress(Exception):
+                    logger.debug(
+                        "send %d bytes; mode=%s; head=%s",
+                        len(payload),
+                        mode,
+                        (payload[:32]).decode('utf-8', 'ignore'),
+                    )
+                # During retry bursts use a short receive timeout
+                attachments: List[memoryview] = []
+                timing: Dict[str, float] = {}
+                sent = True
+                attempt_started = time.perf_counter()
+                response_data = await self._round_trip(
+                    payload, timeout=1.0 if attempt > 0 else None, command_type=command_type,
+                    attachments=attachments, timing=timing)
+                received = time.perf_counter()
+                with contextlib.suppress(Exception):
+                    logger.debug("recv %d bytes; mode=%s",
+                                 len(response_data), mode)
+
+                # Parse straight from the receive buffer
+                resp = _load_frame(response_data)
+                unity_timing = resp.pop(_TIMING_KEY, None) if isinstance(resp, dict) else None
+                self.timing_stats.record(command_type, _call_breakdown(
+                    started, serialized, attempt_started, timing, received, time.perf_counter(),
+                    unity_timing))
+                if self.breaker is not None:
+                    # Unity answered, even if with an error
+                    self.breaker.record_success()
                 if command_type == 'ping':
-                    resp = json.loads(response_data.decode('utf-8'))
                     if resp.get('status') == 'success' and resp.get('result', {}).get('message') == 'pong':
                         return {"message": "pong"}
                     raise Exception("Ping unsuccessful")
 
-                resp = json.loads(response_data.decode('utf-8'))
                 if resp.get('status') == 'error':
                     err = resp.get('error') or resp.get(
                         'message', 'Unknown Unity error')
-                    raise Exception(err)
+                    raise UnityCommandError(err)
+                if attachments:
+                    resp = _resolve_attachments(resp, attachments)
                 return resp.get('result', {})
+            except asyncio.CancelledError:
+                # The caller gave up; a lock-step socket may hold a half-read frame
+                if not self.multiplexed:
+                    await self._close()
+                raise
+            except DeadlineExceeded:
+                # Out of time: no retry, and Unity being slow is not a breaker failure
+                if not self.multiplexed:
+                    await self._close()
+                raise
+            except UnityCommandError as e:
+                if not policy.retry_errors or attempt >= attempts:
+                    raise
+                logger.warning(f"Unity reported an error on attempt {attempt+1}: {e}")
+                await asyncio.sleep(_time_left(min(policy.backoff_cap, random.uniform(0.1, 0.3) * (2 ** attempt))))
             except Exception as e:
                 logger.warning(
                     f"Unity communication attempt {attempt+1} failed: {e}")
-                try:
-                    if self.sock:
-                        self.sock.close()
-                finally:
-                    self.sock = None
-
-                # Re-discover the port for this specific instance
-                try:
-                    new_port: int | None = None
-                    if self.instance_id:
-                        # Try to rediscover the specific instance
-                        pool = get_unity_connection_pool()
-                        refreshed = pool.discover_all_instances(force_refresh=True)
-                        match = next((inst for inst in refreshed if inst.id == self.instance_id), None)
-                        if match:
-                            new_port = match.port
-                            logger.debug(f"Rediscovered instance {self.instance_id} on port {new_port}")
-                        else:
-                            logger.warning(f"Instance {self.instance_id} not found during reconnection")
-
-                    # Fallback to generic port discovery if instance-specific discovery failed
-                    if new_port is None:
-                        if self.instance_id:
-                            raise ConnectionError(
-                                f"Unity instance '{self.instance_id}' could not be rediscovered"
-                            ) from e
-                        new_port = PortDiscovery.discover_unity_port()
-
-                    if new_port != self.port:
-                        logger.info(
-                            f"Unity port changed {self.port} -> {new_port}")
-                    self.port = new_port
-                except Exception as de:
-                    logger.debug(f"Port discovery failed: {de}")
+                # A multiplexed socket stays up for its other requests unless the
+                # failure was at the connection level
+                if not self.multiplexed or (isinstance(e, OSError) and not isinstance(e, TimeoutError)):
+                    await self._close()
+                if isinstance(e, (TimeoutError, asyncio.TimeoutError)):
+                    # Dropped sockets count once their (shared) reconnect fails
+                    self._record_failure(e)
+                if self.breaker is not None and not self.breaker.is_closed():
+                    # Another caller's failures (or our own) tripped it: stop retrying
+                    return self.breaker.rejection()
+                if not self.connected:
+                    await self._rediscover_port(e)
+                if sent and not policy.idempotent and not self.dedupes:
+                    # It may have been applied; resending could apply it twice
+                    raise
 
                 if attempt < attempts:
                     # Heartbeat-aware, jittered backoff
-                    status = read_status_file(target_hash)
-                    # Base exponential backoff
-                    backoff = base_backoff * (2 ** attempt)
+                    status = _read_status_file(target_hash)
                     # Decorrelated jitter multiplier
                     jitter = random.uniform(0.1, 0.3)
 
-                    # Fast‑retry for transient socket failures
-                    fast_error = isinstance(
-                        e, (ConnectionRefusedError, ConnectionResetError, TimeoutError))
-                    if not fast_error:
-                        try:
-                            err_no = getattr(e, 'errno', None)
-                            fast_error = err_no in (
-                                errno.ECONNREFUSED, errno.ECONNRESET, errno.ETIMEDOUT)
-                        except Exception:
-                            pass
-
                     # Cap backoff depending on state
                     if status and status.get('reloading'):
                         cap = 0.8
-                    elif fast_error:
+                    elif _is_fast_error(e):
+                        # Fast‑retry for transient socket failures
                         cap = 0.25
                     else:
-                        cap = 3.0
+                        cap = policy.backoff_cap
 
-                    sleep_s = min(cap, jitter * (2 ** attempt))
-                    time.sleep(sleep_s)
+                    await asyncio.sleep(_time_left(min(cap, jitter * (2 ** attempt))))
                     continue
                 raise
 
 
+class InstanceConnectionPool:
+    """A small pool of framed sockets to one Unity Editor instance.
+
+    Lock-step sockets are checked out exclusively, so up to max_connections
+    calls proceed side by side; a multiplexed socket is shared by every caller.
+    A semaphore caps the requests in flight, sockets that sat idle are pinged
+    before reuse and sockets idle past config.pool_idle_timeout are reaped
+    (one is always kept warm).
+
+    Commands in config.priority_commands (pings, editor state polls and other
+    light reads) never queue: when every socket is busy and the pool is full
+    they go over one extra socket of their own, outside the cap, so a health
+    check never waits behind a multi-second import and is never mistaken for a
+    dead editor.
+
+    Must only be used from the transport loop (see get_transport_loop()).
+    """
+
+    def __init__(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        instance_id: str | None = None,
+        max_connections: int | None = None,
+        max_in_flight: int | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.host = host or config.unity_host
+        self._port = port
+        self._instance_id = instance_id
+        self.max_connections = max(1, int(max_connections or config.pool_max_connections))
+        self.max_in_flight = max(1, int(max_in_flight or config.pool_max_in_flight))
+        self._sockets: List[AsyncUnityConnection] = []
+        self._priority: AsyncUnityConnection | None = None
+        self._load: Dict[AsyncUnityConnection, int] = {}
+        self._idle_since: Dict[AsyncUnityConnection, float] = {}
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._waiters: List[asyncio.Future] = []
+        self._in_flight = 0
+        self._waiting = 0
+        self._reaper: asyncio.TimerHandle | None = None
+        self._closing: set = set()
+        self._stats: Dict[str, float] = {
+            "checkouts": 0,
+            "waits": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "opened": 0,
+            "reaped": 0,
+            "health_check_failures": 0,
+            "priority_calls": 0,
+            "priority_ms_max": 0.0,
+        }
+        # Shared by every socket so the numbers survive reaping and reconnects
+        self.compression_stats = CompressionStats()
+        self.timing_stats = CallTimingStats()
+        self.breaker = breaker or CircuitBreaker(instance_id)
+        self.reload_gate = ReloadGate(instance_id)
+
+    @property
+    def port(self) -> int | None:
+        return self._port
+
+    @port.setter
+    def port(self, value: int | None) -> None:
+        # Sockets pick the new port up the next time they (re)connect
+        self._port = value
+        for conn in self._all_sockets():
+            conn.port = value
+
+    @property
+    def instance_id(self) -> str | None:
+        return self._instance_id
+
+    @instance_id.setter
+    def instance_id(self, value: str | None) -> None:
+        self._instance_id = value
+        self.breaker.instance_id = value
+        self.reload_gate.instance_id = value
+        for conn in self._all_sockets():
+            conn.instance_id = value
+
+    def _all_sockets(self) -> List[AsyncUnityConnection]:
+        return self._sockets + ([self._priority] if self._priority is not None else [])
+
+    def _negotiated(self) -> AsyncUnityConnection | None:
+        return next((c for c in self._sockets if c.connected), None)
+
+    @property
+    def connected(self) -> bool:
+        return self._negotiated() is not None
+
+    @property
+    def use_framing(self) -> bool:
+        conn = self._negotiated()
+        return conn is not None and conn.use_framing
+
+    @property
+    def multiplexed(self) -> bool:
+        conn = self._negotiated()
+        return conn is not None and conn.multiplexed
+
+    @property
+    def compression(self) -> List[str]:
+        conn = self._negotiated()
+        return [codec.name for codec in conn.codecs] if conn is not None else []
+
+    @property
+    def transport(self) -> str | None:
+        """'unix' or 'tcp' for the connected socket, None while disconnected."""
+        conn = self._negotiated()
+        if conn is None:
+            return None
+        return 'unix' if conn.unix_socket else 'tcp'
+
+    def _new_socket(self) -> AsyncUnityConnection:
+        conn = AsyncUnityConnection(host=self.host, port=self._port, instance_id=self._instance_id)
+        conn.compression_stats = self.compression_stats
+        conn.timing_stats = self.timing_stats
+        conn.breaker = self.breaker
+        return conn
+
+    def _open(self) -> AsyncUnityConnection:
+        conn = self._new_socket()
+        self._sockets.append(conn)
+        self._load[conn] = 0
+        self._idle_since[conn] = time.monotonic()
+        self._stats["opened"] += 1
+        logger.debug(f"Opened pooled socket {len(self._sockets)}/{self.max_connections} "
+                     f"for {self._instance_id or self._port}")
+        return conn
+
+    async def connect(self) -> bool:
+        """Make sure at least one socket is connected (and its handshake negotiated)."""
+        conn = self._negotiated() or (self._sockets[0] if self._sockets else self._open())
+        return conn.connected or await conn._reconnect()
+
+    def _pick(self) -> AsyncUnityConnection | None:
+        """Choose a socket for the next request, or None if the caller must wait."""
+        idle = [c for c in self._sockets if self._load[c] == 0]
+        if idle:
+            # Most recently used first, so surplus sockets age out and get reaped
+            return max(idle, key=lambda c: self._idle_since[c])
+        shared = [c for c in self._sockets if c.connected and c.multiplexed]
+        if shared:
+            return min(shared, key=lambda c: self._load[c])
+        if len(self._sockets) < self.max_connections:
+            return self._open()
+        return None
+
+    async def checkout(self) -> AsyncUnityConnection:
+        """Take a socket out of the pool; pair every call with release()."""
+        started = time.monotonic()
+        waited = self._slots.locked()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+            try:
+                conn = self._pick()
+                while conn is None:
+                    waited = True
+                    waiter = asyncio.get_running_loop().create_future()
+                    self._waiters.append(waiter)
+                    try:
+                        await waiter
+                    finally:
+                        with contextlib.suppress(ValueError):
+                            self._waiters.remove(waiter)
+                    conn = self._pick()
+            except BaseException:
+                self._slots.release()
+                raise
+        finally:
+            self._waiting -= 1
+
+        exclusive = self._load[conn] == 0
+        idle_for = time.monotonic() - self._idle_since[conn]
+        self._load[conn] += 1
+        self._in_flight += 1
+
+        wait_ms = (time.monotonic() - started) * 1000.0
+        self._stats["checkouts"] += 1
+        self._stats["wait_ms_total"] += wait_ms
+        self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], wait_ms)
+        if waited:
+            self._stats["waits"] += 1
+
+        if exclusive and conn.connected and idle_for >= config.pool_health_check_interval:
+            try:
+                healthy = await conn.ping()
+            except BaseException:
+                self.release(conn)
+                raise
+            if not healthy:
+                # Drop the stale socket; the request reconnects it transparently
+                self._stats["health_check_failures"] += 1
+                logger.info(f"Pooled socket to {self._instance_id or self._port} failed health check")
+                await conn.disconnect()
+        return conn
+
+    def release(self, conn: AsyncUnityConnection) -> None:
+        """Return a socket taken with checkout()."""
+        self._in_flight -= 1
+        self._slots.release()
+        if conn in self._load:
+            self._load[conn] -= 1
+            if self._load[conn] == 0:
+                self._idle_since[conn] = time.monotonic()
+            if conn.port != self._port and conn.port is not None:
+                # The socket rediscovered its instance on a new port; share that
+                self.port = conn.port
+            self._schedule_reap()
+        elif conn.connected:
+            # The pool was disconnected while this request was in flight
+            self._discard_task(conn)
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _schedule_reap(self) -> None:
+        if self._reaper is None and len(self._sockets) > 1:
+            self._reaper = asyncio.get_running_loop().call_later(
+                config.pool_idle_timeout, self._reap_idle)
+
+    def _reap_idle(self) -> None:
+        self._reaper = None
+        cutoff = time.monotonic() - config.pool_idle_timeout
+        idle = sorted((c for c in self._sockets if self._load[c] == 0),
+                      key=lambda c: self._idle_since[c])
+        for conn in idle:
+            if len(self._sockets) <= 1 or self._idle_since[conn] > cutoff:
+                break
+            self._discard(conn)
+            self._stats["reaped"] += 1
+        self._schedule_reap()
+
+    def _discard(self, conn: AsyncUnityConnection) -> None:
+        self._sockets.remove(conn)
+        self._load.pop(conn, None)
+        self._idle_since.pop(conn, None)
+        self._discard_task(conn)
+
+    def _discard_task(self, conn: AsyncUnityConnection) -> None:
+        task = asyncio.get_running_loop().create_task(conn.disconnect())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def _priority_lane(self) -> AsyncUnityConnection:
+        """The socket for priority commands, created on first use (it connects lazily)."""
+        if self._priority is None:
+            self._priority = self._new_socket()
+        return self._priority
+
+    def _is_priority(self, command_type: str) -> bool:
+        return config.priority_lane and command_type in config.priority_commands
+
+    def _would_wait(self) -> bool:
+        """Whether checkout() would have to wait for a socket right now."""
+        if self._slots.locked():
+            return True
+        if any(self._load[c] == 0 or (c.connected and c.multiplexed) for c in self._sockets):
+            return False
+        return len(self._sockets) >= self.max_connections
+
+    async def disconnect(self) -> None:
+        """Close every socket in the pool."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+            self._reaper = None
+        if self._priority is not None:
+            priority, self._priority = self._priority, None
+            await priority.disconnect()
+        sockets, self._sockets = self._sockets, []
+        self._load.clear()
+        self._idle_since.clear()
+        for conn in sockets:
+            await conn.disconnect()
+
+    async def _probe(self) -> bool:
+        """The half-open breaker's single recovery check: connect and ping once."""
+        if config.priority_lane and self._would_wait():
+            # A slow command holding every socket must not fail the probe
+            conn = self._priority_lane()
+        else:
+            conn = self._negotiated() or (self._sockets[0] if self._sockets else self._open())
+        try:
+            # connect() is bounded by config.connect_timeout and the handshake timeout
+            healthy = await conn.connect() and await conn.ping(config.breaker_probe_timeout)
+        except Exception:
+            healthy = False
+        if healthy:
+            self.breaker.record_success()
+        else:
+            await conn.disconnect()
+            self.breaker.record_failure(ConnectionError("recovery probe failed"))
+            # Unity may have come back on another port
+            await conn._rediscover_port(ConnectionError("recovery probe failed"))
+            if conn.port != self._port and conn.port is not None:
+                self.port = conn.port
+        return healthy
+
+    async def heartbeat(self, timeout: float) -> float | None:
+        """Ping an idle socket in the background; return the round trip in ms.
+
+        Returns None without pinging when no socket is connected, or when every
+        one is busy (they are evidently alive). The pinged socket counts as just
+        used, so the next checkout skips its health check. A socket that fails
+        the ping is closed and ConnectionError raised.
+        """
+        idle = [c for c in self._sockets if c.connected and (self._load[c] == 0 or c.multiplexed)]
+        if not idle:
+            if self._priority is None or not self._priority.connected:
+                return None
+            # Every pooled socket is busy; the priority lane still shows how Unity is doing
+            started = time.perf_counter()
+            if not await self._priority.ping(timeout):
+                self._stats["health_check_failures"] += 1
+                await self._priority.disconnect()
+                raise ConnectionError(f"Heartbeat to {self._instance_id or self._port} failed")
+            return (time.perf_counter() - started) * 1000.0
+        # The socket _pick() would hand out next, so surplus ones still age out
+        conn = max(idle, key=lambda c: self._idle_since[c])
+        self._load[conn] += 1
+        started = time.perf_counter()
+        try:
+            healthy = await conn.ping(timeout)
+        finally:
+            if conn in self._load:
+                self._load[conn] -= 1
+                if self._load[conn] == 0:
+                    self._idle_since[conn] = time.monotonic()
+            for waiter in self._waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+        if not healthy:
+            self._stats["health_check_failures"] += 1
+            await conn.disconnect()
+            raise ConnectionError(f"Heartbeat to {self._instance_id or self._port} failed")
+        return (time.perf_counter() - started) * 1000.0
+
+    async def admit(self) -> MCPResponse | None:
+        """None if a call may proceed, else the breaker's structured rejection."""
+        verdict = self.breaker.admit()
+        if verdict == 'pass' or (verdict == 'probe' and await self._probe()):
+            return None
+        return self.breaker.rejection()
+
+    async def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send a command over a pooled socket (see AsyncUnityConnection.send_command).
+
+        Returns the circuit breaker's rejection without touching the socket
+        while the instance is known to be down, and parks the call while it
+        is reloading (see ReloadGate).
+        """
+        rejection = await self.admit()
+        if rejection is not None:
+            return rejection
+        park = _time_left(config.reload_park_timeout)
+        async with self.reload_gate.passage(park) as ready:
+            if not ready:
+                if park < config.reload_park_timeout:
+                    raise DeadlineExceeded("Unity call exceeded its deadline during a reload")
+                return _reloading_response()
+            if self._is_priority(command_type) and self._would_wait():
+                return await self._send_priority(command_type, params)
+            conn = await self.checkout()
+            try:
+                return await conn.send_command(command_type, params)
+            finally:
+                self.release(conn)
+
+    async def _send_priority(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        started = time.monotonic()
+        try:
+            return await self._priority_lane().send_command(command_type, params)
+        finally:
+            elapsed_ms = (time.monotonic() - started) * 1000.0
+            self._stats["priority_calls"] += 1
+            self._stats["priority_ms_max"] = max(self._stats["priority_ms_max"], elapsed_ms)
+
+    async def iter_result_batches(self, command_type: str, params: Dict[str, Any] = None,
+                                  **kwargs) -> AsyncIterator[List[tuple]]:
+        """Stream result items over a pooled socket (see AsyncUnityConnection.iter_result_batches)."""
+        rejection = await self.admit()
+        if rejection is not None:
+            raise ConnectionError(rejection.error)
+        park = _time_left(config.reload_park_timeout)
+        async with self.reload_gate.passage(park) as ready:
+            if not ready:
+                if park < config.reload_park_timeout:
+                    raise DeadlineExceeded("Unity call exceeded its deadline during a reload")
+                raise ConnectionError(_reloading_response().error)
+            conn = await self.checkout()
+            batches = conn.iter_result_batches(command_type, params, **kwargs)
+            try:
+                async for batch in batches:
+                    yield batch
+            finally:
+                try:
+                    await batches.aclose()
+                finally:
+                    self.release(conn)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of pool size, wait time, saturation, compression savings and
+        the per-command time breakdown (see CallTimingStats)."""
+        sockets = list(self._sockets)
+        checkouts = int(self._stats["checkouts"])
+        return {
+            "size": len(sockets),
+            "connected": sum(1 for c in sockets if c.connected),
+            "idle": sum(1 for c in sockets if self._load.get(c, 0) == 0),
+            "max_connections": self.max_connections,
+            "multiplexed": self.multiplexed,
+            "in_flight": self._in_flight,
+            "max_in_flight": self.max_in_flight,
+            "saturation": round(self._in_flight / self.max_in_flight, 3),
+            "waiting": self._waiting,
+            "checkouts": checkouts,
+            "waits": int(self._stats["waits"]),
+            "wait_ms_avg": round(self._stats["wait_ms_total"] / checkouts, 3) if checkouts else 0.0,
+            "wait_ms_max": round(self._stats["wait_ms_max"], 3),
+            "opened": int(self._stats["opened"]),
+            "reaped": int(self._stats["reaped"]),
+            "health_check_failures": int(self._stats["health_check_failures"]),
+            "priority_lane": {
+                "connected": self._priority is not None and self._priority.connected,
+                "calls": int(self._stats["priority_calls"]),
+                "ms_max": round(self._stats["priority_ms_max"], 3),
+            },
+            "compression": self.compression,
+            "transport": self.transport,
+            "compression_by_command": self.compression_stats.snapshot(),
+            "timing_by_command": self.timing_stats.snapshot(),
+            "circuit": self.breaker.snapshot(),
+            "reload": self.reload_gate.snapshot(),
+        }
+
+
+class UnityConnection:
+    """Manages the socket connections to one Unity Editor instance.
+
+    Synchronous facade over InstanceConnectionPool: every call is executed on the
+    shared transport loop and the calling thread waits for the result.
+    """
+
+    def __init__(self, host: str = config.unity_host, port: int | None = None, instance_id: str | None = None,
+                 breaker: CircuitBreaker | None = None):
+        # Set port from discovery if not explicitly provided
+        if port is None:
+            port = PortDiscovery.discover_unity_port()
+        self.aio = InstanceConnectionPool(host=host, port=port, instance_id=instance_id, breaker=breaker)
+
+    @property
+    def host(self) -> str:
+        return self.aio.host
+
+    @property
+    def port(self) -> int:
+        return self.aio.port
+
+    @port.setter
+    def port(self, value: int) -> None:
+        self.aio.port = value
+
+    @property
+    def instance_id(self) -> str | None:
+        return self.aio.instance_id
+
+    @instance_id.setter
+    def instance_id(self, value: str | None) -> None:
+        self.aio.instance_id = value
+
+    @property
+    def use_framing(self) -> bool:
+        return self.aio.use_framing
+
+    @property
+    def connected(self) -> bool:
+        return self.aio.connected
+
+    def connect(self) -> bool:
+        """Establish a connection to the Unity Editor."""
+        return _transport.run(self.aio.connect())
+
+    def disconnect(self):
+        """Close the connection to the Unity Editor."""
+        _transport.run(self.aio.disconnect())
+
+    def send_command(self, command_type: str, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Send a command with retry/backoff and port rediscovery. Pings only when requested."""
+        return _transport.run(self.aio.send_command(command_type, params))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Socket pool metrics for this instance."""
+        return self.aio.metrics()
+
+
 # -----------------------------
 # Connection Pool for Multiple Unity Instances
 # -----------------------------
@@ -417,6 +2781,8 @@ class UnityConnectionPool:
 
     def __init__(self):
         self._connections: Dict[str, UnityConnection] = {}
+        # Outlive the connections: a connection that fails to connect is dropped
+        self._breakers: Dict[str, CircuitBreaker] = {}
         self._known_instances: Dict[str, UnityInstanceInfo] = {}
         self._last_full_scan: float = 0
         self._scan_interval: float = 5.0  # Cache for 5 seconds
@@ -458,6 +2824,12 @@ class UnityConnectionPool:
         logger.info(f"Found {len(instances)} Unity instances: {[inst.id for inst in instances]}")
         return instances
 
+    async def async_discover_all_instances(self, force_refresh: bool = False) -> List[UnityInstanceInfo]:
+        """Async variant of discover_all_instances; scans run in a worker thread."""
+        if not force_refresh and (time.time() - self._last_full_scan) < self._scan_interval:
+            return list(self._known_instances.values())
+        return await asyncio.to_thread(self.discover_all_instances, force_refresh)
+
     def _resolve_instance_id(self, instance_identifier: Optional[str], instances: List[UnityInstanceInfo]) -> UnityInstanceInfo:
         """
         Resolve an instance identifier to a specific Unity instance.
@@ -564,6 +2936,40 @@ class UnityConnectionPool:
             f"Check unity://instances resource for all instances."
         )
 
+    def _checkout_connection(self, target: UnityInstanceInfo) -> UnityConnection:
+        """Return the pooled connection for target, registering a new one if needed.
+
+        The connection is registered before it connects so concurrent callers share
+        a single socket (and a single handshake) instead of racing to open their own.
+        """
+        with self._pool_lock:
+            conn = self._connections.get(target.id)
+            if conn is None:
+                logger.info(f"Creating new connection to Unity instance: {target.id} (port {target.port})")
+                breaker = self._breakers.get(target.id)
+                if breaker is None:
+                    breaker = self._breakers[target.id] = CircuitBreaker(target.id)
+                conn = UnityConnection(port=target.port, instance_id=target.id, breaker=breaker)
+                self._connections[target.id] = conn
+                return conn
+            # Update existing connection with instance_id and port if changed
+            conn.instance_id = target.id
+            if conn.port != target.port:
+                logger.info(f"Updating cached port for {target.id}: {conn.port} -> {target.port}")
+                conn.port = target.port
+            logger.debug(f"Reusing existing connection to: {target.id}")
+            return conn
+
+    def _connect_failed(self, target: UnityInstanceInfo, conn: UnityConnection) -> ConnectionError:
+        """Drop a connection that could not connect and build the caller's error."""
+        with self._pool_lock:
+            if self._connections.get(target.id) is conn:
+                del self._connections[target.id]
+        return ConnectionError(
+            f"Failed to connect to Unity instance '{target.id}' on port {target.port}. "
+            f"Ensure the Unity Editor is running."
+        )
+
     def get_connection(self, instance_identifier: Optional[str] = None) -> UnityConnection:
         """
         Get or create a connection to a Unity instance.
@@ -585,26 +2991,53 @@ class UnityConnectionPool:
         target = self._resolve_instance_id(instance_identifier, instances)
 
         # Return existing connection or create new one
+        conn = self._checkout_connection(target)
+        # While the circuit is open, send_command() answers with its rejection instead
+        if not conn.connected and conn.aio.breaker.is_closed() and not conn.connect():
+            raise self._connect_failed(target, conn)
+        return conn
+
+    async def async_get_connection(self, instance_identifier: Optional[str] = None) -> InstanceConnectionPool:
+        """Async variant of get_connection; must be awaited on the transport loop.
+
+        Returns the InstanceConnectionPool behind the pooled connection.
+        """
+        instances = await self.async_discover_all_instances()
+        target = self._resolve_instance_id(instance_identifier, instances)
+
+        conn = self._checkout_connection(target)
+        if not conn.connected and conn.aio.breaker.is_closed() and not await conn.aio.connect():
+            raise self._connect_failed(target, conn)
+        return conn.aio
+
+    def instance_pool(self, target: UnityInstanceInfo) -> InstanceConnectionPool:
+        """The socket pool for target, registered (but not connected) if new."""
+        return self._checkout_connection(target).aio
+
+    async def async_forget_instance(self, instance_id: str) -> None:
+        """Disconnect from an instance that went away and drop its cached state.
+
+        Must be awaited on the transport loop.
+        """
         with self._pool_lock:
-            if target.id not in self._connections:
-                logger.info(f"Creating new connection to Unity instance: {target.id} (port {target.port})")
-                conn = UnityConnection(port=target.port, instance_id=target.id)
-                if not conn.connect():
-                    raise ConnectionError(
-                        f"Failed to connect to Unity instance '{target.id}' on port {target.port}. "
-                        f"Ensure the Unity Editor is running."
-                    )
-                self._connections[target.id] = conn
-            else:
-                # Update existing connection with instance_id and port if changed
-                conn = self._connections[target.id]
-                conn.instance_id = target.id
-                if conn.port != target.port:
-                    logger.info(f"Updating cached port for {target.id}: {conn.port} -> {target.port}")
-                    conn.port = target.port
-                logger.debug(f"Reusing existing connection to: {target.id}")
+            conn = self._connections.pop(instance_id, None)
+            self._breakers.pop(instance_id, None)
+            self._known_instances.pop(instance_id, None)
+        if conn is not None:
+            logger.info(f"Forgetting Unity instance: {instance_id}")
+            await conn.aio.disconnect()
+
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Socket pool metrics (size, wait time, saturation) keyed by instance id."""
+        with self._pool_lock:
+            connections = dict(self._connections)
+        return {instance_id: conn.metrics() for instance_id, conn in connections.items()}
 
-            return self._connections[target.id]
+    def get_circuit_states(self) -> Dict[str, Dict[str, Any]]:
+        """Circuit breaker state keyed by instance id, for every instance ever connected to."""
+        with self._pool_lock:
+            breakers = dict(self._breakers)
+        return {instance_id: breaker.snapshot() for instance_id, breaker in breakers.items()}
 
     def disconnect_all(self):
         """Disconnect all active connections"""
@@ -670,13 +3103,55 @@ def _is_reloading_response(resp: dict) -> bool:
     return "reload" in message_text
 
 
+def _deadline_response(command_type: str, timeout: float | None) -> MCPResponse:
+    return MCPResponse(
+        success=False,
+        error=f"Unity did not finish '{command_type}' within its deadline",
+        data={"state": "timeout", "timeout": timeout},
+    )
+
+
+async def _send_command_with_retry(
+    command_type: str,
+    params: Dict[str, Any],
+    instance_id: Optional[str],
+    max_retries: int | None,
+    retry_ms: int | None,
+    timeout: float | None = None,
+) -> Dict[str, Any]:
+    """Coroutine behind both retry helpers; runs on the transport loop."""
+    if max_retries is None:
+        max_retries = getattr(config, "reload_max_retries", 40)
+    if retry_ms is None:
+        retry_ms = getattr(config, "reload_retry_ms", 250)
+
+    with call_deadline(timeout):
+        try:
+            conn = await get_unity_connection_pool().async_get_connection(instance_id)
+            response = await conn.send_command(command_type, params)
+            retries = 0
+            while _is_reloading_response(response) and retries < max_retries:
+                # Once the status file says so, the resend parks until the reload ends;
+                # until then Unity knows before its status file does, so back off briefly
+                if not conn.reload_gate.reloading(refresh=True):
+                    delay_ms = int(response.get("retry_after_ms", retry_ms)
+                                   ) if isinstance(response, dict) else retry_ms
+                    await asyncio.sleep(_time_left(max(0.0, delay_ms / 1000.0)))
+                retries += 1
+                response = await conn.send_command(command_type, params)
+            return response
+        except DeadlineExceeded:
+            return _deadline_response(command_type, timeout)
+
+
 def send_command_with_retry(
     command_type: str,
     params: Dict[str, Any],
     *,
     instance_id: Optional[str] = None,
     max_retries: int | None = None,
-    retry_ms: int | None = None
+    retry_ms: int | None = None,
+    timeout: float | None = None
 ) -> Dict[str, Any]:
     """Send a command to a Unity instance, waiting politely through Unity reloads.
 
@@ -686,28 +3161,21 @@ def send_command_with_retry(
         instance_id: Optional Unity instance identifier (name, hash, name@hash, etc.)
         max_retries: Maximum number of retries for reload states
         retry_ms: Delay between retries in milliseconds
+        timeout: Overall deadline in seconds, covering retries, reload waits and
+            socket reads (heartbeats from Unity do not extend it); also honours
+            an enclosing call_deadline()
 
     Returns:
-        Response dictionary from Unity
+        Response dictionary from Unity. File contents the bridge sent as binary
+        attachments are memoryviews; see attachment_text()
 
     Uses config.reload_retry_ms and config.reload_max_retries by default. Preserves the
-    structured failure if retries are exhausted.
+    structured failure if retries are exhausted. Calls made while the instance's status
+    file reports a reload are parked (see ReloadGate) rather than resent on a timer.
+    A call that runs out of time returns an MCPResponse with data["state"] == "timeout".
     """
-    conn = get_unity_connection(instance_id)
-    if max_retries is None:
-        max_retries = getattr(config, "reload_max_retries", 40)
-    if retry_ms is None:
-        retry_ms = getattr(config, "reload_retry_ms", 250)
-
-    response = conn.send_command(command_type, params)
-    retries = 0
-    while _is_reloading_response(response) and retries < max_retries:
-        delay_ms = int(response.get("retry_after_ms", retry_ms)
-                       ) if isinstance(response, dict) else retry_ms
-        time.sleep(max(0.0, delay_ms / 1000.0))
-        retries += 1
-        response = conn.send_command(command_type, params)
-    return response
+    return _transport.run(_send_command_with_retry(
+        command_type, params, instance_id, max_retries, retry_ms, timeout))
 
 
 async def async_send_command_with_retry(
@@ -717,29 +3185,69 @@ async def async_send_command_with_retry(
     instance_id: Optional[str] = None,
     loop=None,
     max_retries: int | None = None,
-    retry_ms: int | None = None
+    retry_ms: int | None = None,
+    timeout: float | None = None
 ) -> dict[str, Any] | MCPResponse:
-    """Async wrapper that runs the blocking retry helper in a thread pool.
+    """Async variant of send_command_with_retry that never blocks a thread.
 
     Args:
         command_type: The command type to send
         params: Command parameters
         instance_id: Optional Unity instance identifier
-        loop: Optional asyncio event loop
+        loop: Deprecated and ignored; calls always run on the transport loop
         max_retries: Maximum number of retries for reload states
         retry_ms: Delay between retries in milliseconds
+        timeout: Overall deadline in seconds (see send_command_with_retry)
 
     Returns:
-        Response dictionary or MCPResponse on error
+        Response dictionary or MCPResponse on error; attachments as for
+        send_command_with_retry()
     """
     try:
-        import asyncio  # local import to avoid mandatory asyncio dependency for sync callers
-        if loop is None:
-            loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(
-            None,
-            lambda: send_command_with_retry(
-                command_type, params, instance_id=instance_id, max_retries=max_retries, retry_ms=retry_ms),
-        )
+        return await _transport.run_async(_send_command_with_retry(
+            command_type, params, instance_id, max_retries, retry_ms, timeout))
     except Exception as e:
         return MCPResponse(success=False, error=str(e))
+
+
+async def _next_batch(batches: AsyncIterator[List[tuple]]) -> List[tuple]:
+    return await batches.__anext__()
+
+
+async def async_iter_command_items(
+    command_type: str,
+    params: dict[str, Any],
+    *,
+    instance_id: Optional[str] = None,
+    item_depth: int = 3,
+    timeout: float | None = None
+) -> AsyncIterator[tuple]:
+    """Yield (path, item) pairs from a command's result while the response is still arriving.
+
+    Args:
+        command_type: The command type to send
+        params: Command parameters
+        instance_id: Optional Unity instance identifier
+        item_depth: Depth at which array elements are emitted; see IncrementalJSONDecoder
+        timeout: Seconds to wait for each response chunk (config.connection_timeout by default);
+            an enclosing call_deadline() bounds the whole stream
+
+    Paths are relative to the result, so the elements of {"items": [...]} arrive
+    as (('items', 0), item), (('items', 1), item), ... Use this for very large
+    responses (hierarchies, search results) that should be forwarded or
+    filtered instead of materialized whole. Does not retry through reloads.
+    """
+    pool = await _transport.run_async(
+        get_unity_connection_pool().async_get_connection(instance_id))
+    batches = pool.iter_result_batches(
+        command_type, params, item_depth=item_depth, timeout=timeout)
+    try:
+        while True:
+            try:
+                batch = await _transport.run_async(_next_batch(batches))
+            except StopAsyncIteration:
+                return
+            for entry in batch:
+                yield entry
+    finally:
+        await _transport.run_async(batches.aclose())
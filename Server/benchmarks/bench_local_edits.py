@@ -0,0 +1,179 @@
+"""
+Local edit engine benchmark: _apply_edits_locally against the implementation it replaced.
+
+The previous engine split the whole text into lines and summed line lengths
+for every replace_range and rebuilt the string after every edit, so a batch
+of k edits on an n-line file cost O(k*n). The piece table maps line/column
+positions through line-break indexes and builds the string once. This times
+batches of replace_range edits (spread over the file, each with a small
+insertion), plus a mixed batch with anchor and regex edits, on a generated
+script of --lines lines.
+
+legacy_apply_edits() is that previous implementation, kept verbatim as the
+reference the property tests compare against.
+
+Usage (from the server directory):
+
+    python -m benchmarks.bench_local_edits [--lines 20000] [--batches 1,10,100,1000] [--seconds S]
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+
+def legacy_apply_edits(original_text: str, edits: list[dict[str, Any]]) -> str:
+    from tools.script_apply_edits import _find_best_anchor_match
+
+    text = original_text
+    for edit in edits or []:
+        op = (
+            (edit.get("op")
+             or edit.get("operation")
+             or edit.get("type")
+             or edit.get("mode")
+             or "")
+            .strip()
+            .lower()
+        )
+
+        if not op:
+            allowed = "anchor_insert, prepend, append, replace_range, regex_replace"
+            raise RuntimeError(
+                f"op is required; allowed: {allowed}. Use 'op' (aliases accepted: type/mode/operation)."
+            )
+
+        if op == "prepend":
+            prepend_text = edit.get("text", "")
+            text = (prepend_text if prepend_text.endswith(
+                "\n") else prepend_text + "\n") + text
+        elif op == "append":
+            append_text = edit.get("text", "")
+            if not text.endswith("\n"):
+                text += "\n"
+            text += append_text
+            if not text.endswith("\n"):
+                text += "\n"
+        elif op == "anchor_insert":
+            anchor = edit.get("anchor", "")
+            position = (edit.get("position") or "before").lower()
+            insert_text = edit.get("text", "")
+            flags = re.MULTILINE | (
+                re.IGNORECASE if edit.get("ignore_case") else 0)
+
+            # Find the best match using improved heuristics
+            match = _find_best_anchor_match(
+                anchor, text, flags, bool(edit.get("prefer_last", True)))
+            if not match:
+                if edit.get("allow_noop", True):
+                    continue
+                raise RuntimeError(f"anchor not found: {anchor}")
+            idx = match.start() if position == "before" else match.end()
+            text = text[:idx] + insert_text + text[idx:]
+        elif op == "replace_range":
+            start_line = int(edit.get("startLine", 1))
+            start_col = int(edit.get("startCol", 1))
+            end_line = int(edit.get("endLine", start_line))
+            end_col = int(edit.get("endCol", 1))
+            replacement = edit.get("text", "")
+            lines = text.splitlines(keepends=True)
+            max_line = len(lines) + 1  # 1-based, exclusive end
+            if (start_line < 1 or end_line < start_line or end_line > max_line
+                    or start_col < 1 or end_col < 1):
+                raise RuntimeError("replace_range out of bounds")
+
+            def index_of(line: int, col: int) -> int:
+                if line <= len(lines):
+                    return sum(len(l) for l in lines[: line - 1]) + (col - 1)
+                return sum(len(l) for l in lines)
+            a = index_of(start_line, start_col)
+            b = index_of(end_line, end_col)
+            text = text[:a] + replacement + text[b:]
+        elif op == "regex_replace":
+            pattern = edit.get("pattern", "")
+            repl = edit.get("replacement", "")
+            # Translate $n backrefs (our input) to Python \g<n>
+            repl_py = re.sub(r"\$(\d+)", r"\\g<\1>", repl)
+            count = int(edit.get("count", 0))  # 0 = replace all
+            flags = re.MULTILINE
+            if edit.get("ignore_case"):
+                flags |= re.IGNORECASE
+            text = re.sub(pattern, repl_py, text, count=count, flags=flags)
+        else:
+            allowed = "anchor_insert, prepend, append, replace_range, regex_replace"
+            raise RuntimeError(
+                f"unknown edit op: {op}; allowed: {allowed}. Use 'op' (aliases accepted: type/mode/operation).")
+    return text
+
+
+def generate_text(lines: int) -> str:
+    body = "".join(f"        private float speed{i} = {i}.5f; // tuning\n" for i in range(lines - 4))
+    return f"using UnityEngine;\n\npublic class Tuning : MonoBehaviour\n{{\n{body}}}\n"
+
+
+def range_edits(lines: int, count: int, seed: int = 7) -> list[dict[str, Any]]:
+    rng = random.Random(seed)
+    return [{"op": "replace_range", "startLine": line, "startCol": 9, "endLine": line, "endCol": 16,
+             "text": "internal"} for line in (rng.randrange(5, lines - 2) for _ in range(count))]
+
+
+def mixed_edits(lines: int, count: int) -> list[dict[str, Any]]:
+    edits = range_edits(lines, count)
+    edits.insert(len(edits) // 2, {"op": "anchor_insert", "anchor": r"^public class", "text": "[Serializable]\n"})
+    edits.append({"op": "regex_replace", "pattern": r"// tuning$", "replacement": "// tuned", "count": 50})
+    return edits
+
+
+def _time_per_call(fn: Callable[[], Any], seconds: float) -> float:
+    """Seconds per call, from the best of three batches sized to fill `seconds`."""
+    fn()
+    calls = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= seconds / 3 or calls >= 1 << 16:
+            break
+        calls *= 2
+    best = elapsed
+    for _ in range(2):
+        started = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        best = min(best, time.perf_counter() - started)
+    return best / calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lines", type=int, default=20000, help="lines in the generated script")
+    parser.add_argument("--batches", default="1,10,100,1000", help="comma-separated batch sizes")
+    parser.add_argument("--seconds", type=float, default=1.0,
+                        help="approximate time spent per measurement")
+    args = parser.parse_args()
+
+    from tools.script_apply_edits import _apply_edits_locally
+
+    text = generate_text(args.lines)
+    print(f"{args.lines} lines, {len(text) / 1024:.0f} KiB")
+    print(f"{'batch':>14} {'edits':>6} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8}")
+    for size in (int(b) for b in args.batches.split(",")):
+        for label, edits in (("replace_range", range_edits(args.lines, size)),
+                             ("mixed", mixed_edits(args.lines, size))):
+            assert _apply_edits_locally(text, edits) == legacy_apply_edits(text, edits)
+            legacy = _time_per_call(lambda: legacy_apply_edits(text, edits), args.seconds)
+            engine = _time_per_call(lambda: _apply_edits_locally(text, edits), args.seconds)
+            print(f"{label:>14} {len(edits):6d} {legacy * 1e3:10.2f} {engine * 1e3:10.2f} "
+                  f"{legacy / engine:7.1f}x", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Replay a recorded session of bridge traffic against the stand-in bridge.
+
+A capture (run the server with --capture PATH or UNITY_MCP_CAPTURE=PATH, or
+call unity_connection.start_capture()) holds every request the server sent to
+Unity with its response and how long the round trip took. This tool serves
+those responses from the stand-in bridge, holding each back for its recorded
+duration, and sends the requests again through an InstanceConnectionPool at
+their recorded offsets. A production session (large hierarchies, console
+floods, edit bursts) becomes a repeatable latency and memory workload with no
+editor running.
+
+--speed divides both the gaps between requests and the recorded durations;
+--speed 0 sends each request as soon as the previous one returned and answers
+at once. Requests are matched to responses by command type and parameters
+(idempotency keys aside), in recorded order. Round trips that failed in the
+capture (timeouts, dropped sockets) are skipped.
+
+Reports per-command latency (p50/p99/max), measured at the pool and so
+including its queueing, wall time and peak RSS, plus the peak traced Python
+allocations with --trace-memory. The stand-in bridge runs in this process,
+so memory figures include it: compare runs with each other.
+
+Usage (from the server directory):
+
+    python -m benchmarks.replay_capture CAPTURE [--speed 1] [--lockstep] [--trace-memory] [--json OUT]
+"""
+import argparse
+import asyncio
+from collections import defaultdict, deque
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+SERVER_DIR = Path(__file__).resolve().parents[1]
+if str(SERVER_DIR) not in sys.path:
+    sys.path.insert(0, str(SERVER_DIR))
+
+INSTANCE_ID = "Replay@replay001"
+
+
+def _command(request: bytes) -> tuple[str, dict]:
+    if request.strip() == b"ping":
+        return "ping", {}
+    command = json.loads(request)
+    return command.get("type"), command.get("params") or {}
+
+
+def _key(command_type: str | None, params: dict) -> str:
+    return json.dumps([command_type, params], sort_keys=True, separators=(",", ":"))
+
+
+def _with_blobs(value: Any, attachments: list[bytes]) -> Any:
+    """Put attachment bytes back where the response refers to them, for the
+    stand-in bridge to send as attachment frames again."""
+    if isinstance(value, dict):
+        if set(value) == {"$attachment"}:
+            return attachments[value["$attachment"]]
+        return {key: _with_blobs(item, attachments) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_with_blobs(item, attachments) for item in value]
+    return value
+
+
+class CaptureResponder:
+    """Stand-in bridge handler answering commands with their recorded responses."""
+
+    def __init__(self, exchanges: list, speed: float):
+        self.speed = speed
+        self.misses = 0
+        self._responses: dict[str, deque] = defaultdict(deque)
+        self._lock = threading.Lock()
+        for exchange in exchanges:
+            if exchange.command_type != "ping":
+                self._responses[_key(*_command(exchange.request))].append(exchange)
+
+    def __call__(self, command: dict) -> Any:
+        key = _key(command.get("type"), command.get("params") or {})
+        with self._lock:
+            pending = self._responses.get(key)
+            exchange = pending.popleft() if pending else None
+            if exchange is None:
+                self.misses += 1
+        if exchange is None:
+            return {"status": "error", "error": "Command not in the capture"}
+        if self.speed:
+            time.sleep(exchange.elapsed / self.speed)
+        if not exchange.attachments:
+            return exchange.response
+        return _with_blobs(json.loads(exchange.response), exchange.attachments)
+
+
+async def _drive(port: int, exchanges: list, speed: float) -> tuple[dict, int]:
+    from unity_connection import InstanceConnectionPool, UnityCommandError
+
+    pool = InstanceConnectionPool(port=port, instance_id=INSTANCE_ID)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    failures = [0]
+
+    async def send(exchange) -> None:
+        command_type, params = _command(exchange.request)
+        started = time.perf_counter()
+        try:
+            await pool.send_command(command_type, params)
+        except UnityCommandError:
+            pass  # Recorded error responses are replayed like any other
+        except Exception:
+            failures[0] += 1
+            return
+        latencies[command_type].append(time.perf_counter() - started)
+
+    try:
+        if not speed:
+            for exchange in exchanges:
+                await send(exchange)
+        else:
+            origin = time.perf_counter()
+            first = exchanges[0].started
+            tasks = []
+            for exchange in exchanges:
+                wait = (exchange.started - first) / speed - (time.perf_counter() - origin)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                tasks.append(asyncio.create_task(send(exchange)))
+            await asyncio.gather(*tasks)
+    finally:
+        await pool.disconnect()
+    return latencies, failures[0]
+
+
+def _peak_rss_mib() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def replay(path: str, speed: float = 1.0, multiplex: bool = True,
+           trace_memory: bool = False) -> dict[str, Any]:
+    """Replay a capture file; return the summary main() prints."""
+    from tests.integration.stand_in_bridge import StandInBridge
+    from unity_connection import read_capture
+
+    recorded = list(read_capture(path))
+    exchanges = sorted((e for e in recorded if e.response is not None), key=lambda e: e.started)
+    if not exchanges:
+        raise ValueError(f"{path} holds no successful round trips")
+    responder = CaptureResponder(exchanges, speed)
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with StandInBridge(responder, multiplex=multiplex, attachments=multiplex,
+                           compress=("zlib",) if multiplex else (), dedupe=True) as bridge:
+            started = time.perf_counter()
+            latencies, failures = asyncio.run(_drive(bridge.port, exchanges, speed))
+            wall = time.perf_counter() - started
+        traced_peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    commands = {}
+    for command_type, samples in sorted(latencies.items()):
+        samples.sort()
+        commands[command_type] = {
+            "calls": len(samples),
+            "p50_ms": statistics.median(samples) * 1e3,
+            "p99_ms": samples[max(0, int(len(samples) * 0.99) - 1)] * 1e3,
+            "max_ms": samples[-1] * 1e3,
+        }
+    return {
+        "capture": str(path),
+        "speed": speed,
+        "recorded": len(recorded),
+        "skipped": len(recorded) - len(exchanges),
+        "replayed": sum(c["calls"] for c in commands.values()),
+        "failures": failures,
+        "misses": responder.misses,
+        "recorded_seconds": exchanges[-1].started + exchanges[-1].elapsed - exchanges[0].started,
+        "wall_seconds": wall,
+        "traced_peak_mib": traced_peak / (1024 * 1024) if traced_peak is not None else None,
+        "rss_peak_mib": _peak_rss_mib(),
+        "commands": commands,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("capture", help="capture file written by the server")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="pacing multiplier (1 = as recorded, 0 = back to back)")
+    parser.add_argument("--lockstep", action="store_true",
+                        help="replay over lock-step sockets instead of multiplexed ones")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also report peak Python allocations (slows the replay)")
+    parser.add_argument("--json", metavar="OUT", help="also write the summary as JSON to OUT")
+    args = parser.parse_args()
+
+    # Keep real status files out of the replay
+    os.environ["HOME"] = tempfile.mkdtemp(prefix="unity-mcp-replay-")
+    from config import config
+    config.status_watch = False
+
+    summary = replay(args.capture, args.speed, not args.lockstep, args.trace_memory)
+    print(f"{summary['replayed']} of {summary['recorded']} round trips at speed {args.speed:g} "
+          f"({summary['skipped']} failed in the capture, {summary['failures']} failed now, "
+          f"{summary['misses']} unmatched)")
+    print(f"{'command':<28} {'calls':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for command_type, stats in summary["commands"].items():
+        print(f"{command_type:<28} {stats['calls']:7d} {stats['p50_ms']:9.2f} "
+              f"{stats['p99_ms']:9.2f} {stats['max_ms']:9.2f}")
+    print(f"wall {summary['wall_seconds']:.2f}s (recorded {summary['recorded_seconds']:.2f}s)", end="")
+    if summary["traced_peak_mib"] is not None:
+        print(f", traced peak {summary['traced_peak_mib']:.1f} MiB", end="")
+    if summary["rss_peak_mib"] is not None:
+        print(f", peak RSS {summary['rss_peak_mib']:.1f} MiB", end="")
+    print()
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Background supervisor that keeps warm connections to every Unity instance.
+
+One task on the transport loop sweeps every config.supervisor_interval
+seconds. Each sweep:
+
+- rediscovers instances, which keeps the pool's instance list fresh for
+  routing and set_active_instance;
+- connects (framing handshake included) to every instance it does not yet
+  hold a socket for, so the first call to a newly selected instance does not
+  pay for connect plus handshake;
+- pings an idle socket per instance and records the heartbeat sequence and
+  age from the status file and the round-trip latency;
+- tracks domain reloads, sweeping every config.supervisor_reload_interval
+  while one is in progress, so the socket is reconnected as soon as Unity is
+  back rather than by the first request after it;
+- forgets instances missing from discovery for config.supervisor_reap_after
+  seconds, closing their sockets.
+
+Connection failures go through the instance's circuit breaker like any
+other call, so the breaker notices a dead editor before a tool does.
+"""
+import asyncio
+import concurrent.futures
+import contextlib
+from dataclasses import dataclass
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import config
+from models import UnityInstanceInfo
+from status_index import StatusEntry, get_status_index
+from unity_connection import (
+    CircuitBreaker,
+    UnityConnectionPool,
+    get_transport_loop,
+    get_unity_connection_pool,
+)
+
+logger = logging.getLogger("mcp-for-unity-server")
+
+# Weight of the newest sample in the smoothed ping latency
+_LATENCY_SMOOTHING = 0.2
+
+
+@dataclass
+class InstanceHealth:
+    """What the supervisor knows about one instance."""
+    instance_id: str
+    hash: str
+    state: str = "discovered"
+    heartbeat_seq: int | None = None
+    heartbeat_age: float | None = None
+    latency_ms: float | None = None
+    latency_ms_avg: float | None = None
+    pings: int = 0
+    ping_failures: int = 0
+    connects: int = 0
+    reloads: int = 0
+    reloading: bool = False
+    last_seen: float = float('-inf')
+
+    def observe(self, entry: StatusEntry | None) -> None:
+        """Take the heartbeat sequence, age and reload state from the status file."""
+        if entry is None:
+            return
+        seq = entry.data.get('seq')
+        seq = seq if isinstance(seq, int) else None
+        # The bridge's counter restarts with the domain; a drop means a reload we missed
+        restarted = seq is not None and self.heartbeat_seq is not None and seq < self.heartbeat_seq
+        if (entry.reloading and not self.reloading) or (restarted and not self.reloading):
+            self.reloads += 1
+        self.reloading = entry.reloading
+        self.heartbeat_seq = seq
+        self.heartbeat_age = round(entry.heartbeat_age(), 3)
+        if self.reloading:
+            self.state = "reloading"
+
+    def record_ping(self, latency_ms: float) -> None:
+        self.pings += 1
+        self.latency_ms = round(latency_ms, 3)
+        if self.latency_ms_avg is None:
+            self.latency_ms_avg = self.latency_ms
+        else:
+            self.latency_ms_avg = round(
+                self.latency_ms_avg + _LATENCY_SMOOTHING * (latency_ms - self.latency_ms_avg), 3)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "heartbeat_seq": self.heartbeat_seq,
+            "heartbeat_age": self.heartbeat_age,
+            "latency_ms": self.latency_ms,
+            "latency_ms_avg": self.latency_ms_avg,
+            "pings": self.pings,
+            "ping_failures": self.ping_failures,
+            "connects": self.connects,
+            "reloads": self.reloads,
+        }
+
+
+class InstanceSupervisor:
+    """Keeps the connection pool warm; see the module docstring.
+
+    start() and stop() may be called from any thread except the transport
+    loop's; sweep() must be awaited on the transport loop.
+    """
+
+    def __init__(self, pool: UnityConnectionPool | None = None):
+        self._pool = pool
+        self._health: Dict[str, InstanceHealth] = {}
+        self._task: asyncio.Task | None = None
+        self._wake: asyncio.Event | None = None
+        self._stats: Dict[str, int] = {"sweeps": 0, "reaped": 0}
+        # Resolves with snapshot() once the first sweep has finished
+        self.first_sweep: concurrent.futures.Future = concurrent.futures.Future()
+
+    @property
+    def pool(self) -> UnityConnectionPool:
+        return self._pool or get_unity_connection_pool()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start sweeping in the background (no-op if already running)."""
+        asyncio.run_coroutine_threadsafe(self._start(), get_transport_loop()).result()
+
+    def stop(self) -> None:
+        """Stop sweeping; connections stay open. No-op if it never started."""
+        if self._task is None:
+            # Nothing to cancel, and no reason to start the transport loop for it
+            return
+        asyncio.run_coroutine_threadsafe(self._stop(), get_transport_loop()).result()
+
+    def wake(self) -> None:
+        """Sweep now instead of at the next interval."""
+        if self._wake is not None:
+            get_transport_loop().call_soon_threadsafe(self._wake.set)
+
+    async def _start(self) -> None:
+        if not self.running:
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.debug(f"Instance supervisor sweep failed: {e}")
+            if not self.first_sweep.done():
+                self.first_sweep.set_result(self.snapshot())
+            reloading = any(h.reloading for h in self._health.values())
+            interval = config.supervisor_reload_interval if reloading else config.supervisor_interval
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), interval)
+            self._wake.clear()
+
+    async def sweep(self) -> None:
+        """Discover instances, warm and ping their connections and reap the missing."""
+        pool = self.pool
+        instances = await pool.async_discover_all_instances(force_refresh=True)
+        now = time.monotonic()
+        await asyncio.gather(*(self._tend(inst, now) for inst in instances), return_exceptions=True)
+
+        seen = {inst.id for inst in instances}
+        index = get_status_index()
+        for instance_id, health in list(self._health.items()):
+            if instance_id in seen:
+                continue
+            # A reloading editor closes its port, so discovery misses it for a while
+            entry = index.get(health.hash)
+            health.observe(entry)
+            if entry is not None and entry.reloading and not entry.is_stale():
+                health.last_seen = now
+            elif now - health.last_seen >= config.supervisor_reap_after:
+                await pool.async_forget_instance(instance_id)
+                del self._health[instance_id]
+                self._stats["reaped"] += 1
+            else:
+                health.state = "missing"
+        self._stats["sweeps"] += 1
+
+    async def _tend(self, inst: UnityInstanceInfo, now: float) -> None:
+        health = self._health.get(inst.id)
+        if health is None:
+            health = self._health[inst.id] = InstanceHealth(inst.id, inst.hash)
+        health.last_seen = now
+        health.observe(get_status_index().get(inst.hash))
+        if health.reloading:
+            # ReloadGate parks callers meanwhile; reconnect once Unity reports ready
+            return
+
+        conn = self.pool.instance_pool(inst)
+        # Half-open: the breaker's single probe runs here rather than in a caller
+        if conn.breaker.state != CircuitBreaker.CLOSED and await conn.admit() is not None:
+            health.state = "unavailable"
+            return
+        if not conn.connected:
+            if not await conn.connect():
+                health.state = "unreachable"
+                return
+            health.connects += 1
+        try:
+            latency_ms = await conn.heartbeat(config.supervisor_ping_timeout)
+        except ConnectionError:
+            health.ping_failures += 1
+            if not await conn.connect():
+                health.state = "unreachable"
+                return
+            health.connects += 1
+        else:
+            if latency_ms is not None:
+                health.record_ping(latency_ms)
+        health.state = "ready"
+
+    def get_health(self) -> Dict[str, Dict[str, Any]]:
+        """Per-instance health keyed by instance id."""
+        return {instance_id: health.snapshot() for instance_id, health in list(self._health.items())}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {"running": self.running, **self._stats, "instances": self.get_health()}
+
+
+_instance_supervisor: Optional[InstanceSupervisor] = None
+_instance_supervisor_lock = threading.Lock()
+
+
+def get_instance_supervisor() -> InstanceSupervisor:
+    """The process-wide instance supervisor (created stopped)."""
+    global _instance_supervisor
+    if _instance_supervisor is None:
+        with _instance_supervisor_lock:
+            if _instance_supervisor is None:
+                _instance_supervisor = InstanceSupervisor()
+    return _instance_supervisor
@@ -0,0 +1,161 @@
+"""
+JSON encoding and decoding for the Unity transport and tool result paths.
+
+Uses orjson or msgspec when installed and falls back to the standard library.
+Every backend encodes to UTF-8 bytes with non-ASCII characters kept as-is and
+decodes bytes, bytearrays and memoryviews directly, without building an
+intermediate str where the backend allows it. Values a fast backend would
+encode differently (NaN and Infinity, which it writes as null) go through the
+standard library, so every backend produces the same JSON text.
+
+The backend is picked once at import from config.json_codec ("auto", "orjson",
+"msgspec" or "json"); the UNITY_MCP_JSON_CODEC environment variable overrides
+it, and set_codec() switches it at runtime.
+"""
+import json
+import logging
+import math
+import os
+from typing import Any, Callable, Dict, List
+
+from config import config
+
+logger = logging.getLogger("mcp-for-unity-server")
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None  # type: ignore
+    HAS_ORJSON = False
+
+try:
+    import msgspec
+    HAS_MSGSPEC = True
+except ImportError:
+    msgspec = None  # type: ignore
+    HAS_MSGSPEC = False
+
+# Decode errors from every backend are raised as this (orjson's own error
+# already subclasses it), so callers keep catching json.JSONDecodeError
+JSONDecodeError = json.JSONDecodeError
+
+
+class Codec:
+    """One JSON backend.
+
+    decodes_buffers is True when loads() parses bytes-like input in place;
+    otherwise it decodes the buffer to str first.
+    """
+
+    def __init__(self, name: str, dumps: Callable[..., bytes], loads: Callable[[Any], Any],
+                 decodes_buffers: bool):
+        self.name = name
+        self.dumps = dumps
+        self.loads = loads
+        self.decodes_buffers = decodes_buffers
+
+
+def _stdlib_dumps(obj: Any, indent: bool = False) -> bytes:
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _stdlib_loads(data: Any) -> Any:
+    if isinstance(data, (memoryview, bytearray)):
+        data = str(data, 'utf-8')
+    return json.loads(data)
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """True when obj holds a NaN or infinite float anywhere."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return any(_has_non_finite(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(v) for v in obj)
+    return False
+
+
+def _orjson_dumps(obj: Any, indent: bool = False) -> bytes:
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    try:
+        data = orjson.dumps(obj, option=option)
+    except TypeError:
+        # Values orjson rejects (ints beyond 64 bits, unknown types) get the
+        # standard library's chance, and its error if that fails too
+        return _stdlib_dumps(obj, indent)
+    # orjson writes NaN and Infinity as null; the standard library keeps them
+    if b'null' in data and _has_non_finite(obj):
+        return _stdlib_dumps(obj, indent)
+    return data
+
+
+def _orjson_loads(data: Any) -> Any:
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # NaN/Infinity are accepted by the standard library (and Unity's Json.NET)
+        return _stdlib_loads(data)
+
+
+def _msgspec_dumps(obj: Any, indent: bool = False) -> bytes:
+    try:
+        data = _msgspec_encoder.encode(obj)
+    except (TypeError, OverflowError):
+        return _stdlib_dumps(obj, indent)
+    # Like orjson, msgspec writes NaN and Infinity as null
+    if b'null' in data and _has_non_finite(obj):
+        return _stdlib_dumps(obj, indent)
+    return msgspec.json.format(data, indent=2) if indent else data
+
+
+def _msgspec_loads(data: Any) -> Any:
+    try:
+        return _msgspec_decoder.decode(data)
+    except msgspec.DecodeError:
+        return _stdlib_loads(data)
+
+
+CODECS: Dict[str, Codec] = {
+    'json': Codec('json', _stdlib_dumps, _stdlib_loads, decodes_buffers=False),
+}
+if HAS_MSGSPEC:
+    _msgspec_encoder = msgspec.json.Encoder()
+    _msgspec_decoder = msgspec.json.Decoder()
+    CODECS['msgspec'] = Codec('msgspec', _msgspec_dumps, _msgspec_loads, decodes_buffers=True)
+if HAS_ORJSON:
+    CODECS['orjson'] = Codec('orjson', _orjson_dumps, _orjson_loads, decodes_buffers=True)
+
+# Preference order for "auto"
+_AUTO_ORDER: List[str] = ['orjson', 'msgspec', 'json']
+
+codec: Codec = CODECS['json']
+
+
+def set_codec(name: str = 'auto') -> Codec:
+    """Select the backend used by dumps()/loads(); unknown or missing ones fall back to stdlib."""
+    global codec
+    name = (name or 'auto').strip().lower()
+    if name == 'auto':
+        name = next(n for n in _AUTO_ORDER if n in CODECS)
+    elif name not in CODECS:
+        logger.warning(f"JSON codec '{name}' is not available; using the standard library")
+        name = 'json'
+    codec = CODECS[name]
+    return codec
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode obj as UTF-8 JSON bytes; compact unless indent is set."""
+    return codec.dumps(obj, indent)
+
+
+def loads(data: Any) -> Any:
+    """Decode JSON from str, bytes, bytearray or memoryview."""
+    return codec.loads(data)
+
+
+set_codec(os.environ.get('UNITY_MCP_JSON_CODEC') or getattr(config, 'json_codec', 'auto'))
@@ -11,20 +11,31 @@ What changed and why:
   (quick socket connect + ping) before choosing it.
 """
 
+from concurrent.futures import ThreadPoolExecutor, wait
 import glob
-import json
 import logging
 import os
 import struct
 from datetime import datetime
 from pathlib import Path
 import socket
-from typing import Optional, List, Dict
+import threading
+import time
+from typing import Iterable, Optional, List, Dict
 
+from config import config
+import json_codec
 from models import UnityInstanceInfo
+from status_index import get_status_index
 
 logger = logging.getLogger("mcp-for-unity-server")
 
+# Probe results keyed by (port, mtime of the file that named the port)
+_probe_cache: Dict[tuple, tuple[bool, float]] = {}
+_probe_lock = threading.Lock()
+_probe_executor: ThreadPoolExecutor | None = None
+_probe_executor_workers = 0
+
 
 class PortDiscovery:
     """Handles port discovery from Unity Bridge registry"""
@@ -111,20 +122,71 @@ class PortDiscovery:
             logger.debug(f"Connection failed for port {port}: {e}")
             return False
 
+    @staticmethod
+    def _get_probe_executor() -> ThreadPoolExecutor:
+        global _probe_executor, _probe_executor_workers
+        workers = max(1, int(config.discovery_max_workers))
+        with _probe_lock:
+            if _probe_executor is None or _probe_executor_workers != workers:
+                if _probe_executor is not None:
+                    _probe_executor.shutdown(wait=False)
+                _probe_executor = ThreadPoolExecutor(max_workers=workers,
+                                                     thread_name_prefix="unity-probe")
+                _probe_executor_workers = workers
+            return _probe_executor
+
+    @staticmethod
+    def probe_ports(targets: Iterable[tuple[int, float]]) -> Dict[tuple[int, float], bool]:
+        """Probe (port, file mtime) targets concurrently; return which ones answered.
+
+        Results are cached per target for config.discovery_probe_cache_ttl, so a
+        status file that has not changed since its port refused is not probed
+        again. Probes still running at config.discovery_deadline count as not
+        responding and are not cached.
+        """
+        now = time.monotonic()
+        results: Dict[tuple[int, float], bool] = {}
+        pending: Dict[int, List[tuple[int, float]]] = {}
+        with _probe_lock:
+            for key in [k for k, (_, at) in _probe_cache.items()
+                        if now - at > config.discovery_probe_cache_ttl]:
+                del _probe_cache[key]
+            for key in targets:
+                cached = _probe_cache.get(key)
+                if cached is not None:
+                    results[key] = cached[0]
+                else:
+                    # One probe per port, however many files name it
+                    pending.setdefault(key[0], []).append(key)
+        if not pending:
+            return results
+
+        executor = PortDiscovery._get_probe_executor()
+        futures = {executor.submit(PortDiscovery._try_probe_unity_mcp, port): port for port in pending}
+        done, not_done = wait(futures, timeout=config.discovery_deadline)
+        finished = time.monotonic()
+        for future in not_done:
+            future.cancel()
+            logger.debug(f"Probe of port {futures[future]} missed the discovery deadline")
+        with _probe_lock:
+            for future, port in futures.items():
+                alive = future in done and future.exception() is None and bool(future.result())
+                for key in pending[port]:
+                    results[key] = alive
+                    if future in done:
+                        _probe_cache[key] = (alive, finished)
+        return results
+
+    @staticmethod
+    def clear_probe_cache() -> None:
+        with _probe_lock:
+            _probe_cache.clear()
+
     @staticmethod
     def _read_latest_status() -> Optional[dict]:
         try:
-            base = PortDiscovery.get_registry_dir()
-            status_files = sorted(
-                (Path(p)
-                 for p in glob.glob(str(base / "unity-mcp-status-*.json"))),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True,
-            )
-            if not status_files:
-                return None
-            with status_files[0].open('r') as f:
-                return json.load(f)
+            entry = get_status_index().latest()
+            return entry.data if entry is not None else None
         except Exception:
             return None
 
@@ -149,22 +211,28 @@ class PortDiscovery:
         candidates = PortDiscovery.list_candidate_files()
 
         first_seen_port: Optional[int] = None
+        named: List[tuple[Path, tuple[int, float]]] = []
 
         for path in candidates:
             try:
-                with open(path, 'r') as f:
-                    cfg = json.load(f)
+                mtime = path.stat().st_mtime
+                with open(path, 'rb') as f:
+                    cfg = json_codec.loads(f.read())
                 unity_port = cfg.get('unity_port')
                 if isinstance(unity_port, int):
                     if first_seen_port is None:
                         first_seen_port = unity_port
-                    if PortDiscovery._try_probe_unity_mcp(unity_port):
-                        logger.info(
-                            f"Using Unity port from {path.name}: {unity_port}")
-                        return unity_port
+                    named.append((path, (unity_port, mtime)))
             except Exception as e:
                 logger.warning(f"Could not read port registry {path}: {e}")
 
+        # Probe every candidate at once; the newest responsive file still wins
+        alive = PortDiscovery.probe_ports(key for _, key in named)
+        for path, key in named:
+            if alive.get(key):
+                logger.info(f"Using Unity port from {path.name}: {key[0]}")
+                return key[0]
+
         if first_seen_port is not None:
             logger.info(
                 f"No responsive port found; using first seen value {first_seen_port}")
@@ -190,8 +258,8 @@ class PortDiscovery:
             return None
         for path in candidates:
             try:
-                with open(path, 'r') as f:
-                    return json.load(f)
+                with open(path, 'rb') as f:
+                    return json_codec.loads(f.read())
             except Exception as e:
                 logger.warning(
                     f"Could not read port configuration {path}: {e}")
@@ -225,51 +293,47 @@ class PortDiscovery:
         """
         Discover all running Unity Editor instances by scanning status files.
 
+        Ports are probed concurrently (see probe_ports()), so a scan takes about
+        one probe's time however many editors or dead status files there are.
+
         Returns:
             List of UnityInstanceInfo objects for all discovered instances
         """
         instances_by_port: Dict[int, tuple[UnityInstanceInfo, datetime]] = {}
-        base = PortDiscovery.get_registry_dir()
 
-        # Scan all status files
-        status_pattern = str(base / "unity-mcp-status-*.json")
-        status_files = glob.glob(status_pattern)
+        # Status files come from the in-process index, parsed once per change
+        entries = get_status_index().entries(include_stale=True)
+        # Probe every live-looking instance concurrently, under one deadline
+        alive = PortDiscovery.probe_ports(
+            (e.port, e.mtime) for e in entries if e.port is not None and not e.is_stale())
 
-        for status_file_path in status_files:
+        for entry in entries:
             try:
-                status_path = Path(status_file_path)
-                file_mtime = datetime.fromtimestamp(status_path.stat().st_mtime)
-
-                with status_path.open('r') as f:
-                    data = json.load(f)
-
-                # Extract hash from filename: unity-mcp-status-{hash}.json
-                filename = os.path.basename(status_file_path)
-                hash_value = filename.replace('unity-mcp-status-', '').replace('.json', '')
+                data = entry.data
+                hash_value = entry.hash
+                status_path = entry.path
 
                 # Extract information
                 project_path = data.get('project_path', '')
                 project_name = PortDiscovery._extract_project_name(project_path)
-                port = data.get('unity_port')
+                port = entry.port
                 is_reloading = data.get('reloading', False)
+                last_heartbeat = entry.last_heartbeat
 
-                # Parse last_heartbeat
-                last_heartbeat = None
-                heartbeat_str = data.get('last_heartbeat')
-                if heartbeat_str:
-                    try:
-                        last_heartbeat = datetime.fromisoformat(heartbeat_str.replace('Z', '+00:00'))
-                    except Exception:
-                        pass
+                if entry.is_stale():
+                    # The editor stopped writing heartbeats; no need to probe a dead port
+                    logger.debug(f"Skipping {project_name}@{hash_value}: heartbeat is "
+                                 f"{entry.heartbeat_age():.0f}s old")
+                    continue
 
                 # Verify port is actually responding
-                is_alive = PortDiscovery._try_probe_unity_mcp(port) if isinstance(port, int) else False
+                is_alive = alive.get((port, entry.mtime), False)
 
                 if not is_alive:
                     logger.debug(f"Instance {project_name}@{hash_value} has heartbeat but port {port} not responding")
                     continue
 
-                freshness = last_heartbeat or file_mtime
+                freshness = entry.freshness
 
                 existing = instances_by_port.get(port)
                 if existing:
@@ -291,17 +355,18 @@ class PortDiscovery:
                     port=port,
                     status="reloading" if is_reloading else "running",
                     last_heartbeat=last_heartbeat,
-                    unity_version=data.get('unity_version')  # May not be available in current version
+                    unity_version=data.get('unity_version'),  # May not be available in current version
+                    unix_socket=entry.unix_socket
                 )
 
                 instances_by_port[port] = (instance, freshness)
                 logger.debug(f"Discovered Unity instance: {instance.id} on port {instance.port}")
 
             except Exception as e:
-                logger.debug(f"Failed to parse status file {status_file_path}: {e}")
+                logger.debug(f"Failed to use status file {entry.path}: {e}")
                 continue
 
-        deduped_instances = [entry[0] for entry in sorted(instances_by_port.values(), key=lambda item: item[1], reverse=True)]
+        deduped_instances = [item[0] for item in sorted(instances_by_port.values(), key=lambda item: item[1], reverse=True)]
 
         logger.info(f"Discovered {len(deduped_instances)} Unity instances (after de-duplication by port)")
         return deduped_instances
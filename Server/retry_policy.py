@@ -0,0 +1,87 @@
+"""
+Retry policies for Unity commands, keyed by command type and action.
+
+Reads (ping, get_* commands and read-only actions such as manage_script
+read or manage_gameobject find) are idempotent: resending one is always
+safe, so they retry generously, Unity-reported errors included.
+
+Everything else is treated as a mutation. Each call carries a client
+generated idempotency key that stays the same across its attempts; a bridge
+that advertises DEDUPE=1 answers a repeated key from its cache of recent
+responses instead of applying the command again, so mutations can be resent
+just as freely. Against a bridge without it, a mutation is only resent when
+it cannot have reached Unity (the connection failed before it was written),
+and never when Unity answered with an error.
+
+Unknown commands default to the mutation policy; tools with custom commands
+can register their own with get_retry_policies().register().
+"""
+from dataclasses import dataclass
+import threading
+from typing import Any, Dict, Iterable, Optional
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How AsyncUnityConnection.send_command() retries one kind of command."""
+    # Resending cannot apply the command twice
+    idempotent: bool
+    # Resends after the first attempt (at least config.max_retries)
+    attempts: int = 10
+    # Longest pause between attempts, seconds (socket errors retry sooner)
+    backoff_cap: float = 1.0
+    # Resend when Unity answered with an error
+    retry_errors: bool = False
+
+
+READ = RetryPolicy(idempotent=True, retry_errors=True)
+MUTATION = RetryPolicy(idempotent=False)
+
+# Actions that only look at editor state, whichever command carries them
+READ_ACTIONS = frozenset({
+    "read", "get", "find", "search", "list", "validate", "get_sha", "get_info",
+    "get_state", "get_components", "get_hierarchy", "get_active", "get_build_settings",
+    "get_project_root", "get_windows", "get_active_tool", "get_selection",
+    "get_prefab_stage", "get_tags", "get_layers", "get_jsbehaviour_bindings",
+    "telemetry_status",
+})
+
+
+class RetryPolicyRegistry:
+    """Retry policies by (command type, action); see the module docstring."""
+
+    def __init__(self):
+        self._policies: Dict[tuple, RetryPolicy] = {}
+        self._lock = threading.Lock()
+
+    def register(self, command_type: str, policy: RetryPolicy,
+                 actions: Iterable[str] | None = None) -> None:
+        """Use policy for command_type, or only for the given actions of it."""
+        with self._lock:
+            for action in (actions if actions is not None else (None,)):
+                self._policies[(command_type, action.lower() if action else None)] = policy
+
+    def policy_for(self, command_type: str, params: Dict[str, Any] | None = None) -> RetryPolicy:
+        """The policy for a command: registered for its action, then for the command, then by name."""
+        action = (params or {}).get("action")
+        action = action.lower() if isinstance(action, str) else None
+        policy = self._policies.get((command_type, action)) or self._policies.get((command_type, None))
+        if policy is not None:
+            return policy
+        if command_type == "ping" or command_type.startswith("get_") or action in READ_ACTIONS:
+            return READ
+        return MUTATION
+
+
+_retry_policies: Optional[RetryPolicyRegistry] = None
+_retry_policies_lock = threading.Lock()
+
+
+def get_retry_policies() -> RetryPolicyRegistry:
+    """The process-wide retry policy registry."""
+    global _retry_policies
+    if _retry_policies is None:
+        with _retry_policies_lock:
+            if _retry_policies is None:
+                _retry_policies = RetryPolicyRegistry()
+    return _retry_policies
@@ -0,0 +1,348 @@
+"""
+In-process index of Unity status files (~/.unity-mcp/unity-mcp-status-<hash>.json).
+
+Unity rewrites its status file about twice a second with its port, reload
+state and a heartbeat timestamp. The index keeps every file's parsed contents
+keyed by project hash, so the reload preflight on the send path and instance
+discovery are dictionary lookups instead of a glob, stat, sort and JSON parse
+per call.
+
+A filesystem watcher (watchdog, or watchfiles) re-reads files as Unity writes
+them. Without one the index rescans the directory at most every
+config.status_poll_interval seconds; a rescan only stats the files and
+re-parses the ones whose mtime or size changed. With a watcher a slower
+safety rescan still runs every config.status_rescan_interval seconds in case
+events are dropped.
+
+Entries whose heartbeat is older than config.status_stale_after are stale:
+the editor has exited or hung, so discovery skips them without probing. An
+editor that reports a reload does not heartbeat until the reload or import
+is over, so its entry gets config.status_reload_stale_after instead.
+"""
+import atexit
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import logging
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from config import config
+import json_codec
+
+logger = logging.getLogger("mcp-for-unity-server")
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    HAS_WATCHDOG = True
+except ImportError:
+    FileSystemEventHandler = object  # type: ignore
+    Observer = None  # type: ignore
+    HAS_WATCHDOG = False
+
+try:
+    import watchfiles
+    HAS_WATCHFILES = True
+except ImportError:
+    watchfiles = None  # type: ignore
+    HAS_WATCHFILES = False
+
+STATUS_PREFIX = "unity-mcp-status-"
+STATUS_SUFFIX = ".json"
+
+
+def status_dir() -> Path:
+    """Directory Unity writes its status files to."""
+    return Path.home() / ".unity-mcp"
+
+
+def _hash_from_name(name: str) -> str | None:
+    if name.startswith(STATUS_PREFIX) and name.endswith(STATUS_SUFFIX):
+        return name[len(STATUS_PREFIX):-len(STATUS_SUFFIX)] or None
+    return None
+
+
+def _parse_heartbeat(value: Any) -> datetime | None:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        # .NET round-trip timestamps carry 7 fractional digits; Python < 3.11 takes 6
+        head, dot, tail = value.partition('.')
+        if not dot:
+            return None
+        digits = ''.join(c for c in tail if c.isdigit())
+        zone = tail[len(digits):].replace('Z', '+00:00')
+        try:
+            return datetime.fromisoformat(f"{head}.{digits[:6]}{zone}")
+        except ValueError:
+            return None
+
+
+@dataclass
+class StatusEntry:
+    """The parsed contents of one project's status file."""
+    hash: str
+    path: Path
+    mtime: float
+    size: int
+    data: Dict[str, Any]
+    last_heartbeat: datetime | None = field(default=None)
+
+    @classmethod
+    def load(cls, path: Path, project_hash: str, stat: os.stat_result) -> "StatusEntry":
+        data = json_codec.loads(path.read_bytes())
+        if not isinstance(data, dict):
+            raise ValueError("status file is not a JSON object")
+        return cls(project_hash, path, stat.st_mtime, stat.st_size, data,
+                   _parse_heartbeat(data.get('last_heartbeat')))
+
+    @property
+    def port(self) -> int | None:
+        port = self.data.get('unity_port')
+        return port if isinstance(port, int) else None
+
+    @property
+    def unix_socket(self) -> str | None:
+        path = self.data.get('unix_socket')
+        return path if isinstance(path, str) and path else None
+
+    @property
+    def reloading(self) -> bool:
+        return bool(self.data.get('reloading')) or self.data.get('reason') == 'reloading'
+
+    @property
+    def freshness(self) -> datetime:
+        """The heartbeat time, or the file's mtime for bridges that do not write one."""
+        if self.last_heartbeat is not None:
+            if self.last_heartbeat.tzinfo is None:
+                return self.last_heartbeat.replace(tzinfo=timezone.utc)
+            return self.last_heartbeat
+        return datetime.fromtimestamp(self.mtime, tz=timezone.utc)
+
+    def heartbeat_age(self) -> float:
+        """Seconds since the last heartbeat."""
+        return (datetime.now(timezone.utc) - self.freshness).total_seconds()
+
+    def is_stale(self) -> bool:
+        if self.reloading:
+            stale_after = getattr(config, 'status_reload_stale_after', 0)
+        else:
+            stale_after = getattr(config, 'status_stale_after', 0)
+        return bool(stale_after) and self.heartbeat_age() > stale_after
+
+
+class _WatchdogHandler(FileSystemEventHandler):
+    def __init__(self, index: "StatusIndex"):
+        super().__init__()
+        self._index = index
+
+    def on_any_event(self, event) -> None:
+        for path in (getattr(event, 'src_path', None), getattr(event, 'dest_path', None)):
+            if path:
+                self._index.refresh_path(Path(os.fsdecode(path)))
+
+
+class StatusIndex:
+    """Parsed Unity status files keyed by project hash; safe to use from any thread."""
+
+    def __init__(self, directory: Path | None = None, watch: bool | None = None):
+        # None follows status_dir(), so a changed HOME (as in tests) re-targets the index
+        self._fixed_directory = directory
+        self._watch = watch
+        self._directory: Path | None = None
+        self._home: str | None = None
+        self._entries: Dict[str, StatusEntry] = {}
+        self._lock = threading.Lock()
+        self._scanned_at = float('-inf')
+        self._watcher: Any = None
+        self._watcher_kind: str | None = None
+        self._stop_watching: threading.Event | None = None
+        self._watch_attempted_at = float('-inf')
+        self.stats: Dict[str, int] = {"lookups": 0, "scans": 0, "parses": 0, "events": 0}
+
+    @property
+    def watching(self) -> str | None:
+        """Name of the active watcher backend, or None when polling."""
+        return self._watcher_kind
+
+    def _sync(self) -> None:
+        """Re-target, start watching or rescan as needed before a read."""
+        if self._fixed_directory is not None:
+            directory = self._fixed_directory
+        else:
+            # Path.home() is slow next to a dict lookup; only redo it when HOME changes
+            home = os.environ.get('HOME') or os.environ.get('USERPROFILE')
+            if home != self._home or self._directory is None:
+                self._home = home
+                directory = status_dir()
+            else:
+                directory = self._directory
+        now = time.monotonic()
+        if directory != self._directory:
+            self.close(wait=1.0)
+            with self._lock:
+                self._directory = directory
+                self._entries = {}
+                self._scanned_at = float('-inf')
+                self._watch_attempted_at = float('-inf')
+        if self._watcher is None and now - self._watch_attempted_at >= config.status_rescan_interval:
+            with self._lock:
+                if self._watcher is None and now - self._watch_attempted_at >= config.status_rescan_interval:
+                    self._watch_attempted_at = now
+                    self._start_watcher(directory)
+        interval = config.status_rescan_interval if self._watcher is not None else config.status_poll_interval
+        if now - self._scanned_at >= interval:
+            self.rescan()
+
+    def rescan(self) -> None:
+        """Stat every status file; parse only new or changed ones and drop deleted ones."""
+        directory = self._directory or self._fixed_directory or status_dir()
+        seen: Dict[str, tuple] = {}
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    project_hash = _hash_from_name(item.name)
+                    if project_hash is None:
+                        continue
+                    try:
+                        seen[project_hash] = (Path(item.path), item.stat())
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        with self._lock:
+            self.stats["scans"] += 1
+            self._scanned_at = time.monotonic()
+            for project_hash in [h for h in self._entries if h not in seen]:
+                del self._entries[project_hash]
+            for project_hash, (path, stat) in seen.items():
+                self._update_locked(project_hash, path, stat)
+
+    def refresh_path(self, path: Path) -> None:
+        """Re-read one status file after a filesystem event."""
+        project_hash = _hash_from_name(path.name)
+        if project_hash is None:
+            return
+        with self._lock:
+            self.stats["events"] += 1
+            try:
+                stat = path.stat()
+            except OSError:
+                self._entries.pop(project_hash, None)
+                return
+            self._update_locked(project_hash, path, stat)
+
+    def _update_locked(self, project_hash: str, path: Path, stat: os.stat_result) -> None:
+        entry = self._entries.get(project_hash)
+        if entry is not None and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+            return
+        try:
+            self._entries[project_hash] = StatusEntry.load(path, project_hash, stat)
+            self.stats["parses"] += 1
+        except (OSError, ValueError) as e:
+            # Caught mid-write; keep the previous contents and retry on the next event or scan
+            logger.debug(f"Could not read status file {path.name}: {e}")
+            if entry is not None:
+                entry.mtime = -1.0
+
+    def get(self, project_hash: str) -> StatusEntry | None:
+        """The status entry for a project hash, if its file exists."""
+        self._sync()
+        self.stats["lookups"] += 1
+        return self._entries.get(project_hash)
+
+    def entries(self, include_stale: bool = False) -> List[StatusEntry]:
+        """All status entries, freshest heartbeat first."""
+        self._sync()
+        self.stats["lookups"] += 1
+        with self._lock:
+            entries = list(self._entries.values())
+        if not include_stale:
+            entries = [e for e in entries if not e.is_stale()]
+        return sorted(entries, key=lambda e: e.freshness, reverse=True)
+
+    def latest(self, include_stale: bool = False) -> StatusEntry | None:
+        """The entry with the freshest heartbeat."""
+        entries = self.entries(include_stale)
+        return entries[0] if entries else None
+
+    def _start_watcher(self, directory: Path) -> None:
+        if not (self._watch if self._watch is not None else getattr(config, 'status_watch', True)):
+            return
+        if not directory.is_dir():
+            return
+        try:
+            if HAS_WATCHDOG:
+                observer = Observer()
+                observer.schedule(_WatchdogHandler(self), str(directory), recursive=False)
+                observer.daemon = True
+                observer.start()
+                self._watcher, self._watcher_kind = observer, 'watchdog'
+            elif HAS_WATCHFILES:
+                stop = threading.Event()
+                thread = threading.Thread(target=self._watchfiles_loop, args=(directory, stop),
+                                          name="unity-status-watch", daemon=True)
+                thread.start()
+                self._watcher, self._watcher_kind, self._stop_watching = thread, 'watchfiles', stop
+            else:
+                return
+            logger.debug(f"Watching {directory} for Unity status changes ({self._watcher_kind})")
+        except Exception as e:
+            logger.debug(f"Could not watch {directory}; polling instead: {e}")
+            self._watcher = self._watcher_kind = None
+
+    def _watchfiles_loop(self, directory: Path, stop: threading.Event) -> None:
+        try:
+            for changes in watchfiles.watch(directory, stop_event=stop, debounce=50, step=20,
+                                            rust_timeout=200, recursive=False, raise_interrupt=False):
+                for _, path in changes:
+                    self.refresh_path(Path(path))
+        except Exception as e:
+            logger.debug(f"Status watcher stopped: {e}")
+        finally:
+            # Fall back to polling until a new watcher starts
+            if self._stop_watching is stop:
+                self._watcher = self._watcher_kind = None
+
+    def close(self, wait: float = 0.0) -> None:
+        """Stop the filesystem watcher, if any, waiting up to `wait` seconds for it to exit."""
+        watcher, kind = self._watcher, self._watcher_kind
+        self._watcher = self._watcher_kind = None
+        if watcher is None:
+            return
+        if kind == 'watchdog':
+            watcher.stop()
+            if wait:
+                watcher.join(wait)
+        elif self._stop_watching is not None:
+            self._stop_watching.set()
+            self._stop_watching = None
+            if wait:
+                watcher.join(wait)
+
+
+_status_index: Optional[StatusIndex] = None
+_status_index_lock = threading.Lock()
+
+
+def get_status_index() -> StatusIndex:
+    """The process-wide status index."""
+    global _status_index
+    if _status_index is None:
+        with _status_index_lock:
+            if _status_index is None:
+                _status_index = StatusIndex()
+    return _status_index
+
+
+@atexit.register
+def _close_status_index() -> None:
+    # A watcher thread still inside its native wait when the interpreter
+    # finalizes aborts the process, so stop it first
+    if _status_index is not None:
+        _status_index.close(wait=2.0)
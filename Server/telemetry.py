@@ -26,6 +26,8 @@ import uuid
 
 import tomli
 
+import json_codec
+
 try:
     import httpx
     HAS_HTTPX = True
@@ -259,9 +261,8 @@ class TelemetryCollector:
         # Load milestones (failure here must not affect UUID)
         try:
             if self.config.milestones_file.exists():
-                content = self.config.milestones_file.read_text(
-                    encoding="utf-8")
-                self._milestones = json.loads(content) or {}
+                content = self.config.milestones_file.read_bytes()
+                self._milestones = json_codec.loads(content) or {}
                 if not isinstance(self._milestones, dict):
                     self._milestones = {}
         except (OSError, json.JSONDecodeError, ValueError) as e:
@@ -271,10 +272,8 @@ class TelemetryCollector:
     def _save_milestones(self):
         """Save milestones to disk. Caller must hold self._lock."""
         try:
-            self.config.milestones_file.write_text(
-                json.dumps(self._milestones, indent=2),
-                encoding="utf-8",
-            )
+            self.config.milestones_file.write_bytes(
+                json_codec.dumps(self._milestones, indent=True))
         except OSError as e:
             logger.warning(f"Failed to save milestones: {e}", exc_info=True)
 
@@ -383,7 +382,7 @@ class TelemetryCollector:
             else:
                 import urllib.request
                 import urllib.error
-                data_bytes = json.dumps(payload).encode("utf-8")
+                data_bytes = json_codec.dumps(payload)
                 endpoint = self.config._validated_endpoint(
                     self.config.endpoint, self.config.default_endpoint)
                 req = urllib.request.Request(
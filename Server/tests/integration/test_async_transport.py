@@ -0,0 +1,67 @@
+import asyncio
+import threading
+
+import pytest
+
+import unity_connection
+
+from .stand_in_bridge import StandInBridge, use_bridge
+
+
+@pytest.fixture()
+def bridge(monkeypatch, tmp_path):
+    with StandInBridge(delay=0.005) as b:
+        b.instance_id = use_bridge(monkeypatch, tmp_path, b)
+        yield b
+    
+
+def test_sync_facade_round_trip(bridge):
+    result = unity_connection.send_command_with_retry(
+        "manage_scene", {"action": "get_active"}, instance_id=bridge.instance_id)
+    assert result == {"type": "manage_scene", "params": {"action": "get_active"}}
+
+
+def test_sync_facade_rejects_calls_from_transport_loop(bridge):
+    loop = unity_connection.get_transport_loop()
+
+    async def _blocking_call():
+        return unity_connection.send_command_with_retry("manage_scene", {})
+
+    future = asyncio.run_coroutine_threadsafe(_blocking_call(), loop)
+    with pytest.raises(RuntimeError):
+        future.result(timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_async_calls_do_not_consume_threads(bridge):
+    baseline_threads = threading.active_count()
+    calls = [
+        unity_connection.async_send_command_with_retry(
+            "read_console", {"n": i}, instance_id=bridge.instance_id)
+        for i in range(200)
+    ]
+    gathered = asyncio.gather(*calls)
+    await asyncio.sleep(0.05)
+    # 200 pending calls must not translate into 200 blocked worker threads
+    assert threading.active_count() - baseline_threads < 10
+    results = await gathered
+    assert [r["params"]["n"] for r in results] == list(range(200))
+
+
+@pytest.mark.asyncio
+async def test_reload_backoff_uses_async_sleep(monkeypatch, tmp_path):
+    state = {"calls": 0}
+
+    def reloading_then_ok(command):
+        state["calls"] += 1
+        if state["calls"] <= 2:
+            return {"status": "success", "result": {"state": "reloading", "retry_after_ms": 20}}
+        return {"status": "success", "result": {"ok": True}}
+
+    with StandInBridge(reloading_then_ok) as b:
+        instance_id = use_bridge(monkeypatch, tmp_path, b)
+        result = await unity_connection.async_send_command_with_retry(
+            "manage_editor", {}, instance_id=instance_id)
+        assert result == {"ok": True}
+        assert state["calls"] == 3
+        
\ No newline at end of file
@@ -0,0 +1,121 @@
+import base64
+import hashlib
+
+import pytest
+
+import status_index
+import unity_connection
+from config import config
+from status_index import StatusIndex
+
+from .stand_in_bridge import StandInBridge, use_bridge
+from .test_helpers import DummyContext
+
+SCRIPT = "using UnityEngine;\n\npublic class Mover : MonoBehaviour\n{\n    // été\n}\n"
+
+
+@pytest.fixture()
+def attached(monkeypatch):
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+
+
+def _file_reader(contents: bytes):
+    """Answer manage_script reads with the file's bytes and accept any edit."""
+    def handler(command):
+        params = command["params"]
+        if params.get("action") == "read":
+            return {"status": "success", "result": {
+                "success": True, "data": {"path": "Assets/Mover.cs", "contents": contents}}}
+        return {"status": "success", "result": {"success": True, "data": {"echo": params}}}
+    return handler
+
+
+def test_contents_arrive_as_memoryviews(monkeypatch, tmp_path, attached):
+    # Larger than the receive scratch buffer, so it lands in a buffer of its own
+    blob = bytes(range(256)) * 4096
+    with StandInBridge(_file_reader(blob), multiplex=True, attachments=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = unity_connection.send_command_with_retry(
+            "manage_script", {"action": "read"}, instance_id=instance_id)
+        contents = result["data"]["contents"]
+        assert isinstance(contents, memoryview)
+        assert contents == blob
+        assert hashlib.sha256(contents).hexdigest() == hashlib.sha256(blob).hexdigest()
+        assert bridge.attachments_sent == 1
+
+        # Commands that carry no bytes are unaffected
+        echoed = unity_connection.send_command_with_retry(
+            "manage_script", {"action": "get_sha"}, instance_id=instance_id)
+        assert echoed["data"]["echo"] == {"action": "get_sha"}
+
+
+def test_without_attachments_contents_stay_inline(monkeypatch, tmp_path, attached):
+    monkeypatch.setattr(config, "enable_attachments", False)
+    with StandInBridge(_file_reader(b"abc"), multiplex=True, attachments=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = unity_connection.send_command_with_retry(
+            "manage_script", {"action": "read"}, instance_id=instance_id)
+        assert result["data"]["contents"] == base64.b64encode(b"abc").decode()
+        assert bridge.attachments_sent == 0
+
+
+def test_attachments_are_not_mistaken_for_chunks(monkeypatch, tmp_path, attached):
+    blob = b"x" * 5000
+    with StandInBridge(_file_reader(blob), multiplex=True, attachments=True,
+                       chunk_size=1024, compress=("zlib",)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = unity_connection.send_command_with_retry(
+            "manage_script", {"action": "read"}, instance_id=instance_id)
+        assert bytes(result["data"]["contents"]) == blob
+        assert result["data"]["path"] == "Assets/Mover.cs"
+
+
+def test_script_edits_hash_the_attachment(monkeypatch, tmp_path, attached):
+    import tools.script_apply_edits as script_apply_edits
+
+    raw = SCRIPT.encode("utf-8")
+    with StandInBridge(_file_reader(raw), multiplex=True, attachments=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        resp = script_apply_edits.script_apply_edits(
+            DummyContext(), name="Mover", path="Assets",
+            edits=[{"op": "regex_replace", "pattern": r"// (\S+)", "text": "// $1 ok"}])
+        assert resp["success"], resp
+        edit = next(c["params"] for c in bridge.commands if c["params"].get("action") == "apply_text_edits")
+        assert edit["precondition_sha256"] == hashlib.sha256(raw).hexdigest()
+        assert [e["newText"] for e in edit["edits"]] == ["// été ok"]
+
+
+def test_attachment_text_strips_a_bom():
+    text = unity_connection.attachment_text(memoryview(b"\xef\xbb\xbf" + SCRIPT.encode("utf-8")))
+    assert text == SCRIPT
+    assert unity_connection.attachment_text("inline") == "inline"
+    assert unity_connection.attachment_text(None) is None
+
+
+@pytest.mark.parametrize("raw, text", [
+    (SCRIPT.encode("utf-16"), SCRIPT),
+    (b"\xfe\xff" + SCRIPT.encode("utf-16-be"), SCRIPT),
+    # Invalid UTF-8 without a byte order mark is replaced, as File.ReadAllText does
+    (SCRIPT.encode("latin-1"), SCRIPT.replace("é", "\ufffd")),
+], ids=["utf-16", "utf-16-be", "ansi"])
+def test_scripts_that_are_not_utf8_still_read(monkeypatch, tmp_path, attached, raw, text):
+    import tools.manage_script as manage_script
+    import tools.script_apply_edits as script_apply_edits
+
+    # What a bridge attaching the file's own bytes sends for non-UTF-8 scripts
+    with StandInBridge(_file_reader(raw), multiplex=True, attachments=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        resp = script_apply_edits.script_apply_edits(
+            DummyContext(), name="Mover", path="Assets",
+            edits=[{"op": "regex_replace", "pattern": r"// (\S+)", "text": "// $1 ok"}])
+        assert resp["success"], resp
+        read = manage_script.manage_script(DummyContext(), action="read", name="Mover", path="Assets")
+        normalized = manage_script.apply_text_edits(
+            DummyContext(), uri="unity://path/Assets/Mover.cs", edits=[{"range": [0, 0], "text": "// head\n"}])
+        assert normalized["success"], normalized
+    assert bridge.attachments_sent == 3
+    assert read["data"]["contents"] == text
+    edit = next(c["params"] for c in bridge.commands if c["params"].get("action") == "apply_text_edits")
+    assert edit["precondition_sha256"] == hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+import pytest
+
+import unity_connection
+from config import config
+from unity_connection import IncrementalJSONDecoder
+
+from .stand_in_bridge import StandInBridge, use_bridge
+
+
+def _hierarchy(count):
+    return {"status": "success", "result": {
+        "scene": "Main", "hierarchy": [{"name": f"GameObject{i}", "id": i} for i in range(count)]}}
+
+
+def _hierarchy_handler(command):
+    return _hierarchy(command["params"].get("count", 10))
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 64, 100000])
+def test_decoder_matches_json_loads_at_any_chunk_size(chunk):
+    document = {"status": "success", "result": {
+        "items": [{"name": "é✓", "n": i, "f": i / 3} for i in range(50)],
+        "nested": {"values": [1, 2.5, -3e4, True, None, "x"]}, "empty": []}}
+    text = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    decoder = IncrementalJSONDecoder()
+    events = []
+    for offset in range(0, len(text), chunk):
+        events.extend(decoder.feed(text[offset:offset + chunk]))
+    events.extend(decoder.close())
+    assert decoder.document == document
+    assert [path for path, _ in events if path[:2] == ("result", "items")] == \
+        [("result", "items", i) for i in range(50)]
+
+
+def test_decoder_item_depth_selects_emitted_arrays():
+    text = b'{"result": {"nested": {"values": [1, 2.5, -3e4]}}}'
+    assert IncrementalJSONDecoder(item_depth=3).feed(text) == []
+    assert IncrementalJSONDecoder(item_depth=4).feed(text) == [
+        (("result", "nested", "values", 0), 1),
+        (("result", "nested", "values", 1), 2.5),
+        (("result", "nested", "values", 2), -3e4)]
+
+
+def test_decoder_emits_items_before_document_completes():
+    text = json.dumps(_hierarchy(100)).encode("utf-8")
+    decoder = IncrementalJSONDecoder(keep=False)
+    events = decoder.feed(text[:len(text) // 2])
+    assert events and events[0] == (("result", "hierarchy", 0), {"name": "GameObject0", "id": 0})
+    assert not decoder.done
+    events += decoder.feed(text[len(text) // 2:]) + decoder.close()
+    assert len(events) == 100
+    assert decoder.document["result"]["hierarchy"] == []
+
+
+@pytest.mark.parametrize("text", [b'{"a": [1, 2', b'[1,]', b'{"a" 1}', b'[1] 2'])
+def test_decoder_rejects_malformed_input(text):
+    decoder = IncrementalJSONDecoder()
+    with pytest.raises(json.JSONDecodeError):
+        decoder.feed(text)
+        decoder.close()
+
+
+@pytest.mark.asyncio
+async def test_large_response_arrives_in_chunks(monkeypatch, tmp_path):
+    with StandInBridge(_hierarchy_handler, multiplex=True, chunk_size=4096) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = await unity_connection.async_send_command_with_retry(
+            "manage_scene", {"count": 5000}, instance_id=instance_id)
+        assert result == _hierarchy(5000)["result"]
+        assert bridge.chunked_responses == 1
+
+
+@pytest.mark.asyncio
+async def test_items_stream_before_response_completes(monkeypatch, tmp_path):
+    with StandInBridge(_hierarchy_handler, multiplex=True, chunk_size=2048, chunk_delay=0.05) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        loop = asyncio.get_running_loop()
+        seen = []
+        first_at = None
+        async for path, item in unity_connection.async_iter_command_items(
+                "manage_scene", {"count": 2000}, instance_id=instance_id):
+            if first_at is None:
+                first_at = loop.time()
+            seen.append((path, item["id"]))
+        finished_at = loop.time()
+        assert seen == [(("hierarchy", i), i) for i in range(2000)]
+        # Dozens of delayed chunks: the first items come well before the last one
+        assert finished_at - first_at > 0.5
+
+
+@pytest.mark.asyncio
+async def test_early_stop_leaves_socket_usable(monkeypatch, tmp_path):
+    with StandInBridge(_hierarchy_handler, multiplex=True, chunk_size=1024, chunk_delay=0.01) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        items = unity_connection.async_iter_command_items(
+            "manage_scene", {"count": 5000}, instance_id=instance_id)
+        async for path, _ in items:
+            if path[1] == 10:
+                break
+        await items.aclose()
+
+        result = await unity_connection.async_send_command_with_retry(
+            "manage_scene", {"count": 3}, instance_id=instance_id)
+        assert result == _hierarchy(3)["result"]
+        assert bridge.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_oversized_response_spills_to_disk(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "response_spill_bytes", 64 * 1024)
+    spilled = []
+    original = unity_connection._SpilledResponse.load
+
+    def load(self):
+        spilled.append(self.size)
+        return original(self)
+
+    monkeypatch.setattr(unity_connection._SpilledResponse, "load", load)
+    with StandInBridge(_hierarchy_handler, multiplex=True, chunk_size=16 * 1024) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = await unity_connection.async_send_command_with_retry(
+            "manage_scene", {"count": 20000}, instance_id=instance_id)
+        assert result == _hierarchy(20000)["result"]
+        assert spilled and spilled[0] > 64 * 1024
+
+
+@pytest.mark.asyncio
+async def test_response_cap_fails_request(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "max_response_bytes", 32 * 1024)
+    with StandInBridge(_hierarchy_handler, multiplex=True, chunk_size=8 * 1024) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = await unity_connection.async_send_command_with_retry(
+            "manage_scene", {"count": 20000}, instance_id=instance_id)
+        assert not result.success and "max_response_bytes" in result.error
+
+
+@pytest.mark.asyncio
+async def test_streaming_falls_back_on_lock_step_bridge(monkeypatch, tmp_path):
+    with StandInBridge(_hierarchy_handler) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        items = [item["id"] async for _, item in unity_connection.async_iter_command_items(
+            "manage_scene", {"count": 50}, instance_id=instance_id)]
+        assert items == list(range(50))
+        assert bridge.tagged_frames == 0
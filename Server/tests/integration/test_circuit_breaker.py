@@ -0,0 +1,127 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import status_index
+import unity_connection
+from config import config
+from status_index import StatusIndex
+from unity_connection import CircuitBreaker
+
+from .stand_in_bridge import StandInBridge, send, use_bridge
+
+
+@pytest.fixture()
+def breaker_config(monkeypatch):
+    monkeypatch.setattr(config, "breaker_failure_threshold", 2)
+    monkeypatch.setattr(config, "breaker_open_seconds", 0.5)
+    monkeypatch.setattr(config, "reconnect_cooldown", 0.0)
+    monkeypatch.setattr(config, "rediscover_cooldown", 0.0)
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+
+
+def _circuit(instance_id):
+    return unity_connection.get_unity_connection_pool().get_circuit_states()[instance_id]
+
+
+@pytest.mark.asyncio
+async def test_dead_instance_opens_the_circuit_and_fails_fast(monkeypatch, tmp_path, breaker_config):
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        assert (await send(instance_id, params={"n": 0}))["params"] == {"n": 0}
+        assert _circuit(instance_id)["state"] == "closed"
+
+    # The editor is gone: reconnects are refused until the breaker trips
+    for _ in range(config.breaker_failure_threshold):
+        assert not (await send(instance_id)).success
+    assert _circuit(instance_id)["state"] == "open"
+
+    started = time.monotonic()
+    rejected = await send(instance_id)
+    assert time.monotonic() - started < 0.1
+    assert not rejected.success
+    assert rejected.data["state"] == "unavailable"
+    assert 0 < rejected.data["retry_after_ms"] <= 500
+    assert _circuit(instance_id)["rejected"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_half_open_lets_a_single_probe_through(monkeypatch, tmp_path, breaker_config):
+    with StandInBridge(delay=0.05) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await send(instance_id)
+        breaker = unity_connection.get_unity_connection_pool()._breakers[instance_id]
+        for _ in range(2):
+            breaker.record_failure(ConnectionError("simulated"))
+        assert breaker.state == CircuitBreaker.OPEN
+        await asyncio.sleep(0.55)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+
+        pool = await unity_connection.get_unity_connection_pool().async_get_connection(instance_id)
+
+        async def concurrently():
+            return await asyncio.gather(*(pool.send_command("manage_scene", {"n": n}) for n in range(3)))
+
+        results = await unity_connection._transport.run_async(concurrently())
+        passed = [r for r in results if isinstance(r, dict)]
+        assert len(passed) == 1 and breaker.snapshot()["probes"] == 1
+        assert all(r.data["circuit"] == "half_open" for r in results if r not in passed)
+
+        # The probe closed the breaker; everyone goes through again
+        assert breaker.state == CircuitBreaker.CLOSED
+        results = await asyncio.gather(*(send(instance_id, params={"n": n}) for n in range(3)))
+        assert [r["params"]["n"] for r in results] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_stale_heartbeat_trips_on_the_first_failure(monkeypatch, tmp_path, breaker_config):
+    monkeypatch.setattr(config, "breaker_failure_threshold", 10)
+    monkeypatch.setattr(config, "status_stale_after", 30.0)
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await send(instance_id)
+    directory = tmp_path / ".unity-mcp"
+    directory.mkdir()
+    heartbeat = datetime.now(timezone.utc) - timedelta(seconds=600)
+    (directory / "unity-mcp-status-abc123.json").write_text(json.dumps({
+        "unity_port": bridge.port, "reloading": False, "last_heartbeat": heartbeat.isoformat()}))
+
+    await send(instance_id)
+    circuit = _circuit(instance_id)
+    assert circuit["state"] == "open" and circuit["consecutive_failures"] == 1
+
+
+def test_breaker_transitions():
+    breaker = CircuitBreaker("Game@abc")
+    assert breaker.admit() == "pass"
+    for _ in range(config.breaker_failure_threshold):
+        breaker.record_failure(TimeoutError("hung"))
+    assert breaker.admit() == "reject"
+    breaker._opened_at -= config.breaker_open_seconds
+    assert breaker.admit() == "probe"
+    assert breaker.admit() == "reject"
+    breaker.record_failure(ConnectionError("still down"))
+    assert breaker.state == CircuitBreaker.OPEN
+    breaker._opened_at -= config.breaker_open_seconds
+    assert breaker.admit() == "probe"
+    breaker.record_success()
+    assert breaker.admit() == "pass"
+    assert breaker.snapshot()["opened"] == 1 and breaker.snapshot()["probes"] == 2
+
+
+def test_reads_off_the_transport_loop_do_not_half_open():
+    breaker = CircuitBreaker("Game@abc")
+    for _ in range(config.breaker_failure_threshold):
+        breaker.record_failure(TimeoutError("hung"))
+    breaker._opened_at -= config.breaker_open_seconds
+    # Caller threads read the breaker while the loop may be re-opening it
+    assert not breaker.is_closed()
+    assert breaker.snapshot()["state"] == CircuitBreaker.HALF_OPEN
+    assert breaker._state == CircuitBreaker.OPEN
+    assert breaker.admit() == "probe"
+    assert breaker._state == CircuitBreaker.HALF_OPEN
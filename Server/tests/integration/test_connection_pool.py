@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+import pytest
+
+import unity_connection
+from config import config
+
+from .stand_in_bridge import StandInBridge, pool_metrics, send, use_bridge
+
+
+@pytest.mark.asyncio
+async def test_lock_step_bridge_gets_one_socket_per_concurrent_call(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "pool_max_connections", 3)
+    with StandInBridge(delay=0.2) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        started = time.monotonic()
+        results = await asyncio.gather(*(send(instance_id, "manage_scene", {"n": n}) for n in range(3)))
+        assert [r["params"]["n"] for r in results] == [0, 1, 2]
+        assert time.monotonic() - started < 0.5
+        assert bridge.connections == 3
+
+        metrics = pool_metrics(instance_id)
+        assert metrics["size"] == 3 and metrics["idle"] == 3
+        assert metrics["in_flight"] == 0 and metrics["checkouts"] == 3
+
+
+@pytest.mark.asyncio
+async def test_pool_size_bounds_sockets_and_records_waits(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "pool_max_connections", 2)
+    with StandInBridge(delay=0.1) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await asyncio.gather(*(send(instance_id, "manage_scene", {"n": n}) for n in range(6)))
+        assert bridge.connections == 2
+
+        metrics = pool_metrics(instance_id)
+        assert metrics["size"] == 2
+        assert metrics["waits"] >= 4
+        assert metrics["wait_ms_max"] >= 100
+
+
+@pytest.mark.asyncio
+async def test_in_flight_cap_limits_concurrency(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "pool_max_in_flight", 2)
+    with StandInBridge(delay=0.2, multiplex=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        calls = asyncio.ensure_future(asyncio.gather(
+            *(send(instance_id, "manage_gameobject", {"n": n}) for n in range(4))))
+        await asyncio.sleep(0.1)
+
+        metrics = pool_metrics(instance_id)
+        assert metrics["in_flight"] == 2
+        assert metrics["saturation"] == 1.0
+        assert metrics["waiting"] == 2
+        assert len(bridge.commands) == 2
+
+        await calls
+        assert bridge.connections == 1
+        assert pool_metrics(instance_id)["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_idle_sockets_are_reaped_down_to_one(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "pool_idle_timeout", 0.1)
+    with StandInBridge(delay=0.05) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await asyncio.gather(*(send(instance_id, "manage_scene") for _ in range(3)))
+        assert pool_metrics(instance_id)["opened"] == 3
+
+        await asyncio.sleep(0.4)
+        metrics = pool_metrics(instance_id)
+        assert metrics["size"] == 1
+        assert metrics["reaped"] == 2
+        assert (await send(instance_id, "manage_scene"))["type"] == "manage_scene"
+
+
+@pytest.mark.asyncio
+async def test_dropped_socket_is_replaced(monkeypatch, tmp_path):
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        assert (await send(instance_id, "manage_scene"))["type"] == "manage_scene"
+        bridge.drop_clients()
+        await asyncio.sleep(0.05)
+
+        assert (await send(instance_id, "manage_scene"))["type"] == "manage_scene"
+        assert bridge.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_idle_socket_failing_health_check_is_reconnected(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "pool_health_check_interval", 0.0)
+    pings = []
+
+    async def unhealthy_ping(self, timeout=1.0):
+        pings.append(self)
+        return False
+
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        assert (await send(instance_id, "manage_scene"))["type"] == "manage_scene"
+        monkeypatch.setattr(unity_connection.AsyncUnityConnection, "ping", unhealthy_ping)
+
+        assert (await send(instance_id, "manage_scene"))["type"] == "manage_scene"
+        assert len(pings) == 1
+        assert pool_metrics(instance_id)["health_check_failures"] == 1
+        assert bridge.connections == 2
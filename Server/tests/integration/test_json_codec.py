@@ -0,0 +1,69 @@
+import json
+import math
+
+import pytest
+
+import json_codec
+
+
+@pytest.fixture(params=sorted(json_codec.CODECS))
+def codec(request):
+    previous = json_codec.codec
+    yield json_codec.set_codec(request.param)
+    json_codec.codec = previous
+
+
+PAYLOAD = {
+    "status": "success",
+    "result": {
+        "contents": "using UnityEngine;\n// é ✓ 漢字 \"quoted\" \\ \t",
+        "hierarchy": [{"name": f"Cube ({i})", "instanceID": -1000 - i, "active": i % 2 == 0,
+                       "position": [i * 0.5, 1e-7, -3.25], "parent": None} for i in range(20)],
+    },
+}
+
+
+def test_round_trip_matches_stdlib(codec):
+    encoded = json_codec.dumps(PAYLOAD)
+    assert isinstance(encoded, bytes)
+    assert "é ✓ 漢字".encode("utf-8") in encoded
+    assert json.loads(encoded) == PAYLOAD
+    assert json_codec.loads(encoded) == PAYLOAD
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview, lambda b: b.decode("utf-8")])
+def test_decodes_any_buffer(codec, wrap):
+    assert json_codec.loads(wrap(json.dumps(PAYLOAD).encode("utf-8"))) == PAYLOAD
+
+
+def test_values_outside_fast_paths_fall_back(codec):
+    assert json_codec.loads(b'[18446744073709551615, -9223372036854775808]') == [2 ** 64 - 1, -2 ** 63]
+    assert math.isnan(json_codec.loads(b'[NaN]')[0])
+    assert json.loads(json_codec.dumps({1: 2 ** 70})) == {"1": 2 ** 70}
+
+
+def test_non_finite_floats_encode_like_stdlib(codec):
+    value = {"a": [math.nan, {"b": math.inf}], "c": -math.inf, "d": None}
+    encoded = json_codec.dumps(value)
+    assert encoded == json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    assert encoded == b'{"a":[NaN,{"b":Infinity}],"c":-Infinity,"d":null}'
+    assert json_codec.dumps({"a": math.nan}, indent=True) == json.dumps(
+        {"a": math.nan}, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def test_decode_errors_are_json_decode_errors(codec):
+    with pytest.raises(json.JSONDecodeError):
+        json_codec.loads(b'{"a": ')
+
+
+def test_indent(codec):
+    assert json_codec.dumps({"a": [1]}, indent=True).decode("utf-8").splitlines()[0] == "{"
+
+
+def test_unknown_codec_falls_back_to_stdlib():
+    previous = json_codec.codec
+    try:
+        assert json_codec.set_codec("simdjson").name == "json"
+        assert json_codec.set_codec("auto").name in json_codec.CODECS
+    finally:
+        json_codec.codec = previous
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from benchmarks.bench_local_edits import generate_text, legacy_apply_edits, mixed_edits
+from tools.script_apply_edits import _apply_edits_locally, _EditBuffer
+
+BREAKS = ["\n", "\n", "\n", "\r\n", "\r", " ", "\x0c"]
+WORDS = ["void", "Start()", "{", "}", "    ", "x", "class", "\r", "\n", ""]
+
+
+def _random_text(rng):
+    return "".join(rng.choice(WORDS) + (rng.choice(BREAKS) if rng.random() < 0.5 else "")
+                   for _ in range(rng.randrange(0, 30)))
+
+
+def _random_edit(rng, text):
+    lines = len(text.splitlines()) + 1
+    op = rng.choice(["replace_range"] * 6 + ["prepend", "append", "anchor_insert", "regex_replace"])
+    if op == "replace_range":
+        start = rng.randrange(0, lines + 2)
+        return {"op": op, "startLine": start, "startCol": rng.randrange(0, 12),
+                "endLine": rng.choice([start, start + 1, rng.randrange(0, lines + 2)]),
+                "endCol": rng.randrange(0, 12), "text": rng.choice(WORDS + BREAKS + ["a\r", "\nb"])}
+    if op == "anchor_insert":
+        return {"op": op, "anchor": rng.choice([r"\{", r"^\s*}\s*$", "class", "missing"]),
+                "position": rng.choice(["before", "after"]), "text": "// here\n",
+                "allow_noop": rng.random() < 0.8}
+    if op == "regex_replace":
+        pattern, replacement = rng.choice([(r"x$", "y"), (r"(\w+)\(\)", "$1(int a)"), (r"\r", "")])
+        return {"op": op, "pattern": pattern, "replacement": replacement, "count": rng.randrange(0, 3)}
+    return {"op": op, "text": rng.choice(["using System;", "// end\n", ""])}
+
+
+def _outcome(apply, text, edits):
+    try:
+        return apply(text, edits)
+    except RuntimeError as exc:
+        return str(exc)
+
+
+def test_batches_match_the_previous_engine():
+    rng = random.Random(22)
+    for _ in range(1500):
+        text = _random_text(rng)
+        edits = []
+        scratch = text
+        for _ in range(rng.randrange(1, 8)):
+            edits.append(_random_edit(rng, scratch))
+            scratch = _outcome(legacy_apply_edits, scratch, edits[-1:])
+        assert _outcome(_apply_edits_locally, text, edits) == _outcome(legacy_apply_edits, text, edits), \
+            (text, edits)
+
+
+def test_large_batches_match_the_previous_engine():
+    text = generate_text(3000)
+    edits = mixed_edits(3000, 300)
+    assert _apply_edits_locally(text, edits) == legacy_apply_edits(text, edits)
+
+
+@pytest.mark.parametrize("text", ["", "a", "a\r", "a\r\nb", "\r\n\r\n", "a\nb\rc d\x1c"])
+def test_buffer_line_index_tracks_splits_across_carriage_returns(text):
+    buffer = _EditBuffer(text)
+    for offset in range(len(text) + 1):
+        # Cut every piece boundary through the text, then rejoin a \r\n split by the cut
+        buffer.splice(offset, offset, "")
+        buffer.splice(offset, offset, "|")
+        buffer.splice(offset, offset + 1, "")
+        assert buffer.line_count() == len(text.splitlines())
+        starts = [len("".join(text.splitlines(keepends=True)[:n])) for n in range(len(text.splitlines()))]
+        assert [buffer.line_start(n + 1) for n in range(len(starts))] == starts
+        assert buffer.text == text
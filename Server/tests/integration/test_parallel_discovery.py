@@ -0,0 +1,135 @@
+import json
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import port_discovery
+import status_index
+from config import config
+from port_discovery import PortDiscovery
+from status_index import StatusIndex
+
+from .stand_in_bridge import StandInBridge
+
+
+class SilentListener:
+    """Accepts connections and never answers, so every probe runs to its timeout."""
+
+    def __init__(self):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.bind(("127.0.0.1", 0))
+        self._sock.listen(16)
+        self.port = self._sock.getsockname()[1]
+        self._clients = []
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self):
+        while True:
+            try:
+                self._clients.append(self._sock.accept()[0])
+            except OSError:
+                return
+
+    def close(self):
+        self._sock.close()
+        for client in self._clients:
+            client.close()
+
+
+def _write_status(directory, project_hash, port, name):
+    path = directory / f"unity-mcp-status-{project_hash}.json"
+    path.write_text(json.dumps({
+        "unity_port": port, "reloading": False, "project_name": name,
+        "project_path": f"/Projects/{name}/Assets",
+        "last_heartbeat": datetime.now(timezone.utc).isoformat(),
+    }))
+    return path
+
+
+@pytest.fixture()
+def status_home(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    directory = tmp_path / ".unity-mcp"
+    directory.mkdir()
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    PortDiscovery.clear_probe_cache()
+    yield directory
+    PortDiscovery.clear_probe_cache()
+
+
+def test_unresponsive_instances_are_probed_concurrently(status_home):
+    silent = [SilentListener() for _ in range(6)]
+    with StandInBridge() as bridge:
+        try:
+            _write_status(status_home, "live0001", bridge.port, "Live")
+            for i, listener in enumerate(silent):
+                _write_status(status_home, f"hung{i:04d}", listener.port, f"Hung{i}")
+            started = time.perf_counter()
+            instances = PortDiscovery.discover_all_unity_instances()
+            elapsed = time.perf_counter() - started
+        finally:
+            for listener in silent:
+                listener.close()
+    assert [i.id for i in instances] == ["Live@live0001"]
+    # Sequential probing would spend at least 6 x CONNECT_TIMEOUT here
+    assert elapsed < 3 * PortDiscovery.CONNECT_TIMEOUT
+
+
+def test_deadline_bounds_the_scan(monkeypatch, status_home):
+    monkeypatch.setattr(config, "discovery_deadline", 0.2)
+    release = threading.Event()
+
+    def probe(port):
+        release.wait(5)
+        return True
+
+    monkeypatch.setattr(PortDiscovery, "_try_probe_unity_mcp", staticmethod(probe))
+    path = _write_status(status_home, "slow0001", 6401, "Slow")
+    try:
+        started = time.perf_counter()
+        assert PortDiscovery.discover_all_unity_instances() == []
+        assert time.perf_counter() - started < 1.0
+    finally:
+        release.set()
+    # A probe cut off by the deadline is not cached; the next scan asks again
+    key = (6401, path.stat().st_mtime)
+    assert PortDiscovery.probe_ports([key]) == {key: True}
+
+
+def test_results_are_cached_per_port_and_mtime(monkeypatch, status_home):
+    probed = []
+    monkeypatch.setattr(PortDiscovery, "_try_probe_unity_mcp",
+                        staticmethod(lambda port: probed.append(port) or True))
+    path = _write_status(status_home, "live0001", 6401, "Live")
+    assert len(PortDiscovery.discover_all_unity_instances()) == 1
+    assert len(PortDiscovery.discover_all_unity_instances()) == 1
+    assert probed == [6401]
+
+    # Unity rewrote its status file: probe again
+    _write_status(status_home, "live0001", 6401, "Live")
+    os.utime(path, (time.time() + 5, time.time() + 5))
+    assert len(PortDiscovery.discover_all_unity_instances()) == 1
+    assert probed == [6401, 6401]
+
+    monkeypatch.setattr(config, "discovery_probe_cache_ttl", 0.0)
+    time.sleep(0.01)
+    PortDiscovery.discover_all_unity_instances()
+    assert probed == [6401, 6401, 6401]
+
+
+def test_discover_unity_port_prefers_newest_responsive_file(monkeypatch, status_home):
+    monkeypatch.setattr(port_discovery.PortDiscovery, "_read_latest_status", staticmethod(lambda: None))
+    probed = []
+    monkeypatch.setattr(PortDiscovery, "_try_probe_unity_mcp",
+                        staticmethod(lambda port: probed.append(port) or port != 7002))
+    for i, port in enumerate((7001, 7002)):
+        path = status_home / f"unity-mcp-port-p{i}.json"
+        path.write_text(json.dumps({"unity_port": port}))
+        os.utime(path, (time.time() + i, time.time() + i))
+    assert PortDiscovery.discover_unity_port() == 7001
+    assert sorted(probed) == [7001, 7002]
@@ -0,0 +1,83 @@
+import pytest
+
+from config import config
+
+from .stand_in_bridge import StandInBridge, pool_metrics, send, use_bridge
+
+
+def _script_handler(command):
+    lines = command["params"].get("lines", 10)
+    contents = "\n".join(f"    public int field{i} = {i}; // padding padding padding" for i in range(lines))
+    return {"status": "success", "result": {"contents": contents, "echo": command["params"].get("echo")}}
+
+
+@pytest.mark.asyncio
+async def test_large_frames_are_compressed_both_ways(monkeypatch, tmp_path):
+    with StandInBridge(_script_handler, multiplex=True, compress=("zlib",)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        echo = "using UnityEngine;\n" * 500
+        result = await send(instance_id, "manage_script", {"lines": 2000, "echo": echo})
+        assert result["echo"] == echo
+        assert result["contents"].count("\n") == 1999
+        assert bridge.compressed_requests == 1
+        assert bridge.compressed_responses == 1
+
+        metrics = pool_metrics(instance_id)
+        assert metrics["compression"] == ["zlib"]
+        stats = metrics["compression_by_command"]["manage_script"]
+        assert stats["frames"] == 2 and stats["compressed_frames"] == 2
+        assert stats["ratio"] > 5
+        assert stats["compress_ms"] > 0 and stats["decompress_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_small_frames_stay_uncompressed(monkeypatch, tmp_path):
+    with StandInBridge(_script_handler, multiplex=True, compress=("zlib",)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await send(instance_id, "manage_editor", {"lines": 1})
+        assert bridge.compressed_requests == 0 and bridge.compressed_responses == 0
+        stats = pool_metrics(instance_id)["compression_by_command"]["manage_editor"]
+        assert stats["compressed_frames"] == 0 and stats["ratio"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_compressed_chunks(monkeypatch, tmp_path):
+    with StandInBridge(_script_handler, multiplex=True, compress=("zlib",), chunk_size=16 * 1024) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = await send(instance_id, "manage_script", {"lines": 5000})
+        assert result["contents"].endswith("field4999 = 4999; // padding padding padding")
+        assert bridge.chunked_responses == 1
+        assert bridge.compressed_responses > 1
+
+
+@pytest.mark.asyncio
+async def test_decompressed_size_is_capped(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "max_response_bytes", 64 * 1024)
+    with StandInBridge(_script_handler, multiplex=True, compress=("zlib",)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = await send(instance_id, "manage_script", {"lines": 5000})
+        assert not result.success and "exceeds" in result.error
+        # The socket survives a rejected frame
+        assert (await send(instance_id, "manage_script", {"lines": 1}))["contents"]
+        assert bridge.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_framing_only_bridge_is_not_compressed(monkeypatch, tmp_path):
+    with StandInBridge(_script_handler, compress=("zlib",)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = await send(instance_id, "manage_script", {"lines": 2000})
+        assert result["contents"].count("\n") == 1999
+        assert bridge.welcome == b"WELCOME UNITY-MCP 1 FRAMING=1\n"
+        metrics = pool_metrics(instance_id)
+        assert metrics["compression"] == [] and metrics["compression_by_command"] == {}
+
+
+@pytest.mark.asyncio
+async def test_compression_can_be_disabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "enable_compression", False)
+    with StandInBridge(_script_handler, multiplex=True, compress=("zlib",)) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await send(instance_id, "manage_script", {"lines": 2000, "echo": "x" * 4096})
+        assert bridge.compressed_requests == 0 and bridge.compressed_responses == 0
+        assert pool_metrics(instance_id)["compression"] == []
@@ -0,0 +1,77 @@
+import asyncio
+import time
+
+import pytest
+
+import status_index
+import unity_connection
+from config import config
+from status_index import StatusIndex
+
+from .stand_in_bridge import StandInBridge, pool_metrics, send, use_bridge
+
+SLOW_SECONDS = 1.5
+
+
+@pytest.fixture()
+def busy_pool(monkeypatch):
+    # A single pooled socket, so without the lane every call queues behind the slow one
+    monkeypatch.setattr(config, "pool_max_connections", 1)
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+
+
+def _slow_imports(command):
+    return SLOW_SECONDS if command["type"] == "manage_asset" else 0.0
+
+
+async def _latencies_while_busy(instance_id, command_type, calls):
+    await send(instance_id, command_type)
+    slow = asyncio.ensure_future(send(instance_id, "manage_asset", {"action": "import"}))
+    await asyncio.sleep(0.1)
+    samples = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await send(instance_id, command_type)
+        samples.append(time.perf_counter() - started)
+    in_flight = not slow.done()
+    await slow
+    return sorted(samples), in_flight
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("command_type", ["ping", "get_editor_state"])
+async def test_priority_commands_stay_fast_during_a_slow_command(monkeypatch, tmp_path, busy_pool, command_type):
+    with StandInBridge(delay=_slow_imports) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        samples, in_flight = await _latencies_while_busy(instance_id, command_type, 100)
+        assert in_flight
+        p99 = samples[98]
+        assert p99 < 0.05, f"{command_type} p99 {p99 * 1000:.1f} ms"
+
+        metrics = pool_metrics(instance_id)
+        assert metrics["size"] == 1 and metrics["checkouts"] == 2
+        assert metrics["priority_lane"]["connected"]
+        assert metrics["priority_lane"]["calls"] == 100
+        assert bridge.connections == 2
+
+
+@pytest.mark.asyncio
+async def test_without_the_lane_pings_queue_behind_the_slow_command(monkeypatch, tmp_path, busy_pool):
+    monkeypatch.setattr(config, "priority_lane", False)
+    with StandInBridge(delay=_slow_imports) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        samples, _ = await _latencies_while_busy(instance_id, "ping", 1)
+        assert samples[0] > SLOW_SECONDS / 2
+        assert bridge.connections == 1
+
+
+@pytest.mark.asyncio
+async def test_other_commands_still_use_the_pool(monkeypatch, tmp_path, busy_pool):
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        assert (await send(instance_id, "manage_scene", {"n": 1}))["params"] == {"n": 1}
+        metrics = pool_metrics(instance_id)
+        assert metrics["priority_lane"] == {"connected": False, "calls": 0, "ms_max": 0.0}
+        assert bridge.connections == 1
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import pytest
+
+import unity_connection
+from config import config
+from port_discovery import PortDiscovery
+
+from .stand_in_bridge import StandInBridge, send, use_bridge
+
+
+@pytest.fixture(autouse=True)
+def fresh_single_flight(monkeypatch):
+    # Results shared under the cooldown must not leak between tests
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+
+
+def _count_scans(monkeypatch):
+    scans = []
+    discover = PortDiscovery.discover_all_unity_instances
+
+    def counting():
+        scans.append(time.monotonic())
+        return discover()
+
+    monkeypatch.setattr(PortDiscovery, "discover_all_unity_instances", staticmethod(counting))
+    return scans
+
+
+@pytest.mark.asyncio
+async def test_dropped_sockets_share_one_rediscovery(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "pool_max_connections", 8)
+    # Deduping bridge: the in-flight commands are safe to resend
+    with StandInBridge(delay=0.3, dedupe=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await send(instance_id, params={"n": -1})
+        scans = _count_scans(monkeypatch)
+
+        calls = asyncio.ensure_future(asyncio.gather(*(send(instance_id, params={"n": n}) for n in range(8))))
+        await asyncio.sleep(0.15)
+        assert bridge.connections >= 8
+        bridge.drop_clients()
+
+        results = await calls
+        assert [r["params"]["n"] for r in results] == list(range(8))
+        # Eight sockets failed together; one scan served all of them
+        assert len(scans) == 1
+
+
+@pytest.mark.asyncio
+async def test_unreachable_instance_is_probed_a_bounded_number_of_times(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "pool_max_connections", 6)
+    monkeypatch.setattr(config, "max_retries", 3)
+    connects = []
+    original_connect = unity_connection.AsyncUnityConnection.connect
+
+    async def counting_connect(self):
+        if not self.connected:
+            connects.append(self)
+        return await original_connect(self)
+
+    monkeypatch.setattr(unity_connection.AsyncUnityConnection, "connect", counting_connect)
+    with StandInBridge(delay=0.3) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await send(instance_id, params={"n": -1})
+        scans = _count_scans(monkeypatch)
+        connects.clear()
+
+        calls = asyncio.ensure_future(asyncio.gather(*(send(instance_id, params={"n": n}) for n in range(6))))
+        await asyncio.sleep(0.15)
+    # Unity went away mid-call: every socket drops and every reconnect is refused
+    started = time.monotonic()
+    results = await calls
+    elapsed = time.monotonic() - started
+
+    assert all(isinstance(r, unity_connection.MCPResponse) and not r.success for r in results)
+    # One scan per cooldown window rather than one per failed attempt per caller
+    assert len(scans) <= elapsed / config.rediscover_cooldown + 1
+    # Six callers with six attempts each would make 36 connects on their own
+    assert len(connects) < 6 * 6
+    assert unity_connection._single_flight.stats["followers"] > 0
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+import status_index
+from config import config
+from status_index import StatusIndex
+
+from .stand_in_bridge import StandInBridge, pool_metrics, send, use_bridge
+
+
+@pytest.fixture()
+def reload_home(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "status_watch", False)
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(config, "reload_poll_interval", 0.02)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    directory = tmp_path / ".unity-mcp"
+    directory.mkdir()
+    return directory
+
+
+def _set_reloading(directory, reloading):
+    path = directory / "unity-mcp-status-abc123.json"
+    path.write_text(json.dumps({
+        "unity_port": 6400, "reloading": reloading, "reason": "reloading" if reloading else "ready",
+        "last_heartbeat": datetime.now(timezone.utc).isoformat()}))
+    # Make sure the rewrite is seen as a change even on coarse-mtime filesystems
+    stamp = time.time() + (1 if not reloading else 0)
+    os.utime(path, (stamp, stamp))
+
+
+@pytest.mark.asyncio
+async def test_requests_park_during_reload_and_release_in_order(monkeypatch, tmp_path, reload_home):
+    monkeypatch.setattr(config, "reload_release_concurrency", 1)
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await send(instance_id, params={"n": -1})
+        bridge.commands.clear()
+        _set_reloading(reload_home, True)
+
+        calls = []
+        for n in range(5):
+            calls.append(asyncio.ensure_future(send(instance_id, params={"n": n})))
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.3)
+        # Parked without touching the socket
+        assert bridge.commands == []
+        metrics = pool_metrics(instance_id)
+        assert metrics["reload"]["reloading"] and metrics["reload"]["waiting"] == 5
+
+        ready_at = time.monotonic()
+        _set_reloading(reload_home, False)
+        results = await asyncio.gather(*calls)
+        assert time.monotonic() - ready_at < 0.5
+        assert [r["params"]["n"] for r in results] == list(range(5))
+        assert [c["params"]["n"] for c in bridge.commands] == list(range(5))
+        assert pool_metrics(instance_id)["reload"]["released"] == 5
+
+
+@pytest.mark.asyncio
+async def test_release_concurrency_is_bounded(monkeypatch, tmp_path, reload_home):
+    monkeypatch.setattr(config, "reload_release_concurrency", 2)
+    in_flight, peak = [0], [0]
+
+    def handler(command):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        in_flight[0] -= 1
+        return {"status": "success", "result": command["params"]}
+
+    with StandInBridge(handler, multiplex=True) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await send(instance_id, params={"n": -1})
+        _set_reloading(reload_home, True)
+        calls = asyncio.ensure_future(asyncio.gather(*(send(instance_id, params={"n": n}) for n in range(6))))
+        await asyncio.sleep(0.1)
+        _set_reloading(reload_home, False)
+        results = await calls
+    assert sorted(r["n"] for r in results) == list(range(6))
+    assert peak[0] <= 2
+
+
+@pytest.mark.asyncio
+async def test_reload_outlasting_the_park_timeout_returns_a_retry_hint(monkeypatch, tmp_path, reload_home):
+    monkeypatch.setattr(config, "reload_park_timeout", 0.2)
+    with StandInBridge() as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        await send(instance_id, params={"n": -1})
+        bridge.commands.clear()
+        _set_reloading(reload_home, True)
+        started = time.monotonic()
+        response = await send(instance_id, params={"n": 0})
+        assert 0.2 <= time.monotonic() - started < 1.0
+        assert not response.success and response.data["state"] == "reloading"
+        assert bridge.commands == []
+        assert pool_metrics(instance_id)["reload"]["timed_out"] == 1
@@ -0,0 +1,98 @@
+import pytest
+
+import retry_policy
+import status_index
+import unity_connection
+from config import config
+from retry_policy import MUTATION, READ, RetryPolicy, RetryPolicyRegistry
+from status_index import StatusIndex
+
+from .stand_in_bridge import StandInBridge, use_bridge
+
+CREATE = ("manage_gameobject", {"action": "create", "name": "Cube"})
+
+
+@pytest.fixture()
+def retrying(monkeypatch):
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+
+
+def _send(instance_id, command):
+    return unity_connection.send_command_with_retry(*command, instance_id=instance_id)
+
+
+def test_policies_follow_command_and_action():
+    registry = RetryPolicyRegistry()
+    assert registry.policy_for("ping") is READ
+    assert registry.policy_for("get_editor_state", {}) is READ
+    assert registry.policy_for("manage_script", {"action": "read"}) is READ
+    assert registry.policy_for("manage_gameobject", {"action": "Find"}) is READ
+    assert registry.policy_for("manage_gameobject", {"action": "create"}) is MUTATION
+    assert registry.policy_for("manage_asset", {"action": "duplicate"}) is MUTATION
+    assert registry.policy_for("custom_tool", {}) is MUTATION
+
+    relaxed = RetryPolicy(idempotent=True, attempts=2)
+    registry.register("manage_editor", relaxed, actions=["play"])
+    registry.register("custom_tool", READ)
+    assert registry.policy_for("manage_editor", {"action": "play"}) is relaxed
+    assert registry.policy_for("manage_editor", {"action": "stop"}) is MUTATION
+    assert registry.policy_for("custom_tool", {"action": "anything"}) is READ
+
+
+@pytest.mark.parametrize("multiplex", [False, True])
+def test_lost_mutation_response_is_replayed_not_reapplied(monkeypatch, tmp_path, retrying, multiplex):
+    with StandInBridge(dedupe=True, drop_responses=1, multiplex=multiplex) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        result = _send(instance_id, CREATE)
+        assert result["params"] == CREATE[1]
+        assert bridge.applied == 1 and bridge.replayed == 1
+        # Both attempts carried the same key
+        keys = {command["idempotencyKey"] for command in bridge.commands}
+        assert len(bridge.commands) == 2 and len(keys) == 1
+
+        # A new call is a new mutation
+        _send(instance_id, CREATE)
+        assert bridge.applied == 2
+
+
+def test_mutation_is_not_resent_without_bridge_dedupe(monkeypatch, tmp_path, retrying):
+    with StandInBridge(drop_responses=1) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        with pytest.raises(Exception):
+            _send(instance_id, CREATE)
+        assert len(bridge.commands) == bridge.applied == 1
+
+        # The socket recovers for the next call
+        assert _send(instance_id, CREATE)["params"] == CREATE[1]
+
+
+def test_reads_retry_through_lost_responses(monkeypatch, tmp_path, retrying):
+    read = ("manage_scene", {"action": "get_hierarchy"})
+    with StandInBridge(drop_responses=3) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        assert _send(instance_id, read)["params"] == read[1]
+        assert bridge.applied == 4
+        assert all("idempotencyKey" not in command for command in bridge.commands)
+
+
+def test_unity_errors_are_retried_for_reads_only(monkeypatch, tmp_path, retrying):
+    monkeypatch.setattr(config, "max_retries", 2)
+    registry = RetryPolicyRegistry()
+    registry.register("manage_gameobject", RetryPolicy(idempotent=True, attempts=3, backoff_cap=0.01,
+                                                       retry_errors=True), actions=["find"])
+    monkeypatch.setattr(retry_policy, "_retry_policies", registry)
+
+    def failing(command):
+        return {"status": "error", "error": "GameObject not found"}
+
+    with StandInBridge(failing) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        with pytest.raises(unity_connection.UnityCommandError, match="not found"):
+            _send(instance_id, CREATE)
+        assert len(bridge.commands) == 1
+        with pytest.raises(unity_connection.UnityCommandError, match="not found"):
+            _send(instance_id, ("manage_gameobject", {"action": "find"}))
+        assert len(bridge.commands) == 1 + 4
+        assert bridge.connections == 1
@@ -0,0 +1,324 @@
+import asyncio
+import hashlib
+import os
+import time
+
+import pytest
+
+import script_cache
+import status_index
+import unity_connection
+from config import config
+from script_cache import ScriptCache, script_path
+from status_index import HAS_WATCHDOG, HAS_WATCHFILES, StatusIndex
+
+from .stand_in_bridge import StandInBridge, use_bridge
+from .test_csharp_outline import SOURCE
+from .test_helpers import DummyContext
+
+REPLACE_UPDATE = {"op": "replace_method", "methodName": "Update",
+                  "replacement": "        void Update() { Debug.Log(\"tick\"); }"}
+REPLACE_GET = {"op": "replace_method", "methodName": "Get",
+               "replacement": "        public T Get<T>(int index) where T : class => default;"}
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@pytest.fixture()
+def project(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    monkeypatch.setattr(unity_connection, "_single_flight", unity_connection._SingleFlight())
+    monkeypatch.setattr(script_cache, "_script_cache", ScriptCache(watch=False))
+    root = tmp_path / "Project"
+    (root / "Assets" / "Scripts").mkdir(parents=True)
+    (root / "Assets" / "Scripts" / "Mover.cs").write_text(SOURCE, encoding="utf-8")
+    monkeypatch.setenv("UNITY_PROJECT_ROOT", str(root))
+    return root
+
+
+def _disk_handler(root, formatter=None):
+    """ManageScript's read, get_sha and apply_text_edits against the files under root.
+
+    formatter, if given, rewrites the edited text before it is written, like Roslyn formatting.
+    """
+    from tools.script_apply_edits import _apply_edits_locally
+
+    def handler(command):
+        params = command["params"]
+        file = root / script_path(params["name"], params.get("path"))
+        raw = file.read_bytes()
+        text = raw.decode("utf-16" if raw[:2] == b"\xff\xfe" else "utf-8-sig")
+        action = params.get("action")
+        if action == "read":
+            data = {"contents": text}
+        elif action == "get_sha":
+            data = {"sha256": _sha(text), "lengthBytes": len(text.encode("utf-8"))}
+        elif action == "apply_text_edits":
+            if params.get("precondition_sha256") not in (None, _sha(text)):
+                return {"status": "success", "result": {"success": False, "code": "stale_file"}}
+            # Spans all refer to the same text: apply the last one first
+            edits = sorted(params["edits"], key=lambda e: (e["startLine"], e["startCol"]), reverse=True)
+            text = _apply_edits_locally(text, [
+                {"op": "replace_range", "text": e["newText"],
+                 **{k: e[k] for k in ("startLine", "startCol", "endLine", "endCol")}}
+                for e in edits])
+            if formatter is not None:
+                text = formatter(text)
+            file.write_bytes(text.encode("utf-8"))
+            data = {"sha256": _sha(text)}
+        else:
+            data = {"echo": params}
+        return {"status": "success", "result": {"success": True, "data": data}}
+    return handler
+
+
+def _actions(bridge):
+    return [c["params"]["action"] for c in bridge.commands if c["type"] == "manage_script"]
+
+
+def test_edits_reuse_the_text_they_wrote(monkeypatch, tmp_path, project):
+    import tools.script_apply_edits as script_apply_edits
+
+    with StandInBridge(_disk_handler(project), multiplex=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        for edit in (REPLACE_UPDATE, REPLACE_GET):
+            resp = script_apply_edits.script_apply_edits(
+                DummyContext(), name="Mover", path="Assets/Scripts", edits=[edit])
+            assert resp["success"], resp
+            assert resp["data"]["routing"] == "structured/local"
+    assert _actions(bridge) == ["apply_text_edits", "apply_text_edits"]
+    assert script_cache.get_script_cache().stats["disk_reads"] == 1
+    on_disk = (project / "Assets/Scripts/Mover.cs").read_text(encoding="utf-8")
+    assert 'Debug.Log("tick")' in on_disk and "=> default;" in on_disk
+    entry = script_cache.get_script_cache().get(project.resolve(), "Assets/Scripts/Mover.cs")
+    assert entry.text == on_disk and entry.sha256 == _sha(on_disk)
+
+
+def test_text_edits_update_the_cache_in_place(monkeypatch, tmp_path, project):
+    import tools.manage_script as manage_script
+    import tools.script_apply_edits as script_apply_edits
+
+    cache = script_cache.get_script_cache()
+    with StandInBridge(_disk_handler(project), multiplex=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        # Several spans in one batch
+        resp = script_apply_edits.script_apply_edits(
+            DummyContext(), name="Mover", path="Assets/Scripts",
+            edits=[{"op": "regex_replace", "pattern": r"float speed", "text": "float pace"},
+                   {"op": "regex_replace", "pattern": r"// a \{ in a comment", "text": "// a comment"}])
+        assert resp["success"], resp
+        sha = manage_script.get_sha(DummyContext(), uri="unity://path/Assets/Scripts/Mover.cs")["data"]["sha256"]
+        resp = manage_script.apply_text_edits(
+            DummyContext(), uri="unity://path/Assets/Scripts/Mover.cs", precondition_sha256=sha,
+            edits=[{"startLine": 10, "startCol": 9, "endLine": 10, "endCol": 15, "newText": "internal"}])
+        assert resp["success"], resp
+        entry = cache.get(project.resolve(), "Assets/Scripts/Mover.cs")
+    assert _actions(bridge) == ["apply_text_edits", "apply_text_edits"]
+    assert cache.stats["disk_reads"] == 1
+    on_disk = (project / "Assets/Scripts/Mover.cs").read_text(encoding="utf-8")
+    assert "internal float pace = 2f;" in on_disk and "// a comment\n" in on_disk
+    assert entry.text == on_disk and entry.sha256 == _sha(on_disk)
+
+
+def test_writes_unity_reformats_are_read_again(monkeypatch, tmp_path, project):
+    import tools.script_apply_edits as script_apply_edits
+
+    def formatter(text):
+        return text.replace("    ", "\t")
+
+    cache = script_cache.get_script_cache()
+    with StandInBridge(_disk_handler(project, formatter), multiplex=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        for edit in ({"op": "regex_replace", "pattern": r"float speed", "text": "float pace"}, REPLACE_UPDATE):
+            resp = script_apply_edits.script_apply_edits(
+                DummyContext(), name="Mover", path="Assets/Scripts", edits=[edit])
+            assert resp["success"], resp
+    assert _actions(bridge) == ["apply_text_edits", "apply_text_edits"]
+    assert cache.stats["disk_reads"] == 2
+    on_disk = (project / "Assets/Scripts/Mover.cs").read_text(encoding="utf-8")
+    assert "\tpublic float pace = 2f;" in on_disk and 'Debug.Log("tick")' in on_disk
+
+
+@pytest.mark.parametrize("text, edits, expected", [
+    ("ab\r\ncd\ref", [{"startLine": 2, "startCol": 3, "endLine": 3, "endCol": 1, "newText": "-"}], "ab\r\ncd-ef"),
+    ("abc\ndef", [{"startLine": 1, "startCol": 2, "endLine": 1, "endCol": 2, "newText": "X"},
+                   {"startLine": 2, "startCol": 4, "endLine": 2, "endCol": 1, "newText": "Y"}], "aXbc\nY"),
+    ("abc", [{"startLine": 1, "startCol": 5, "endLine": 1, "endCol": 5, "newText": "X"}], None),
+    ("abc\n", [{"startLine": 3, "startCol": 1, "endLine": 3, "endCol": 1, "newText": "X"}], None),
+    ("abcdef", [{"startLine": 1, "startCol": 1, "endLine": 1, "endCol": 4, "newText": ""},
+                {"startLine": 1, "startCol": 3, "endLine": 1, "endCol": 5, "newText": ""}], None),
+])
+def test_text_spans_apply_like_manage_script(text, edits, expected):
+    assert script_cache.apply_text_spans(text, edits) == expected
+
+
+def test_changed_files_are_read_again(monkeypatch, tmp_path, project):
+    import tools.script_apply_edits as script_apply_edits
+
+    file = project / "Assets/Scripts/Mover.cs"
+    with StandInBridge(_disk_handler(project), multiplex=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        script_apply_edits.script_apply_edits(
+            DummyContext(), name="Mover", path="Assets/Scripts", edits=[REPLACE_UPDATE])
+        # Someone else edits the file between calls
+        file.write_text(file.read_text(encoding="utf-8") + "// touched\n", encoding="utf-8")
+        resp = script_apply_edits.script_apply_edits(
+            DummyContext(), name="Mover", path="Assets/Scripts", edits=[REPLACE_GET])
+    assert resp["success"], resp
+    assert _actions(bridge) == ["apply_text_edits", "apply_text_edits"]
+    assert file.read_text(encoding="utf-8").endswith("// touched\n")
+    assert script_cache.get_script_cache().stats["stale"] == 1
+    assert script_cache.get_script_cache().stats["disk_reads"] == 2
+
+
+def test_reads_and_hashes_are_served_from_disk(monkeypatch, tmp_path, project):
+    import tools.manage_script as manage_script
+
+    with StandInBridge(_disk_handler(project), multiplex=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        first = manage_script.manage_script(DummyContext(), action="read", name="Mover", path="Assets/Scripts")
+        second = manage_script.manage_script(DummyContext(), action="read", name="Mover", path="Assets/Scripts")
+        sha = manage_script.get_sha(DummyContext(), uri="unity://path/Assets/Scripts/Mover.cs")
+        # Index ranges need the text to be mapped to lines; the write then drops the entry
+        manage_script.apply_text_edits(DummyContext(), uri="unity://path/Assets/Scripts/Mover.cs",
+                                       edits=[{"range": [0, 0], "text": "// head\n"}])
+        after = manage_script.get_sha(DummyContext(), uri="unity://path/Assets/Scripts/Mover.cs")
+    assert first["data"]["contents"] == second["data"]["contents"] == SOURCE
+    assert second["data"]["path"] == "Assets/Scripts/Mover.cs"
+    assert sha["data"] == {"sha256": _sha(SOURCE), "lengthBytes": len(SOURCE.encode("utf-8"))}
+    assert after["data"]["sha256"] == _sha("// head\n" + SOURCE)
+    assert _actions(bridge) == ["apply_text_edits"]
+    assert script_cache.get_script_cache().stats["disk_reads"] == 2
+
+
+def test_unity_reads_what_the_server_cannot(monkeypatch, tmp_path, project):
+    import tools.manage_script as manage_script
+
+    file = project / "Assets/Scripts/Mover.cs"
+    with StandInBridge(_disk_handler(project), multiplex=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        # Not UTF-8: Unity decodes it
+        file.write_bytes(SOURCE.encode("utf-16"))
+        utf16 = manage_script.manage_script(DummyContext(), action="read", name="Mover", path="Assets/Scripts")
+        file.write_text(SOURCE, encoding="utf-8")
+        # Without disk reads, what Unity read is still kept
+        monkeypatch.setattr(config, "script_disk_reads", False)
+        for _ in range(2):
+            kept = manage_script.manage_script(DummyContext(), action="read", name="Mover", path="Assets/Scripts")
+        # Without a project root nothing is read from disk or kept
+        monkeypatch.setattr(config, "script_disk_reads", True)
+        monkeypatch.delenv("UNITY_PROJECT_ROOT")
+        sha = manage_script.get_sha(DummyContext(), uri="unity://path/Assets/Scripts/Mover.cs")
+    assert utf16["data"]["contents"] == kept["data"]["contents"] == SOURCE
+    assert sha["data"]["sha256"] == _sha(SOURCE)
+    assert _actions(bridge) == ["read", "read", "get_sha"]
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="needs symlinks")
+def test_linked_folders_are_left_to_unity(monkeypatch, tmp_path, project):
+    import tools.manage_script as manage_script
+
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "Secret.cs").write_text("class Secret { }\n", encoding="utf-8")
+    (project / "Assets" / "Linked").symlink_to(outside, target_is_directory=True)
+    (project / "Assets" / "Linked" / "Nested").mkdir()
+    cache = script_cache.get_script_cache()
+    # ManageScript refuses a link anywhere from the script's folder up to Assets
+    assert cache.locate(None, "Secret", "Linked") is None
+    assert cache.locate(None, "Secret", "Linked/Nested") is None
+    assert cache.locate(None, "Mover", "Scripts") == (project.resolve(), "Assets/Scripts/Mover.cs")
+
+    refused = {"status": "success", "result": {"success": False, "message": "Invalid path"}}
+    with StandInBridge(lambda command: refused, multiplex=True) as bridge:
+        use_bridge(monkeypatch, tmp_path, bridge)
+        resp = manage_script.manage_script(DummyContext(), action="read", name="Secret", path="Assets/Linked")
+    assert not resp["success"]
+    assert _actions(bridge) == ["read"]
+    assert cache.stats["disk_reads"] == 0
+
+
+def test_resource_reads_share_the_cache(project):
+    from registry import get_registered_tools
+    import tools.resource_tools  # noqa: F401 - registers read_resource
+
+    read_resource = next(t["func"] for t in get_registered_tools() if t["name"] == "read_resource")
+    # A BOM is not part of the text or of the hash Unity checks preconditions against
+    file = project / "Assets/Scripts/Mover.cs"
+    file.write_bytes(b"\xef\xbb\xbf" + SOURCE.encode("utf-8"))
+    resp = asyncio.run(read_resource(uri="unity://path/Assets/Scripts/Mover.cs", ctx=DummyContext(),
+                                     start_line=1, line_count=3, project_root=str(project)))
+    assert resp["data"]["text"] == "\n".join(SOURCE.splitlines()[:3])
+    assert resp["data"]["metadata"] == {"sha256": _sha(SOURCE), "lengthBytes": len(SOURCE.encode("utf-8")) + 3}
+    cache = script_cache.get_script_cache()
+    assert cache.get(project.resolve(), "Assets/Scripts/Mover.cs").text == SOURCE
+
+
+@pytest.mark.parametrize("name, path, expected", [
+    ("Mover", None, "Assets/Scripts/Mover.cs"),
+    ("Mover", "Assets/Scripts", "Assets/Scripts/Mover.cs"),
+    ("Mover", "assets\\Game/Core/", "Assets/Game/Core/Mover.cs"),
+    ("Mover", "Game/../Other", "Assets/Other/Mover.cs"),
+    ("Mover", "../Outside", None),
+    ("Not-A-Name", "Assets/Scripts", None),
+])
+def test_script_paths_resolve_like_manage_script(name, path, expected):
+    assert script_path(name, path) == expected
+
+
+def test_writes_unity_disagrees_with_are_dropped(tmp_path):
+    (tmp_path / "Assets").mkdir()
+    (tmp_path / "Assets" / "A.cs").write_text("class A { }", encoding="utf-8")
+    cache = ScriptCache(capacity=1, watch=False)
+    assert cache.load(tmp_path, "Assets/A.cs").text == "class A { }"
+    assert cache.update(tmp_path, "Assets/A.cs", "class A { int x; }", _sha("something else")) is None
+    assert cache.get(tmp_path, "Assets/A.cs") is None
+    # Capacity one: loading another script evicts the first
+    (tmp_path / "Assets" / "B.cs").write_text("class B { }", encoding="utf-8")
+    cache.load(tmp_path, "Assets/A.cs")
+    cache.load(tmp_path, "Assets/B.cs")
+    assert [key[1] for key in cache._entries] == ["Assets/B.cs"]
+
+
+@pytest.mark.parametrize("data", [b"", b"\xef\xbb\xbf", "\ufeffclass \u00c9 { }\r\n".encode("utf-8"), b"class A { }"])
+def test_disk_reads_hash_the_text_without_its_bom(tmp_path, data):
+    (tmp_path / "Assets").mkdir()
+    (tmp_path / "Assets" / "A.cs").write_bytes(data)
+    entry = ScriptCache(watch=False).load(tmp_path, "Assets/A.cs")
+    assert entry.text == data.decode("utf-8-sig")
+    assert entry.sha256 == _sha(entry.text) and entry.size == len(data)
+
+
+def test_line_columns_count_only_newlines(tmp_path):
+    (tmp_path / "Assets").mkdir()
+    (tmp_path / "Assets" / "A.cs").write_text("ab\r\ncd\n\nef", encoding="utf-8", newline="")
+    entry = ScriptCache(watch=False).load(tmp_path, "Assets/A.cs")
+    assert [entry.line_col(i) for i in (0, 2, 3, 4, 7, 8, 9)] == [
+        (1, 1), (1, 3), (1, 4), (2, 1), (3, 1), (4, 1), (4, 2)]
+    assert entry.lines == ["ab", "cd", "", "ef"]
+
+
+@pytest.mark.skipif(not (HAS_WATCHDOG or HAS_WATCHFILES), reason="needs watchdog or watchfiles")
+def test_watched_projects_drop_entries_on_change(tmp_path):
+    (tmp_path / "Assets").mkdir()
+    file = tmp_path / "Assets" / "A.cs"
+    file.write_text("class A { }", encoding="utf-8")
+    cache = ScriptCache(watch=True)
+    try:
+        entry = cache.load(tmp_path.resolve(), "Assets/A.cs")
+        assert cache.watching(tmp_path.resolve())
+        # Same size and mtime: only the watcher can tell
+        stat = os.stat(file)
+        time.sleep(0.3)
+        file.write_text("class B { }", encoding="utf-8")
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        deadline = time.monotonic() + 5.0
+        while cache._entries and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert not cache._entries and cache.stats["events"] >= 1
+        assert cache.load(tmp_path.resolve(), "Assets/A.cs").text == "class B { }" != entry.text
+    finally:
+        cache.close(wait=2.0)
@@ -0,0 +1,133 @@
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import status_index
+import unity_connection
+from config import config
+from port_discovery import PortDiscovery
+from status_index import StatusIndex, _parse_heartbeat
+
+
+def _write_status(directory, project_hash, *, port=6401, reloading=False, age=0.0, name="Game"):
+    heartbeat = datetime.now(timezone.utc) - timedelta(seconds=age)
+    path = directory / f"unity-mcp-status-{project_hash}.json"
+    path.write_text(json.dumps({
+        "unity_port": port, "reloading": reloading, "reason": "reloading" if reloading else "ready",
+        "project_path": f"/Projects/{name}/Assets", "project_name": name,
+        "last_heartbeat": heartbeat.strftime("%Y-%m-%dT%H:%M:%S.%f0Z"),
+    }))
+    return path
+
+
+@pytest.fixture()
+def status_home(monkeypatch, tmp_path):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    directory = tmp_path / ".unity-mcp"
+    directory.mkdir()
+    monkeypatch.setattr(status_index, "_status_index", StatusIndex(watch=False))
+    PortDiscovery.clear_probe_cache()
+    return directory
+
+
+def test_lookups_between_scans_do_not_touch_the_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "status_poll_interval", 60.0)
+    _write_status(tmp_path, "aaaa1111", port=6401)
+    index = StatusIndex(tmp_path, watch=False)
+    assert index.get("aaaa1111").port == 6401
+    for _ in range(100):
+        assert index.get("aaaa1111").reloading is False
+    assert index.stats["scans"] == 1 and index.stats["parses"] == 1
+    assert index.get("missing") is None
+
+
+def test_rescan_parses_only_changed_files(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "status_poll_interval", 0.0)
+    _write_status(tmp_path, "aaaa1111", port=6401)
+    changing = _write_status(tmp_path, "bbbb2222", port=6402)
+    index = StatusIndex(tmp_path, watch=False)
+    assert len(index.entries()) == 2
+    assert index.stats["parses"] == 2
+
+    _write_status(tmp_path, "bbbb2222", port=6402, reloading=True, name="Renamed")
+    assert index.get("bbbb2222").reloading
+    assert index.stats["parses"] == 3
+
+    changing.unlink()
+    assert index.get("bbbb2222") is None
+    assert [e.hash for e in index.entries()] == ["aaaa1111"]
+
+
+def test_stale_heartbeats_are_filtered(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "status_stale_after", 30.0)
+    _write_status(tmp_path, "live0001", age=1)
+    _write_status(tmp_path, "dead0001", age=600)
+    index = StatusIndex(tmp_path, watch=False)
+    assert [e.hash for e in index.entries()] == ["live0001"]
+    assert [e.hash for e in index.entries(include_stale=True)] == ["live0001", "dead0001"]
+    assert index.get("dead0001").is_stale()
+
+
+def test_reloading_editors_get_longer_to_heartbeat(monkeypatch, status_home):
+    monkeypatch.setattr(config, "status_stale_after", 30.0)
+    monkeypatch.setattr(config, "status_reload_stale_after", 1800.0)
+    # A long import on a large project: no heartbeat for ten minutes, still reloading
+    _write_status(status_home, "busy0001", port=6401, reloading=True, age=600, name="Busy")
+    _write_status(status_home, "gone0001", port=6402, reloading=True, age=3600, name="Gone")
+    assert not status_index.get_status_index().get("busy0001").is_stale()
+    assert status_index.get_status_index().get("gone0001").is_stale()
+    probed = []
+    monkeypatch.setattr(PortDiscovery, "_try_probe_unity_mcp",
+                        staticmethod(lambda port: probed.append(port) or True))
+    assert [i.id for i in PortDiscovery.discover_all_unity_instances()] == ["Busy@busy0001"]
+    assert probed == [6401]
+
+
+def test_dotnet_round_trip_timestamps_parse():
+    parsed = _parse_heartbeat("2024-05-01T12:00:00.1234567Z")
+    assert parsed == datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    assert _parse_heartbeat("garbage") is None
+
+
+@pytest.mark.skipif(not (status_index.HAS_WATCHDOG or status_index.HAS_WATCHFILES),
+                    reason="needs watchdog or watchfiles")
+def test_watcher_picks_up_writes_without_rescans(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "status_poll_interval", 3600.0)
+    monkeypatch.setattr(config, "status_rescan_interval", 3600.0)
+    _write_status(tmp_path, "aaaa1111", port=6401)
+    index = StatusIndex(tmp_path, watch=True)
+    try:
+        assert index.get("aaaa1111").port == 6401
+        assert index.watching
+        # The watcher thread arms asynchronously; give it a moment before writing
+        time.sleep(0.3)
+        _write_status(tmp_path, "aaaa1111", port=6401, reloading=True)
+        deadline = time.monotonic() + 5
+        while not index.get("aaaa1111").reloading and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert index.get("aaaa1111").reloading
+        assert index.stats["scans"] == 1 and index.stats["events"] >= 1
+    finally:
+        index.close(wait=2.0)
+
+
+def test_discovery_skips_stale_instances_without_probing(monkeypatch, status_home):
+    monkeypatch.setattr(config, "status_stale_after", 30.0)
+    _write_status(status_home, "live0001", port=6401, name="Live")
+    _write_status(status_home, "dead0001", port=6402, age=600, name="Dead")
+    probed = []
+    monkeypatch.setattr(PortDiscovery, "_try_probe_unity_mcp",
+                        staticmethod(lambda port: probed.append(port) or True))
+    instances = PortDiscovery.discover_all_unity_instances()
+    assert [i.id for i in instances] == ["Live@live0001"]
+    assert probed == [6401]
+
+
+def test_reload_preflight_reads_the_index(status_home):
+    _write_status(status_home, "abc123", reloading=True)
+    conn = unity_connection.AsyncUnityConnection(port=1, instance_id="Game@abc123")
+    response = unity_connection._transport.run(conn.send_command("manage_scene", {}))
+    assert not response.success and response.data["state"] == "reloading"
+    assert unity_connection._read_status_file("abc123")["reloading"] is True
@@ -0,0 +1,96 @@
+import json
+import random
+
+import pytest
+
+import unity_connection
+from unity_connection import _BufferPool, _FrameProtocol, _FRAME_HEADER
+
+from .stand_in_bridge import StandInBridge, use_bridge
+
+
+def _feed(protocol, data, chunk_sizes):
+    """Deliver data the way a selector transport does: recv_into get_buffer()."""
+    view = memoryview(data)
+    while view:
+        buf = protocol.get_buffer(-1)
+        n = min(len(buf), len(view), next(chunk_sizes))
+        buf[:n] = view[:n]
+        del buf
+        protocol.buffer_updated(n)
+        view = view[n:]
+
+
+def _frame(payload: bytes) -> bytes:
+    return _FRAME_HEADER.pack(len(payload)) + payload
+
+
+@pytest.mark.asyncio
+async def test_protocol_splits_stream_regardless_of_chunking():
+    big = bytes(random.Random(7).getrandbits(8) for _ in range(1024)) * 1024  # 1 MiB
+    stream = (b"WELCOME UNITY-MCP 1 FRAMING=1\n" + _frame(b"") + _frame(b'{"a":1}')
+              + _frame(big) + _frame(b'{"b":2}'))
+    rng = random.Random(1)
+    protocol = _FrameProtocol()
+    _feed(protocol, stream[:40], iter(lambda: rng.randint(1, 9), None))
+    assert await protocol.read_item() == b"WELCOME UNITY-MCP 1 FRAMING=1\n"
+
+    protocol.set_mode("framed")
+    _feed(protocol, stream[40:], iter(lambda: rng.choice([3, 100, 70000]), None))
+    assert await protocol.read_item() == b""
+    assert await protocol.read_item() == b'{"a":1}'
+    large = await protocol.read_item()
+    assert isinstance(large, memoryview) and isinstance(large.obj, bytearray)
+    assert large == big
+    assert await protocol.read_item() == b'{"b":2}'
+
+
+@pytest.mark.asyncio
+async def test_protocol_rejects_oversized_frame():
+    protocol = _FrameProtocol()
+    protocol.set_mode("framed")
+    _feed(protocol, _FRAME_HEADER.pack(unity_connection.FRAMED_MAX + 1), iter(lambda: 8, None))
+    with pytest.raises(ValueError):
+        await protocol.read_item()
+
+
+def test_buffer_pool_recycles_only_moderate_buffers():
+    pool = _BufferPool()
+    buf = pool.acquire(300_000)
+    assert len(buf) == 512 * 1024
+    pool.release(memoryview(buf)[:300_000])
+    assert pool.acquire(400_000) is buf
+
+    huge = pool.acquire(unity_connection._POOLED_BUFFER_MAX + 1)
+    pool.release(memoryview(huge))
+    assert pool.acquire(unity_connection._POOLED_BUFFER_MAX + 1) is not huge
+
+
+def test_frame_header_and_payload_are_written_together():
+    class _Transport:
+        def __init__(self):
+            self.calls = []
+
+        def writelines(self, parts):
+            self.calls.append(("writelines", list(parts)))
+
+        def write(self, data):
+            self.calls.append(("write", data))
+
+    conn = unity_connection.AsyncUnityConnection(port=1)
+    conn._transport = _Transport()
+    conn._write_frame(b"H" * 8, b"payload")
+    assert conn._transport.calls == [("writelines", [b"H" * 8, b"payload"])]
+
+
+@pytest.mark.parametrize("multiplex", [False, True])
+@pytest.mark.asyncio
+async def test_large_response_round_trip(monkeypatch, tmp_path, multiplex):
+    text = "x" * (8 * 1024 * 1024)
+    response = json.dumps({"status": "success", "result": {"text": text}}).encode("utf-8")
+    with StandInBridge(lambda command: response, multiplex=multiplex) as bridge:
+        instance_id = use_bridge(monkeypatch, tmp_path, bridge)
+        for _ in range(2):
+            result = await unity_connection.async_send_command_with_retry(
+                "read_console", {}, instance_id=instance_id)
+            assert result["text"] == text
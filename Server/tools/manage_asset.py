@@ -1,11 +1,10 @@
 """
 Defines the manage_asset tool for interacting with Unity assets.
 """
-import asyncio
-import json
 from typing import Annotated, Any, Literal
 
 from fastmcp import Context
+import json_codec
 from registry import mcp_for_unity_tool
 from tools import get_unity_instance_from_context, async_send_with_unity_instance
 from unity_connection import async_send_command_with_retry
@@ -40,7 +39,7 @@ async def manage_asset(
     # Coerce 'properties' from JSON string to dict for client compatibility
     if isinstance(properties, str):
         try:
-            properties = json.loads(properties)
+            properties = json_codec.loads(properties)
             ctx.info("manage_asset: coerced properties from JSON string to dict")
         except Exception as e:
             ctx.warn(f"manage_asset: failed to parse properties JSON string: {e}")
@@ -86,10 +85,7 @@ async def manage_asset(
     # Remove None values to avoid sending unnecessary nulls
     params_dict = {k: v for k, v in params_dict.items() if v is not None}
 
-    # Get the current asyncio event loop
-    loop = asyncio.get_running_loop()
-
     # Use centralized async retry helper with instance routing
-    result = await async_send_with_unity_instance(async_send_command_with_retry, unity_instance, "manage_asset", params_dict, loop=loop)
+    result = await async_send_with_unity_instance(async_send_command_with_retry, unity_instance, "manage_asset", params_dict)
     # Return the result obtained from Unity
     return result if isinstance(result, dict) else {"success": False, "message": str(result)}
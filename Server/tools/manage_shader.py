@@ -4,7 +4,7 @@ from typing import Annotated, Any, Literal
 from fastmcp import Context
 from registry import mcp_for_unity_tool
 from tools import get_unity_instance_from_context, send_with_unity_instance
-from unity_connection import send_command_with_retry
+from unity_connection import attachment_text, send_command_with_retry
 
 
 @mcp_for_unity_tool(
@@ -47,6 +47,10 @@ def manage_shader(
 
         # Process response from Unity
         if isinstance(response, dict) and response.get("success"):
+            data = response.get("data") or {}
+            if isinstance(data, dict) and "contents" in data:
+                # Sent as a binary attachment when the bridge supports it
+                data["contents"] = attachment_text(data["contents"])
             # If the response contains base64 encoded content, decode it
             if response.get("data", {}).get("contentsEncoded"):
                 decoded_contents = base64.b64decode(
@@ -13,7 +13,9 @@ from urllib.parse import urlparse, unquote
 
 from fastmcp import Context
 
+from csharp_outline import get_outline_cache
 from registry import mcp_for_unity_tool
+from script_cache import get_script_cache
 from tools import get_unity_instance_from_context, send_with_unity_instance, async_send_with_unity_instance
 from unity_connection import send_command_with_retry
 
@@ -282,6 +284,9 @@ async def read_resource(
             p.relative_to(project / "Assets")
         except ValueError:
             return {"success": False, "error": "Read restricted to Assets/"}
+        # Scripts come from the shared script cache, with the SHA-256 Unity checks
+        # preconditions against (BOM excluded)
+        entry = get_script_cache().load(project, p.relative_to(project).as_posix()) if p.suffix == ".cs" else None
         # Natural-language convenience: request like "last 120 lines", "first 200 lines",
         # "show 40 lines around MethodName", etc.
         if request:
@@ -297,20 +302,18 @@ async def read_resource(
             if m:
                 head_bytes = int(m.group(1))
             m = re.search(
-                r"show\s+(\d+)\s+lines\s+around\s+([A-Za-z_][A-Za-z0-9_]*)", req)
+                r"show\s+(\d+)\s+lines\s+around\s+([A-Za-z_][A-Za-z0-9_]*)", request.strip(), re.IGNORECASE)
             if m:
                 window = int(m.group(1))
-                method = m.group(2)
-                # naive search for method header to get a line number
-                text_all = p.read_text(encoding="utf-8")
-                lines_all = text_all.splitlines()
-                pat = re.compile(
-                    rf"^\s*(?:\[[^\]]+\]\s*)*(?:public|private|protected|internal|static|virtual|override|sealed|async|extern|unsafe|new|partial).*?\b{re.escape(method)}\s*\(", re.MULTILINE)
-                hit_line = None
-                for i, line in enumerate(lines_all, start=1):
-                    if pat.search(line):
-                        hit_line = i
-                        break
+                member = m.group(2)
+                # Locate the declaration in the script's outline: methods first, then any
+                # member or type, exact case before case-insensitive
+                outline = get_outline_cache().outline(entry.text if entry else p.read_text(encoding="utf-8"))
+                declarations = [d for d, _ in outline.walk()]
+                hit = (next((d for d in declarations if d.kind in ("method", "constructor") and d.name == member), None)
+                       or next((d for d in declarations if d.name == member), None)
+                       or next((d for d in declarations if d.name.lower() == member.lower()), None))
+                hit_line = outline.line_col(hit.header_start)[0] if hit else None
                 if hit_line:
                     half = max(1, window // 2)
                     start_line = max(1, hit_line - half)
@@ -323,8 +326,14 @@ async def read_resource(
         tail_lines = _coerce_int(tail_lines, minimum=1)
 
         # Compute SHA over full file contents (metadata-only default)
-        full_bytes = p.read_bytes()
-        full_sha = hashlib.sha256(full_bytes).hexdigest()
+        if entry is not None and not head_bytes:
+            full_bytes = None
+            full_sha, length_bytes = entry.sha256, entry.size
+        else:
+            full_bytes = p.read_bytes()
+            full_sha, length_bytes = hashlib.sha256(full_bytes).hexdigest(), len(full_bytes)
+            if entry is not None:
+                full_sha = entry.sha256
 
         # Selection only when explicitly requested via windowing args or request text hints
         selection_requested = bool(head_bytes or tail_lines or (
@@ -336,20 +345,20 @@ async def read_resource(
                 raw = full_bytes[: head_bytes]
                 text = raw.decode("utf-8", errors="replace")
             else:
-                text = full_bytes.decode("utf-8", errors="replace")
+                text = entry.text if entry is not None else full_bytes.decode("utf-8", errors="replace")
                 if tail_lines is not None and tail_lines > 0:
-                    lines = text.splitlines()
+                    lines = entry.lines if entry is not None else text.splitlines()
                     n = max(0, tail_lines)
                     text = "\n".join(lines[-n:])
                 elif start_line is not None and line_count is not None and line_count >= 0:
-                    lines = text.splitlines()
+                    lines = entry.lines if entry is not None else text.splitlines()
                     s = max(0, start_line - 1)
                     e = min(len(lines), s + line_count)
                     text = "\n".join(lines[s:e])
-            return {"success": True, "data": {"text": text, "metadata": {"sha256": full_sha, "lengthBytes": len(full_bytes)}}}
+            return {"success": True, "data": {"text": text, "metadata": {"sha256": full_sha, "lengthBytes": length_bytes}}}
         else:
             # Default: metadata only
-            return {"success": True, "data": {"metadata": {"sha256": full_sha, "lengthBytes": len(full_bytes)}}}
+            return {"success": True, "data": {"metadata": {"sha256": full_sha, "lengthBytes": length_bytes}}}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
@@ -2,6 +2,7 @@ from typing import Annotated, Any
 
 from fastmcp import Context
 from registry import mcp_for_unity_tool
+from instance_supervisor import get_instance_supervisor
 from unity_connection import get_unity_connection_pool
 from unity_instance_middleware import get_unity_instance_middleware
 
@@ -13,9 +14,12 @@ def set_active_instance(
 	ctx: Context,
 	instance: Annotated[str, "Target instance (Name@hash or hash prefix)"]
 ) -> dict[str, Any]:
-	# Discover running instances
+	# The instance supervisor keeps the instance list current; rescan only for an unknown value
 	pool = get_unity_connection_pool()
-	instances = pool.discover_all_instances(force_refresh=True)
+	value = instance.strip()
+	instances = pool.discover_all_instances()
+	if not any(inst.id == value or inst.hash.startswith(value) for inst in instances):
+		instances = pool.discover_all_instances(force_refresh=True)
 	ids = {inst.id: inst for inst in instances}
 	hashes = {}
 	for inst in instances:
@@ -23,7 +27,6 @@ def set_active_instance(
 		hashes.setdefault(inst.hash, inst)
 	
 	# Disallow plain names to ensure determinism
-	value = instance.strip()
 	resolved = None
 	if "@" in value:
 		resolved = ids.get(value)
@@ -42,4 +45,6 @@ def set_active_instance(
 	# Store selection in middleware (session-scoped)
 	middleware = get_unity_instance_middleware()
 	middleware.set_active_instance(ctx, resolved.id)
+	# Make sure its connection is warm before the first call
+	get_instance_supervisor().wake()
 	return {"success": True, "message": f"Active instance set to {resolved.id}", "data": {"instance": resolved.id}}